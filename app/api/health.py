@@ -6,22 +6,29 @@ CLIENT SPEC Lines 385-394: Health, Resilience, Operations
 - /status (detailed component status)
 - /metrics (Prometheus-compatible)
 - Killswitch for emergency stop
+- /debug/loop (event-loop stalls with sampled stacks, admin token)
 
 All endpoints return JSON and are designed for monitoring/alerting.
+/status and /metrics are computed in the background by HealthSnapshotter and
+served from its last snapshot (with `snapshot_age_s` / `snapshot_stale`).
+
+FastAPI/uvicorn are imported lazily: the app object is only built when the
+health server starts (or `get_health_app()` is called), so importing this
+module (e.g. for `is_killswitch_active()`) stays cheap.
 """
 
-from fastapi import FastAPI, HTTPException, Header
-from fastapi.responses import JSONResponse
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 import asyncio
 import os
+import time
+import traceback
 
 from app.core.logging import system_logger
 
 
-# Create FastAPI app for health endpoints
-app = FastAPI(title="Bybit Copybot Health API", version="1.0.0")
+# FastAPI app for health endpoints (built on first use)
+_health_app = None
 
 # Killswitch state
 _killswitch_active = False
@@ -29,7 +36,40 @@ _killswitch_reason = ""
 _killswitch_activated_at: Optional[datetime] = None
 
 
-@app.get("/health")
+def get_health_app():
+    """Build (once) and return the FastAPI app with all health routes."""
+    global _health_app
+    if _health_app is None:
+        from fastapi import FastAPI, Header
+
+        health_app = FastAPI(title="Bybit Copybot Health API", version="1.0.0")
+        health_app.get("/health")(health_check)
+        health_app.get("/status")(status_check)
+        health_app.get("/metrics")(metrics)
+
+        @health_app.get("/debug/loop")
+        async def _loop_debug_route(x_admin_token: Optional[str] = Header(None)):
+            return await loop_debug(x_admin_token)
+
+        @health_app.post("/killswitch")
+        async def _killswitch_route(x_admin_token: Optional[str] = Header(None)):
+            return await killswitch(x_admin_token)
+
+        @health_app.post("/resume")
+        async def _resume_route(x_admin_token: Optional[str] = Header(None)):
+            return await resume_trading(x_admin_token)
+
+        _health_app = health_app
+    return _health_app
+
+
+def __getattr__(name: str):
+    # Backwards compatibility: `from app.api.health import app`
+    if name == "app":
+        return get_health_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 async def health_check():
     """
     Basic health check (stdlib/curl compatible).
@@ -46,132 +86,309 @@ async def health_check():
     }
 
 
-@app.get("/status")
 async def status_check():
     """
     Detailed status check.
     
     CLIENT SPEC Line 386: "/status"
     
-    Returns detailed component status for troubleshooting.
+    Returns detailed component status for troubleshooting, served from the
+    background snapshot (see HealthSnapshotter).
     """
-    try:
-        # Import here to avoid circular dependencies
-        from app.bybit.client import get_bybit_client
-        from app.core.ntp_sync import get_ntp_monitor
-        from app.core.market_guards import get_market_guards
-        from app.core.journal import get_append_only_journal
-        from app.storage.db import get_db_connection
-        
-        # Check each component
-        bybit_status = await _check_bybit_status()
-        telegram_status = await _check_telegram_status()
-        db_status = await _check_database_status()
-        
-        # NTP status
-        ntp_monitor = get_ntp_monitor()
-        ntp_status = ntp_monitor.get_status()
-        
-        # Market guards status
-        guards = get_market_guards()
-        guards_status = guards.get_statistics()
-        
-        # Journal status
-        journal = get_append_only_journal()
-        journal_integrity = journal.verify_integrity()
-        
-        # Overall trading status
-        trading_allowed = (
-            bybit_status["available"] and
-            ntp_status["trading_allowed"] and
-            not _killswitch_active
-        )
-        
-        return {
-            "status": "operational" if trading_allowed else "degraded",
-            "trading_enabled": trading_allowed,
-            "killswitch_active": _killswitch_active,
-            "components": {
-                "bybit_api": bybit_status,
-                "telegram": telegram_status,
-                "database": db_status,
-                "ntp_sync": ntp_status,
-                "market_guards": guards_status,
-                "journal": {
-                    "entries": journal.get_entry_count(),
-                    "integrity_valid": journal_integrity["valid"],
-                    "last_hash": journal.last_hash[:16] if journal.last_hash else None
-                }
-            },
-            "timestamp": datetime.utcnow().isoformat()
+    return await get_health_snapshotter().serve("status")
+
+
+async def _compute_status() -> Dict[str, Any]:
+    """Probe every component (Bybit, Telegram, DB, NTP, guards, journal, shards)."""
+    # Import here to avoid circular dependencies
+    from app.core.ntp_sync import get_ntp_monitor
+    from app.core.market_guards import get_market_guards
+    from app.core.journal import get_append_only_journal
+    
+    # Check each component
+    bybit_status = await _check_bybit_status()
+    telegram_status = await _check_telegram_status()
+    db_status = await _check_database_status()
+    
+    # NTP status
+    ntp_monitor = get_ntp_monitor()
+    ntp_status = ntp_monitor.get_status()
+    
+    # Market guards status
+    guards = get_market_guards()
+    guards_status = guards.get_statistics()
+    
+    # Journal status
+    journal = get_append_only_journal()
+    journal_integrity = journal.verify_integrity()
+    
+    # Trade shards (supervisor mode only)
+    from app.runtime.sharding import get_shard_router
+    router = get_shard_router()
+    shards_status = router.get_status() if router is not None else None
+    
+    components = {
+        "bybit_api": bybit_status,
+        "telegram": telegram_status,
+        "database": db_status,
+        "ntp_sync": ntp_status,
+        "market_guards": guards_status,
+        "journal": {
+            "entries": journal.get_entry_count(),
+            "integrity_valid": journal_integrity["valid"],
+            "last_hash": journal.last_hash[:16] if journal.last_hash else None
         }
-        
-    except Exception as e:
-        system_logger.error(f"Status check error: {e}", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content={
-                "status": "error",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-        )
+    }
+    if shards_status is not None:
+        components["shards"] = shards_status
+    
+    # Killswitch is applied when serving (it changes between snapshots)
+    return {
+        "components_ok": bybit_status["available"] and ntp_status["trading_allowed"],
+        "shards_healthy": shards_status is None or shards_status["healthy_shards"] == shards_status["shard_count"],
+        "components": components,
+        "timestamp": datetime.utcnow().isoformat()
+    }
 
 
-@app.get("/metrics")
 async def metrics():
     """
     Prometheus-compatible metrics.
     
     CLIENT SPEC Line 386: "/metrics"
     
-    Returns metrics for monitoring and alerting.
+    Returns metrics for monitoring and alerting, served from the background
+    snapshot (see HealthSnapshotter).
     """
-    try:
-        # Get 24h statistics
-        stats_24h = await _get_24h_statistics()
+    return await get_health_snapshotter().serve("metrics")
+
+
+async def _compute_metrics() -> Dict[str, Any]:
+    """Collect 24h trade statistics and system metrics."""
+    # Get 24h statistics
+    stats_24h = await _get_24h_statistics()
+    
+    # Get current state
+    from app.core.ntp_sync import get_ntp_monitor
+    from app.core.market_guards import get_market_guards
+    from app.core.loop_monitor import get_loop_monitor
+    from app.core.postonly_repricer import get_postonly_repricer
+    from app.core.websocket_gap_detector import get_gap_detector
+    
+    ntp = get_ntp_monitor()
+    guards = get_market_guards()
+    loop_stats = get_loop_monitor().get_stats()
+    postonly_stats = get_postonly_repricer().get_stats()
+    gap_status = get_gap_detector().get_status()
+    from app.bybit import websocket
+    ws_queues = websocket._ws_instance.dispatcher.get_stats() if websocket._ws_instance else {}
+    from app.runtime.resume import get_resume_report
+    resume_report = get_resume_report()
+    from app.signals.parse_pool import get_parse_pool
+    parse_stats = get_parse_pool().get_stats()
+    from app.signals.parse_cache import get_parse_cache
+    parse_cache_stats = get_parse_cache().get_stats()
+    
+    return {
+        # Trade metrics
+        "total_trades_24h": stats_24h["total_trades"],
+        "winning_trades_24h": stats_24h["winning_trades"],
+        "losing_trades_24h": stats_24h["losing_trades"],
+        "win_rate_24h": stats_24h["win_rate"],
+        "total_pnl_24h_usdt": stats_24h["total_pnl"],
         
-        # Get current state
-        from app.core.ntp_sync import get_ntp_monitor
-        from app.core.market_guards import get_market_guards
+        # Performance metrics
+        "avg_latency_ms": stats_24h["avg_latency"],
+        "errors_24h": stats_24h["error_count"],
         
-        ntp = get_ntp_monitor()
-        guards = get_market_guards()
+        # System metrics
+        "ntp_drift_ms": ntp.last_drift * 1000 if ntp.last_drift else 0,
+        "clock_drift_blocks": ntp.drift_blocks,
+        "market_guard_blocks": guards.spread_blocks + guards.liquidity_blocks + guards.maintenance_blocks,
         
-        return {
-            # Trade metrics
-            "total_trades_24h": stats_24h["total_trades"],
-            "winning_trades_24h": stats_24h["winning_trades"],
-            "losing_trades_24h": stats_24h["losing_trades"],
-            "win_rate_24h": stats_24h["win_rate"],
-            "total_pnl_24h_usdt": stats_24h["total_pnl"],
-            
-            # Performance metrics
-            "avg_latency_ms": stats_24h["avg_latency"],
-            "errors_24h": stats_24h["error_count"],
-            
-            # System metrics
-            "ntp_drift_ms": ntp.last_drift * 1000 if ntp.last_drift else 0,
-            "clock_drift_blocks": ntp.drift_blocks,
-            "market_guard_blocks": guards.spread_blocks + guards.liquidity_blocks + guards.maintenance_blocks,
-            
-            # State
-            "trading_enabled": ntp.is_trading_allowed() and not _killswitch_active,
-            "killswitch_active": _killswitch_active,
-            
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        # Event-loop health
+        "loop_lag_ms": loop_stats["last_lag_ms"],
+        "loop_lag_p99_ms": loop_stats["p99_lag_ms"],
+        "loop_lag_max_ms": loop_stats["max_lag_ms"],
+        "loop_stalls": loop_stats["stalls"],
+        "loop_lag_histogram_ms": loop_stats["histogram_ms"],
+        "loop_top_offenders": loop_stats["top_offenders"],
         
-    except Exception as e:
-        system_logger.error(f"Metrics error: {e}", exc_info=True)
-        return JSONResponse(
-            status_code=500,
-            content={"error": str(e)}
+        # PostOnly entry pricing
+        "postonly_reject_rate": postonly_stats["reject_rate"],
+        "postonly_time_to_rest_avg_ms": postonly_stats["time_to_rest_avg_ms"],
+        "postonly_time_to_rest_p95_ms": postonly_stats["time_to_rest_p95_ms"],
+        
+        # WebSocket gap/reconnect recovery
+        "ws_recoveries": gap_status["total_recoveries_successful"],
+        "ws_pause_last_ms": gap_status["last_pause_ms"],
+        "ws_pause_max_ms": gap_status["max_pause_ms"],
+        "ws_pause_total_ms": gap_status["total_pause_ms"],
+        "ws_queues": ws_queues,
+        
+        # Startup resume of open trades
+        "resume_time_to_ready_ms": resume_report.get("time_to_ready_ms"),
+        "resumed_trades": resume_report.get("running", 0) + resume_report.get("pending_entries", 0),
+        
+        # Signal parsing (worker pool or inline)
+        "parse_pool": parse_stats,
+        "parse_cache": parse_cache_stats,
+        
+        # Killswitch is applied when serving (it changes between snapshots)
+        "clock_trading_allowed": ntp.is_trading_allowed(),
+        
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+class HealthSnapshotter:
+    """
+    Computes /status and /metrics in the background on a fixed cadence.
+    
+    Scrapes (Prometheus every 5-15 s, uptime checks) used to open SQLite and
+    probe Bybit/Telegram on every request, competing with trading for the
+    loop and the DB. Now one background task refreshes both snapshots every
+    `interval` seconds and requests return the last snapshot in constant
+    time, with its age and a staleness flag. Killswitch state is overlaid
+    live. A failed refresh keeps the previous snapshot (it ages into stale).
+    """
+    
+    def __init__(self, interval: float = 10.0, stale_after: Optional[float] = None):
+        self.interval = interval
+        self.stale_after = stale_after if stale_after is not None else interval * 3
+        self.computers = {"status": _compute_status, "metrics": _compute_metrics}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}  # name -> {"payload", "computed_at"}
+        self._errors: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.refreshes = 0
+    
+    async def refresh(self, names=None):
+        """Recompute the given snapshots (all by default) concurrently."""
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+        names = list(names or self.computers)
+        async with self._refresh_lock:
+            results = await asyncio.gather(
+                *(self.computers[name]() for name in names), return_exceptions=True
+            )
+            for name, result in zip(names, results):
+                if isinstance(result, Exception):
+                    self._errors[name] = str(result)
+                    # Not raised here, so format_exc() would have no traceback: format the result's own
+                    system_logger.error(f"Health snapshot '{name}' failed: {result!r}", {
+                        'exception': "".join(traceback.format_exception(type(result), result, result.__traceback__))
+                    })
+                else:
+                    self._errors.pop(name, None)
+                    self._snapshots[name] = {"payload": result, "computed_at": time.monotonic()}
+            self.refreshes += 1
+    
+    async def run(self):
+        """Background refresh loop."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                system_logger.error(f"Health snapshotter error: {e}", exc_info=True)
+            await asyncio.sleep(self.interval)
+    
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+            system_logger.info("Health snapshotter started", {
+                "interval_s": self.interval,
+                "stale_after_s": self.stale_after
+            })
+    
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def serve(self, name: str):
+        """Last snapshot plus age/staleness and live killswitch state."""
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            # Nothing computed yet (first request, or snapshotter not started)
+            await self.refresh([name])
+            snapshot = self._snapshots.get(name)
+            if snapshot is None:
+                from fastapi.responses import JSONResponse
+                return JSONResponse(
+                    status_code=500,
+                    content={
+                        "status": "error",
+                        "error": self._errors.get(name, "snapshot unavailable"),
+                        "timestamp": datetime.utcnow().isoformat()
+                    }
+                )
+        
+        age = time.monotonic() - snapshot["computed_at"]
+        payload = _apply_live_state(name, snapshot["payload"])
+        payload["snapshot_age_s"] = round(age, 3)
+        payload["snapshot_stale"] = age > self.stale_after
+        if name in self._errors:
+            payload["snapshot_error"] = self._errors[name]
+        return payload
+
+
+def _apply_live_state(name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay killswitch-dependent fields onto a cached snapshot."""
+    payload = dict(payload)
+    if name == "status":
+        trading_allowed = payload.pop("components_ok") and not _killswitch_active
+        shards_healthy = payload.pop("shards_healthy")
+        payload["status"] = "operational" if trading_allowed and shards_healthy else "degraded"
+        payload["trading_enabled"] = trading_allowed
+    else:
+        payload["trading_enabled"] = payload.pop("clock_trading_allowed") and not _killswitch_active
+    payload["killswitch_active"] = _killswitch_active
+    return payload
+
+
+_health_snapshotter: Optional[HealthSnapshotter] = None
+
+
+def get_health_snapshotter() -> HealthSnapshotter:
+    """Get global health snapshotter (HEALTH_SNAPSHOT_INTERVAL seconds, default 10)."""
+    global _health_snapshotter
+    if _health_snapshotter is None:
+        _health_snapshotter = HealthSnapshotter(
+            interval=float(os.getenv("HEALTH_SNAPSHOT_INTERVAL", "10"))
         )
+    return _health_snapshotter
 
 
-@app.post("/killswitch")
-async def killswitch(x_admin_token: Optional[str] = Header(None)):
+async def loop_debug(x_admin_token: Optional[str] = None):
+    """
+    Event-loop watchdog detail.
+    
+    Lag percentiles, histogram, recent stalls and the top blocking
+    callbacks with the stack sampled while each one was running.
+    Stacks expose code paths, so this requires admin authentication.
+    
+    Headers:
+        X-Admin-Token: Admin authentication token
+    """
+    _require_admin(x_admin_token)
+    from app.core.loop_monitor import get_loop_monitor
+    return get_loop_monitor().get_debug()
+
+
+def _require_admin(x_admin_token: Optional[str]):
+    """Reject the request unless it carries the ADMIN_TOKEN."""
+    expected_token = os.getenv("ADMIN_TOKEN", "")
+    if not expected_token or x_admin_token != expected_token:
+        from fastapi import HTTPException
+        raise HTTPException(status_code=401, detail="Unauthorized - invalid admin token")
+
+
+async def killswitch(x_admin_token: Optional[str] = None):
     """
     Emergency killswitch to stop all trading.
     
@@ -188,10 +405,7 @@ async def killswitch(x_admin_token: Optional[str] = Header(None)):
     """
     global _killswitch_active, _killswitch_reason, _killswitch_activated_at
     
-    # Verify admin token
-    expected_token = os.getenv("ADMIN_TOKEN", "")
-    if not expected_token or x_admin_token != expected_token:
-        raise HTTPException(status_code=401, detail="Unauthorized - invalid admin token")
+    _require_admin(x_admin_token)
     
     if _killswitch_active:
         return {
@@ -224,8 +438,7 @@ async def killswitch(x_admin_token: Optional[str] = Header(None)):
     }
 
 
-@app.post("/resume")
-async def resume_trading(x_admin_token: Optional[str] = Header(None)):
+async def resume_trading(x_admin_token: Optional[str] = None):
     """
     Resume trading after killswitch.
     
@@ -235,10 +448,7 @@ async def resume_trading(x_admin_token: Optional[str] = Header(None)):
     """
     global _killswitch_active, _killswitch_reason
     
-    # Verify admin token
-    expected_token = os.getenv("ADMIN_TOKEN", "")
-    if not expected_token or x_admin_token != expected_token:
-        raise HTTPException(status_code=401, detail="Unauthorized - invalid admin token")
+    _require_admin(x_admin_token)
     
     if not _killswitch_active:
         return {
@@ -538,13 +748,15 @@ async def start_health_server(host: str = "0.0.0.0", port: int = 8080):
     })
     
     config = uvicorn.Config(
-        app,
+        get_health_app(),
         host=host,
         port=port,
         log_level="info",
         access_log=False  # Reduce log noise
     )
     
+    get_health_snapshotter().start()
+    
     server = uvicorn.Server(config)
     await server.serve()
 
@@ -1,7 +1,10 @@
-import os, time, hmac, hashlib, json, httpx, asyncio
-from typing import Any, Dict
+import os, time, httpx, asyncio
+from typing import Any, Dict, Optional
 from email.utils import parsedate_to_datetime
 from app.core.logging import system_logger
+from app.core import json_codec
+from app.bybit.signer import RequestSigner, get_request_signer
+from app.bybit.rate_limiter import get_rate_limiter, create_rate_limiter, BybitRateLimiter, RATE_LIMIT_RET_CODE
 
 # CLIENT SPEC (doc/10_15.md Lines 1-4, 277-302):
 # HARD RULE: All secrets MUST be accessed through ALL_PARAMETERS.py (via STRICT_CONFIG)
@@ -35,6 +38,9 @@ class BybitAPIError(Exception):
         self.result = result
         super().__init__(f"Bybit API error {ret_code}: {ret_msg}")
 
+class BybitRateLimitError(BybitAPIError):
+    """retCode 10006: the endpoint group's window is used up (not an exchange failure)"""
+
 def _check_response(response: dict) -> dict:
     """Check Bybit response for retCode and raise exception if not 0"""
     ret_code = response.get("retCode", 0)
@@ -49,56 +55,62 @@ def _check_response(response: dict) -> dict:
     if ret_code == 10002:
         raise BybitAPIError(ret_code, f"Timestamp sync error: {ret_msg}. Check system clock or increase recv_window.", response.get("result"))
     
+    if ret_code == RATE_LIMIT_RET_CODE:
+        raise BybitRateLimitError(ret_code, ret_msg, response.get("result"))
+    
     raise BybitAPIError(ret_code, ret_msg, response.get("result"))
 
 def _ts() -> str:
     return str(int(time.time() * 1000))
 
+def _main_signer() -> RequestSigner:
+    """Signer for the main account's credentials (STRICT_CONFIG)."""
+    return get_request_signer(_get_bybit_api_key(), _get_bybit_api_secret(), _get_bybit_recv_window())
+
 def _sign(payload: str) -> str:
-    return hmac.new(_get_bybit_api_secret().encode(), payload.encode(), hashlib.sha256).hexdigest()
+    return _main_signer().sign(payload)
 
 def _headers(body: Dict[str, Any]):
-    ts = _ts()
-    body_str = json.dumps(body, separators=(",", ":"), ensure_ascii=False)
-    prehash = ts + _get_bybit_api_key() + _get_bybit_recv_window() + body_str
-    return {
-        "X-BAPI-API-KEY": _get_bybit_api_key(),
-        "X-BAPI-TIMESTAMP": ts,
-        "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
-        "X-BAPI-SIGN": _sign(prehash),
-        "X-BAPI-SIGN-TYPE": "2",
-        "Content-Type": "application/json",
-    }
+    return _main_signer().headers(_ts(), json_codec.dumps(body), json_body=True)
 
 def _headers_get(params: str = ""):
     """Headers for GET requests with query parameters"""
-    ts = _ts()
-    prehash = ts + _get_bybit_api_key() + _get_bybit_recv_window() + params
-    return {
-        "X-BAPI-API-KEY": _get_bybit_api_key(),
-        "X-BAPI-TIMESTAMP": ts,
-        "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
-        "X-BAPI-SIGN": _sign(prehash),
-        "X-BAPI-SIGN-TYPE": "2",
-    }
+    return _main_signer().headers(_ts(), params)
 
 class BybitClient:
     """
     Async V5 client with server-time sync and 10002 retry.
     Singleton pattern to ensure single instance across all modules.
+
+    Passing an account (name, api_key, api_secret) creates a separate client
+    for that account instead: its own connection pool, signing keys and
+    rate limiter (Bybit limits are per UID). See app/trade/multi_account.py.
     """
     _instance = None
     _initialized = False
     
-    def __new__(cls):
+    def __new__(cls, account: Optional[Dict[str, Any]] = None):
+        if account is not None:
+            return super(BybitClient, cls).__new__(cls)
         if cls._instance is None:
             cls._instance = super(BybitClient, cls).__new__(cls)
         return cls._instance
     
-    def __init__(self):
+    def __init__(self, account: Optional[Dict[str, Any]] = None):
         # Only initialize once
         if self._initialized:
             return
+
+        # None = the main account configured in STRICT_CONFIG
+        self.account = account
+        self.account_name = account["name"] if account else None
+        self._rate_limiter = create_rate_limiter() if account else None
+        self._request_signer: Optional[RequestSigner] = None
+        self._circuit_breaker = None
+        if account:
+            # A rejected key on one account must not trip the main account's breaker
+            from app.core.circuit_breaker import CircuitBreaker
+            self._circuit_breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=60)
             
         # CRITICAL FIX: Completely disable proxy at multiple levels
         # This fixes 403 Forbidden errors caused by system proxy settings
@@ -134,14 +146,39 @@ class BybitClient:
             headers=default_headers  # Add browser-like headers
         )
         self._ts_offset_ms = 0
-        self._last_sync = 0.0
+        self._last_sync = 0.0  # last successful sync
+        self._last_sync_attempt = 0.0
+        self._sync_retry_interval = 5.0  # failed syncs are retried this often, not per request
         # Allow env override; default 60s
         # CLIENT SPEC: Non-secret config can still use os.getenv() for operational settings
         self._sync_interval = int(os.getenv("BYBIT_TIME_SYNC_INTERVAL", "60"))
         
         # Mark as initialized
         self._initialized = True
-        system_logger.info(f"BybitClient singleton created with endpoint: {self.http.base_url}", {"proxy": "DISABLED"})
+        if account:
+            system_logger.info(f"BybitClient created for account {self.account_name}", {"endpoint": str(self.http.base_url)})
+        else:
+            system_logger.info(f"BybitClient singleton created with endpoint: {self.http.base_url}", {"proxy": "DISABLED"})
+
+    def _signer(self) -> RequestSigner:
+        """Signer for this client's credentials (resolved once, on first signed call)."""
+        if self._request_signer is None:
+            if self.account:
+                self._request_signer = get_request_signer(
+                    self.account["api_key"], self.account["api_secret"], _get_bybit_recv_window()
+                )
+            else:
+                self._request_signer = _main_signer()
+        return self._request_signer
+
+    def _api_key(self) -> str:
+        return self._signer().api_key
+
+    def _sign(self, payload: str) -> str:
+        return self._signer().sign(payload)
+
+    def _limiter(self) -> BybitRateLimiter:
+        return self._rate_limiter or get_rate_limiter()
     
     def ensure_http_client_open(self):
         """Ensure HTTP client is open and ready for requests."""
@@ -156,12 +193,27 @@ class BybitClient:
             )
             system_logger.info(f"HTTP client recreated for endpoint: {self.http.base_url}", {"proxy": "DISABLED"})
 
-    async def _server_ms(self) -> int:
-        """Get server time in milliseconds"""
+    async def _send(self, method: str, path: str, sign=None, priority: int = None, **kwargs) -> httpx.Response:
+        """
+        Send a request through the rate-limit scheduler and feed back Bybit's limit headers.
+        
+        `sign` (optional) is called after any rate-limit wait and returns the signed
+        request kwargs, so the signature timestamp is always fresh.
+        """
+        limiter = self._limiter()
+        await limiter.acquire(path, priority)
+        if sign is not None:
+            kwargs.update(sign())
+        r = await self.http.request(method, path, **kwargs)
+        limiter.record_response(path, r.headers, r.status_code)
+        return r
+
+    async def _server_ms(self) -> Optional[int]:
+        """Get server time in milliseconds (None if unavailable)"""
         try:
-            r = await self.http.get("/v5/market/time")
+            r = await self._send("GET", "/v5/market/time")
             r.raise_for_status()
-            data = r.json()
+            data = json_codec.loads(r.content)
             if data.get("retCode") == 0 and "result" in data:
                 res = data["result"]
                 if "timeSecond" in res:
@@ -169,20 +221,37 @@ class BybitClient:
                 if "timeNano" in res:
                     return int(res["timeNano"]) // 1000000
         except Exception as e:
-            system_logger.warning(f"Failed to get server time, using local time: {e}")
-        # Fallback to local time
-        return int(time.time() * 1000)
+            system_logger.warning(f"Failed to get server time, keeping previous offset: {e}")
+        return None
 
     async def sync_time(self, force: bool = False):
-        """Sync time with Bybit server"""
+        """Sync time with Bybit server via the shared clock monitor"""
         now = time.time()
-        if (not force) and (now - self._last_sync < self._sync_interval):
+        if (not force) and (now - self._last_sync < self._sync_interval
+                            or now - self._last_sync_attempt < self._sync_retry_interval):
             return
+        # Claimed before the request so concurrent callers do not all probe
+        self._last_sync_attempt = now
+
+        sent = time.time()
         srv = await self._server_ms()
-        loc = int(time.time() * 1000)
-        self._ts_offset_ms = srv - loc
-        self._last_sync = now
-        system_logger.info("Bybit time sync", {"server": srv, "local": loc, "offset_ms": self._ts_offset_ms})
+        received = time.time()
+        if srv is None:
+            return
+        self._last_sync = received
+
+        # Compare against the midpoint of the round trip, not the receive time
+        loc = (sent + received) / 2 * 1000
+        from app.core.ntp_sync import get_ntp_monitor
+        monitor = get_ntp_monitor()
+        monitor.record_exchange_offset(srv - loc, (received - sent) * 1000)
+        self._ts_offset_ms = monitor.get_offset_ms()
+        system_logger.info("Bybit time sync", {
+            "server": srv,
+            "local": int(loc),
+            "offset_ms": self._ts_offset_ms,
+            "rtt_ms": (received - sent) * 1000
+        })
 
     def _ts_sync(self) -> str:
         """Get timestamp with server offset applied"""
@@ -190,21 +259,21 @@ class BybitClient:
 
     def _headers_sync(self, body: Dict[str, Any]):
         """Generate headers with synced timestamp"""
-        ts = self._ts_sync()
         # Use same serialization for signature and content
-        body_str = json.dumps(body, separators=(",", ":"), ensure_ascii=False)
-        prehash = ts + _get_bybit_api_key() + _get_bybit_recv_window() + body_str
-        return {
-            "X-BAPI-API-KEY": _get_bybit_api_key(),
-            "X-BAPI-TIMESTAMP": ts,
-            "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
-            "X-BAPI-SIGN": _sign(prehash),
-            "X-BAPI-SIGN-TYPE": "2",
-            "Content-Type": "application/json",
-        }, body_str
+        body_str = json_codec.dumps(body)
+        return self._signer().headers(self._ts_sync(), body_str, json_body=True), body_str
+
+    def _signed_post(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Signed request kwargs for a JSON POST body."""
+        headers, body_str = self._headers_sync(body)
+        return {"headers": headers, "content": body_str}
+
+    def _signed_get(self, query_string: str) -> Dict[str, Any]:
+        """Signed request kwargs for a GET with the given (already encoded) query."""
+        return {"headers": self._signer().headers(self._ts_sync(), query_string)}
 
     async def _get_auth(self, path: str, params: Dict[str, Any], retry_on_10002: bool = True):
-        """GET with authentication and 10002 retry. Ensures the signed query exactly matches the sent query."""
+        """GET with authentication, 10002 and 10006 retry. Ensures the signed query exactly matches the sent query."""
         from urllib.parse import urlencode
         await self.sync_time()  # Ensure we have fresh offset
         
@@ -215,40 +284,28 @@ class BybitClient:
         sorted_items = sorted(params.items())
         query_string = urlencode(sorted_items, doseq=False)
         
-        ts = self._ts_sync()
-        prehash = ts + _get_bybit_api_key() + _get_bybit_recv_window() + query_string
-        headers = {
-            "X-BAPI-API-KEY": _get_bybit_api_key(),
-            "X-BAPI-TIMESTAMP": ts,
-            "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
-            "X-BAPI-SIGN": _sign(prehash),
-            "X-BAPI-SIGN-TYPE": "2",
-        }
         full_path = f"{path}?{query_string}" if query_string else path
         try:
-            r = await self.http.get(full_path, headers=headers)
+            r = await self._send("GET", full_path, sign=lambda: self._signed_get(query_string))
             r.raise_for_status()
-            return _check_response(r.json())
+            return _check_response(json_codec.loads(r.content))
         except BybitAPIError as e:
+            if e.ret_code == RATE_LIMIT_RET_CODE:
+                # Hold the group until its reset (_send waits it out) and retry once
+                self._limiter().record_rate_limited(path)
+                r2 = await self._send("GET", full_path, sign=lambda: self._signed_get(query_string))
+                r2.raise_for_status()
+                return _check_response(json_codec.loads(r2.content))
             if retry_on_10002 and e.ret_code == 10002:
                 # Re-sync hard and retry once
                 await self.sync_time(force=True)
-                ts2 = self._ts_sync()
-                prehash2 = ts2 + _get_bybit_api_key() + _get_bybit_recv_window() + query_string
-                headers2 = {
-                    "X-BAPI-API-KEY": _get_bybit_api_key(),
-                    "X-BAPI-TIMESTAMP": ts2,
-                    "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
-                    "X-BAPI-SIGN": _sign(prehash2),
-                    "X-BAPI-SIGN-TYPE": "2",
-                }
-                r2 = await self.http.get(full_path, headers=headers2)
+                r2 = await self._send("GET", full_path, sign=lambda: self._signed_get(query_string))
                 r2.raise_for_status()
-                return _check_response(r2.json())
+                return _check_response(json_codec.loads(r2.content))
             raise
 
     async def _post_auth(self, path: str, body: Dict[str, Any], retry_on_10002: bool = True):
-        """POST with authentication and 10002 retry"""
+        """POST with authentication, 10002 and 10006 retry"""
         from app.core.circuit_breaker import get_bybit_circuit_breaker, execute_with_circuit_breaker
         
         async def _do_post():
@@ -258,23 +315,27 @@ class BybitClient:
             self.ensure_http_client_open()
             
             try:
-                headers, body_str = self._headers_sync(body)
-                r = await self.http.post(path, headers=headers, content=body_str)
+                r = await self._send("POST", path, sign=lambda: self._signed_post(body))
                 r.raise_for_status()
-                return _check_response(r.json())
+                return _check_response(json_codec.loads(r.content))
             except BybitAPIError as e:
+                if e.ret_code == RATE_LIMIT_RET_CODE:
+                    # Hold the group until its reset (_send waits it out) and retry once
+                    self._limiter().record_rate_limited(path)
+                    r2 = await self._send("POST", path, sign=lambda: self._signed_post(body))
+                    r2.raise_for_status()
+                    return _check_response(json_codec.loads(r2.content))
                 if retry_on_10002 and e.ret_code == 10002:
                     # Re-sync hard and retry once
                     await self.sync_time(force=True)
-                    headers2, body_str2 = self._headers_sync(body)
-                    r2 = await self.http.post(path, headers=headers2, content=body_str2)
+                    r2 = await self._send("POST", path, sign=lambda: self._signed_post(body))
                     r2.raise_for_status()
-                    return _check_response(r2.json())
+                    return _check_response(json_codec.loads(r2.content))
                 raise
         
-        # Execute with circuit breaker protection
-        circuit_breaker = get_bybit_circuit_breaker()
-        return await execute_with_circuit_breaker(circuit_breaker, _do_post)
+        # Execute with circuit breaker protection (a rate limit is not an exchange failure)
+        circuit_breaker = self._circuit_breaker or get_bybit_circuit_breaker()
+        return await execute_with_circuit_breaker(circuit_breaker, _do_post, ignored=(BybitRateLimitError,))
 
     async def aclose(self):
         """Close HTTP client cleanly"""
@@ -292,9 +353,9 @@ class BybitClient:
         except Exception as e:
             # Fallback to unauthenticated for backwards compatibility
             system_logger.warning(f"Authenticated instruments call failed, trying unauthenticated: {e}")
-            r = await self.http.get("/v5/market/instruments-info", params=params)
+            r = await self._send("GET", "/v5/market/instruments-info", params=params)
             r.raise_for_status()
-            return _check_response(r.json())
+            return _check_response(json_codec.loads(r.content))
     
     async def get_position(self, category: str, symbol: str):
         """Get current position for a symbol"""
@@ -381,7 +442,7 @@ class BybitClient:
             result = await self._get_auth("/v5/account/wallet-balance", params)
             
             # Debug: Log the balance response
-            system_logger.info(f"Balance response: {result}")
+            system_logger.debug(f"Balance response: {result}")
             
             return result
         except Exception as e:
@@ -485,6 +546,10 @@ class BybitClient:
                 # For other errors, don't retry
                 raise
 
+    async def amend_order(self, body: Dict[str, Any]):
+        """Amend an open order in place (price/qty/trigger) by orderId or orderLinkId."""
+        return await self._post_auth("/v5/order/amend", body)
+
     async def cancel_all(self, category, symbol):
         body = {"category":category,"symbol":symbol}
         return await self._post_auth("/v5/order/cancel-all", body)
@@ -510,6 +575,15 @@ class BybitClient:
             # Already logged by system_logger, no need for print
             return {"retCode":0, "retMsg":"OK", "result":{"list":[]}}
 
+    async def get_executions(self, category, symbol=None, limit=50, start_time=None):
+        """Get recent executions (newest first), optionally for one symbol or since `start_time` (ms)."""
+        params = {"category": category, "limit": limit}
+        if symbol:
+            params["symbol"] = symbol
+        if start_time:
+            params["startTime"] = int(start_time)
+        return await self._get_auth("/v5/execution/list", params)
+
     async def get_open_orders(self, category, symbol=None, settleCoin=None):
         """Alias for query_open to maintain compatibility with existing code."""
         return await self.query_open(category, symbol, settleCoin)
@@ -532,6 +606,11 @@ class BybitClient:
                 return {"retCode":0, "retMsg":"OK", "result":{"list":[]}}
             raise
 
+    async def positions_by_settle_coin(self, category, settle_coin="USDT"):
+        """Get all open positions settled in a coin (one call instead of one per symbol)."""
+        params = {"category": category, "settleCoin": settle_coin}
+        return await self._get_auth("/v5/position/list", params)
+
     # Helpers enforce required flags
     async def entry_limit_postonly(self, category, symbol, side, qty, price, link_id):
         body = {
@@ -669,10 +748,9 @@ class BybitClient:
             'stopLoss': body.get('stopLoss')
         })
         
-        headers, body_str = self._headers_sync(body)
-        r = await self.http.post("/v5/position/trading-stop", headers=headers, content=body_str)
+        r = await self._send("POST", "/v5/position/trading-stop", sign=lambda: self._signed_post(body))
         r.raise_for_status()
-        return _check_response(r.json())
+        return _check_response(json_codec.loads(r.content))
     
     async def set_trading_stop_alternative(self, category, symbol, stop_loss: Any = None, take_profit: Any = None):
         """
@@ -703,10 +781,9 @@ class BybitClient:
                     "positionIdx": 0,  # Add positionIdx
                     "orderLinkId": f"tp_{symbol}_{int(time.time())}"
                 }
-                headers, body_str = self._headers_sync(tp_body)
-                r = await self.http.post("/v5/order/create", headers=headers, content=body_str)
+                r = await self._send("POST", "/v5/order/create", sign=lambda: self._signed_post(tp_body))
                 r.raise_for_status()
-                results.append(_check_response(r.json()))
+                results.append(_check_response(json_codec.loads(r.content)))
             
             if stop_loss is not None:
                 # Place conditional stop loss order
@@ -722,10 +799,9 @@ class BybitClient:
                     "positionIdx": 0,  # Add positionIdx
                     "orderLinkId": f"sl_{symbol}_{int(time.time())}"
                 }
-                headers, body_str = self._headers_sync(sl_body)
-                r = await self.http.post("/v5/order/create", headers=headers, content=body_str)
+                r = await self._send("POST", "/v5/order/create", sign=lambda: self._signed_post(sl_body))
                 r.raise_for_status()
-                results.append(_check_response(r.json()))
+                results.append(_check_response(json_codec.loads(r.content)))
             
             return {
                 "retCode": 0,
@@ -771,9 +847,9 @@ class BybitClient:
                         return int(res["timeNano"]) // 1000000
             except:
                 # Fallback to unauthenticated
-                r = await self.http.get("/v5/market/time")
+                r = await self._send("GET", "/v5/market/time")
                 r.raise_for_status()
-                data = r.json()
+                data = json_codec.loads(r.content)
                 if data.get("retCode") == 0 and "result" in data:
                     res = data["result"]
                     if "timeSecond" in res:
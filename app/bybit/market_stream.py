@@ -0,0 +1,279 @@
+"""
+Bybit V5 public market stream (tickers).
+
+Streams `tickers.{symbol}` from the public linear WebSocket and pushes every
+last-price update to registered listeners (best bid/ask are kept as a local
+top-of-book for PostOnly pricing). Listeners are plain callables
+`listener(symbol, price, received_at)` invoked inline from the receive loop,
+so they must be cheap and non-blocking (schedule tasks for any I/O).
+
+Subscriptions are reference counted so several components can share a
+symbol's stream.
+
+A dropped connection is retried forever with capped exponential backoff
+(the outage is logged as an error after `max_retries` attempts). While
+`is_connected` is False, consumers poll tickers over REST instead.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config.settings import BYBIT_ENDPOINT, BYBIT_WS_PUBLIC_URL
+from app.core.logging import system_logger
+from app.core import json_codec
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+
+PriceListener = Callable[[str, Decimal, float], None]
+
+
+class BybitMarketStream:
+    """Public ticker stream with ref-counted subscriptions and reconnect."""
+
+    def __init__(self):
+        # Demo trading uses mainnet public market data
+        if BYBIT_WS_PUBLIC_URL:
+            self.ws_url = BYBIT_WS_PUBLIC_URL
+        elif "testnet" in BYBIT_ENDPOINT:
+            self.ws_url = "wss://stream-testnet.bybit.com/v5/public/linear"
+        else:
+            self.ws_url = "wss://stream.bybit.com/v5/public/linear"
+
+        self.ws = None
+        self.running = False
+        self._symbol_refs: Dict[str, int] = {}
+        self._listeners: List[PriceListener] = []
+        self._tasks: List[asyncio.Task] = []
+
+        self.last_prices: Dict[str, Decimal] = {}
+        self.last_update: Dict[str, float] = {}
+        # symbol -> (best bid, best ask, received_at monotonic)
+        self.top_of_book: Dict[str, Tuple[Optional[Decimal], Optional[Decimal], float]] = {}
+
+        self.ping_interval = 20  # Bybit recommends a ping every 20s
+        self.retry_count = 0
+        self.max_retries = 5  # attempts before the outage is logged as an error
+        self.base_delay = 1.0
+        self.max_delay = 60.0
+
+    @property
+    def is_connected(self) -> bool:
+        return self.ws is not None and not getattr(self.ws, "closed", False)
+
+    def add_listener(self, listener: PriceListener):
+        """Register a price listener."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: PriceListener):
+        """Unregister a price listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get_last_price(self, symbol: str) -> Optional[Decimal]:
+        """Last streamed price for a symbol (None if not streamed yet)."""
+        return self.last_prices.get(symbol)
+
+    def get_top_of_book(self, symbol: str, max_age: float) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best bid/ask streamed within `max_age` seconds (None if unknown or stale)."""
+        book = self.top_of_book.get(symbol)
+        if book is None or book[0] is None or book[1] is None:
+            return None
+        if time.monotonic() - book[2] > max_age:
+            return None
+        return book[0], book[1]
+
+    async def subscribe_ticker(self, symbol: str):
+        """Subscribe to a symbol's ticker (ref counted)."""
+        refs = self._symbol_refs.get(symbol, 0)
+        self._symbol_refs[symbol] = refs + 1
+        if refs == 0 and self.is_connected:
+            await self._send({"op": "subscribe", "args": [f"tickers.{symbol}"]})
+            system_logger.debug(f"Subscribed to ticker stream for {symbol}", {"symbol": symbol})
+
+    async def unsubscribe_ticker(self, symbol: str):
+        """Release one reference on a symbol's ticker subscription."""
+        refs = self._symbol_refs.get(symbol, 0)
+        if refs <= 1:
+            self._symbol_refs.pop(symbol, None)
+            self.last_prices.pop(symbol, None)
+            self.last_update.pop(symbol, None)
+            self.top_of_book.pop(symbol, None)
+            if refs == 1 and self.is_connected:
+                await self._send({"op": "unsubscribe", "args": [f"tickers.{symbol}"]})
+        else:
+            self._symbol_refs[symbol] = refs - 1
+
+    async def _send(self, payload: dict):
+        try:
+            await self.ws.send(json_codec.dumps(payload))
+        except Exception as e:
+            system_logger.warning(f"Market stream send failed: {e}")
+
+    def _handle_message(self, message: dict, received_at: float):
+        """Dispatch a ticker message to listeners."""
+        topic = message.get("topic", "")
+        if not topic.startswith("tickers."):
+            return
+
+        data = message.get("data") or {}
+        symbol = data.get("symbol") or topic[len("tickers."):]
+
+        # Top of book (PostOnly repricing); deltas only carry changed sides
+        bid, ask = data.get("bid1Price"), data.get("ask1Price")
+        if bid or ask:
+            book = self.top_of_book.get(symbol)
+            self.top_of_book[symbol] = (
+                Decimal(bid) if bid else (book[0] if book else None),
+                Decimal(ask) if ask else (book[1] if book else None),
+                received_at
+            )
+
+        last_price = data.get("lastPrice")
+        if not last_price:
+            # Deltas only carry changed fields
+            return
+
+        price = Decimal(last_price)
+        self.last_prices[symbol] = price
+        self.last_update[symbol] = received_at
+
+        for listener in list(self._listeners):
+            try:
+                listener(symbol, price, received_at)
+            except Exception as e:
+                system_logger.error(f"Market stream listener error for {symbol}: {e}")
+
+    async def connect(self) -> bool:
+        """Connect and (re)subscribe all referenced symbols."""
+        if not WEBSOCKETS_AVAILABLE:
+            system_logger.warning("Market stream not available - install websockets package")
+            return False
+        try:
+            self.ws = await websockets.connect(self.ws_url, ping_interval=None)
+            system_logger.info("Bybit market stream connected", {"ws_url": self.ws_url})
+            if self._symbol_refs:
+                await self._send({
+                    "op": "subscribe",
+                    "args": [f"tickers.{symbol}" for symbol in self._symbol_refs]
+                })
+            self.retry_count = 0
+            return True
+        except Exception as e:
+            system_logger.error(f"Bybit market stream connection failed: {e}")
+            self.ws = None
+            return False
+
+    async def _reconnect(self):
+        """Reconnect with capped exponential backoff until connected or stopped."""
+        while self.running:
+            delay = min(self.base_delay * (2 ** min(self.retry_count, 16)), self.max_delay)
+            self.retry_count += 1
+            if self.retry_count == self.max_retries:
+                system_logger.error("Market stream still down - consumers are polling REST, reconnect continues", {
+                    "attempts": self.retry_count,
+                    "retry_delay_s": self.max_delay
+                })
+            else:
+                system_logger.warning(f"Market stream reconnecting in {delay:.1f}s (attempt {self.retry_count})")
+            await asyncio.sleep(delay)
+            if await self.connect():
+                return True
+        return False
+
+    async def _receive_loop(self):
+        errors = 0  # consecutive receive errors
+        while self.running:
+            if not self.is_connected and not await self._reconnect():
+                break
+            try:
+                raw = await self.ws.recv()
+                self._handle_message(json_codec.loads(raw), time.monotonic())
+                errors = 0
+            except asyncio.CancelledError:
+                break
+            except websockets.exceptions.ConnectionClosed:
+                system_logger.warning("Market stream connection closed")
+                self.ws = None
+            except Exception as e:
+                errors += 1
+                system_logger.error(f"Market stream receive error: {e}", {"consecutive_errors": errors})
+                # A broken socket fails every recv at once: back off instead of spinning
+                await asyncio.sleep(min(self.base_delay * (2 ** min(errors - 1, 16)), self.max_delay))
+
+    async def _heartbeat_loop(self):
+        while self.running:
+            try:
+                await asyncio.sleep(self.ping_interval)
+                if self.is_connected:
+                    await self._send({"op": "ping"})
+            except asyncio.CancelledError:
+                break
+
+    async def start(self) -> bool:
+        """
+        Connect and start receive/heartbeat loops; True if connected.
+
+        The loops start even if the first connect fails: the receive loop
+        keeps reconnecting, so listeners and subscriptions registered now
+        get prices once it is up.
+        """
+        if self.running:
+            return self.is_connected
+        if not WEBSOCKETS_AVAILABLE:
+            system_logger.warning("Market stream not available - install websockets package")
+            return False
+        connected = await self.connect()
+        self.running = True
+        self._tasks = [
+            asyncio.create_task(self._receive_loop()),
+            asyncio.create_task(self._heartbeat_loop())
+        ]
+        return connected
+
+    async def stop(self):
+        """Stop the stream."""
+        self.running = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        if self.ws:
+            try:
+                await self.ws.close()
+            except Exception:
+                pass
+        self.ws = None
+        system_logger.info("Bybit market stream stopped")
+
+
+# Global market stream instance
+_market_stream: Optional[BybitMarketStream] = None
+
+
+def get_market_stream() -> BybitMarketStream:
+    """Get the global market stream instance (not started)."""
+    global _market_stream
+    if _market_stream is None:
+        _market_stream = BybitMarketStream()
+    return _market_stream
+
+
+async def start_market_stream() -> BybitMarketStream:
+    """Get the global market stream, starting it if needed."""
+    stream = get_market_stream()
+    if not stream.running:
+        await stream.start()
+    return stream
+
+
+async def stop_market_stream():
+    """Stop the global market stream."""
+    global _market_stream
+    if _market_stream:
+        await _market_stream.stop()
+        _market_stream = None
@@ -0,0 +1,303 @@
+"""
+Rate-limit-aware request scheduler for the Bybit V5 REST API.
+
+Bybit limits requests per UID and per endpoint, and reports the live state of
+each limit in the response headers:
+
+- X-Bapi-Limit:                  requests allowed per window
+- X-Bapi-Limit-Status:           requests remaining in the current window
+- X-Bapi-Limit-Reset-Timestamp:  when the window resets (ms)
+
+Endpoints are grouped (orders, position writes, reads, reporting, market data)
+and each group has a token bucket that is refilled at the group's rate and
+corrected from those headers after every response. Requests are ordered by
+priority: order create/amend/cancel first, reporting reads last. Low-priority
+calls also leave a reserve of tokens untouched, so a burst of reporting reads
+is delayed instead of starving order placement or drawing 10006
+("too many visits") errors.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, Optional, Mapping
+
+from app.core.logging import system_logger
+
+# Priorities (lower runs first)
+PRIORITY_ORDER = 0      # order create/amend/cancel, trading-stop
+PRIORITY_POSITION = 1   # leverage / margin mode changes
+PRIORITY_NORMAL = 2     # position/order state reads, market data
+PRIORITY_REPORTING = 3  # wallet, history, closed PnL
+
+RATE_LIMIT_RET_CODE = 10006
+
+# group -> (requests per second, default priority)
+ENDPOINT_GROUPS: Dict[str, tuple] = {
+    "order": (10, PRIORITY_ORDER),
+    "position_write": (10, PRIORITY_POSITION),
+    "order_read": (50, PRIORITY_NORMAL),
+    "position_read": (50, PRIORITY_NORMAL),
+    "account": (50, PRIORITY_REPORTING),
+    "market": (100, PRIORITY_NORMAL),
+    "default": (10, PRIORITY_NORMAL),
+}
+
+# Exact paths first, then prefixes
+_PATH_GROUPS: Dict[str, str] = {
+    "/v5/order/create": "order",
+    "/v5/order/amend": "order",
+    "/v5/order/cancel": "order",
+    "/v5/order/cancel-all": "order",
+    "/v5/order/create-batch": "order",
+    "/v5/order/amend-batch": "order",
+    "/v5/order/cancel-batch": "order",
+    "/v5/position/trading-stop": "order",
+    "/v5/position/set-leverage": "position_write",
+    "/v5/position/set-margin-mode": "position_write",
+    "/v5/position/switch-isolated": "position_write",
+    "/v5/position/switch-mode": "position_write",
+    "/v5/position/list": "position_read",
+    "/v5/order/realtime": "order_read",
+    "/v5/order/history": "account",
+    "/v5/execution/list": "account",
+    "/v5/position/closed-pnl": "account",
+}
+_PREFIX_GROUPS = (
+    ("/v5/market/", "market"),
+    ("/v5/account/", "account"),
+    ("/v5/asset/", "account"),
+    ("/v5/order/", "order_read"),
+    ("/v5/position/", "position_read"),
+)
+
+
+def get_endpoint_group(path: str) -> str:
+    """Map a request path (query string allowed) to its rate-limit group."""
+    path = path.split("?", 1)[0]
+    group = _PATH_GROUPS.get(path)
+    if group:
+        return group
+    for prefix, prefix_group in _PREFIX_GROUPS:
+        if path.startswith(prefix):
+            return prefix_group
+    return "default"
+
+
+class TokenBucket:
+    """Token bucket for one endpoint group, corrected from Bybit's limit headers."""
+
+    def __init__(self, name: str, rate: float, reserve_ratio: float = 0.2):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = float(rate)
+        # Configured limit: the header limit can lower the rate, never raise it past this
+        self.ceiling = float(rate)
+        self.header_limit: Optional[int] = None
+        # Fraction of the UID limit this process may use (trade shards split it)
+        self.share = 1.0
+        self.reserve_ratio = reserve_ratio
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.waiting: Dict[int, int] = {}
+
+        self.granted = 0
+        self.delayed = 0
+        self.throttled = 0
+        self.last_remaining: Optional[int] = None
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def try_acquire(self, priority: int, now: Optional[float] = None) -> float:
+        """Take a token; returns 0 when granted, else seconds to wait before retrying."""
+        if now is None:
+            now = time.monotonic()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        self._refill(now)
+
+        # Higher-priority callers waiting on this bucket go first
+        if any(count for p, count in self.waiting.items() if p < priority):
+            return 1.0 / self.rate
+
+        floor = self.capacity * self.reserve_ratio if priority >= PRIORITY_REPORTING else 0.0
+        if self.tokens - 1.0 >= floor:
+            self.tokens -= 1.0
+            self.granted += 1
+            return 0.0
+        return (1.0 + floor - self.tokens) / self.rate
+
+    def update_from_headers(self, limit: Optional[int], remaining: Optional[int], reset_ms: Optional[int]):
+        """Align the bucket with the exchange's view of the current window."""
+        now = time.monotonic()
+        self._refill(now)
+        if limit:
+            self.header_limit = limit
+            self._apply_rate()
+        if remaining is not None:
+            self.last_remaining = remaining
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining <= 0:
+                self.block(self._seconds_until(reset_ms))
+
+    def set_ceiling(self, rate: float):
+        """Lower the configured limit (e.g. demo-environment order pacing)."""
+        self.ceiling = min(self.ceiling, float(rate))
+        self._apply_rate()
+
+    def _apply_rate(self):
+        rate = self.ceiling if not self.header_limit else min(self.ceiling, float(self.header_limit))
+        self.rate = self.capacity = rate * self.share
+        self.tokens = min(self.tokens, self.capacity)
+
+    def block(self, seconds: float):
+        """Stop granting tokens for `seconds` (window exhausted or 10006)."""
+        self.throttled += 1
+        self.tokens = 0.0
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    @staticmethod
+    def _seconds_until(reset_ms: Optional[int]) -> float:
+        if not reset_ms:
+            return 1.0
+        # Reset is exchange wall-clock time; clamp against local clock skew
+        return min(max(reset_ms / 1000.0 - time.time(), 0.05), 5.0)
+
+    def get_state(self) -> Dict[str, Any]:
+        return {
+            'rate': self.rate,
+            'tokens': round(self.tokens, 2),
+            'last_remaining': self.last_remaining,
+            'blocked_for_ms': max(0.0, self.blocked_until - time.monotonic()) * 1000,
+            'waiting': sum(self.waiting.values()),
+            'granted': self.granted,
+            'delayed': self.delayed,
+            'throttled': self.throttled
+        }
+
+
+class BybitRateLimiter:
+    """Per-endpoint-group token buckets with priority ordering."""
+
+    def __init__(self, groups: Optional[Dict[str, tuple]] = None):
+        self.groups = dict(groups or ENDPOINT_GROUPS)
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(name, rate) for name, (rate, _) in self.groups.items()
+        }
+
+    def get_bucket(self, path: str) -> TokenBucket:
+        return self.buckets[get_endpoint_group(path)]
+
+    def default_priority(self, path: str) -> int:
+        return self.groups[get_endpoint_group(path)][1]
+
+    async def acquire(self, path: str, priority: Optional[int] = None) -> float:
+        """Wait until a request to `path` may be sent; returns time waited (s)."""
+        bucket = self.get_bucket(path)
+        if priority is None:
+            priority = self.default_priority(path)
+
+        wait = bucket.try_acquire(priority)
+        if wait == 0.0:
+            return 0.0
+
+        start = time.monotonic()
+        bucket.delayed += 1
+        bucket.waiting[priority] = bucket.waiting.get(priority, 0) + 1
+        try:
+            while wait > 0.0:
+                await asyncio.sleep(wait)
+                bucket.waiting[priority] -= 1
+                try:
+                    wait = bucket.try_acquire(priority)
+                finally:
+                    bucket.waiting[priority] += 1
+        finally:
+            bucket.waiting[priority] -= 1
+
+        waited = time.monotonic() - start
+        system_logger.debug("Bybit request delayed by rate limiter", {
+            'group': bucket.name,
+            'path': path.split("?", 1)[0],
+            'priority': priority,
+            'waited_ms': waited * 1000
+        })
+        return waited
+
+    def record_response(self, path: str, headers: Mapping[str, str], status_code: int = 200):
+        """Feed a response's rate-limit headers (and 429s) back into the bucket."""
+        bucket = self.get_bucket(path)
+        if status_code == 429:
+            bucket.block(1.0)
+            return
+        bucket.update_from_headers(
+            _int_header(headers, "X-Bapi-Limit"),
+            _int_header(headers, "X-Bapi-Limit-Status"),
+            _int_header(headers, "X-Bapi-Limit-Reset-Timestamp")
+        )
+
+    def record_rate_limited(self, path: str, reset_ms: Optional[int] = None):
+        """A request was rejected with retCode 10006: hold the group until reset."""
+        bucket = self.get_bucket(path)
+        bucket.block(TokenBucket._seconds_until(reset_ms))
+        system_logger.warning("Bybit rate limit hit", {
+            'group': bucket.name,
+            'path': path.split("?", 1)[0],
+            'blocked_ms': max(0.0, bucket.blocked_until - time.monotonic()) * 1000
+        })
+
+    def apply_min_interval(self, group: str, min_interval: float):
+        """Cap a group's rate (e.g. stricter demo-environment order limits)."""
+        if min_interval > 0 and group in self.buckets:
+            self.buckets[group].set_ceiling(1.0 / min_interval)
+
+    def apply_share(self, fraction: float):
+        """Scale every group to a share of the UID limit (trade shards split it)."""
+        if 0 < fraction < 1:
+            for bucket in self.buckets.values():
+                bucket.share = fraction
+                bucket._apply_rate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: bucket.get_state() for name, bucket in self.buckets.items()}
+
+
+def _int_header(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Global rate limiter instance
+_rate_limiter: Optional[BybitRateLimiter] = None
+
+
+def create_rate_limiter() -> BybitRateLimiter:
+    """New limiter for one UID, with demo and supervisor-mode limits applied."""
+    limiter = BybitRateLimiter()
+    from app.core.demo_config import DemoConfig
+    if DemoConfig.is_demo_environment():
+        limiter.apply_min_interval("order", DemoConfig.get_demo_limits()['min_request_interval'])
+    # Limits are per UID: in supervisor mode every process gets an equal share
+    # (header limits are scaled by the same share)
+    from app.runtime.sharding import get_process_role, get_shard_count, ROLE_STANDALONE
+    if get_process_role() != ROLE_STANDALONE:
+        limiter.apply_share(1.0 / (get_shard_count() + 1))
+    return limiter
+
+
+def get_rate_limiter() -> BybitRateLimiter:
+    """Get the global Bybit rate limiter (main account)."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = create_rate_limiter()
+    return _rate_limiter
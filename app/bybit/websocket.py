@@ -1,11 +1,14 @@
 import asyncio
-import json
 import time
 import hmac
 import hashlib
 from typing import Callable, Dict, Optional
-from app.config.settings import BYBIT_API_KEY, BYBIT_API_SECRET, BYBIT_ENDPOINT, BYBIT_RECV_WINDOW
+from app.config.settings import BYBIT_API_KEY, BYBIT_API_SECRET, BYBIT_ENDPOINT, BYBIT_RECV_WINDOW, BYBIT_WS_PRIVATE_URL
 from app.core.logging import system_logger
+from app.core import json_codec
+from app.core.fill_waiters import get_fill_registry
+from app.core.account_state import get_account_state
+from app.bybit.ws_dispatcher import TopicDispatcher
 
 try:
     import websockets
@@ -21,8 +24,10 @@ class BybitWebSocket:
     """
     
     def __init__(self):
-        # Determine WebSocket endpoint from REST endpoint
-        if "testnet" in BYBIT_ENDPOINT:
+        # Determine WebSocket endpoint from REST endpoint (unless overridden)
+        if BYBIT_WS_PRIVATE_URL:
+            self.ws_url = BYBIT_WS_PRIVATE_URL
+        elif "testnet" in BYBIT_ENDPOINT:
             self.ws_url = "wss://stream-testnet.bybit.com/v5/private"
         elif "demo" in BYBIT_ENDPOINT:
             self.ws_url = "wss://stream-demo.bybit.com/v5/private"
@@ -31,11 +36,15 @@ class BybitWebSocket:
         
         self.ws: Optional[websockets.WebSocketClientProtocol] = None
         self.running = False
+        self.authenticated = False  # private topics (execution/order) only flow once authenticated
+        self._reconnecting = False  # recovery snapshot seeds the account cache instead
         self.subscriptions = set()
         
         # Event handlers: symbol -> callback(data)
         self.execution_handlers: Dict[str, Callable] = {}
         self.position_handlers: Dict[str, Callable] = {}
+        # Handlers run in per-topic/per-symbol lanes, off the receive loop
+        self.dispatcher = TopicDispatcher(self._resolve_handler)
         
         # CLIENT SPEC: Heartbeat (30s ping, pong timeout)
         self.last_pong = time.time()
@@ -52,6 +61,7 @@ class BybitWebSocket:
         # CLIENT SPEC: Gap detection
         from app.core.websocket_gap_detector import get_gap_detector
         self.gap_detector = get_gap_detector()
+        self.gap_detector.set_replay_handler(self._dispatch)
         
     def _generate_auth_signature(self) -> dict:
         """Generate authentication payload for private WebSocket (Bybit V5)
@@ -86,6 +96,7 @@ class BybitWebSocket:
             
         # Reset retry count on successful connection
         self.retry_count = 0
+        self.authenticated = False
         
         try:
             system_logger.info(f"Connecting to Bybit WebSocket: {self.ws_url}")
@@ -100,16 +111,18 @@ class BybitWebSocket:
             # Authenticate for testnet/mainnet
             auth_payload = self._generate_auth_signature()
             system_logger.debug("Sending WebSocket authentication", {"op": "auth"})
-            await self.ws.send(json.dumps(auth_payload))
+            await self.ws.send(json_codec.dumps(auth_payload))
             system_logger.info("Authentication sent, waiting for confirmation")
             
             # Wait for auth response with timeout
             try:
                 response = await asyncio.wait_for(self.ws.recv(), timeout=10.0)
-                auth_response = json.loads(response)
+                auth_response = json_codec.loads(response)
                 
                 if auth_response.get("success"):
                     system_logger.info("Bybit WebSocket authenticated successfully")
+                    self.authenticated = True
+                    await self._subscribe_account()
                     return True
                 else:
                     system_logger.error("Bybit WebSocket authentication failed", {
@@ -144,6 +157,16 @@ class BybitWebSocket:
         
         return False
     
+    async def _subscribe_account(self):
+        """
+        Subscribe to wallet/position for the account-state cache and seed it
+        from REST (on reconnect the recovery snapshot does this).
+        """
+        await self.ws.send(json_codec.dumps({"op": "subscribe", "args": ["wallet", "position"]}))
+        self.subscriptions.update(("wallet", "position"))
+        if not self._reconnecting:
+            asyncio.create_task(get_account_state().refresh("connect"))
+    
     async def subscribe_execution(self, symbol: str, handler: Callable):
         """
         Subscribe to order execution updates for a symbol.
@@ -152,12 +175,13 @@ class BybitWebSocket:
         self.execution_handlers[symbol] = handler
         
         if self.ws and not self.ws.closed:
+            # "order" carries cancellations/rejections for the fill-waiter registry
             subscribe_msg = {
                 "op": "subscribe",
-                "args": ["execution"]
+                "args": ["execution", "order"]
             }
-            await self.ws.send(json.dumps(subscribe_msg))
-            self.subscriptions.add("execution")
+            await self.ws.send(json_codec.dumps(subscribe_msg))
+            self.subscriptions.update(("execution", "order"))
             system_logger.info(f"Subscribed to execution updates for {symbol}", {"symbol": symbol})
     
     async def subscribe_position(self, symbol: str, handler: Callable):
@@ -172,7 +196,7 @@ class BybitWebSocket:
                 "op": "subscribe",
                 "args": ["position"]
             }
-            await self.ws.send(json.dumps(subscribe_msg))
+            await self.ws.send(json_codec.dumps(subscribe_msg))
             self.subscriptions.add("position")
             system_logger.info(f"Subscribed to position updates for {symbol}", {"symbol": symbol})
     
@@ -205,40 +229,64 @@ class BybitWebSocket:
         # CLIENT SPEC: Check for sequence gaps
         topic = message.get("topic", "")
         if topic:
-            gap_detected = await self.gap_detector.check_message(topic, message)
+            if self.gap_detector.recovering:
+                # Held until the snapshot is applied, then replayed in order
+                self.gap_detector.buffer(topic, message)
+                return
+            gap_detected = self.gap_detector.detect_gap(topic, message)
             if gap_detected:
                 # Gap recovery initiated - message processing paused
                 system_logger.warning(f"Gap detected on {topic}, recovery initiated")
                 return
         
+        await self._dispatch(message)
+    
+    def _resolve_handler(self, topic: str, symbol: str) -> Optional[Callable]:
+        """Current handler for a dispatcher lane (looked up when the update is handled)."""
+        handlers = self.execution_handlers if topic == "execution" else self.position_handlers
+        return handlers.get(symbol)
+    
+    async def _dispatch(self, message: dict):
+        """
+        Route a data message by topic.
+        
+        Registries (fill waiters, account state) are updated inline; symbol
+        handlers are queued on the dispatcher so receiving never waits on them.
+        """
+        topic = message.get("topic", "")
+        data = message.get("data", [])
+        
         # Handle execution updates (order fills)
         if topic == "execution":
-            data = message.get("data", [])
+            fill_registry = get_fill_registry()
             for execution in data:
+                fill_registry.on_execution(execution)
                 symbol = execution.get("symbol")
-                exec_type = execution.get("execType")  # Trade, Funding, etc.
-                order_status = execution.get("orderStatus")
                 
-                # Only process actual trade executions
-                if exec_type == "Trade" and symbol in self.execution_handlers:
-                    handler = self.execution_handlers[symbol]
-                    try:
-                        await handler(execution)
-                    except Exception as e:
-                        system_logger.error(f"Execution handler error for {symbol}: {e}")
+                # Only process actual trade executions (not Funding etc.)
+                if execution.get("execType") == "Trade" and symbol in self.execution_handlers:
+                    self.dispatcher.submit("execution", symbol, execution)
+        
+        # Handle order status updates (entry fills/cancellations)
+        elif topic == "order":
+            fill_registry = get_fill_registry()
+            for order in data:
+                fill_registry.on_order(order)
         
         # Handle position updates
         elif topic == "position":
-            data = message.get("data", [])
+            account_state = get_account_state()
             for position in data:
+                account_state.on_position(position)
                 symbol = position.get("symbol")
-                
                 if symbol in self.position_handlers:
-                    handler = self.position_handlers[symbol]
-                    try:
-                        await handler(position)
-                    except Exception as e:
-                        system_logger.error(f"Position handler error for {symbol}: {e}")
+                    self.dispatcher.submit("position", symbol, position)
+        
+        # Handle wallet updates (balance/equity/IM for sizing)
+        elif topic == "wallet":
+            account_state = get_account_state()
+            for account in data:
+                account_state.on_wallet(account)
     
     async def _heartbeat_loop(self):
         """
@@ -258,7 +306,7 @@ class BybitWebSocket:
                 
                 # CLIENT SPEC: Send ping
                 ping_msg = {"op": "ping"}
-                await self.ws.send(json.dumps(ping_msg))
+                await self.ws.send(json_codec.dumps(ping_msg))
                 self.gap_detector.record_ping()  # Track ping sent
                 
                 # CLIENT SPEC: Check pong timeout
@@ -279,20 +327,22 @@ class BybitWebSocket:
         while self.running and self.ws:
             try:
                 message_str = await self.ws.recv()
-                message = json.loads(message_str)
+                message = json_codec.loads(message_str)
                 await self._handle_message(message)
                 
             except websockets.exceptions.ConnectionClosed:
                 system_logger.warning("WebSocket connection closed")
-                if self.running:
-                    await self.reconnect()
+                self.authenticated = False
+                get_account_state().invalidate()
+                if self.running and await self.reconnect():
+                    continue
                 break
             except Exception as e:
                 system_logger.error(f"WebSocket receive error: {e}", exc_info=True)
                 if self.running:
                     await asyncio.sleep(1)
     
-    async def reconnect(self):
+    async def reconnect(self) -> bool:
         """
         Reconnect to WebSocket and restore subscriptions.
         
@@ -300,12 +350,13 @@ class BybitWebSocket:
         - Fetch REST snapshot on reconnect
         - Restore subscriptions
         - Resume with consistent state
+        
+        Reconnects immediately; the snapshot is fetched by the gap detector's
+        recovery once subscriptions are restored, while new messages are
+        buffered (so nothing falls between snapshot and stream).
         """
         system_logger.info("Reconnecting to Bybit WebSocket with snapshot flow...")
         
-        # CLIENT SPEC: Step 1 - Fetch snapshot before reconnecting
-        snapshot = await self.gap_detector.fetch_snapshot()
-        
         # Store current subscriptions
         old_execution_handlers = self.execution_handlers.copy()
         old_position_handlers = self.position_handlers.copy()
@@ -317,25 +368,31 @@ class BybitWebSocket:
             except Exception as e:
                 system_logger.warning(f"Error closing WebSocket: {e}")
         
-        # Wait before reconnecting
-        await asyncio.sleep(2)
-        
-        # CLIENT SPEC: Step 2 - Reconnect with exponential backoff
-        if await self.connect_with_retry():
-            # CLIENT SPEC: Step 3 - Restore subscriptions
-            for symbol, handler in old_execution_handlers.items():
-                await self.subscribe_execution(symbol, handler)
-            
-            for symbol, handler in old_position_handlers.items():
-                await self.subscribe_position(symbol, handler)
-            
-            system_logger.info("WebSocket reconnected and subscriptions restored", {
-                "snapshot_fetched": snapshot is not None,
-                "execution_handlers": len(old_execution_handlers),
-                "position_handlers": len(old_position_handlers)
-            })
-        else:
+        # CLIENT SPEC: Step 1 - Reconnect with exponential backoff
+        self._reconnecting = True
+        try:
+            connected = await self.connect_with_retry()
+        finally:
+            self._reconnecting = False
+        if not connected:
             system_logger.error("Reconnection failed")
+            return False
+        
+        # CLIENT SPEC: Step 2 - Restore subscriptions
+        for symbol, handler in old_execution_handlers.items():
+            await self.subscribe_execution(symbol, handler)
+        
+        for symbol, handler in old_position_handlers.items():
+            await self.subscribe_position(symbol, handler)
+        
+        # CLIENT SPEC: Step 3 - Snapshot + replay in the background, buffering meanwhile
+        self.gap_detector.start_recovery("reconnect")
+        
+        system_logger.info("WebSocket reconnected and subscriptions restored", {
+            "execution_handlers": len(old_execution_handlers),
+            "position_handlers": len(old_position_handlers)
+        })
+        return True
     
     async def start(self):
         """Start WebSocket connection and message processing"""
@@ -354,6 +411,8 @@ class BybitWebSocket:
         """Stop WebSocket connection"""
         system_logger.info("Stopping Bybit WebSocket")
         self.running = False
+        self.authenticated = False
+        get_account_state().invalidate()
         
         if self.ws:
             try:
@@ -361,6 +420,7 @@ class BybitWebSocket:
             except:
                 pass
         
+        await self.dispatcher.stop()
         self.execution_handlers.clear()
         self.position_handlers.clear()
         self.subscriptions.clear()
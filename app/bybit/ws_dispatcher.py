@@ -0,0 +1,146 @@
+"""
+Per-topic, per-symbol dispatch of private WebSocket updates to handlers.
+
+The receive loop used to await every symbol handler inline, so one slow
+handler (e.g. an entry fill that sends Telegram messages) stopped frames from
+being read and could trip the pong timeout. The receive loop now only routes:
+each update is appended to the lane of its (topic, symbol) and a lane task
+drains it, so handlers of one symbol run in order while other symbols and
+the socket keep moving.
+
+- Lanes are bounded (`max_pending`); overflowing updates are dropped and
+  counted (fills are also tracked inline by the fill-waiter registry and the
+  recovery snapshot).
+- Position lanes conflate: position updates are full snapshots, so a lane
+  that falls behind keeps only the latest one per symbol.
+- A lane task exists only while the lane has work.
+
+Queue depth and handler latency per topic are exposed by get_stats().
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.logging import system_logger
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+CONFLATED_TOPICS = frozenset({"position"})
+
+
+class _Lane:
+    __slots__ = ("topic", "symbol", "pending", "task")
+
+    def __init__(self, topic: str, symbol: str):
+        self.topic = topic
+        self.symbol = symbol
+        self.pending = deque()
+        self.task: Optional[asyncio.Task] = None
+
+
+class _TopicStats:
+    __slots__ = ("processed", "merged", "dropped", "errors", "latency_total_ms", "latency_max_ms")
+
+    def __init__(self):
+        self.processed = 0
+        self.merged = 0
+        self.dropped = 0
+        self.errors = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+
+
+class TopicDispatcher:
+    """Routes (topic, symbol) updates to handler tasks without blocking the caller."""
+
+    def __init__(self, resolve: Callable[[str, str], Optional[Handler]], max_pending: int = 1000):
+        self._resolve = resolve  # (topic, symbol) -> current handler or None
+        self.max_pending = max_pending
+        self._lanes: Dict[Tuple[str, str], _Lane] = {}
+        self._stats: Dict[str, _TopicStats] = {}
+
+    def submit(self, topic: str, symbol: str, item: Dict[str, Any]):
+        """Queue one update for its symbol's handler (never awaits)."""
+        key = (topic, symbol)
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane(topic, symbol)
+        stats = self._stats.get(topic)
+        if stats is None:
+            stats = self._stats[topic] = _TopicStats()
+
+        if topic in CONFLATED_TOPICS and lane.pending:
+            lane.pending[-1] = item
+            stats.merged += 1
+        elif len(lane.pending) >= self.max_pending:
+            stats.dropped += 1
+            system_logger.error(f"WebSocket {topic} queue full for {symbol}, update dropped", {
+                "topic": topic,
+                "symbol": symbol,
+                "depth": len(lane.pending)
+            })
+            return
+        else:
+            lane.pending.append(item)
+
+        if lane.task is None:
+            lane.task = asyncio.create_task(self._drain(lane, stats))
+
+    async def _drain(self, lane: _Lane, stats: _TopicStats):
+        try:
+            while lane.pending:
+                item = lane.pending.popleft()
+                handler = self._resolve(lane.topic, lane.symbol)
+                if handler is None:
+                    continue
+                started = time.perf_counter()
+                try:
+                    await handler(item)
+                except Exception as e:
+                    stats.errors += 1
+                    system_logger.error(f"{lane.topic.capitalize()} handler error for {lane.symbol}: {e}")
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                stats.processed += 1
+                stats.latency_total_ms += elapsed_ms
+                if elapsed_ms > stats.latency_max_ms:
+                    stats.latency_max_ms = elapsed_ms
+        finally:
+            lane.task = None
+            if not lane.pending:
+                self._lanes.pop((lane.topic, lane.symbol), None)
+
+    async def drain(self):
+        """Wait until all queued updates have been handled."""
+        while True:
+            tasks = [lane.task for lane in self._lanes.values() if lane.task is not None]
+            if not tasks:
+                return
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stop(self):
+        """Cancel lane tasks and drop queued updates."""
+        tasks = [lane.task for lane in self._lanes.values() if lane.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes.clear()
+
+    def depth(self, topic: str) -> int:
+        return sum(len(lane.pending) for (t, _), lane in self._lanes.items() if t == topic)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-topic queue depth, throughput and handler latency."""
+        result = {}
+        for topic, stats in self._stats.items():
+            result[topic] = {
+                "depth": self.depth(topic),
+                "processed": stats.processed,
+                "merged": stats.merged,
+                "dropped": stats.dropped,
+                "errors": stats.errors,
+                "handler_avg_ms": round(stats.latency_total_ms / stats.processed, 3) if stats.processed else 0.0,
+                "handler_max_ms": round(stats.latency_max_ms, 3)
+            }
+        return result
@@ -30,6 +30,9 @@ BYBIT_ENDPOINT = os.getenv("BYBIT_ENDPOINT", "https://api-demo.bybit.com")  # DE
 BYBIT_API_KEY = os.getenv("BYBIT_API_KEY") or ""  # DEPRECATED: Use STRICT_CONFIG.bybit_api_key
 BYBIT_API_SECRET = os.getenv("BYBIT_API_SECRET") or ""  # DEPRECATED: Use STRICT_CONFIG.bybit_api_secret
 BYBIT_RECV_WINDOW = os.getenv("BYBIT_RECV_WINDOW", "30000")
+# Optional WebSocket overrides (default: derived from BYBIT_ENDPOINT), e.g. for app/tools/fake_exchange.py
+BYBIT_WS_PRIVATE_URL = os.getenv("BYBIT_WS_PRIVATE_URL", "")
+BYBIT_WS_PUBLIC_URL = os.getenv("BYBIT_WS_PUBLIC_URL", "")
 
 # Whitelist "3 always" channels (strict requirement)
 ALWAYS_WHITELIST_CHANNELS = [
@@ -0,0 +1,182 @@
+"""
+Live account state: wallet balance and per-position IM from the private stream.
+
+Opening a trade used to cost a wallet-balance REST call for sizing, and every
+IM confirmation (entry, pyramid, trailing, hedge...) fetched the position
+again just to read positionIM. AccountState keeps both up to date from the
+private `wallet` and `position` topics, so sizing and IM confirmation read it
+synchronously.
+
+REST is only used to (re)seed the cache: after the private stream
+authenticates (connect/reconnect) and after a sequence gap. Until the stream
+is authenticated and a seed succeeded the cache reports not-live and callers
+keep their REST path (demo endpoint, stream down).
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional
+
+from app.core.logging import system_logger
+
+ZERO = Decimal("0")
+
+
+def _dec(value: Any) -> Decimal:
+    """Bybit sends numbers as strings, sometimes empty."""
+    try:
+        return Decimal(str(value)) if value not in (None, "") else ZERO
+    except Exception:
+        return ZERO
+
+
+class AccountState:
+    """Equity, balances and per-symbol position IM for the unified account."""
+
+    def __init__(self, coin: str = "USDT", stream_live: Optional[Callable[[], bool]] = None):
+        self.coin = coin
+        self._stream_live = stream_live or _private_stream_live
+        self.equity: Optional[Decimal] = None
+        self.wallet_balance: Optional[Decimal] = None
+        self.available_balance: Optional[Decimal] = None
+        self.total_im: Optional[Decimal] = None
+        self.positions: Dict[str, Dict[str, Decimal]] = {}  # symbol -> size/avgPrice/positionIM
+        self.updated_at: Optional[float] = None
+        self.synced = False  # seeded by REST since the last (re)connect/gap
+        self._refresh_lock = asyncio.Lock()
+
+        # Statistics
+        self.ws_updates = 0
+        self.rest_refreshes = 0
+        self.cache_reads = 0
+
+    @property
+    def live(self) -> bool:
+        """Cache is authoritative: seeded and kept current by an authenticated stream."""
+        return self.synced and self._stream_live()
+
+    def on_wallet(self, account: Dict[str, Any], source: str = "ws"):
+        """Apply one `wallet` topic item (or wallet-balance REST list entry)."""
+        if account.get("accountType", "UNIFIED") != "UNIFIED":
+            return
+        self.equity = _dec(account.get("totalEquity"))
+        self.wallet_balance = _dec(account.get("totalWalletBalance"))
+        self.available_balance = _dec(account.get("totalAvailableBalance"))
+        self.total_im = _dec(account.get("totalInitialMargin"))
+        self.updated_at = time.time()
+        if source == "ws":
+            self.ws_updates += 1
+
+    def on_position(self, position: Dict[str, Any], source: str = "ws"):
+        """Apply one `position` topic item (or position-list REST entry)."""
+        symbol = position.get("symbol")
+        if not symbol:
+            return
+        size = _dec(position.get("size"))
+        if size > 0:
+            self.positions[symbol] = {
+                "size": size,
+                "avgPrice": _dec(position.get("avgPrice")),
+                "positionIM": _dec(position.get("positionIM"))
+            }
+        else:
+            self.positions.pop(symbol, None)
+        self.updated_at = time.time()
+        if source == "ws":
+            self.ws_updates += 1
+
+    def invalidate(self):
+        """Stream lost or gapped: stop serving reads until re-seeded."""
+        self.synced = False
+
+    def get_wallet_balance(self) -> Optional[Decimal]:
+        """Total wallet balance, or None when the cache is not live."""
+        if not self.live or self.wallet_balance is None:
+            return None
+        self.cache_reads += 1
+        return self.wallet_balance
+
+    def get_position_im(self, symbol: str) -> Optional[Decimal]:
+        """
+        positionIM of an open position, or None when not known from the cache.
+
+        A live cache without the symbol also returns None (the position event
+        may not have arrived yet), so callers fall back to REST.
+        """
+        if not self.live:
+            return None
+        position = self.positions.get(symbol)
+        if position is None or position["positionIM"] <= 0:
+            return None
+        self.cache_reads += 1
+        return position["positionIM"]
+
+    async def refresh(self, reason: str = "manual") -> bool:
+        """Re-seed wallet and positions from REST."""
+        from app.bybit.client import get_bybit_client
+        async with self._refresh_lock:
+            client = get_bybit_client()
+            try:
+                wallet, positions = await asyncio.gather(
+                    client.get_wallet_balance("UNIFIED"),
+                    client.positions_by_settle_coin("linear", self.coin)
+                )
+            except Exception as e:
+                self.synced = False
+                system_logger.warning(f"Account state refresh failed: {e}", {"reason": reason})
+                return False
+
+            self.apply_snapshot(wallet, positions)
+            system_logger.info("Account state refreshed from REST", {
+                "reason": reason,
+                "wallet_balance": str(self.wallet_balance),
+                "positions": len(self.positions)
+            })
+            return True
+
+    def apply_snapshot(self, wallet: Optional[Dict[str, Any]], positions: Optional[Dict[str, Any]]):
+        """Replace state with REST wallet-balance / position-list responses."""
+        if wallet is None or positions is None:
+            self.synced = False
+            return
+        for account in wallet.get("result", {}).get("list", []):
+            self.on_wallet(account, source="rest")
+        self.positions.clear()
+        for position in positions.get("result", {}).get("list", []):
+            self.on_position(position, source="rest")
+        self.synced = True
+        self.rest_refreshes += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "live": self.live,
+            "synced": self.synced,
+            "equity": str(self.equity) if self.equity is not None else None,
+            "wallet_balance": str(self.wallet_balance) if self.wallet_balance is not None else None,
+            "available_balance": str(self.available_balance) if self.available_balance is not None else None,
+            "positions": len(self.positions),
+            "age_s": round(time.time() - self.updated_at, 3) if self.updated_at else None,
+            "ws_updates": self.ws_updates,
+            "rest_refreshes": self.rest_refreshes,
+            "cache_reads": self.cache_reads
+        }
+
+
+def _private_stream_live() -> bool:
+    """True when the private WebSocket is connected and authenticated."""
+    from app.bybit import websocket
+    ws = websocket._ws_instance
+    return ws is not None and ws.running and getattr(ws, "authenticated", False)
+
+
+# Global account state instance
+_account_state: Optional[AccountState] = None
+
+
+def get_account_state() -> AccountState:
+    """Get global account state cache."""
+    global _account_state
+    if _account_state is None:
+        _account_state = AccountState()
+    return _account_state
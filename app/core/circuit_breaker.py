@@ -92,8 +92,12 @@ def get_bybit_circuit_breaker() -> CircuitBreaker:
     """Get the global Bybit circuit breaker."""
     return _bybit_circuit_breaker
 
-async def execute_with_circuit_breaker(circuit_breaker: CircuitBreaker, operation):
-    """Execute operation with circuit breaker protection."""
+async def execute_with_circuit_breaker(circuit_breaker: CircuitBreaker, operation, ignored: tuple = ()):
+    """
+    Execute operation with circuit breaker protection.
+    
+    Exceptions in `ignored` (e.g. rate limits) propagate without counting as failures.
+    """
     if not circuit_breaker.can_execute():
         raise Exception(f"Circuit breaker is {circuit_breaker.state.value}")
     
@@ -101,6 +105,8 @@ async def execute_with_circuit_breaker(circuit_breaker: CircuitBreaker, operatio
         result = await operation()
         circuit_breaker.record_success()
         return result
+    except ignored:
+        raise
     except circuit_breaker.expected_exception as e:
         circuit_breaker.record_failure(e)
         raise
@@ -164,6 +164,12 @@ class ConfirmationGate:
         """
         try:
             from app.bybit.client import get_bybit_client
+            from app.core.account_state import get_account_state
+            
+            # Live position IM from the private position stream, if known
+            cached_im = get_account_state().get_position_im(symbol)
+            if cached_im is not None:
+                return cached_im
             
             # Fetch actual position data from Bybit
             client = get_bybit_client()
@@ -214,17 +220,30 @@ class ConfirmationGate:
         leverage: Decimal,
         channel_name: str,
         tps: List = None,
-        sl = None
+        sl = None,
+        client = None,
+        notify: bool = True,
+        order_link_prefix: str = None
     ) -> bool:
-        """Place entry orders with confirmation gate."""
-        from app.bybit.client import BybitClient
+        """
+        Place entry orders with confirmation gate.
+
+        `client` selects the account (default: main account singleton);
+        `notify=False` skips the Telegram confirmation (mirrored accounts).
+        Entry i gets orderLinkId f"{order_link_prefix}_{i}" when a prefix is
+        given, so the caller can wait for its fills (app/core/fill_waiters.py).
+        """
+        from app.bybit.client import get_bybit_client
         from app.telegram.output import send_message
         
-        operation_id = f"entry_{symbol}_{direction}_{int(asyncio.get_event_loop().time())}"
+        if client is None:
+            client = get_bybit_client()
+        if order_link_prefix is None:
+            from app.core.fill_waiters import entry_link_prefix
+            order_link_prefix = entry_link_prefix(f"{symbol}_{direction}_{int(asyncio.get_event_loop().time())}")
+        operation_id = order_link_prefix
         
         async def bybit_operation():
-            from app.bybit.client import get_bybit_client
-            client = get_bybit_client()
             try:
                 # CLIENT SPEC: Set margin mode to ISOLATED (doc/requirement.txt Line 13)
                 system_logger.info(f"Setting ISOLATED margin mode for {symbol}")
@@ -376,8 +395,6 @@ class ConfirmationGate:
                     # For MARKET orders, try to get the actual fill price
                     try:
                         # Get recent executions to find fill price
-                        from app.bybit.client import get_bybit_client
-                        client = get_bybit_client()
                         position_resp = await client.get_position(STRICT_CONFIG.supported_categories[0], symbol)
                         
                         if position_resp.get('retCode') == 0:
@@ -448,7 +465,8 @@ class ConfirmationGate:
             )
         
         return await self.wait_for_confirmation(
-            operation_id, bybit_operation, telegram_callback
+            self._account_operation_id(operation_id, client), bybit_operation,
+            telegram_callback if notify else self._skip_telegram
         )
     
     async def place_exit_orders(
@@ -459,17 +477,19 @@ class ConfirmationGate:
         tps: List,
         sl,
         channel_name: str,
-        entry_price: Decimal = None
+        entry_price: Decimal = None,
+        client = None,
+        notify: bool = True
     ) -> bool:
-        """Place exit orders (TP/SL) with confirmation gate."""
-        from app.bybit.client import BybitClient
+        """Place exit orders (TP/SL) with confirmation gate (`client`/`notify` as for entries)."""
+        from app.bybit.client import get_bybit_client
         from app.telegram.output import send_message
         
+        if client is None:
+            client = get_bybit_client()
         operation_id = f"exit_{symbol}_{side}_{int(asyncio.get_event_loop().time())}"
         
         async def bybit_operation():
-            from app.bybit.client import get_bybit_client
-            client = get_bybit_client()
             try:
                 order_results = []
                 tp_success = True
@@ -620,8 +640,9 @@ class ConfirmationGate:
                             entry_price=price_for_tpsl,
                             tp_levels=tp_percentages,
                             sl_percentage=sl_percentage,
-                            trade_id=operation_id,
-                            callback=lambda x: None  # Dummy callback for compatibility
+                            trade_id=self._account_operation_id(operation_id, client),
+                            callback=lambda x: None,  # Dummy callback for compatibility
+                            client=client
                         ),
                         attempts=5, delay=1.0, op_name="set_intelligent_tpsl_fixed"
                     )
@@ -717,8 +738,20 @@ class ConfirmationGate:
             await send_message(message, template_name="tp_sl_confirmed", symbol=symbol)
         
         return await self.wait_for_confirmation(
-            operation_id, bybit_operation, telegram_callback
+            self._account_operation_id(operation_id, client), bybit_operation,
+            telegram_callback if notify else self._skip_telegram
         )
+
+    @staticmethod
+    def _account_operation_id(operation_id: str, client) -> str:
+        """Keep pending confirmations and TP/SL of concurrently mirrored accounts apart."""
+        account_name = getattr(client, "account_name", None)
+        return f"{operation_id}@{account_name}" if account_name else operation_id
+
+    @staticmethod
+    async def _skip_telegram(bybit_result: Dict[str, Any]) -> None:
+        """Telegram callback for operations that must not notify."""
+        return None
     
     async def close_position(
         self,
@@ -826,8 +859,6 @@ class ConfirmationGate:
         from decimal import Decimal, ROUND_DOWN, ROUND_UP
         from app.core.symbol_registry import get_symbol_registry
         
-        postonly_failures = 0  # Track PostOnly failures for fallback
-        
         for attempt in range(max_retries):
             try:
                 # Get symbol info for quantity formatting
@@ -878,14 +909,14 @@ class ConfirmationGate:
                 # Log the exact order body being sent to Bybit
                 system_logger.info(f"Sending order to Bybit: {order_body}")
                 
-                # Apply demo environment rate limiting
-                from app.core.demo_config import DemoConfig
-                if DemoConfig.is_demo_environment():
-                    import asyncio
-                    limits = DemoConfig.get_demo_limits()
-                    await asyncio.sleep(limits['min_request_interval'])
-                
-                result = await client.place_order(order_body)
+                # Demo environment order pacing is applied by the client's rate limiter
+                if "price" in order_body and time_in_force == "PostOnly":
+                    # Priced against the local top of book, re-quoted on rejection
+                    from app.core.postonly_repricer import get_postonly_repricer
+                    tick_size = symbol_info.tick_size if symbol_info else None
+                    result = await get_postonly_repricer().place(client, order_body, tick_size)
+                else:
+                    result = await client.place_order(order_body)
                 
                 # Log the response from Bybit
                 system_logger.info(f"Bybit response: {result}")
@@ -897,57 +928,6 @@ class ConfirmationGate:
                     else:
                         system_logger.info(f"Limit order accepted: {symbol} {side} {qty} @ {adjusted_price}")
                     return result
-                elif "PostOnly" in str(result.get('retMsg', '')) and STRICT_CONFIG.entry_time_in_force == "PostOnly":
-                    # PostOnly rejected - implement smart price adjustment
-                    postonly_failures += 1
-                    system_logger.warning(f"PostOnly rejected (attempt {attempt + 1}/{max_retries}, failures: {postonly_failures}): {result.get('retMsg')}")
-                    if attempt < max_retries - 1:
-                        try:
-                            # Get current market price and instrument info for smart adjustment
-                            ticker_response = await client.get_ticker(symbol)
-                            instrument_response = await client.get_instrument_info(symbol)
-                            
-                            if ticker_response and ticker_response.get('retCode') == 0 and 'list' in ticker_response['result']:
-                                current_price = Decimal(ticker_response['result']['list'][0]['lastPrice'])
-                                
-                                # Get tick size for proper price adjustment
-                                tick_size = Decimal("0.0001")  # Default tick size
-                                if instrument_response and instrument_response.get('retCode') == 0:
-                                    instrument_list = instrument_response.get('result', {}).get('list', [])
-                                    if instrument_list:
-                                        filters = instrument_list[0].get('lotSizeFilter', {})
-                                        tick_size = Decimal(str(filters.get('tickSize', '0.0001')))
-                                
-                                # Calculate smart price adjustment
-                                if side == "Buy":
-                                    # For Buy orders, move price very close to market to ensure fill
-                                    # Use 0.01% above market + tick size buffer
-                                    price = current_price * Decimal("1.0001")  # Move 0.01% above market
-                                    # Round to tick size
-                                    price = (price / tick_size).quantize(Decimal('1')) * tick_size
-                                else:
-                                    # For Sell orders, move price very close to market to ensure fill
-                                    # Use 0.01% below market + tick size buffer
-                                    price = current_price * Decimal("0.9999")  # Move 0.01% below market
-                                    # Round to tick size
-                                    price = (price / tick_size).quantize(Decimal('1')) * tick_size
-                                
-                                system_logger.info(f"Smart adjustment: {side} price from {current_price} to {price} (tick_size: {tick_size})")
-                            else:
-                                # Fallback to larger adjustment if ticker fails
-                                if side == "Buy":
-                                    price = price * Decimal("1.001")  # Move 0.1% above
-                                else:
-                                    price = price * Decimal("0.999")  # Move 0.1% below
-                                system_logger.info(f"Fallback: Adjusted {side} price to {price} for PostOnly acceptance")
-                        except Exception as e:
-                            system_logger.warning(f"Failed to get ticker/instrument for PostOnly adjustment: {e}")
-                            # Fallback to larger adjustment
-                            if side == "Buy":
-                                price = price * Decimal("1.001")  # Move 0.1% above
-                            else:
-                                price = price * Decimal("0.999")  # Move 0.1% below
-                        continue
                 elif "Qty invalid" in str(result.get('retMsg', '')):
                     # Handle qty invalid error with demo-specific logic
                     from app.core.demo_config import DemoConfig
@@ -992,195 +972,6 @@ class ConfirmationGate:
         # If we get here, all retries failed
         return {'retCode': -1, 'retMsg': f'Order rejected after {max_retries} attempts'}
 
-    async def _place_postonly_order_with_retry(self, client, symbol: str, side: str, qty: Decimal, price: Decimal, order_link_id: str, max_retries: int = 10) -> Dict[str, Any]:
-        """Place PostOnly order with retry logic until accepted."""
-        from decimal import Decimal, ROUND_DOWN, ROUND_UP
-        from app.core.symbol_registry import get_symbol_registry
-        
-        for attempt in range(max_retries):
-            try:
-                # Get symbol info for price adjustment
-                registry = get_symbol_registry()
-                symbol_info = await registry.get_symbol_info(symbol)
-                
-                # Adjust price to ensure PostOnly acceptance
-                # Apply demo environment specific price adjustment
-                from app.core.demo_config import DemoConfig
-                if DemoConfig.is_demo_environment():
-                    limits = DemoConfig.get_demo_limits()
-                    if side == "Buy":
-                        adjusted_price = price * limits['buy_price_factor']
-                    else:
-                        adjusted_price = price * limits['sell_price_factor']
-                else:
-                    # Live environment price adjustment
-                    if side == "Buy":
-                        adjusted_price = price * Decimal("0.999")  # 0.1% below
-                    else:
-                        adjusted_price = price * Decimal("1.001")  # 0.1% above
-                
-                # Quantize to tick size
-                if symbol_info:
-                    adjusted_price = symbol_info.quantize_price(adjusted_price)
-                
-                # Format quantity with correct precision
-                if symbol_info:
-                    formatted_qty = symbol_info.format_qty(qty)
-                else:
-                    formatted_qty = str(qty)
-                
-                # Build order body based on order type
-                if STRICT_CONFIG.entry_order_type == "Market":
-                    # Market orders don't need price
-                    order_body = {
-                        "category": STRICT_CONFIG.supported_categories[0],
-                        "symbol": symbol,
-                        "side": side,
-                        "orderType": STRICT_CONFIG.entry_order_type,
-                        "qty": formatted_qty,
-                        "timeInForce": STRICT_CONFIG.entry_time_in_force,
-                        "reduceOnly": False,
-                        "positionIdx": 0,
-                        "orderLinkId": order_link_id
-                    }
-                else:
-                    # Limit orders need price
-                    order_body = {
-                        "category": STRICT_CONFIG.supported_categories[0],
-                        "symbol": symbol,
-                        "side": side,
-                        "orderType": STRICT_CONFIG.entry_order_type,
-                        "qty": formatted_qty,
-                        "price": str(adjusted_price),
-                        "timeInForce": STRICT_CONFIG.entry_time_in_force,
-                        "reduceOnly": False,
-                        "positionIdx": 0,
-                        "orderLinkId": order_link_id
-                    }
-                
-                # Log the exact order body being sent to Bybit
-                system_logger.info(f"Sending order to Bybit: {order_body}")
-                
-                # Apply demo environment rate limiting
-                from app.core.demo_config import DemoConfig
-                if DemoConfig.is_demo_environment():
-                    import asyncio
-                    limits = DemoConfig.get_demo_limits()
-                    await asyncio.sleep(limits['min_request_interval'])
-                
-                result = await client.place_order(order_body)
-                
-                # Log the response from Bybit
-                system_logger.info(f"Bybit response: {result}")
-                
-                # Check if order was accepted
-                if result.get('retCode') == 0:
-                    if STRICT_CONFIG.entry_order_type == "Market":
-                        system_logger.info(f"Market order accepted: {symbol} {side} {qty}")
-                    else:
-                        system_logger.info(f"Limit order accepted: {symbol} {side} {qty} @ {adjusted_price}")
-                    return result
-                elif "PostOnly" in str(result.get('retMsg', '')) and STRICT_CONFIG.entry_time_in_force == "PostOnly":
-                    # PostOnly rejected - implement smart price adjustment
-                    postonly_failures += 1
-                    system_logger.warning(f"PostOnly rejected (attempt {attempt + 1}/{max_retries}, failures: {postonly_failures}): {result.get('retMsg')}")
-                    if attempt < max_retries - 1:
-                        try:
-                            # Get current market price and instrument info for smart adjustment
-                            ticker_response = await client.get_ticker(symbol)
-                            instrument_response = await client.get_instrument_info(symbol)
-                            
-                            if ticker_response and ticker_response.get('retCode') == 0 and 'list' in ticker_response['result']:
-                                current_price = Decimal(ticker_response['result']['list'][0]['lastPrice'])
-                                
-                                # Get tick size for proper price adjustment
-                                tick_size = Decimal("0.0001")  # Default tick size
-                                if instrument_response and instrument_response.get('retCode') == 0:
-                                    instrument_list = instrument_response.get('result', {}).get('list', [])
-                                    if instrument_list:
-                                        filters = instrument_list[0].get('lotSizeFilter', {})
-                                        tick_size = Decimal(str(filters.get('tickSize', '0.0001')))
-                                
-                                # Calculate smart price adjustment
-                                if side == "Buy":
-                                    # For Buy orders, move price very close to market to ensure fill
-                                    # Use 0.01% above market + tick size buffer
-                                    price = current_price * Decimal("1.0001")  # Move 0.01% above market
-                                    # Round to tick size
-                                    price = (price / tick_size).quantize(Decimal('1')) * tick_size
-                                else:
-                                    # For Sell orders, move price very close to market to ensure fill
-                                    # Use 0.01% below market + tick size buffer
-                                    price = current_price * Decimal("0.9999")  # Move 0.01% below market
-                                    # Round to tick size
-                                    price = (price / tick_size).quantize(Decimal('1')) * tick_size
-                                
-                                system_logger.info(f"Smart adjustment: {side} price from {current_price} to {price} (tick_size: {tick_size})")
-                            else:
-                                # Fallback to larger adjustment if ticker fails
-                                if side == "Buy":
-                                    price = price * Decimal("1.001")  # Move 0.1% above
-                                else:
-                                    price = price * Decimal("0.999")  # Move 0.1% below
-                                system_logger.info(f"Fallback: Adjusted {side} price to {price} for PostOnly acceptance")
-                        except Exception as e:
-                            system_logger.warning(f"Failed to get ticker/instrument for PostOnly adjustment: {e}")
-                            # Fallback to larger adjustment
-                            if side == "Buy":
-                                price = price * Decimal("1.001")  # Move 0.1% above
-                            else:
-                                price = price * Decimal("0.999")  # Move 0.1% below
-                        continue
-                elif "Qty invalid" in str(result.get('retMsg', '')):
-                    # Handle qty invalid error with demo-specific logic
-                    from app.core.demo_config import DemoConfig
-                    if DemoConfig.is_demo_environment():
-                        error_config = DemoConfig.get_demo_error_handling()
-                        if error_config['qty_invalid_retry'] and attempt < max_retries - 1:
-                            system_logger.warning(f"Demo environment: Qty invalid error (attempt {attempt + 1}/{max_retries}): {result.get('retMsg')}")
-                            # Reduce quantity using demo configuration
-                            qty = qty * error_config['qty_reduction_factor']
-                            # Re-format quantity with correct precision
-                            if symbol_info:
-                                formatted_qty = symbol_info.format_qty(qty)
-                            else:
-                                formatted_qty = str(qty)
-                            system_logger.info(f"Demo environment: Reducing quantity to {formatted_qty} for retry")
-                            continue
-                        else:
-                            # Final attempt failed, return error
-                            system_logger.error(f"Demo environment: Final qty invalid error: {result.get('retMsg')}", {
-                                'symbol': symbol,
-                                'side': side,
-                                'qty': str(qty),
-                                'price': str(adjusted_price),
-                                'full_result': result
-                            })
-                            return result
-                    else:
-                        # Live environment: return immediately for qty errors
-                        system_logger.error(f"Live environment: Qty invalid error: {result.get('retMsg')}", {
-                            'symbol': symbol,
-                            'side': side,
-                            'qty': str(qty),
-                            'price': str(adjusted_price),
-                            'full_result': result
-                        })
-                        return result
-                else:
-                    # Other error, return immediately
-                    system_logger.error(f"Order placement failed: {result}")
-                    return result
-                    
-            except Exception as e:
-                system_logger.error(f"Order placement attempt {attempt + 1} failed: {e}")
-                if attempt == max_retries - 1:
-                    return {'retCode': -1, 'retMsg': f'Order placement failed after {max_retries} attempts: {str(e)}'}
-                continue
-        
-        # If we get here, all retries failed
-        return {'retCode': -1, 'retMsg': f'PostOnly order rejected after {max_retries} attempts'}
-    
     def get_pending_confirmations(self) -> Dict[str, Any]:
         """Get pending confirmations for monitoring."""
         return {
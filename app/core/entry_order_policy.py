@@ -15,6 +15,7 @@ from typing import Dict, Any, List, Tuple
 from dataclasses import dataclass
 from app.core.logging import system_logger
 from app.core.symbol_registry import SymbolInfo
+from app.core.ticks import tick_scale
 
 
 @dataclass
@@ -49,6 +50,11 @@ class EntryOrderPolicy:
         # Hard enforcement: Post-Only must be True per CLIENT SPEC
         if not self.config.post_only:
             raise ValueError("Entry orders MUST have post_only=True per CLIENT SPEC")
+        
+        # ±offset multipliers, computed once
+        offset = self.config.offset_pct / Decimal("100")
+        self._below_factor = Decimal("1") - offset
+        self._above_factor = Decimal("1") + offset
     
     def create_dual_entry_orders(
         self,
@@ -186,26 +192,17 @@ class EntryOrderPolicy:
             symbol_info: Symbol metadata
             
         Returns:
-            Tuple of (price1, price2) properly rounded
+            Tuple of (price1, price2) rounded down to whole ticks
         """
-        offset_multiplier = Decimal("1") + (self.config.offset_pct / Decimal("100"))
+        scale = tick_scale(symbol_info.tick_size, symbol_info.step_size)
+        below = scale.floor_ticks(base_price * self._below_factor)
+        above = scale.floor_ticks(base_price * self._above_factor)
         
         if direction.upper() == "LONG":
-            # For LONG: Buy at two slightly different prices
-            # Price1: base_price - 0.1%
-            # Price2: base_price + 0.1%
-            price1 = base_price * (Decimal("1") - self.config.offset_pct / Decimal("100"))
-            price2 = base_price * offset_multiplier
-        else:  # SHORT
-            # For SHORT: Sell at two slightly different prices
-            price1 = base_price * offset_multiplier
-            price2 = base_price * (Decimal("1") - self.config.offset_pct / Decimal("100"))
-        
-        # Round to tick size
-        price1 = self._round_price(price1, symbol_info)
-        price2 = self._round_price(price2, symbol_info)
-        
-        return price1, price2
+            # For LONG: Buy at base_price - 0.1% and base_price + 0.1%
+            return scale.price(below), scale.price(above)
+        # For SHORT: Sell at base_price + 0.1% and base_price - 0.1%
+        return scale.price(above), scale.price(below)
     
     def _split_quantity(
         self,
@@ -220,13 +217,11 @@ class EntryOrderPolicy:
             symbol_info: Symbol metadata
             
         Returns:
-            Quantity per order (properly quantized)
+            Quantity per order (whole steps)
         """
-        # Split in half
-        qty_per_order = total_qty / Decimal("2")
-        
-        # Quantize to step size (ROUND_DOWN to ensure we don't exceed total)
-        qty_per_order = symbol_info.quantize_qty(qty_per_order)
+        # Split the whole steps in half (floor: both legs never exceed total)
+        scale = tick_scale(symbol_info.tick_size, symbol_info.step_size)
+        qty_per_order = scale.qty(scale.split_qty(total_qty, 2))
         
         # Ensure meets minimum
         if qty_per_order < symbol_info.min_qty:
@@ -0,0 +1,271 @@
+"""
+Fill-waiter registry: entry fills resolved by private WebSocket events.
+
+A trade waiting for its PostOnly entry used to poll the position once per
+second (300 signed REST calls per pending entry), yet limit entries may rest
+for days before they fill or cleanup_old_orders cancels them. Instead, each
+pending trade registers a FillWaiter keyed by its entry orderLinkIds (and,
+once known, orderIds) and sleeps on a future - no periodic work per trade:
+
+- `execution` events (execType Trade) and `order` events (Filled /
+  PartiallyFilled) resolve the waiter as filled.
+- `order` events with a terminal status (Cancelled, Rejected, Deactivated)
+  mark that entry dead; the waiter resolves as cancelled once all are dead.
+  A PostOnly entry the exchange cancelled for crossing the book is handed to
+  the PostOnly repricer instead, which re-sends it and relinks the waiter to
+  the new orderLinkId.
+- cancel_symbol() resolves waiters when orders are cancelled by REST
+  (e.g. the 6-day cleanup).
+- A reconciliation sweep checks the position of each pending symbol (one
+  call per symbol, not per trade) as a safety net for missed events. It runs
+  rarely while the private stream is authenticated, and at the old polling
+  cadence while it is not (demo endpoint, stream down).
+
+Entry orderLinkIds are entry_<hash of trade_id>_<index> (entry_link_id), so
+they stay within Bybit's 36-character limit whatever the trade id.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from app.core.idempotency import short_order_link_id
+from app.core.logging import system_logger
+from app.core.postonly_repricer import POSTONLY_CANCEL_REASON
+
+FILLED = "Filled"
+CANCELLED = "Cancelled"
+
+_FILL_STATUSES = {"Filled", "PartiallyFilled"}
+_DEAD_STATUSES = {"Cancelled", "Rejected", "Deactivated", "PartiallyFilledCanceled"}
+
+def entry_link_prefix(trade_id: str) -> str:
+    """orderLinkId prefix of a trade's entries (fixed length, any trade id)."""
+    return short_order_link_id("entry", trade_id)
+
+
+def entry_link_id(trade_id: str, index: int) -> str:
+    """orderLinkId of a trade's entry `index`."""
+    return short_order_link_id("entry", trade_id, index)
+
+
+class FillWaiter:
+    """Dormant wait for the first fill of any of one trade's entry orders."""
+
+    def __init__(self, symbol: str, link_ids: Iterable[str]):
+        self.symbol = symbol
+        self.orders: Set[str] = {k for k in link_ids if k}  # entry orderLinkIds
+        self.dead: Set[str] = set()                          # orders cancelled/rejected
+        self.created_at = time.monotonic()
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    @property
+    def done(self) -> bool:
+        return self.future.done()
+
+    def resolve(self, status: str, source: str, event: Optional[Dict[str, Any]] = None):
+        if not self.future.done():
+            self.future.set_result({"status": status, "source": source, "event": event or {}})
+
+    async def wait(self) -> Dict[str, Any]:
+        """Wait until resolved: {"status": Filled|Cancelled, "source": ws|rest|..., "event": {...}}."""
+        return await asyncio.shield(self.future)
+
+
+class FillWaiterRegistry:
+    """Pending entry fills indexed by orderLinkId/orderId and by symbol."""
+
+    def __init__(self, sweep_interval: float = 300.0, fallback_interval: float = 1.0,
+                 stream_live: Optional[Callable[[], bool]] = None,
+                 fetch_position: Optional[Callable[[str], Any]] = None,
+                 reprice: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        self.sweep_interval = sweep_interval
+        self.fallback_interval = fallback_interval
+        self._stream_live = stream_live or _private_stream_live
+        self._fetch_position = fetch_position or _fetch_position
+        self._reprice = reprice or _reprice_postonly
+        # orderLinkId/orderId -> (waiter, orderLinkId of that entry)
+        self._by_key: Dict[str, Tuple[FillWaiter, str]] = {}
+        self._by_symbol: Dict[str, Set[FillWaiter]] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self.resolved_ws = 0
+        self.resolved_rest = 0
+        self.sweeps = 0
+
+    def expect(self, symbol: str, link_ids: Iterable[str]) -> FillWaiter:
+        """Register a waiter before the orders are placed (so no fill can be missed)."""
+        waiter = FillWaiter(symbol, link_ids)
+        for link_id in waiter.orders:
+            self._by_key[link_id] = (waiter, link_id)
+        self._by_symbol.setdefault(symbol, set()).add(waiter)
+        self._ensure_sweeper()
+        return waiter
+
+    def bind(self, waiter: FillWaiter, link_id: str, order_id: str):
+        """Also match events that carry only the exchange orderId of an entry."""
+        if order_id and link_id in waiter.orders and not waiter.done:
+            self._by_key[order_id] = (waiter, link_id)
+
+    def relink(self, link_id: str, new_link_id: str):
+        """An entry was re-sent under a new orderLinkId: wait for that one instead."""
+        match = self._by_key.get(link_id)
+        if match is None:
+            return
+        waiter = match[0]
+        for key in [k for k, (w, linked) in self._by_key.items() if w is waiter and linked == link_id]:
+            del self._by_key[key]
+        waiter.orders.discard(link_id)
+        waiter.orders.add(new_link_id)
+        self._by_key[new_link_id] = (waiter, new_link_id)
+
+    def discard(self, waiter: Optional[FillWaiter]):
+        """Forget a waiter (trade finished or gave up)."""
+        if waiter is None:
+            return
+        for key in [k for k, (w, _) in self._by_key.items() if w is waiter]:
+            del self._by_key[key]
+        waiters = self._by_symbol.get(waiter.symbol)
+        if waiters is not None:
+            waiters.discard(waiter)
+            if not waiters:
+                del self._by_symbol[waiter.symbol]
+        if not waiter.future.done():
+            waiter.future.cancel()
+
+    @property
+    def pending(self) -> int:
+        return sum(1 for waiters in self._by_symbol.values() for w in waiters if not w.done)
+
+    def _lookup(self, event: Dict[str, Any]) -> Optional[Tuple[FillWaiter, str]]:
+        return self._by_key.get(event.get("orderLinkId") or "") or self._by_key.get(event.get("orderId") or "")
+
+    def _resolve(self, waiter: FillWaiter, status: str, source: str, event: Optional[Dict[str, Any]] = None):
+        if waiter.done:
+            return
+        waiter.resolve(status, source, event)
+        if source == "ws":
+            self.resolved_ws += 1
+        else:
+            self.resolved_rest += 1
+        system_logger.info(f"Entry {status.lower()} for {waiter.symbol} ({source})", {
+            "symbol": waiter.symbol,
+            "order_link_id": (event or {}).get("orderLinkId"),
+            "waited_s": round(time.monotonic() - waiter.created_at, 3)
+        })
+
+    def on_execution(self, execution: Dict[str, Any]):
+        """Private `execution` topic item."""
+        if execution.get("execType", "Trade") != "Trade":
+            return
+        match = self._lookup(execution)
+        if match is not None:
+            self._resolve(match[0], FILLED, "ws", execution)
+
+    def on_order(self, order: Dict[str, Any]):
+        """Private `order` topic item."""
+        if order.get("rejectReason") == POSTONLY_CANCEL_REASON and self._reprice(order):
+            return  # re-sent under a new orderLinkId, not dead
+        match = self._lookup(order)
+        if match is None:
+            return
+        waiter, link_id = match
+        status = order.get("orderStatus")
+        if status in _FILL_STATUSES or Decimal(str(order.get("cumExecQty") or "0")) > 0:
+            self._resolve(waiter, FILLED, "ws", order)
+        elif status in _DEAD_STATUSES:
+            waiter.dead.add(link_id)
+            if waiter.dead >= waiter.orders:
+                self._resolve(waiter, CANCELLED, "ws", order)
+
+    def cancel_symbol(self, symbol: str, source: str = "rest"):
+        """All entry orders on `symbol` were cancelled outside the stream (e.g. cleanup)."""
+        for waiter in list(self._by_symbol.get(symbol, ())):
+            self._resolve(waiter, CANCELLED, source)
+
+    async def sweep(self) -> int:
+        """REST reconciliation: resolve waiters whose symbol now has a position."""
+        self.sweeps += 1
+        resolved = 0
+        symbols = [s for s, waiters in self._by_symbol.items() if any(not w.done for w in waiters)]
+        positions = await asyncio.gather(*(self._fetch_position(s) for s in symbols), return_exceptions=True)
+        for symbol, position in zip(symbols, positions):
+            if isinstance(position, BaseException) or not position:
+                continue
+            if Decimal(str(position.get("size") or "0")) > 0:
+                for waiter in list(self._by_symbol.get(symbol, ())):
+                    if not waiter.done:
+                        self._resolve(waiter, FILLED, "rest", position)
+                        resolved += 1
+        return resolved
+
+    def _ensure_sweeper(self):
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def _sweep_loop(self):
+        """One loop for all waiters; exits when none are pending."""
+        last_sweep = time.monotonic()
+        while self.pending:
+            # Re-check the cadence every fallback_interval: the stream may go down
+            await asyncio.sleep(self.fallback_interval)
+            interval = self.sweep_interval if self._stream_live() else self.fallback_interval
+            if time.monotonic() - last_sweep < interval:
+                continue
+            last_sweep = time.monotonic()
+            try:
+                await self.sweep()
+            except Exception as e:
+                system_logger.error(f"Fill reconciliation sweep error: {e}", exc_info=True)
+
+    async def stop(self):
+        if self._sweep_task is not None:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "pending": self.pending,
+            "symbols": len(self._by_symbol),
+            "resolved_ws": self.resolved_ws,
+            "resolved_rest": self.resolved_rest,
+            "sweeps": self.sweeps,
+            "stream_live": self._stream_live()
+        }
+
+
+def _reprice_postonly(order: Dict[str, Any]) -> bool:
+    from app.core.postonly_repricer import get_postonly_repricer
+    return get_postonly_repricer().on_postonly_cancel(order)
+
+
+def _private_stream_live() -> bool:
+    """True when the private WebSocket is connected and authenticated."""
+    from app.bybit import websocket
+    ws = websocket._ws_instance
+    return ws is not None and ws.running and getattr(ws, "authenticated", False)
+
+
+async def _fetch_position(symbol: str) -> Optional[Dict[str, Any]]:
+    from app.bybit.client import get_bybit_client
+    result = await get_bybit_client().get_position("linear", symbol)
+    positions = result.get("result", {}).get("list", [])
+    return positions[0] if positions else None
+
+
+# Global registry instance
+_fill_registry: Optional[FillWaiterRegistry] = None
+
+
+def get_fill_registry() -> FillWaiterRegistry:
+    """Get global fill-waiter registry."""
+    global _fill_registry
+    if _fill_registry is None:
+        _fill_registry = FillWaiterRegistry()
+    return _fill_registry
@@ -138,6 +138,23 @@ def mark_signal_processed(signal: Dict[str, Any]):
 # Deterministic orderLinkId Generation (CLIENT SPEC Line 295)
 # ============================================================================
 
+ORDER_LINK_ID_MAX = 36  # Bybit orderLinkId length limit
+
+
+def short_order_link_id(kind: str, key: str, suffix=None) -> str:
+    """
+    Bounded orderLinkId: {kind}_{12 hex of hash(key)}[_{suffix}].
+
+    Ids built from trade ids (symbol, side, timestamp, account) can exceed
+    Bybit's limit; the same key always gives the same id.
+    """
+    link_id = f"{kind}_{hashlib.blake2b(key.encode('utf-8'), digest_size=6).hexdigest()}"
+    if suffix is not None:
+        link_id = f"{link_id}_{suffix}"
+    assert len(link_id) <= ORDER_LINK_ID_MAX, link_id
+    return link_id
+
+
 def generate_deterministic_order_link_id(
     trade_id: str,
     step: str,
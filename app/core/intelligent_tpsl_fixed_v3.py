@@ -4,17 +4,19 @@ from decimal import Decimal
 from typing import Dict, Any, List, Optional, Callable
 from app.core.logging import system_logger
 from app.core.environment_detector import get_environment_detector, TPSLStrategy, BybitEnvironment
+from app.core.idempotency import short_order_link_id
 from app.bybit.client import get_bybit_client
 
 
 class IntelligentTPSLHandlerFixed:
     """Fixed intelligent TP/SL handler with correct V5 API implementation for multiple TP levels."""
     
-    def __init__(self):
-        self._client = None
+    def __init__(self, client=None):
+        # None = main account singleton (resolved in initialize)
+        self._client = client
         self.environment_detector = get_environment_detector()
         from app.core.simulated_tpsl import get_simulated_tpsl_manager
-        self.simulated_manager = get_simulated_tpsl_manager()
+        self.simulated_manager = get_simulated_tpsl_manager(client)
         self.initialized = False
 
     def _get_trigger_source(self) -> str:
@@ -24,7 +26,8 @@ class IntelligentTPSLHandlerFixed:
     
     async def initialize(self):
         if not self.initialized:
-            self._client = get_bybit_client()
+            if self._client is None:
+                self._client = get_bybit_client()
             
             # Force environment detection based on endpoint BEFORE analysis
             endpoint_str = str(self._client.http.base_url)
@@ -83,6 +86,8 @@ class IntelligentTPSLHandlerFixed:
             else:
                 # Fall back to simulated TP/SL
                 system_logger.info(f"Falling back to simulated TP/SL for {trade_id}")
+                # Managers of additional accounts start on first use (no-op once running)
+                await self.simulated_manager.start()
                 success = await self.simulated_manager.add_tpsl_order(
                     symbol, side, position_size, entry_price, tp_levels, sl_percentage, trade_id, callback
                 )
@@ -306,7 +311,7 @@ class IntelligentTPSLHandlerFixed:
                             "reduceOnly": True,
                             "closeOnTrigger": False,  # ✅ CRITICAL: False for partial close!
                             "positionIdx": position_idx,
-                            "orderLinkId": f"tp_{trade_id}_{i}"
+                            "orderLinkId": short_order_link_id("tp", trade_id, i)
                         }
                         
                         tp_result = await self._client.place_order(tp_order)
@@ -416,6 +421,8 @@ class IntelligentTPSLHandlerFixed:
 
 # Global instance
 _intelligent_tpsl_handler = None
+# Handlers for additional accounts, keyed by account name
+_account_tpsl_handlers: Dict[str, IntelligentTPSLHandlerFixed] = {}
 
 def get_intelligent_tpsl_handler_fixed() -> IntelligentTPSLHandlerFixed:
     """Get singleton instance of intelligent TP/SL handler."""
@@ -432,10 +439,16 @@ async def set_intelligent_tpsl_fixed(
     tp_levels: List[Decimal],
     sl_percentage: Optional[Decimal],
     trade_id: str,
-    callback: Callable[[Dict[str, Any]], None] = None
+    callback: Callable[[Dict[str, Any]], None] = None,
+    client=None
 ) -> Dict[str, Any]:
-    """Set intelligent TP/SL using the fixed handler."""
-    handler = get_intelligent_tpsl_handler_fixed()
+    """Set intelligent TP/SL using the fixed handler (of `client`'s account, if given)."""
+    if client is None or client.account_name is None:
+        handler = get_intelligent_tpsl_handler_fixed()
+    else:
+        handler = _account_tpsl_handlers.get(client.account_name)
+        if handler is None:
+            handler = _account_tpsl_handlers[client.account_name] = IntelligentTPSLHandlerFixed(client)
     return await handler.set_tpsl(
         symbol, side, position_size, entry_price, tp_levels, sl_percentage, trade_id, callback
     )
@@ -25,6 +25,7 @@ import pytz
 import asyncio
 
 from app.core.logging import system_logger
+from app.core import json_codec
 
 
 class JournalEntry:
@@ -47,7 +48,9 @@ class JournalEntry:
         self.data = self._sanitize_data(data)
         self.prev_hash = prev_hash
         self.timestamp_utc = datetime.now(pytz.UTC).isoformat()
-        self.hash = self._compute_hash()
+        # Serialized once: feeds the hash and is spliced into the journal line
+        self._data_json = self._canonical_data()
+        self.hash = self._compute_hash(self._data_json)
     
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Sanitize data for JSON serialization."""
@@ -67,7 +70,16 @@ class JournalEntry:
                 sanitized[key] = str(value)
         return sanitized
     
-    def _compute_hash(self) -> str:
+    def _canonical_data(self) -> str:
+        """
+        Canonical JSON of the data (stdlib, sorted keys, default separators).
+        
+        This is the hash input format; it must never change or existing
+        journals would fail verification.
+        """
+        return json.dumps(self.data, sort_keys=True)
+    
+    def _compute_hash(self, data_json: Optional[str] = None) -> str:
         """
         Compute SHA256 hash of entry.
         
@@ -75,7 +87,8 @@ class JournalEntry:
         This creates a chain where any tampering breaks all subsequent hashes.
         """
         # Sort data keys for deterministic hashing
-        data_json = json.dumps(self.data, sort_keys=True)
+        if data_json is None:
+            data_json = self._canonical_data()
         content = f"{self.sequence}|{self.event_type}|{data_json}|{self.prev_hash}|{self.timestamp_utc}"
         return hashlib.sha256(content.encode()).hexdigest()
     
@@ -91,8 +104,16 @@ class JournalEntry:
         }
     
     def to_json(self) -> str:
-        """Convert to JSON string."""
-        return json.dumps(self.to_dict())
+        """Convert to JSON string (data reuses the already-serialized hash input)."""
+        data_json = self._data_json or self._canonical_data()
+        head = json_codec.dumps({
+            "sequence": self.sequence,
+            "event_type": self.event_type,
+            "prev_hash": self.prev_hash,
+            "timestamp_utc": self.timestamp_utc,
+            "hash": self.hash
+        })
+        return f'{head[:-1]},"data":{data_json}}}'
     
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> 'JournalEntry':
@@ -104,6 +125,7 @@ class JournalEntry:
         entry.prev_hash = d["prev_hash"]
         entry.timestamp_utc = d["timestamp_utc"]
         entry.hash = d["hash"]
+        entry._data_json = None
         return entry
 
 
@@ -143,7 +165,7 @@ class AppendOnlyJournal:
                     lines = f.readlines()
                     for line in lines:
                         if line.strip():
-                            entry_dict = json.loads(line)
+                            entry_dict = json_codec.loads(line)
                             entry = JournalEntry.from_dict(entry_dict)
                             self._entries_cache.append(entry)
                     
@@ -260,7 +282,17 @@ class AppendOnlyJournal:
             "last_hash": self.last_hash
         }
     
-    async def reconcile_with_bybit(self, bybit_client) -> Dict[str, Any]:
+    def last_entry_time_ms(self) -> Optional[int]:
+        """Timestamp (epoch ms) of the last journal entry, None if empty."""
+        if not self._entries_cache:
+            return None
+        try:
+            return int(datetime.fromisoformat(self._entries_cache[-1].timestamp_utc).timestamp() * 1000)
+        except (TypeError, ValueError):
+            return None
+    
+    async def reconcile_with_bybit(self, bybit_client, open_orders: Optional[List[Dict[str, Any]]] = None,
+                                   executions: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Reconcile journal with Bybit state.
         
@@ -269,21 +301,26 @@ class AppendOnlyJournal:
         Detects:
         - Orphan orders (in journal but not in Bybit)
         - Missing entries (in Bybit but not in journal)
+        - Unjournaled fills (executions since the last entry not in journal)
         - State mismatches
         
         Args:
             bybit_client: Bybit API client
+            open_orders: Open orders from the startup snapshot (fetched if None)
+            executions: Executions since the last journal entry (skipped if None)
         
         Returns:
             {
                 "orphans": [journal entries not in Bybit],
                 "missing": [Bybit orders not in journal],
+                "unjournaled_fills": [Bybit executions not in journal],
                 "mismatches": [state differences],
                 "status": "clean" | "has_issues"
             }
         """
         orphans = []
         missing = []
+        unjournaled_fills = []
         mismatches = []
         
         try:
@@ -295,19 +332,22 @@ class AppendOnlyJournal:
                     if order_id:
                         journal_orders[order_id] = entry
             
-            # Get all open orders from Bybit
+            # Get all open orders from Bybit (already in the startup snapshot when given)
             bybit_orders = {}
-            for category in ["linear"]:  # Add more categories if needed
-                try:
-                    # CRITICAL FIX: Add settleCoin parameter to avoid error 10001
-                    response = await bybit_client.get_open_orders(category, settleCoin="USDT")
-                    if response.get("retCode") == 0:
-                        for order in response.get("result", {}).get("list", []):
-                            order_id = order.get("orderId")
-                            if order_id:
-                                bybit_orders[order_id] = order
-                except Exception as e:
-                    system_logger.warning(f"Failed to get open orders for {category}: {e}")
+            if open_orders is None:
+                open_orders = []
+                for category in ["linear"]:  # Add more categories if needed
+                    try:
+                        # CRITICAL FIX: Add settleCoin parameter to avoid error 10001
+                        response = await bybit_client.get_open_orders(category, settleCoin="USDT")
+                        if response.get("retCode") == 0:
+                            open_orders.extend(response.get("result", {}).get("list", []))
+                    except Exception as e:
+                        system_logger.warning(f"Failed to get open orders for {category}: {e}")
+            for order in open_orders:
+                order_id = order.get("orderId")
+                if order_id:
+                    bybit_orders[order_id] = order
             
             # Find orphans (in journal but not in Bybit)
             for order_id, entry in journal_orders.items():
@@ -336,12 +376,27 @@ class AppendOnlyJournal:
                         "orderLinkId": bybit_order.get("orderLinkId")
                     })
             
+            # Find fills that happened while we were down (not journaled)
+            if executions:
+                filled_ids = {e.data.get("order_id") for e in self._entries_cache if e.event_type == "ORDER_FILLED"}
+                for execution in executions:
+                    if execution.get("execType", "Trade") == "Trade" and execution.get("orderId") not in filled_ids:
+                        unjournaled_fills.append({
+                            "order_id": execution.get("orderId"),
+                            "symbol": execution.get("symbol"),
+                            "side": execution.get("side"),
+                            "exec_qty": execution.get("execQty"),
+                            "exec_price": execution.get("execPrice"),
+                            "orderLinkId": execution.get("orderLinkId")
+                        })
+            
             # Determine status
             status = "clean" if (not orphans and not missing) else "has_issues"
             
             result = {
                 "orphans": orphans,
                 "missing": missing,
+                "unjournaled_fills": unjournaled_fills,
                 "mismatches": mismatches,
                 "status": status,
                 "journal_order_count": len(journal_orders),
@@ -361,6 +416,7 @@ class AppendOnlyJournal:
             return {
                 "orphans": [],
                 "missing": [],
+                "unjournaled_fills": [],
                 "mismatches": [],
                 "status": "error",
                 "error": str(e)
@@ -486,16 +542,22 @@ async def verify_journal_integrity() -> Dict[str, Any]:
     return journal.verify_integrity()
 
 
-async def reconcile_on_startup(bybit_client) -> Dict[str, Any]:
+async def reconcile_on_startup(bybit_client, snapshot: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Run journal reconciliation on startup.
     
     CLIENT SPEC: Must be called during bot startup to detect orphans.
     
+    With the shared startup snapshot (app.runtime.resume) no extra REST call
+    is made.
+    
     Returns reconciliation report with any issues found.
     """
     journal = get_append_only_journal()
-    report = await journal.reconcile_with_bybit(bybit_client)
+    snapshot = snapshot or {}
+    report = await journal.reconcile_with_bybit(
+        bybit_client, open_orders=snapshot.get("orders"), executions=snapshot.get("executions")
+    )
     
     # Log summary
     if report["status"] == "clean":
@@ -513,5 +575,10 @@ async def reconcile_on_startup(bybit_client) -> Dict[str, Any]:
                 "missing": report["missing"]
             })
     
+    if report.get("unjournaled_fills"):
+        system_logger.warning(f"Found {len(report['unjournaled_fills'])} fills since the last journal entry", {
+            "unjournaled_fills": report["unjournaled_fills"]
+        })
+    
     return report
 
@@ -0,0 +1,74 @@
+"""
+Pluggable JSON codec for the hot path (REST, WebSocket, logs, journal).
+
+Uses orjson when installed and falls back to the stdlib `json` module
+otherwise (or when JSON_CODEC=json). Output matches the stdlib settings the
+callers used before:
+
+- dumps(obj)                 compact, UTF-8 kept as-is
+                             == json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+- dumps(obj, sort_keys=True) same, keys sorted
+
+For the str/int/bool/None payloads Bybit requests carry, both backends give
+byte-identical output, so request signatures do not depend on the backend.
+The signed string is also the exact body sent (BybitClient._headers_sync).
+
+NaN/Infinity floats are written as null by orjson (the stdlib writes NaN).
+Anything orjson cannot encode (ints beyond 64 bit, exotic types without a
+`default`) or decode is retried with the stdlib, so behaviour never regresses.
+"""
+
+import json
+import os
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+AVAILABLE_BACKENDS = ("orjson", "json") if orjson is not None else ("json",)
+
+_backend = "json"
+
+
+def set_backend(name: str) -> str:
+    """Select the backend ("orjson" or "json"); unknown/unavailable names fall back to json."""
+    global _backend
+    _backend = name if name in AVAILABLE_BACKENDS else "json"
+    return _backend
+
+
+def get_backend() -> str:
+    """Name of the active backend."""
+    return _backend
+
+
+def _stdlib_dumps(obj: Any, sort_keys: bool, default: Optional[Callable]) -> str:
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, sort_keys=sort_keys, default=default)
+
+
+def dumps(obj: Any, *, sort_keys: bool = False, default: Optional[Callable] = None) -> str:
+    """Serialize to a compact JSON string."""
+    if _backend == "orjson":
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=default, option=option).decode()
+        except TypeError:
+            pass
+    return _stdlib_dumps(obj, sort_keys, default)
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """Parse JSON from str or UTF-8 bytes."""
+    if _backend == "orjson":
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+set_backend(os.getenv("JSON_CODEC", "orjson"))
@@ -1,17 +1,24 @@
 """Structured logging with traceId and error mapping."""
 
-import json
 import uuid
 import traceback
 import os
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
+from app.core import json_codec
 # Removed retcodes import - no longer needed
 
-# Create logs directory if it doesn't exist
+# Logs directory is created on first write, not at import
 LOG_DIR = Path("logs")
-LOG_DIR.mkdir(exist_ok=True)
+_log_dir_ready = False
+
+def _ensure_log_dir():
+    """Create the logs directory once, on first log write."""
+    global _log_dir_ready
+    if not _log_dir_ready:
+        LOG_DIR.mkdir(exist_ok=True)
+        _log_dir_ready = True
 
 class StructuredLogger:
     """Structured JSON logger with traceId support and file output."""
@@ -32,13 +39,14 @@ class StructuredLogger:
             "data": data or {}
         }
         
-        log_line = json.dumps(log_entry, ensure_ascii=False)
+        log_line = json_codec.dumps(log_entry)
         
         # Print to stdout (for console viewing)
         print(log_line)
         
         # Write to file (for persistence and auditing per CLIENT REQUIREMENT #21)
         try:
+            _ensure_log_dir()
             with open(self.log_file, 'a', encoding='utf-8') as f:
                 f.write(log_line + '\n')
         except Exception as e:
@@ -0,0 +1,272 @@
+"""
+Event-loop lag monitor and slow-callback profiler.
+
+Everything in the bot shares one asyncio loop, so any synchronous work on it
+(file writes in StructuredLogger, sqlite3 in resume/order_data_manager, a
+blocking NTP query, a pathological regex) delays every order, fill and
+Telegram update behind it. This module makes those stalls visible:
+
+- A ticker task sleeps `interval` seconds in a loop and records how late it
+  wakes up (scheduling lag) into a histogram and a recent-sample window.
+- A watchdog thread watches the ticker's heartbeat. When the heartbeat is
+  older than `interval + threshold`, the loop is stuck inside one callback;
+  the watchdog samples the loop thread's stack (sys._current_frames) at that
+  moment, so the offender is captured while it is still running.
+- When the ticker resumes, the stall is attributed to the sampled frame and
+  aggregated into top offenders (count, total and max blocked ms).
+
+Stats are exposed via /metrics (summary) and /debug/loop (stacks).
+
+Note: code that blocks while holding the GIL (e.g. a long regex match) also
+delays the watchdog thread; such stalls are still measured but may be
+sampled late or recorded as unsampled.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple
+
+from app.core.logging import system_logger
+
+# Histogram upper bounds in ms (cumulative, Prometheus "le" style)
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Frames under this directory are preferred when naming an offender
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_PROJECT_DIR = os.path.dirname(_APP_DIR)
+
+UNSAMPLED = "<unsampled>"
+
+
+class LoopLagMonitor:
+    """Measures event-loop scheduling lag and profiles the callbacks that cause it."""
+
+    def __init__(self, interval: float = 0.05, threshold_ms: float = 100.0,
+                 max_offenders: int = 50, stack_depth: int = 15):
+        self.interval = interval
+        self.threshold_ms = threshold_ms
+        self.max_offenders = max_offenders
+        self.stack_depth = stack_depth
+
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._loop_thread_id: Optional[int] = None
+
+        # Heartbeat: monotonic time the ticker last went to sleep
+        self._heartbeat: Optional[float] = None
+        # Stack sampled by the watchdog for the stall after heartbeat X: (X, key, stack)
+        self._pending: Optional[Tuple[float, str, List[str]]] = None
+
+        # Statistics
+        self.samples = 0
+        self.stalls = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self.histogram: Dict[str, int] = {str(b): 0 for b in LAG_BUCKETS_MS}
+        self.histogram["+Inf"] = 0
+        self.recent_lags: deque = deque(maxlen=1000)
+        self.recent_stalls: deque = deque(maxlen=50)
+        self.offenders: Dict[str, Dict[str, Any]] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the ticker on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop_event.clear()
+        self._task = asyncio.get_running_loop().create_task(self._tick_loop())
+        self._thread = threading.Thread(target=self._watchdog, name="loop-lag-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        """Stop the ticker and join the watchdog thread."""
+        self._stop_event.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join, 1.0)
+            self._thread = None
+
+    async def _tick_loop(self):
+        while True:
+            beat = time.monotonic()
+            self._heartbeat = beat
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (time.monotonic() - beat - self.interval) * 1000)
+            self._record(beat, lag_ms)
+
+    def _record(self, beat: float, lag_ms: float):
+        """Account one tick (runs on the loop)."""
+        self.samples += 1
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        self.recent_lags.append(lag_ms)
+        for bound in LAG_BUCKETS_MS:
+            if lag_ms <= bound:
+                self.histogram[str(bound)] += 1
+        self.histogram["+Inf"] += 1
+
+        if lag_ms < self.threshold_ms:
+            return
+
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending is not None and pending[0] == beat:
+            _, key, stack = pending
+        else:
+            key, stack = UNSAMPLED, []
+
+        self.stalls += 1
+        offender = self.offenders.get(key)
+        if offender is None:
+            if len(self.offenders) >= self.max_offenders:
+                # Drop the least costly offender to keep memory bounded
+                smallest = min(self.offenders, key=lambda k: self.offenders[k]["total_ms"])
+                del self.offenders[smallest]
+            offender = self.offenders[key] = {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "stack": stack}
+        offender["count"] += 1
+        offender["total_ms"] += lag_ms
+        if lag_ms >= offender["max_ms"]:
+            offender["max_ms"] = lag_ms
+            if stack:
+                offender["stack"] = stack
+        offender["last_seen"] = datetime.utcnow().isoformat()
+        self.recent_stalls.append({"at": offender["last_seen"], "lag_ms": round(lag_ms, 2), "callback": key})
+
+        system_logger.warning(f"Event loop blocked for {lag_ms:.0f} ms", {
+            "lag_ms": round(lag_ms, 2),
+            "threshold_ms": self.threshold_ms,
+            "callback": key
+        })
+
+    def _watchdog(self):
+        """Helper thread: sample the loop thread's stack while it is stuck."""
+        poll = max(0.005, min(self.interval, self.threshold_ms / 1000) / 2)
+        sampled_beat = None
+        while not self._stop_event.wait(poll):
+            beat = self._heartbeat
+            if beat is None or beat == sampled_beat:
+                continue
+            if (time.monotonic() - beat - self.interval) * 1000 < self.threshold_ms:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            sampled_beat = beat
+            key, stack = self._describe(frame)
+            with self._lock:
+                self._pending = (beat, key, stack)
+
+    def _describe(self, frame) -> Tuple[str, List[str]]:
+        """Offender key (innermost app frame, else innermost frame) and formatted stack."""
+        summary = traceback.extract_stack(frame)
+        del frame
+        culprit = summary[-1]
+        for entry in reversed(summary):
+            if entry.filename.startswith(_APP_DIR) and entry.filename != __file__:
+                culprit = entry
+                break
+        filename = os.path.relpath(culprit.filename, _PROJECT_DIR) \
+            if culprit.filename.startswith(_PROJECT_DIR) else culprit.filename
+        key = f"{filename}:{culprit.lineno} in {culprit.name}"
+        stack = [line.rstrip() for line in traceback.format_list(summary[-self.stack_depth:])]
+        return key, stack
+
+    def _percentile(self, pct: float) -> Optional[float]:
+        if not self.recent_lags:
+            return None
+        ordered = sorted(self.recent_lags)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    def top_offenders(self, limit: int = 10, with_stacks: bool = False) -> List[Dict[str, Any]]:
+        """Offenders ordered by total blocked time."""
+        ranked = sorted(self.offenders.items(), key=lambda item: item[1]["total_ms"], reverse=True)
+        result = []
+        for key, offender in ranked[:limit]:
+            entry = {
+                "callback": key,
+                "count": offender["count"],
+                "total_ms": round(offender["total_ms"], 2),
+                "max_ms": round(offender["max_ms"], 2),
+                "last_seen": offender.get("last_seen")
+            }
+            if with_stacks:
+                entry["stack"] = offender["stack"]
+            result.append(entry)
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Summary for /metrics."""
+        p50 = self._percentile(0.50)
+        p99 = self._percentile(0.99)
+        return {
+            "running": self.running,
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold_ms,
+            "samples": self.samples,
+            "stalls": self.stalls,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+            "p50_lag_ms": round(p50, 2) if p50 is not None else None,
+            "p99_lag_ms": round(p99, 2) if p99 is not None else None,
+            "histogram_ms": dict(self.histogram),
+            "top_offenders": self.top_offenders(limit=5)
+        }
+
+    def get_debug(self) -> Dict[str, Any]:
+        """Full detail for /debug/loop, including sampled stacks."""
+        stats = self.get_stats()
+        stats["top_offenders"] = self.top_offenders(limit=self.max_offenders, with_stacks=True)
+        stats["recent_stalls"] = list(self.recent_stalls)
+        return stats
+
+
+# Global loop monitor instance
+_loop_monitor: Optional[LoopLagMonitor] = None
+
+
+def get_loop_monitor() -> LoopLagMonitor:
+    """Get global loop monitor instance (configured from STRICT_CONFIG)."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        from app.core.strict_config import STRICT_CONFIG
+        _loop_monitor = LoopLagMonitor(
+            interval=STRICT_CONFIG.loop_lag_interval,
+            threshold_ms=STRICT_CONFIG.loop_lag_threshold_ms
+        )
+    return _loop_monitor
+
+
+async def start_loop_monitor() -> LoopLagMonitor:
+    """Start lag monitoring on the running loop."""
+    monitor = get_loop_monitor()
+    monitor.start()
+    system_logger.info("Event loop monitor started", {
+        "interval_ms": monitor.interval * 1000,
+        "threshold_ms": monitor.threshold_ms
+    })
+    return monitor
+
+
+async def stop_loop_monitor():
+    """Stop lag monitoring (if started)."""
+    if _loop_monitor is not None:
+        await _loop_monitor.stop()
@@ -9,23 +9,42 @@ CLIENT SPEC Lines 300-302:
 
 This prevents timestamp-related errors with Bybit API and ensures
 accurate order timing.
+
+Probing never blocks the event loop: all configured servers are queried
+concurrently in worker threads and the median offset is kept, so one slow or
+dead server neither stalls order placement nor skews the result. The monitor
+is also the single clock source for request timestamps: BybitClient.sync_time
+reports the exchange server-time offset here and reads the merged offset back
+(get_offset_ms: fresh NTP and exchange offsets weighted by their uncertainty).
 """
 
 import asyncio
-from datetime import datetime, timedelta
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List, Dict, Any
-import pytz
-
-try:
-    import ntplib
-    NTP_AVAILABLE = True
-except ImportError:
-    NTP_AVAILABLE = False
-    from app.core.logging import system_logger
-    system_logger.warning("ntplib not installed. Run: pip install ntplib")
 
 from app.core.logging import system_logger
 
+# ntplib is imported on first drift check (see _load_ntplib) so importing this
+# module - e.g. from BybitClient's clock-discipline guard - stays cheap.
+ntplib = None
+NTP_AVAILABLE: Optional[bool] = None
+
+
+def _load_ntplib() -> bool:
+    """Import ntplib once; returns availability."""
+    global ntplib, NTP_AVAILABLE
+    if NTP_AVAILABLE is None:
+        try:
+            import ntplib as _ntplib
+            ntplib = _ntplib
+            NTP_AVAILABLE = True
+        except ImportError:
+            NTP_AVAILABLE = False
+            system_logger.warning("ntplib not installed. Run: pip install ntplib")
+    return NTP_AVAILABLE
+
 
 class NTPClockMonitor:
     """
@@ -64,55 +83,159 @@ class NTPClockMonitor:
         # CLIENT SPEC: P95/P99 drift metrics
         self.drift_history: List[float] = []
         self.max_history_size = 1000  # Keep last 1000 measurements
+        
+        # Concurrent probing (per-server timeout; servers run in parallel)
+        self.probe_timeout = 2.0
+        self.last_offsets: Dict[str, float] = {}
+        self.last_probe_ms: Optional[float] = None
+        self.last_source: Optional[str] = None
+        
+        # Bybit server-time offset (server - local), reported by BybitClient.sync_time
+        self.exchange_offset_ms: Optional[float] = None
+        self.exchange_rtt_ms: Optional[float] = None
+        self.exchange_synced_at: Optional[float] = None  # monotonic
+        self.exchange_max_age = 300.0  # seconds an exchange sample may stand in for NTP
+        
+        # Last NTP median (seconds) and its uncertainty, kept apart from exchange fallbacks
+        self.ntp_offset: Optional[float] = None
+        self.ntp_error_ms: Optional[float] = None
+        self.ntp_synced_at: Optional[float] = None  # monotonic
+        self.ntp_max_age = 300.0
+        self.ntp_min_error_ms = 5.0  # floor: server agreement says nothing about path asymmetry
+    
+    def _probe(self, ntp_server: str) -> float:
+        """Blocking NTP query for one server (runs in a worker thread)."""
+        client = ntplib.NTPClient()
+        response = client.request(ntp_server, version=3, timeout=self.probe_timeout)
+        return response.offset
+    
+    async def _probe_all(self) -> Dict[str, float]:
+        """Query every server concurrently off the event loop; returns server -> offset."""
+        start = time.monotonic()
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._probe, server) for server in self.ntp_servers),
+            return_exceptions=True
+        )
+        self.last_probe_ms = (time.monotonic() - start) * 1000
+        
+        offsets = {}
+        for server, result in zip(self.ntp_servers, results):
+            if isinstance(result, BaseException):
+                system_logger.debug(f"NTP server {server} failed: {result}")
+            else:
+                offsets[server] = result
+        return offsets
+    
+    def _fresh_exchange_offset(self) -> Optional[float]:
+        """Exchange offset in seconds if a recent sample exists."""
+        if self.exchange_offset_ms is None or self.exchange_synced_at is None:
+            return None
+        if time.monotonic() - self.exchange_synced_at > self.exchange_max_age:
+            return None
+        return self.exchange_offset_ms / 1000
     
     async def check_drift(self) -> Optional[float]:
         """
-        Check current clock drift against NTP server.
+        Check current clock drift against all NTP servers concurrently.
         
         Returns:
-            Drift in seconds (positive = local clock ahead, negative = local clock behind)
-            None if check failed
+            Median offset in seconds across responding servers (true time - local,
+            so positive = local clock behind), or the exchange offset if no server
+            answered. None if check failed
         """
-        if not NTP_AVAILABLE:
+        if not _load_ntplib():
             system_logger.warning("NTP library not available, skipping drift check")
             return None
         
         self.total_checks += 1
         
-        # Try each NTP server until one succeeds
-        for ntp_server in self.ntp_servers:
-            try:
-                client = ntplib.NTPClient()
-                response = client.request(ntp_server, version=3, timeout=5)
-                
-                # Get offset (drift) in seconds
-                drift = response.offset
-                self.last_drift = drift
-                self.last_check = datetime.now(pytz.UTC)
-                self.consecutive_failures = 0
-                
-                # CLIENT SPEC: Track drift history for P95/P99 metrics
-                self.drift_history.append(abs(drift))
-                if len(self.drift_history) > self.max_history_size:
-                    self.drift_history.pop(0)  # Keep only recent history
-                
-                # Log drift
-                system_logger.debug(f"NTP drift check", {
-                    "server": ntp_server,
-                    "drift_ms": drift * 1000,
-                    "drift_seconds": drift
+        offsets = await self._probe_all()
+        if offsets:
+            drift = statistics.median(offsets.values())
+            source = "ntp"
+            # Uncertainty: how far the servers spread around the median
+            spread = statistics.median(abs(offset - drift) for offset in offsets.values())
+            self.ntp_offset = drift
+            self.ntp_error_ms = max(spread * 1000, self.ntp_min_error_ms)
+            self.ntp_synced_at = time.monotonic()
+        else:
+            # No NTP server answered (e.g. UDP 123 filtered): fall back to the exchange clock
+            drift = self._fresh_exchange_offset()
+            source = "exchange"
+        
+        if drift is None:
+            self.consecutive_failures += 1
+            system_logger.warning(f"NTP check failed for all servers (attempt {self.consecutive_failures}/{self.max_consecutive_failures})")
+            return None
+        
+        self.last_offsets = offsets
+        self.last_source = source
+        self.last_drift = drift
+        self.last_check = datetime.now(timezone.utc)
+        self.consecutive_failures = 0
+        
+        # CLIENT SPEC: Track drift history for P95/P99 metrics
+        self.drift_history.append(abs(drift))
+        if len(self.drift_history) > self.max_history_size:
+            self.drift_history.pop(0)  # Keep only recent history
+        
+        system_logger.debug("NTP drift check", {
+            "source": source,
+            "drift_ms": drift * 1000,
+            "servers_responded": len(offsets),
+            "servers_total": len(self.ntp_servers),
+            "probe_ms": self.last_probe_ms,
+            "exchange_offset_ms": self.exchange_offset_ms
+        })
+        
+        return drift
+    
+    def record_exchange_offset(self, offset_ms: float, rtt_ms: Optional[float] = None):
+        """
+        Record the Bybit server-time offset (server - local, ms).
+        
+        Called by BybitClient.sync_time; large disagreement with NTP is logged
+        since it points at exchange-side skew or a bad network path.
+        """
+        self.exchange_offset_ms = offset_ms
+        self.exchange_rtt_ms = rtt_ms
+        self.exchange_synced_at = time.monotonic()
+        
+        if self.ntp_offset is not None:
+            disagreement_ms = offset_ms - self.ntp_offset * 1000
+            if abs(disagreement_ms) > self.drift_block * 1000:
+                system_logger.warning("Exchange and NTP clock offsets disagree", {
+                    "exchange_offset_ms": offset_ms,
+                    "ntp_offset_ms": self.ntp_offset * 1000,
+                    "disagreement_ms": disagreement_ms,
+                    "exchange_rtt_ms": rtt_ms
                 })
-                
-                return drift
-                
-            except Exception as e:
-                system_logger.debug(f"NTP server {ntp_server} failed: {e}")
-                continue
+    
+    def get_offset_ms(self) -> float:
+        """
+        Offset to add to local time for exchange request timestamps (ms).
+        
+        Merges the fresh NTP median and exchange offset, each weighted by the
+        inverse square of its uncertainty (exchange: half the round trip; NTP:
+        server spread, at least ntp_min_error_ms). Without a fresh sample the
+        last exchange, then NTP, offset is used, else 0.
+        """
+        estimates = []
+        exchange = self._fresh_exchange_offset()
+        if exchange is not None:
+            rtt_ms = self.exchange_rtt_ms if self.exchange_rtt_ms is not None else 100.0
+            estimates.append((exchange * 1000, max(rtt_ms / 2, 1.0)))
+        if self.ntp_offset is not None and time.monotonic() - self.ntp_synced_at <= self.ntp_max_age:
+            estimates.append((self.ntp_offset * 1000, self.ntp_error_ms))
         
-        # All servers failed
-        self.consecutive_failures += 1
-        system_logger.warning(f"NTP check failed for all servers (attempt {self.consecutive_failures}/{self.max_consecutive_failures})")
-        return None
+        if estimates:
+            weights = [1.0 / (error_ms * error_ms) for _, error_ms in estimates]
+            return sum(w * offset_ms for w, (offset_ms, _) in zip(weights, estimates)) / sum(weights)
+        if self.exchange_offset_ms is not None:
+            return self.exchange_offset_ms
+        if self.ntp_offset is not None:
+            return self.ntp_offset * 1000
+        return 0.0
     
     async def monitor_loop(self):
         """
@@ -165,7 +288,7 @@ class NTPClockMonitor:
                             "threshold_ms": self.drift_block * 1000,
                             "action": "TRADING_BLOCKED",
                             "local_time": datetime.now().isoformat(),
-                            "ntp_time": (datetime.now() - timedelta(seconds=drift)).isoformat()
+                            "ntp_time": (datetime.now() + timedelta(seconds=drift)).isoformat()
                         })
                         
                         # TODO: Send alert to admin (Telegram, email, etc.)
@@ -229,7 +352,15 @@ class NTPClockMonitor:
             "drift_warnings": self.drift_warnings,
             "drift_blocks": self.drift_blocks,
             "consecutive_failures": self.consecutive_failures,
-            "ntp_servers": self.ntp_servers
+            "ntp_servers": self.ntp_servers,
+            "source": self.last_source,
+            "servers_responded": len(self.last_offsets),
+            "last_probe_ms": self.last_probe_ms,
+            "exchange_offset_ms": self.exchange_offset_ms,
+            "exchange_rtt_ms": self.exchange_rtt_ms,
+            "ntp_offset_ms": self.ntp_offset * 1000 if self.ntp_offset is not None else None,
+            "ntp_error_ms": self.ntp_error_ms,
+            "clock_offset_ms": self.get_offset_ms()
         }
         
         # CLIENT SPEC: Add P95/P99 metrics
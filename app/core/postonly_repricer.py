@@ -0,0 +1,267 @@
+"""
+Order-book aware pricing for PostOnly entries.
+
+A PostOnly limit that would cross the book is refused by the exchange. The
+gate used to find out only after sending: it then fetched ticker and
+instrument info over REST and nudged the price by fixed factors, up to ten
+full round-trips before an order rested. The repricer prices against the
+local top of book instead:
+
+    Buy   min(target, best_ask - tick)     never above the signal price
+    Sell  max(target, best_bid + tick)     never below the signal price
+
+i.e. the signal price when it rests as-is, otherwise the most aggressive
+price that still posts. Best bid/ask come from the public ticker stream when
+fresh, else from a single REST ticker per order (retries reuse it); tick
+size from the symbol registry.
+
+Bybit accepts a crossing PostOnly order and then cancels it on its own, with
+rejectReason EC_PostOnlyWillTakeLiquidity on the private `order` stream. Accepted
+orders are watched for that event (FillWaiterRegistry.on_order hands it to
+on_postonly_cancel) for `reject_window` seconds; a cancelled one is re-quoted
+(one extra tick of room per attempt) and re-sent. An order refused outright
+is re-sent the same way. Each re-send gets its own orderLinkId
+(<orderLinkId>-<attempt>) and the entry's fill waiter is moved to it.
+
+Reject rate and time-to-rest (first send -> accepted and not cancelled) are
+tracked.
+"""
+
+import asyncio
+import time
+from collections import deque
+from decimal import Decimal, ROUND_CEILING, ROUND_FLOOR
+from typing import Any, Dict, Optional, Set, Tuple
+
+from app.core.idempotency import ORDER_LINK_ID_MAX
+from app.core.logging import system_logger
+
+# Bybit messages for a PostOnly order that would take liquidity
+_POSTONLY_MARKERS = ("postonly", "post only", "take liquidity")
+
+# rejectReason of an accepted PostOnly order the exchange cancelled for crossing
+POSTONLY_CANCEL_REASON = "EC_PostOnlyWillTakeLiquidity"
+
+
+def is_postonly_reject(error: Exception) -> bool:
+    """True if an order error means the price would have crossed the book."""
+    message = str(getattr(error, "ret_msg", error)).lower()
+    return any(marker in message for marker in _POSTONLY_MARKERS)
+
+
+def retry_link_id(link_id: str, attempt: int) -> str:
+    """orderLinkId of re-send `attempt` (a cancelled order's id cannot be reused)."""
+    if attempt == 0:
+        return link_id
+    retry_id = f"{link_id}-{attempt}"
+    assert len(retry_id) <= ORDER_LINK_ID_MAX, retry_id
+    return retry_id
+
+
+def posting_price(side: str, target: Decimal, bid: Decimal, ask: Decimal,
+                  tick: Decimal, extra_ticks: int = 0) -> Decimal:
+    """Most aggressive price at or better than `target` that does not cross the book."""
+    margin = tick * (1 + extra_ticks)
+    if side == "Buy":
+        price = min(target, ask - margin)
+        rounding = ROUND_FLOOR
+    else:
+        price = max(target, bid + margin)
+        rounding = ROUND_CEILING
+    return (price / tick).to_integral_value(rounding=rounding) * tick
+
+
+class PostOnlyRepricer:
+    """Places and re-prices PostOnly limits against the local top of book."""
+
+    def __init__(self, max_book_age: float = 2.0, max_attempts: int = 5, history: int = 500,
+                 reject_window: float = 10.0):
+        self.max_book_age = max_book_age
+        self.max_attempts = max_attempts
+        self.reject_window = reject_window
+        # orderLinkId -> placement of accepted orders the exchange may still cancel
+        self._watching: Dict[str, Dict[str, Any]] = {}
+        self._resend_tasks: Set[asyncio.Task] = set()
+
+        # Statistics
+        self.orders = 0
+        self.attempts = 0
+        self.rejects = 0
+        self.failures = 0
+        self.book_from_stream = 0
+        self.book_from_rest = 0
+        self._time_to_rest_ms = deque(maxlen=history)
+
+    async def top_of_book(self, client, symbol: str, rest: bool = True) -> Optional[Tuple[Decimal, Decimal]]:
+        """Best bid/ask: streamed if fresh, else (if `rest`) one REST ticker."""
+        from app.bybit.market_stream import get_market_stream
+        book = get_market_stream().get_top_of_book(symbol, self.max_book_age)
+        if book is not None:
+            self.book_from_stream += 1
+            return book
+        if not rest:
+            return None
+        try:
+            response = await client.get_ticker(symbol)
+            tickers = (response or {}).get("result", {}).get("list") or []
+            if tickers and tickers[0].get("bid1Price") and tickers[0].get("ask1Price"):
+                self.book_from_rest += 1
+                return Decimal(tickers[0]["bid1Price"]), Decimal(tickers[0]["ask1Price"])
+        except Exception as e:
+            system_logger.warning(f"Top of book unavailable for {symbol}: {e}")
+        return None
+
+    async def _quote(self, client, symbol: str, side: str, target: Decimal, tick: Optional[Decimal],
+                     extra_ticks: int, last_book: Optional[Tuple[Decimal, Decimal]]):
+        """(price, book) for one attempt; retries reuse the REST book plus extra ticks."""
+        if not tick:
+            return target, None
+        book = await self.top_of_book(client, symbol, rest=extra_ticks == 0) or last_book
+        if book is None:
+            return target, None
+        price = posting_price(side, target, book[0], book[1], tick, extra_ticks)
+        if price != target:
+            system_logger.info(f"PostOnly price for {symbol} {side}: {target} -> {price}", {
+                "symbol": symbol,
+                "bid": str(book[0]),
+                "ask": str(book[1]),
+                "extra_ticks": extra_ticks
+            })
+        return price, book
+
+    async def place(self, client, order_body: Dict[str, Any], tick_size: Optional[Decimal]) -> Dict[str, Any]:
+        """
+        Place a PostOnly limit priced to rest on the first try.
+
+        `order_body["price"]` is the target (signal) price and
+        `order_body["orderLinkId"]` the id of the first attempt. Re-quotes and
+        re-sends on PostOnly rejection; other errors propagate.
+        """
+        self._prune()
+        self.orders += 1
+        placement = {
+            "client": client,
+            "body": order_body,
+            "target": Decimal(str(order_body["price"])),
+            "tick": tick_size,
+            "book": None,
+            "link_id": order_body["orderLinkId"],
+            "attempt": 0,
+            "started": time.monotonic()
+        }
+        result = await self._send(placement, 0)
+        if result is None:
+            return {"retCode": -1, "retMsg": f"PostOnly order rejected after {self.max_attempts} attempts"}
+        return result
+
+    async def _send(self, placement: Dict[str, Any], attempt: int) -> Optional[Dict[str, Any]]:
+        """Send attempts from `attempt` on until one is accepted; None if all are refused."""
+        body = placement["body"]
+        symbol, side = body["symbol"], body["side"]
+        while attempt < self.max_attempts:
+            price, placement["book"] = await self._quote(
+                placement["client"], symbol, side, placement["target"], placement["tick"], attempt, placement["book"]
+            )
+            link_id = retry_link_id(body["orderLinkId"], attempt)
+            if link_id != placement["link_id"]:
+                from app.core.fill_waiters import get_fill_registry
+                get_fill_registry().relink(placement["link_id"], link_id)
+                placement["link_id"] = link_id
+            self.attempts += 1
+            try:
+                result = await placement["client"].place_order({**body, "price": str(price), "orderLinkId": link_id})
+            except Exception as e:
+                if not is_postonly_reject(e):
+                    raise
+                self.rejects += 1
+                system_logger.warning(f"PostOnly rejected for {symbol} @ {price} (attempt {attempt + 1}/{self.max_attempts})")
+                attempt += 1
+                continue
+            placement["attempt"] = attempt
+            placement["accepted_at"] = time.monotonic()
+            self._watching[link_id] = placement
+            system_logger.info(f"PostOnly order accepted: {symbol} {side} @ {price}", {
+                "symbol": symbol,
+                "target": str(placement["target"]),
+                "order_link_id": link_id,
+                "attempts": attempt + 1
+            })
+            return result
+
+        self.failures += 1
+        return None
+
+    def on_postonly_cancel(self, order: Dict[str, Any]) -> bool:
+        """
+        An accepted order was cancelled for crossing the book.
+
+        True if it is being re-sent (under a new orderLinkId), False if it is
+        not one of ours or is out of attempts.
+        """
+        self._prune()
+        placement = self._watching.pop(order.get("orderLinkId") or "", None)
+        if placement is None:
+            return False
+        self.rejects += 1
+        attempt = placement["attempt"] + 1
+        system_logger.warning(f"PostOnly cancelled for {order.get('symbol')} @ {order.get('price')} "
+                              f"(attempt {attempt}/{self.max_attempts})")
+        if attempt >= self.max_attempts:
+            self.failures += 1
+            return False
+        task = asyncio.get_running_loop().create_task(self._resend(placement, attempt))
+        self._resend_tasks.add(task)
+        task.add_done_callback(self._resend_tasks.discard)
+        return True
+
+    async def _resend(self, placement: Dict[str, Any], attempt: int):
+        try:
+            result = await self._send(placement, attempt)
+        except Exception as e:
+            system_logger.error(f"PostOnly re-send failed for {placement['body']['symbol']}: {e}")
+            result = None
+        if result is None:
+            # Nothing rests for this entry any more: its fill waiter counts it as dead
+            from app.core.fill_waiters import get_fill_registry
+            get_fill_registry().on_order({
+                "symbol": placement["body"]["symbol"],
+                "orderLinkId": placement["link_id"],
+                "orderStatus": "Rejected",
+                "cumExecQty": "0"
+            })
+
+    def _prune(self):
+        """Orders not cancelled within the reject window have rested."""
+        now = time.monotonic()
+        for link_id, placement in list(self._watching.items()):
+            if now - placement["accepted_at"] > self.reject_window:
+                del self._watching[link_id]
+                self._time_to_rest_ms.append((placement["accepted_at"] - placement["started"]) * 1000)
+
+    def get_stats(self) -> Dict[str, Any]:
+        self._prune()
+        samples = sorted(self._time_to_rest_ms)
+        return {
+            "orders": self.orders,
+            "attempts": self.attempts,
+            "rejects": self.rejects,
+            "reject_rate": round(self.rejects / self.attempts, 4) if self.attempts else 0.0,
+            "watching": len(self._watching),
+            "failures": self.failures,
+            "book_from_stream": self.book_from_stream,
+            "book_from_rest": self.book_from_rest,
+            "time_to_rest_avg_ms": round(sum(samples) / len(samples), 1) if samples else 0.0,
+            "time_to_rest_p95_ms": round(samples[int(0.95 * (len(samples) - 1))], 1) if samples else 0.0
+        }
+
+
+# Global repricer instance
+_postonly_repricer: Optional[PostOnlyRepricer] = None
+
+
+def get_postonly_repricer() -> PostOnlyRepricer:
+    """Get global PostOnly repricer."""
+    global _postonly_repricer
+    if _postonly_repricer is None:
+        _postonly_repricer = PostOnlyRepricer()
+    return _postonly_repricer
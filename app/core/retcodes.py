@@ -8,7 +8,7 @@ MAP = {
     10003: "❌ Invalid signature",
     10004: "❌ Invalid request",
     10005: "❌ Invalid permission",
-    10006: "❌ IP address not in whitelist",
+    10006: "❌ Too many visits (rate limit exceeded)",
     10007: "❌ Invalid request ID",
     10008: "❌ Invalid category",
     10009: "❌ Invalid symbol",
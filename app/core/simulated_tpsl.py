@@ -4,9 +4,13 @@ Simulated TP/SL Manager
 
 Implements custom TP/SL logic when Bybit's native set_trading_stop API
 is not available (e.g., in Demo/Futurus environment).
+
+Levels are checked event-driven on streamed ticker updates via
+app.core.tpsl_trigger_engine (see SimulatedTPSLManager).
 """
 
 import asyncio
+import time
 from decimal import Decimal
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass
@@ -14,6 +18,9 @@ from datetime import datetime, timedelta
 from app.core.logging import system_logger
 from app.bybit.client import get_bybit_client
 from app.core.environment_detector import get_environment_detector
+from app.core.idempotency import short_order_link_id
+from app.core.tpsl_trigger_engine import TPSLTriggerEngine, PriceTrigger, compile_tpsl_triggers
+from app.bybit.market_stream import start_market_stream
 
 @dataclass
 class TPLevel:
@@ -44,27 +51,46 @@ class SimulatedTPSLOrder:
     callback: Optional[Callable] = None
 
 class SimulatedTPSLManager:
-    """Manages simulated TP/SL orders when native API is unavailable."""
+    """
+    Manages simulated TP/SL orders when native API is unavailable.
+    
+    TP/SL levels are compiled to absolute prices in a TPSLTriggerEngine and
+    checked on every streamed ticker update, so a level fires as soon as the
+    tick that crosses it arrives. REST ticker polling is only used as a
+    fallback while the public market stream is not connected.
+    """
     
-    def __init__(self):
+    def __init__(self, client=None):
         self.active_orders: Dict[str, SimulatedTPSLOrder] = {}
         self.price_monitor_task: Optional[asyncio.Task] = None
-        self._client = None
+        self.trigger_engine = TPSLTriggerEngine()
+        self.trigger_engine.set_fire_handler(self._on_trigger)
+        self._client = client  # None = main account singleton (resolved in start)
+        self._stream = None
         self._running = False
-        self._monitor_interval = 2.0  # Check prices every 2 seconds
+        self._monitor_interval = 2.0  # Fallback REST polling interval (stream unavailable)
     
     async def start(self):
         """Start the simulated TP/SL monitoring."""
         if self._running:
             return
         
-        self._client = get_bybit_client()
+        if self._client is None:
+            self._client = get_bybit_client()
         self._running = True
         
-        # Start price monitoring task
+        # Attached even if the stream is down now: it keeps reconnecting
+        stream = await start_market_stream()
+        self._stream = stream
+        stream.add_listener(self.trigger_engine.on_price)
+        for symbol in {order.symbol for order in self.active_orders.values()}:
+            await stream.subscribe_ticker(symbol)
+        # Fallback: poll tickers over REST (whenever the stream is down) and
+        # feed the same trigger engine
         self.price_monitor_task = asyncio.create_task(self._monitor_prices())
         
         system_logger.info("Simulated TP/SL manager started", {
+            'mode': 'stream' if stream.is_connected else 'rest_polling',
             'monitor_interval': self._monitor_interval
         })
     
@@ -72,6 +98,10 @@ class SimulatedTPSLManager:
         """Stop the simulated TP/SL monitoring."""
         self._running = False
         
+        if self._stream:
+            self._stream.remove_listener(self.trigger_engine.on_price)
+            self._stream = None
+        
         if self.price_monitor_task:
             self.price_monitor_task.cancel()
             try:
@@ -79,7 +109,9 @@ class SimulatedTPSLManager:
             except asyncio.CancelledError:
                 pass
         
-        system_logger.info("Simulated TP/SL manager stopped")
+        system_logger.info("Simulated TP/SL manager stopped", {
+            'trigger_latency': self.trigger_engine.get_latency_stats()
+        })
     
     async def add_tpsl_order(
         self,
@@ -105,7 +137,7 @@ class SimulatedTPSLManager:
                 ))
             
             # Create SL level
-            sl_level = SLLevel(percentage=sl_percentage)
+            sl_level = SLLevel(percentage=sl_percentage) if sl_percentage is not None else None
             
             order = SimulatedTPSLOrder(
                 symbol=symbol,
@@ -119,15 +151,27 @@ class SimulatedTPSLManager:
                 callback=callback
             )
             
+            # Replace any previous order for this trade
+            if trade_id in self.active_orders:
+                await self.remove_tpsl_order(trade_id)
+            
             self.active_orders[trade_id] = order
             
+            # Compile percentages to absolute trigger prices once
+            triggers = compile_tpsl_triggers(trade_id, symbol, side, entry_price, tp_levels, sl_percentage)
+            self.trigger_engine.add_triggers(triggers)
+            
+            if self._stream:
+                await self._stream.subscribe_ticker(symbol)
+            
             system_logger.info(f"Added simulated TP/SL order: {trade_id}", {
                 'symbol': symbol,
                 'side': side,
                 'position_size': str(position_size),
                 'entry_price': str(entry_price),
                 'tp_levels': [str(tp.percentage) for tp in tp_objects],
-                'sl_percentage': str(sl_percentage)
+                'sl_percentage': str(sl_percentage),
+                'trigger_prices': {f"{t.kind}{t.index}": str(t.price) for t in triggers}
             })
             
             return True
@@ -138,25 +182,41 @@ class SimulatedTPSLManager:
     
     async def remove_tpsl_order(self, trade_id: str) -> bool:
         """Remove a simulated TP/SL order."""
-        if trade_id in self.active_orders:
-            del self.active_orders[trade_id]
-            system_logger.info(f"Removed simulated TP/SL order: {trade_id}")
-            return True
-        return False
+        order = self.active_orders.pop(trade_id, None)
+        if order is None:
+            return False
+        
+        self.trigger_engine.remove_trade(order.symbol, trade_id)
+        if self._stream:
+            await self._stream.unsubscribe_ticker(order.symbol)
+        system_logger.info(f"Removed simulated TP/SL order: {trade_id}")
+        return True
+    
+    async def _on_trigger(self, trigger: PriceTrigger, current_price: Decimal, received_at: float):
+        """Fire handler: execute the crossed level and record trigger-to-order latency."""
+        order = self.active_orders.get(trigger.trade_id)
+        if order is None:
+            return
+        
+        if trigger.kind == 'sl':
+            if not order.sl_level or order.sl_level.triggered:
+                return
+            success = await self._execute_sl_level(order, current_price)
+        else:
+            tp_level = order.tp_levels[trigger.index]
+            if tp_level.triggered:
+                return
+            success = await self._execute_tp_level(order, tp_level, current_price)
+        
+        self.trigger_engine.record_trigger_latency(trigger, received_at, success)
     
     async def _monitor_prices(self):
-        """Monitor prices for all active TP/SL orders."""
+        """Fallback: poll tickers for armed symbols and feed the trigger engine."""
         while self._running:
             try:
-                if not self.active_orders:
-                    await asyncio.sleep(self._monitor_interval)
-                    continue
-                
-                # Get current prices for all active symbols
-                symbols = list(set(order.symbol for order in self.active_orders.values()))
-                
-                for symbol in symbols:
-                    await self._check_symbol_prices(symbol)
+                symbols = self.trigger_engine.armed_symbols()
+                if symbols and not (self._stream and self._stream.is_connected):
+                    await asyncio.gather(*(self._check_symbol_prices(symbol) for symbol in symbols))
                 
                 await asyncio.sleep(self._monitor_interval)
                 
@@ -167,9 +227,9 @@ class SimulatedTPSLManager:
                 await asyncio.sleep(self._monitor_interval)
     
     async def _check_symbol_prices(self, symbol: str):
-        """Check prices for a specific symbol."""
+        """Fetch a symbol's last price over REST and feed it to the trigger engine."""
         try:
-            # Get current market price
+            received_at = time.monotonic()
             ticker_result = await self._client.get_ticker(symbol)
             if not ticker_result or 'result' not in ticker_result:
                 return
@@ -181,44 +241,27 @@ class SimulatedTPSLManager:
                 system_logger.error(f"No list data in ticker result for {symbol}")
                 return
             
-            # Check all orders for this symbol
-            symbol_orders = [order for order in self.active_orders.values() 
-                           if order.symbol == symbol]
-            
-            for order in symbol_orders:
-                await self._check_order_triggers(order, current_price)
+            self.trigger_engine.on_price(symbol, current_price, received_at)
                 
         except Exception as e:
             system_logger.error(f"Failed to check prices for {symbol}: {e}")
     
-    async def _check_order_triggers(self, order: SimulatedTPSLOrder, current_price: Decimal):
-        """Check if TP/SL levels are triggered for an order."""
-        try:
-            entry_price = order.entry_price
-            side = order.side
-            
-            # Calculate price changes
-            if side == 'Buy':
-                # For long positions: profit when price goes up, loss when down
-                price_change_pct = ((current_price - entry_price) / entry_price) * 100
-            else:
-                # For short positions: profit when price goes down, loss when up
-                price_change_pct = ((entry_price - current_price) / entry_price) * 100
-            
-            # Check TP levels
-            for tp_level in order.tp_levels:
-                if not tp_level.triggered and price_change_pct >= tp_level.percentage:
-                    await self._execute_tp_level(order, tp_level, current_price)
-            
-            # Check SL level
-            if (order.sl_level and not order.sl_level.triggered and 
-                price_change_pct <= -order.sl_level.percentage):
-                await self._execute_sl_level(order, current_price)
-                
-        except Exception as e:
-            system_logger.error(f"Failed to check triggers for {order.trade_id}: {e}")
+    async def _place_close_order(self, order: SimulatedTPSLOrder, qty: Decimal, link_id: str) -> Dict:
+        """Place a reduce-only market order closing (part of) the position."""
+        close_side = 'Sell' if order.side == 'Buy' else 'Buy'
+        return await self._client.place_order({
+            'category': 'linear',
+            'symbol': order.symbol,
+            'side': close_side,
+            'orderType': 'Market',
+            'qty': str(qty),
+            'timeInForce': 'IOC',
+            'reduceOnly': True,
+            'positionIdx': 0,
+            'orderLinkId': link_id
+        })
     
-    async def _execute_tp_level(self, order: SimulatedTPSLOrder, tp_level: TPLevel, current_price: Decimal):
+    async def _execute_tp_level(self, order: SimulatedTPSLOrder, tp_level: TPLevel, current_price: Decimal) -> bool:
         """Execute a take profit level."""
         try:
             tp_level.triggered = True
@@ -226,20 +269,9 @@ class SimulatedTPSLManager:
             # Calculate quantity to close
             close_quantity = order.position_size * tp_level.quantity_pct
             
-            # Determine close side (opposite of entry)
-            close_side = 'Sell' if order.side == 'Buy' else 'Buy'
-            
             # Create market close order
-            close_result = await self._client.create_order(
-                category='linear',
-                symbol=order.symbol,
-                side=close_side,
-                order_type='Market',
-                qty=str(close_quantity),
-                time_in_force='IOC',
-                reduce_only=True,
-                position_idx=0,
-                order_link_id=f"sim_tp_{order.trade_id}_{tp_level.percentage}"
+            close_result = await self._place_close_order(
+                order, close_quantity, short_order_link_id("sim_tp", f"{order.trade_id}_{tp_level.percentage}")
             )
             
             if close_result and close_result.get('retCode') == 0:
@@ -264,31 +296,23 @@ class SimulatedTPSLManager:
                     except Exception as e:
                         system_logger.error(f"TP callback error: {e}")
                 
-            else:
-                system_logger.error(f"Failed to execute TP order: {close_result}")
+                return True
+            
+            system_logger.error(f"Failed to execute TP order: {close_result}")
+            return False
                 
         except Exception as e:
             system_logger.error(f"Failed to execute TP level: {e}", exc_info=True)
+            return False
     
-    async def _execute_sl_level(self, order: SimulatedTPSLOrder, current_price: Decimal):
+    async def _execute_sl_level(self, order: SimulatedTPSLOrder, current_price: Decimal) -> bool:
         """Execute a stop loss level."""
         try:
             order.sl_level.triggered = True
             
-            # Determine close side (opposite of entry)
-            close_side = 'Sell' if order.side == 'Buy' else 'Buy'
-            
             # Create market close order for entire position
-            close_result = await self._client.create_order(
-                category='linear',
-                symbol=order.symbol,
-                side=close_side,
-                order_type='Market',
-                qty=str(order.position_size),
-                time_in_force='IOC',
-                reduce_only=True,
-                position_idx=0,
-                order_link_id=f"sim_sl_{order.trade_id}"
+            close_result = await self._place_close_order(
+                order, order.position_size, short_order_link_id("sim_sl", order.trade_id)
             )
             
             if close_result and close_result.get('retCode') == 0:
@@ -315,12 +339,14 @@ class SimulatedTPSLManager:
                 
                 # Remove order since SL closes entire position
                 await self.remove_tpsl_order(order.trade_id)
-                
-            else:
-                system_logger.error(f"Failed to execute SL order: {close_result}")
+                return True
+            
+            system_logger.error(f"Failed to execute SL order: {close_result}")
+            return False
                 
         except Exception as e:
             system_logger.error(f"Failed to execute SL level: {e}", exc_info=True)
+            return False
     
     def get_active_orders(self) -> Dict[str, SimulatedTPSLOrder]:
         """Get all active simulated TP/SL orders."""
@@ -363,10 +389,17 @@ class SimulatedTPSLManager:
 
 # Global instance
 _simulated_tpsl_manager = None
+# Managers of additional accounts, bound to that account's client (by account name)
+_account_simulated_managers: Dict[str, SimulatedTPSLManager] = {}
 
-def get_simulated_tpsl_manager() -> SimulatedTPSLManager:
-    """Get global simulated TP/SL manager instance."""
+def get_simulated_tpsl_manager(client=None) -> SimulatedTPSLManager:
+    """Get the simulated TP/SL manager of `client`'s account (default: main account)."""
     global _simulated_tpsl_manager
+    if client is not None and client.account_name is not None:
+        manager = _account_simulated_managers.get(client.account_name)
+        if manager is None:
+            manager = _account_simulated_managers[client.account_name] = SimulatedTPSLManager(client)
+        return manager
     if _simulated_tpsl_manager is None:
         _simulated_tpsl_manager = SimulatedTPSLManager()
     return _simulated_tpsl_manager
@@ -377,6 +410,8 @@ async def start_simulated_tpsl():
     await manager.start()
 
 async def stop_simulated_tpsl():
-    """Stop the simulated TP/SL manager."""
+    """Stop the simulated TP/SL managers (main and additional accounts)."""
     manager = get_simulated_tpsl_manager()
     await manager.stop()
+    for manager in _account_simulated_managers.values():
+        await manager.stop()
@@ -0,0 +1,202 @@
+"""
+Startup profiling: per-module import cost and per-component init time.
+
+Enabled with COPYBOT_PROFILE_STARTUP=1 (or `python start.py --profile-startup`).
+When disabled every hook is a no-op, so the profiler can stay wired into
+app.main permanently.
+
+This module must stay dependency-free (stdlib only, no app imports at module
+level) because it is imported before anything else in app.main so that the
+import hook sees the heavy third-party imports.
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, Any, List, Optional, Iterator
+
+STARTUP_PROFILE_ENV = "COPYBOT_PROFILE_STARTUP"
+
+
+def is_startup_profiling_enabled() -> bool:
+    """Check whether startup profiling was requested via environment."""
+    return os.getenv(STARTUP_PROFILE_ENV, "").lower() in {"1", "true", "yes"}
+
+
+class _TimedLoader:
+    """
+    Loader proxy that times exec_module() of the wrapped loader.
+
+    The proxy only lives for the import it was created for: exec_module()
+    hands the module its real loader back before running it, and once the
+    hook is removed it just delegates.
+    """
+
+    def __init__(self, loader, finder: "_ImportTimingFinder"):
+        self._loader = loader
+        self._finder = finder
+
+    def __getattr__(self, name: str):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None and module.__spec__.loader is self:
+            module.__spec__.loader = self._loader
+        if not self._finder.active:
+            self._loader.exec_module(module)
+            return
+        self._finder.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._finder.exit(module.__name__)
+
+
+class _ImportTimingFinder(MetaPathFinder):
+    """
+    Meta path finder that wraps every found loader with a timer.
+
+    Tracks an explicit stack so nested imports are subtracted from the
+    parent's self time (same semantics as `python -X importtime`).
+    """
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+        self._stack: List[List[Any]] = []  # [name, start, child_time]
+        self._resolving = False
+        self.active = True
+
+    def find_spec(self, fullname, path, target=None):
+        if self._resolving or not self.active:
+            return None
+        self._resolving = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._resolving = False
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self, name: str) -> None:
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self, name: str) -> None:
+        entry_name, start, child_time = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][2] += cumulative
+        self._profiler.record_import(entry_name, cumulative - child_time, cumulative)
+
+
+class StartupProfiler:
+    """Collects import and component timings during bot startup."""
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = time.perf_counter()
+        self.imports: Dict[str, Dict[str, float]] = {}
+        self.components: Dict[str, float] = {}
+        self._finder: Optional[_ImportTimingFinder] = None
+
+    def install_import_hook(self) -> None:
+        """Start timing every subsequent module import."""
+        if not self.enabled or self._finder is not None:
+            return
+        self._finder = _ImportTimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def remove_import_hook(self) -> None:
+        """Stop timing imports (modules already imported keep their timings)."""
+        if self._finder is not None:
+            # Loaders handed out but not executed yet stop timing too
+            self._finder.active = False
+            if self._finder in sys.meta_path:
+                sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def record_import(self, module: str, self_seconds: float, cumulative_seconds: float) -> None:
+        """Record the import cost of a single module."""
+        self.imports[module] = {
+            "self_ms": self_seconds * 1000,
+            "cumulative_ms": cumulative_seconds * 1000
+        }
+
+    def record_component(self, name: str, seconds: float) -> None:
+        """Record the initialization time of a startup component."""
+        self.components[name] = self.components.get(name, 0.0) + seconds * 1000
+
+    @contextmanager
+    def component(self, name: str) -> Iterator[None]:
+        """
+        Time a startup component.
+
+        Usage:
+            with profiler.component("symbol_registry"):
+                await registry.update_symbols(force=True)
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_component(name, time.perf_counter() - start)
+
+    def get_report(self, top_n: int = 25) -> Dict[str, Any]:
+        """Build the startup report (slowest imports by self time, all components)."""
+        slowest = sorted(self.imports.items(), key=lambda item: item[1]["self_ms"], reverse=True)
+        top_packages: Dict[str, float] = {}
+        for module, timing in self.imports.items():
+            package = module.split(".", 1)[0]
+            top_packages[package] = top_packages.get(package, 0.0) + timing["self_ms"]
+
+        return {
+            "total_startup_ms": (time.perf_counter() - self.started_at) * 1000,
+            "modules_imported": len(self.imports),
+            "total_import_ms": sum(t["self_ms"] for t in self.imports.values()),
+            "slowest_imports": [
+                {"module": module, **timing} for module, timing in slowest[:top_n]
+            ],
+            "import_ms_by_package": dict(
+                sorted(top_packages.items(), key=lambda item: item[1], reverse=True)[:top_n]
+            ),
+            "components_ms": dict(
+                sorted(self.components.items(), key=lambda item: item[1], reverse=True)
+            )
+        }
+
+    def log_report(self, top_n: int = 25) -> None:
+        """Log the startup report and stop the import hook."""
+        if not self.enabled:
+            return
+        self.remove_import_hook()
+        from app.core.logging import system_logger
+        system_logger.info("Startup profile", self.get_report(top_n))
+
+
+# Global profiler instance
+_startup_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """Get the global startup profiler (enabled from environment on first use)."""
+    global _startup_profiler
+    if _startup_profiler is None:
+        _startup_profiler = StartupProfiler(enabled=is_startup_profiling_enabled())
+    return _startup_profiler
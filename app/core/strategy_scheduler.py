@@ -0,0 +1,423 @@
+"""
+Central strategy scheduler for RUNNING trades.
+
+Replaces the per-trade 1s polling loop (position fetch + pyramid/trailing/hedge
+checks, each with its own REST call) with one event-driven pass per symbol:
+
+- Every price update (public ticker stream, or one shared REST ticker poll
+  when the stream is unavailable) and every private position update is
+  evaluated against all RUNNING trades on that symbol with cheap, I/O-free
+  strategy predicates.
+- Only actions that actually fire are queued to a bounded worker pool.
+  Pending actions are coalesced per (trade, action) so a burst of ticks runs
+  the action once with the latest price, and actions of one trade never run
+  concurrently.
+
+CPU and API cost therefore scale with market events, not trades x seconds.
+Once the symbol's instrument info is loaded, each update is converted to
+integer ticks once (app.core.ticks) and first checked against the symbol's
+quiet band: the nearest trigger above and below over all its trades, in
+ticks. An update inside the band fires nothing and costs two int compares
+whatever the number of trades; only updates that reach a trigger are
+evaluated per trade (int compares too). The band is rebuilt after trades
+register/unregister and after every action (strategy triggers only move
+when an action runs). Without instrument info the strategies compare
+Decimals per trade as before.
+The trade FSM keeps owning its state; it only sleeps between slow position
+reconciles and is woken by the scheduler when something needs its attention.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple, Any
+
+from app.core.logging import system_logger
+
+ACTION_HEDGE = "hedge"
+ACTION_PYRAMID = "pyramid"
+ACTION_TRAILING = "trailing"
+
+
+class StrategyScheduler:
+    """Evaluates strategy conditions per symbol and dispatches fired actions."""
+
+    def __init__(self, max_workers: int = 4, poll_interval: float = 1.0, reconcile_interval: float = 5.0):
+        self.max_workers = max_workers
+        self.poll_interval = poll_interval  # REST ticker poll when no stream
+        self.reconcile_interval = reconcile_interval  # FSM position reconcile
+
+        # symbol -> trade_id -> TradeFSM
+        self._trades: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        # symbol -> (scale, above, below): no trade fires while floor < above and ceil > below
+        self._bands: Dict[str, Tuple[Any, Any, Any]] = {}
+
+        # (trade_id, action) -> (price, received_at); queue carries the keys
+        self._pending: Dict[Tuple[str, str], Tuple[Decimal, float]] = {}
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+
+        self._stream = None
+        self._position_ws = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._client = None
+        self._running = False
+
+        self.events_processed = 0
+        self.actions_dispatched = 0
+        self.actions_coalesced = 0
+        self.quiet_updates = 0
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    @property
+    def is_streaming(self) -> bool:
+        """Whether prices arrive from the ticker stream (vs REST polling)."""
+        return self._stream is not None and self._stream.is_connected
+
+    def get_reconcile_interval(self) -> float:
+        """How long a RUNNING FSM may sleep between position reconciles."""
+        if self._position_ws is not None:
+            # Position closes are pushed by the private stream; REST is only a safety net
+            return max(self.reconcile_interval, 30.0)
+        return self.reconcile_interval
+
+    # ------------------------------------------------------------------ #
+    # Registration
+    # ------------------------------------------------------------------ #
+
+    async def register(self, fsm) -> bool:
+        """Start evaluating strategies for a RUNNING trade (idempotent)."""
+        symbol = fsm.signal_data['symbol']
+        trades = self._trades.setdefault(symbol, {})
+        if fsm.trade_id in trades:
+            return False
+
+        trades[fsm.trade_id] = fsm
+        self._locks[fsm.trade_id] = asyncio.Lock()
+        self._bands.pop(symbol, None)
+
+        if len(trades) == 1:
+            if self._stream:
+                await self._stream.subscribe_ticker(symbol)
+            if self._position_ws:
+                try:
+                    await self._position_ws.subscribe_position(symbol, self.on_position)
+                except Exception as e:
+                    system_logger.warning(f"Position stream subscribe failed for {symbol}: {e}")
+
+        system_logger.debug("Trade registered with strategy scheduler", {
+            'trade_id': fsm.trade_id,
+            'symbol': symbol,
+            'trades_on_symbol': len(trades)
+        })
+        return True
+
+    async def unregister(self, fsm) -> bool:
+        """Stop evaluating strategies for a trade."""
+        symbol = fsm.signal_data['symbol']
+        trades = self._trades.get(symbol)
+        if not trades or trades.pop(fsm.trade_id, None) is None:
+            return False
+
+        self._locks.pop(fsm.trade_id, None)
+        self._bands.pop(symbol, None)
+        for key in [key for key in self._pending if key[0] == fsm.trade_id]:
+            del self._pending[key]
+
+        if not trades:
+            del self._trades[symbol]
+            if self._stream:
+                await self._stream.unsubscribe_ticker(symbol)
+        return True
+
+    def trade_count(self, symbol: Optional[str] = None) -> int:
+        """Number of registered trades (for one symbol or all)."""
+        if symbol is not None:
+            return len(self._trades.get(symbol, {}))
+        return sum(len(trades) for trades in self._trades.values())
+
+    # ------------------------------------------------------------------ #
+    # Event intake (synchronous, no I/O)
+    # ------------------------------------------------------------------ #
+
+    def on_price(self, symbol: str, price: Decimal, received_at: Optional[float] = None) -> List[Tuple[str, str]]:
+        """
+        Evaluate every trade on `symbol` against a price update.
+
+        Returns the (trade_id, action) pairs that fired. Safe to call from the
+        market stream's receive loop.
+        """
+        trades = self._trades.get(symbol)
+        if not trades or price <= 0:
+            return []
+
+        self.events_processed += 1
+        if received_at is None:
+            received_at = time.monotonic()
+
+        from app.core.ticks import get_tick_scale
+        scale = get_tick_scale(symbol)
+        at = None
+        if scale is not None:
+            at = scale.at(price)
+            band = self._bands.get(symbol)
+            if band is None or band[0] is not scale:
+                band = self._bands[symbol] = self._build_band(scale, trades)
+            if at.floor < band[1] and at.ceil > band[2]:
+                self.quiet_updates += 1
+                return []
+
+        fired = []
+        for trade_id, fsm in trades.items():
+            for action in self._evaluate(fsm, price, at):
+                self._enqueue(trade_id, action, price, received_at)
+                fired.append((trade_id, action))
+        return fired
+
+    async def on_position(self, position: Dict[str, Any]):
+        """Private stream position update: wake closed trades, evaluate mark price."""
+        symbol = position.get("symbol")
+        trades = self._trades.get(symbol)
+        if not trades:
+            return
+
+        if Decimal(str(position.get("size") or "0")) == 0:
+            # Let each FSM reconcile (and close) right away instead of at its next poll
+            for fsm in list(trades.values()):
+                fsm.wake()
+            return
+
+        mark_price = position.get("markPrice")
+        if mark_price:
+            self.on_price(symbol, Decimal(str(mark_price)))
+
+    def _evaluate(self, fsm, price: Decimal, at=None) -> List[str]:
+        """Run the cheap strategy predicates for one trade (hedge first, as before)."""
+        actions = []
+        hedge = fsm.hedge_strategy
+        if hedge is not None and hedge.should_activate(price, fsm.original_entry, at):
+            actions.append(ACTION_HEDGE)
+        pyramid = fsm.pyramid_strategy
+        if pyramid is not None and pyramid.should_activate(price, at):
+            actions.append(ACTION_PYRAMID)
+        trailing = fsm.trailing_strategy
+        if trailing is not None and trailing.needs_update(price, fsm.original_entry, at):
+            actions.append(ACTION_TRAILING)
+        return actions
+
+    def _build_band(self, scale, trades: Dict[str, Any]) -> Tuple[Any, Any, Any]:
+        """Nearest trigger ticks above/below over all trades of a symbol."""
+        above, below = float("inf"), float("-inf")
+        for fsm in trades.values():
+            bands = []
+            if fsm.hedge_strategy is not None:
+                bands.append(fsm.hedge_strategy.tick_band(scale, fsm.original_entry))
+            if fsm.pyramid_strategy is not None:
+                bands.append(fsm.pyramid_strategy.tick_band(scale))
+            if fsm.trailing_strategy is not None:
+                bands.append(fsm.trailing_strategy.tick_band(scale, fsm.original_entry))
+            for trigger_above, trigger_below in bands:
+                if trigger_above is not None and trigger_above < above:
+                    above = trigger_above
+                if trigger_below is not None and trigger_below > below:
+                    below = trigger_below
+        return scale, above, below
+
+    def _enqueue(self, trade_id: str, action: str, price: Decimal, received_at: float):
+        key = (trade_id, action)
+        if key in self._pending:
+            # Already queued: run it once with the newest price
+            self._pending[key] = (price, self._pending[key][1])
+            self.actions_coalesced += 1
+            return
+        self._pending[key] = (price, received_at)
+        self._queue.put_nowait(key)
+
+    # ------------------------------------------------------------------ #
+    # Worker pool
+    # ------------------------------------------------------------------ #
+
+    async def _worker(self):
+        while True:
+            key = await self._queue.get()
+            try:
+                await self._run_action(key)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                system_logger.error(f"Strategy action error for {key[0]} ({key[1]}): {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run_action(self, key: Tuple[str, str]):
+        trade_id, action = key
+        lock = self._locks.get(trade_id)
+        if lock is None:
+            self._pending.pop(key, None)
+            return
+
+        async with lock:
+            entry = self._pending.pop(key, None)
+            fsm = self._find_trade(trade_id)
+            if entry is None or fsm is None:
+                return
+            price, received_at = entry
+
+            start = time.monotonic()
+            success = True
+            try:
+                await fsm.on_strategy_action(action, price)
+            except Exception:
+                success = False
+                raise
+            finally:
+                # The action may have moved this trade's triggers
+                self._bands.pop(fsm.signal_data['symbol'], None)
+                self.actions_dispatched += 1
+                from app.core.performance_monitor import get_performance_monitor
+                get_performance_monitor().record_request(f"strategy_{action}", time.monotonic() - start, success)
+                system_logger.debug("Strategy action executed", {
+                    'trade_id': trade_id,
+                    'action': action,
+                    'price': str(price),
+                    'queue_delay_ms': (start - received_at) * 1000,
+                    'success': success
+                })
+
+    def _find_trade(self, trade_id: str):
+        for trades in self._trades.values():
+            fsm = trades.get(trade_id)
+            if fsm is not None:
+                return fsm
+        return None
+
+    async def drain(self):
+        """Wait until every queued action has run (used on shutdown/tests)."""
+        await self._queue.join()
+
+    # ------------------------------------------------------------------ #
+    # Price feeds
+    # ------------------------------------------------------------------ #
+
+    async def _poll_prices(self):
+        """Fallback while the stream is down: one shared ticker poll per symbol."""
+        while self._running:
+            try:
+                symbols = list(self._trades.keys())
+                if symbols and not (self._stream and self._stream.is_connected):
+                    await asyncio.gather(*(self._poll_symbol(symbol) for symbol in symbols))
+                await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                system_logger.error(f"Strategy price polling error: {e}", exc_info=True)
+                await asyncio.sleep(self.poll_interval)
+
+    async def _poll_symbol(self, symbol: str):
+        try:
+            result = await self._client.get_ticker(symbol)
+            if result.get('retCode') != 0:
+                return
+            tickers = result.get('result', {}).get('list', [])
+            if tickers:
+                self.on_price(symbol, Decimal(str(tickers[0].get('lastPrice', '0'))))
+        except Exception as e:
+            system_logger.warning(f"Ticker poll failed for {symbol}: {e}")
+
+    async def start(self):
+        """Start workers and attach price/position feeds."""
+        if self._running:
+            return
+        self._running = True
+
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+        from app.bybit.market_stream import start_market_stream
+        # Attached even if the stream is down now: it keeps reconnecting
+        stream = await start_market_stream()
+        self._stream = stream
+        stream.add_listener(self.on_price)
+        for symbol in self._trades:
+            await stream.subscribe_ticker(symbol)
+        from app.bybit.client import get_bybit_client
+        self._client = get_bybit_client()
+        self._poll_task = asyncio.create_task(self._poll_prices())
+
+        try:
+            from app.bybit.websocket import get_websocket
+            ws = await get_websocket()
+            if ws.ws is not None:
+                self._position_ws = ws
+                for symbol in self._trades:
+                    await ws.subscribe_position(symbol, self.on_position)
+        except Exception as e:
+            system_logger.info(f"Strategy scheduler running without position stream: {e}")
+
+        system_logger.info("Strategy scheduler started", {
+            'workers': self.max_workers,
+            'price_feed': 'stream' if self.is_streaming else 'rest_polling',
+            'position_feed': 'stream' if self._position_ws else 'reconcile',
+            'reconcile_interval': self.get_reconcile_interval()
+        })
+
+    async def stop(self):
+        """Stop workers and detach feeds."""
+        self._running = False
+
+        if self._stream:
+            self._stream.remove_listener(self.on_price)
+            self._stream = None
+        self._position_ws = None
+
+        tasks = list(self._workers)
+        if self._poll_task:
+            tasks.append(self._poll_task)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._poll_task = None
+
+        system_logger.info("Strategy scheduler stopped", self.get_stats())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler counters."""
+        return {
+            'symbols': len(self._trades),
+            'trades': self.trade_count(),
+            'events_processed': self.events_processed,
+            'actions_dispatched': self.actions_dispatched,
+            'actions_coalesced': self.actions_coalesced,
+            'quiet_updates': self.quiet_updates,
+            'queued': self._queue.qsize()
+        }
+
+
+# Global scheduler instance
+_strategy_scheduler: Optional[StrategyScheduler] = None
+
+
+def get_strategy_scheduler() -> StrategyScheduler:
+    """Get the global strategy scheduler instance."""
+    global _strategy_scheduler
+    if _strategy_scheduler is None:
+        _strategy_scheduler = StrategyScheduler()
+    return _strategy_scheduler
+
+
+async def start_strategy_scheduler():
+    """Start the global strategy scheduler."""
+    await get_strategy_scheduler().start()
+
+
+async def stop_strategy_scheduler():
+    """Stop the global strategy scheduler."""
+    global _strategy_scheduler
+    if _strategy_scheduler:
+        await _strategy_scheduler.stop()
+        _strategy_scheduler = None
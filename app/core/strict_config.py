@@ -6,9 +6,6 @@ import os
 from zoneinfo import ZoneInfo
 from app.core.logging import system_logger
 
-# CRITICAL FIX: Load .env BEFORE reading environment variables
-from dotenv import load_dotenv
-load_dotenv()  # Ensure .env is loaded before os.getenv() calls
 
 class StrictSettings:
     """Strict configuration matching client requirements exactly."""
@@ -30,6 +27,8 @@ class StrictSettings:
     breakeven_offset: Decimal = Decimal("0.0015")  # 0.0015% offset for BE
     trailing_trigger: Decimal = Decimal("6.1")     # 6.1% trigger for trailing (CLIENT SPEC)
     trailing_distance: Decimal = Decimal("2.5")    # 2.5% trailing distance (CLIENT SPEC)
+    trailing_min_step: Decimal = Decimal("0.1")    # Move the live SL only by >=0.1% (and >=1 tick)
+    trailing_min_interval: float = 1.0             # Seconds between SL moves on the exchange
     hedge_trigger: Decimal = Decimal("-2.0")       # -2% trigger for hedge
     max_reentries: int = 3                         # Maximum re-entry attempts
     
@@ -80,6 +79,14 @@ class StrictSettings:
     bybit_recv_window: str = "30000"
     bybit_api_key: str = ""
     
+    # Additional accounts that copy every signal (BYBIT_ACCOUNTS, see load_strict_config)
+    bybit_accounts: List[Dict[str, Any]] = []
+    multi_account_concurrency: int = 8      # Accounts placing orders at the same time
+    
+    # Event-loop watchdog (app/core/loop_monitor.py)
+    loop_lag_interval: float = 0.05         # Seconds between lag probes
+    loop_lag_threshold_ms: float = 100.0    # Lag that counts as a stall (stack is sampled)
+    
     # Position limits
     max_position_size_usdt: Decimal = Decimal("1000")  # Maximum position size in USDT
     bybit_api_secret: str = ""
@@ -178,6 +185,11 @@ class StrictSettings:
 def load_strict_config() -> StrictSettings:
     """Load configuration with validation."""
     try:
+        # CRITICAL FIX: Load .env BEFORE reading environment variables
+        # (done here, on first STRICT_CONFIG access, rather than at import)
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         # Create settings instance
         config = StrictSettings()
         
@@ -190,6 +202,26 @@ def load_strict_config() -> StrictSettings:
         config.bybit_endpoint = os.getenv("BYBIT_ENDPOINT", "https://api-demo.bybit.com")
         config.bybit_recv_window = os.getenv("BYBIT_RECV_WINDOW", "30000")
         
+        # Additional accounts: name:api_key:api_secret[:im_target],...
+        config.bybit_accounts = []
+        for spec in os.getenv("BYBIT_ACCOUNTS", "").split(','):
+            parts = [p.strip() for p in spec.split(':')]
+            if len(parts) < 3 or not all(parts[:3]):
+                continue
+            config.bybit_accounts.append({
+                "name": parts[0],
+                "api_key": parts[1],
+                "api_secret": parts[2],
+                "im_target": Decimal(parts[3]) if len(parts) > 3 and parts[3] else config.im_target
+            })
+        if config.bybit_accounts:
+            system_logger.info(
+                f"Loaded {len(config.bybit_accounts)} additional Bybit accounts",
+                {"accounts": [a["name"] for a in config.bybit_accounts]}
+            )
+        config.multi_account_concurrency = int(os.getenv("MULTI_ACCOUNT_CONCURRENCY", "8"))
+        config.loop_lag_threshold_ms = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+        
         # Load channel ID to name mapping from environment
         channel_mapping_str = os.getenv("CHANNEL_ID_NAME_MAP", "")
         if channel_mapping_str:
@@ -315,8 +347,14 @@ def load_strict_config() -> StrictSettings:
     except Exception as e:
         raise ValueError(f"Configuration validation failed: {e}")
 
-# Global settings instance
-STRICT_CONFIG = load_strict_config()
+def __getattr__(name: str):
+    # Global settings instance, loaded (with .env) on first access rather than at import;
+    # cached as a module global so `from ... import STRICT_CONFIG` and patch.object keep working
+    global STRICT_CONFIG
+    if name == "STRICT_CONFIG":
+        STRICT_CONFIG = load_strict_config()
+        return STRICT_CONFIG
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def reload_strict_config():
     """Reload strict configuration (useful for development)."""
@@ -1,13 +1,14 @@
 """Strict FSM for trade lifecycle management."""
 
 import asyncio
+import time
 from enum import Enum
 from typing import Dict, Any, Optional, Callable
 from decimal import Decimal, ROUND_DOWN
-from datetime import datetime
 from app.core.logging import system_logger, trade_logger
 from app.core.strict_config import STRICT_CONFIG
 from app.core.confirmation_gate import get_confirmation_gate
+from app.core.trade_book import RecordField, get_trade_book, TRAILING_ACTIVE, HEDGE_TRIGGERED, POSITION_LOGGED
 from app.strategies.pyramid_v2 import PyramidStrategyV2
 from app.strategies.trailing_v2 import TrailingStopStrategyV2
 from app.strategies.hedge_v2 import HedgeStrategyV2
@@ -31,24 +32,44 @@ class TradeState(Enum):
 class TradeFSM:
     """Strict FSM for trade lifecycle management."""
     
+    max_errors = 3
+    
+    # Numeric trade state lives in a slotted TradeRecord (see app.core.trade_book)
+    position_size = RecordField("size", "qty")
+    entry_price = RecordField("entry", "price")
+    original_entry = RecordField("original_entry", "price")  # Store original entry for pyramid calculations
+    current_pnl = RecordField("pnl", "pnl")
+    pyramid_level = RecordField("pyramid_level", "int")
+    hedge_count = RecordField("hedge_count", "int")
+    reentry_count = RecordField("reentry_count", "int")
+    error_count = RecordField("error_count", "int")
+    trailing_active = RecordField("flags", TRAILING_ACTIVE)
+    _hedge_triggered = RecordField("flags", HEDGE_TRIGGERED)
+    _position_logged = RecordField("flags", POSITION_LOGGED)
+    _position_check_count = RecordField("position_checks", "int")
+    
+    # State -> handler method name (resolved per call, not bound per instance)
+    _STATE_HANDLERS = {
+        TradeState.INIT: "_handle_init",
+        TradeState.LEVERAGE_SET: "_handle_leverage_set",
+        TradeState.ENTRY_PLACED: "_handle_entry_placed",
+        TradeState.ENTRY_FILLED: "_handle_entry_filled",
+        TradeState.TP_SL_PLACED: "_handle_tp_sl_placed",
+        TradeState.RUNNING: "_handle_running",
+        TradeState.TP_HIT: "_handle_tp_hit",
+        TradeState.SL_HIT: "_handle_sl_hit",
+        TradeState.HEDGE_ACTIVE: "_handle_hedge_active",
+        TradeState.REENTRY_ATTEMPT: "_handle_reentry_attempt",
+        TradeState.CLOSED: "_handle_closed",
+        TradeState.ERROR: "_handle_error"
+    }
+    
     def __init__(self, signal_data: Dict[str, Any]):
         # Validate signal data
         self._validate_signal_data(signal_data)
         self.signal_data = signal_data
         self.state = TradeState.INIT
-        self.trade_id = f"{signal_data['symbol']}_{int(datetime.now().timestamp())}"
-        self.entry_orders = []
-        self.exit_orders = []
-        self.position_size = Decimal("0")
-        self.entry_price = Decimal("0")
-        self.original_entry = Decimal("0")  # Store original entry for pyramid calculations
-        self.current_pnl = Decimal("0")
-        self.pyramid_level = 0
-        self.trailing_active = False
-        self.hedge_count = 0
-        self.reentry_count = 0
-        self.error_count = 0
-        self.max_errors = 3
+        self.record = get_trade_book().open(f"{signal_data['symbol']}_{int(time.time())}", signal_data['symbol'])
         
         # Initialize strategies
         self.pyramid_strategy = None
@@ -56,21 +77,43 @@ class TradeFSM:
         self.hedge_strategy = None
         self.reentry_strategy = None
         
-        # State transition handlers
-        self._handlers = {
-            TradeState.INIT: self._handle_init,
-            TradeState.LEVERAGE_SET: self._handle_leverage_set,
-            TradeState.ENTRY_PLACED: self._handle_entry_placed,
-            TradeState.ENTRY_FILLED: self._handle_entry_filled,
-            TradeState.TP_SL_PLACED: self._handle_tp_sl_placed,
-            TradeState.RUNNING: self._handle_running,
-            TradeState.TP_HIT: self._handle_tp_hit,
-            TradeState.SL_HIT: self._handle_sl_hit,
-            TradeState.HEDGE_ACTIVE: self._handle_hedge_active,
-            TradeState.REENTRY_ATTEMPT: self._handle_reentry_attempt,
-            TradeState.CLOSED: self._handle_closed,
-            TradeState.ERROR: self._handle_error
-        }
+        # RUNNING state is driven by the central strategy scheduler; the FSM
+        # sleeps on this event between position reconciles
+        self._wakeup = asyncio.Event()
+        
+        # ENTRY_FILLED sleeps on this until a WS fill (or REST sweep) resolves it
+        self._fill_waiter = None
+    
+    @property
+    def trade_id(self) -> str:
+        return self.record.trade_id
+    
+    @trade_id.setter
+    def trade_id(self, value: str):
+        get_trade_book().rename(self.record, value)
+    
+    @classmethod
+    def restore(cls, trade_id: str, signal_data: Dict[str, Any], state: TradeState,
+                entry_price: Decimal, position_size: Decimal, entry_link_ids=()) -> 'TradeFSM':
+        """
+        Rebuild the FSM of a trade that was open before a restart.
+        
+        `state` is where run() picks up: RUNNING/TP_SL_PLACED for a live
+        position, ENTRY_FILLED for entries still resting (waiting on
+        `entry_link_ids`).
+        """
+        fsm = cls(signal_data)
+        fsm.trade_id = trade_id
+        fsm.entry_price = entry_price
+        fsm.original_entry = entry_price
+        fsm.position_size = position_size
+        if state == TradeState.ENTRY_FILLED:
+            from app.core.fill_waiters import get_fill_registry
+            fsm._fill_waiter = get_fill_registry().expect(signal_data['symbol'], entry_link_ids)
+        else:
+            fsm._initialize_strategies()
+        fsm.state = state
+        return fsm
     
     def _validate_signal_data(self, signal_data: Dict[str, Any]) -> None:
         """Validate signal data before processing."""
@@ -120,7 +163,8 @@ class TradeFSM:
             })
             
             while self.state not in [TradeState.CLOSED, TradeState.ERROR]:
-                handler = self._handlers.get(self.state)
+                handler_name = self._STATE_HANDLERS.get(self.state)
+                handler = getattr(self, handler_name) if handler_name else None
                 if not handler:
                     system_logger.error(f"No handler for state {self.state}")
                     await self._transition_to(TradeState.ERROR)
@@ -156,6 +200,20 @@ class TradeFSM:
             'trade_id': self.trade_id,
             'symbol': self.signal_data['symbol']
         })
+        
+        if new_state in (TradeState.CLOSED, TradeState.ERROR):
+            get_trade_book().close(self.record)
+            from app.core.fill_waiters import get_fill_registry
+            get_fill_registry().discard(self._fill_waiter)
+            self._fill_waiter = None
+            from app.core.strategy_scheduler import get_strategy_scheduler
+            await get_strategy_scheduler().unregister(self)
+            if self.trailing_strategy is not None:
+                self.trailing_strategy.stop()
+            from app.trade.multi_account import get_account_pool
+            pool = get_account_pool()
+            if pool is not None:
+                pool.discard(self.trade_id)
     
     async def _handle_init(self) -> bool:
         """Handle INIT state - validate signal and prepare."""
@@ -243,7 +301,17 @@ class TradeFSM:
             tps = self.signal_data.get('tps', [])
             sl = self.signal_data.get('sl')
             
-            success = await gate.place_entry_orders(
+            # Register the fill waiter before placing, so an immediate fill is not missed
+            from app.core.fill_waiters import entry_link_id, entry_link_prefix, get_fill_registry
+            link_prefix = entry_link_prefix(self.trade_id)
+            registry = get_fill_registry()
+            registry.discard(self._fill_waiter)
+            self._fill_waiter = registry.expect(
+                self.signal_data['symbol'],
+                [entry_link_id(self.trade_id, i) for i in range(len(processed_entries))]
+            )
+            
+            entry = gate.place_entry_orders(
                 self.signal_data['symbol'],
                 self.signal_data['direction'],
                 processed_entries,
@@ -251,11 +319,31 @@ class TradeFSM:
                 Decimal(str(self.signal_data['leverage'])),
                 self.signal_data['channel_name'],
                 tps=tps,
-                sl=sl
+                sl=sl,
+                order_link_prefix=link_prefix
             )
             
+            # Copy to additional accounts at the same time (never affects this trade's outcome)
+            from app.trade.multi_account import get_account_pool
+            pool = get_account_pool()
+            if pool is not None:
+                success, _ = await asyncio.gather(entry, pool.place_entry_orders(
+                    self.trade_id,
+                    self.signal_data['symbol'],
+                    self.signal_data['direction'],
+                    processed_entries,
+                    Decimal(str(self.signal_data['leverage'])),
+                    self.signal_data['channel_name'],
+                    tps=tps,
+                    sl=sl
+                ))
+            else:
+                success = await entry
+            
             if success:
                 await self._transition_to(TradeState.ENTRY_FILLED)
+                # Persist the pending trade so a restart can resume waiting on its entries
+                await self._save_trade_to_database()
             else:
                 await self._transition_to(TradeState.ERROR)
             
@@ -274,17 +362,40 @@ class TradeFSM:
             return False
     
     async def _handle_entry_filled(self) -> bool:
-        """Handle ENTRY_FILLED state - monitor for fills."""
+        """
+        Handle ENTRY_FILLED state - wait for the entry fill.
+        
+        The trade sleeps on its fill waiter (resolved by the private WS
+        execution/order stream, with a per-symbol REST sweep as safety net)
+        instead of polling the position; PostOnly entries may rest for days.
+        """
         try:
-            # Initialize timeout counter if not exists
-            if not hasattr(self, '_fill_check_count'):
-                self._fill_check_count = 0
-                # PostOnly orders may take longer to fill (waiting for exact price)
-                self._max_fill_checks = 300  # 5 minutes timeout for PostOnly orders
+            from app.core.fill_waiters import get_fill_registry, CANCELLED
+            registry = get_fill_registry()
+            if self._fill_waiter is None:
+                # No entry link ids known (e.g. resumed trade): rely on the sweep
+                self._fill_waiter = registry.expect(self.signal_data['symbol'], [])
+            
+            outcome = await self._fill_waiter.wait()
+            if outcome["status"] == CANCELLED:
+                system_logger.warning(f"Entry orders for {self.signal_data['symbol']} cancelled before filling", {
+                    'trade_id': self.trade_id,
+                    'source': outcome["source"]
+                })
+                await self._transition_to(TradeState.ERROR)
+                return False
+            
+            # The fill event can arrive just before the position endpoint reflects it
+            position = None
+            for _ in range(10):
+                position = await self._get_position()
+                if position and float(position.get('size', 0)) > 0:
+                    break
+                await asyncio.sleep(0.5)
             
-            # Check for position
-            position = await self._get_position()
             if position and float(position.get('size', 0)) > 0:
+                registry.discard(self._fill_waiter)
+                self._fill_waiter = None
                 self.entry_price = Decimal(str(position.get('avgPrice', 0)))
                 self.original_entry = self.entry_price  # Store for pyramid calculations
                 
@@ -300,22 +411,13 @@ class TradeFSM:
                 system_logger.info(f"Position filled for {self.signal_data['symbol']}: {position.get('size')} contracts at {self.entry_price}")
                 await self._transition_to(TradeState.TP_SL_PLACED)
                 return True
-            else:
-                # Increment check counter
-                self._fill_check_count += 1
-                
-                # Check if timeout reached
-                if self._fill_check_count >= self._max_fill_checks:
-                    system_logger.warning(f"Entry fill timeout for {self.signal_data['symbol']} after {self._max_fill_checks} seconds")
-                    await self._transition_to(TradeState.ERROR)
-                    return False
-                
-                # Wait for fill (only log every 10 checks to reduce spam)
-                if self._fill_check_count % 10 == 0:
-                    system_logger.debug(f"Waiting for fill for {self.signal_data['symbol']} (check {self._fill_check_count}/{self._max_fill_checks})")
-                
-                await asyncio.sleep(1)
-                return True
+            
+            # Fill reported but no position yet: wait again (the sweep will catch it)
+            system_logger.warning(f"Fill reported for {self.signal_data['symbol']} but no position yet, waiting again")
+            orders = self._fill_waiter.orders
+            registry.discard(self._fill_waiter)
+            self._fill_waiter = registry.expect(self.signal_data['symbol'], orders)
+            return True
                 
         except Exception as e:
             system_logger.error(f"Entry filled handler error: {e}", exc_info=True)
@@ -351,7 +453,7 @@ class TradeFSM:
                 sl_decimal = "DEFAULT_SL"  # Use default SL if none specified
             
             # Place TP/SL orders through confirmation gate
-            success = await gate.place_exit_orders(
+            exits = gate.place_exit_orders(
                 self.signal_data['symbol'],
                 self.signal_data['direction'],
                 self.position_size,
@@ -361,6 +463,21 @@ class TradeFSM:
                 entry_price=self.entry_price  # Pass actual entry price from position
             )
             
+            from app.trade.multi_account import get_account_pool
+            pool = get_account_pool()
+            if pool is not None:
+                success, _ = await asyncio.gather(exits, pool.place_exit_orders(
+                    self.trade_id,
+                    self.signal_data['symbol'],
+                    self.signal_data['direction'],
+                    tp_decimals,
+                    sl_decimal,
+                    self.signal_data['channel_name'],
+                    entry_price=self.entry_price
+                ))
+            else:
+                success = await exits
+            
             if success:
                 system_logger.info(f"TP/SL orders placed successfully for {self.signal_data['symbol']}")
                 await self._transition_to(TradeState.RUNNING)
@@ -376,8 +493,20 @@ class TradeFSM:
             return False
     
     async def _handle_running(self) -> bool:
-        """Handle RUNNING state - monitor position and manage strategies."""
+        """
+        Handle RUNNING state - reconcile position and wait for strategy events.
+        
+        Pyramid/trailing/hedge conditions are evaluated by the central strategy
+        scheduler on every price/position update for all trades on the symbol;
+        this handler only reconciles the position and sleeps until woken.
+        """
         try:
+            from app.core.strategy_scheduler import get_strategy_scheduler
+            scheduler = get_strategy_scheduler()
+            if not scheduler.is_running:
+                await scheduler.start()
+            await scheduler.register(self)
+            
             # Check position status
             position = await self._get_position()
             if not position or float(position.get('size', 0)) == 0:
@@ -407,32 +536,19 @@ class TradeFSM:
             except Exception as e:
                 system_logger.warning(f"SL hit check failed for {self.signal_data['symbol']}: {e}")
             
-            # Check for hedge trigger (only if hedge strategy is active)
-            try:
-                if self.hedge_strategy:
-                    if await self._check_hedge_trigger():
-                        system_logger.info(f"Hedge trigger detected for {self.signal_data['symbol']}")
-                        await self._transition_to(TradeState.HEDGE_ACTIVE)
-                        return True
-            except Exception as e:
-                system_logger.warning(f"Hedge trigger check failed for {self.signal_data['symbol']}: {e}")
-            
-            # Check for pyramid levels (only if pyramid strategy is active)
-            try:
-                if self.pyramid_strategy:
-                    await self._check_pyramid_levels()
-            except Exception as e:
-                system_logger.warning(f"Pyramid levels check failed for {self.signal_data['symbol']}: {e}")
+            # Hedge activated by the scheduler
+            if self._hedge_triggered:
+                self._hedge_triggered = False
+                system_logger.info(f"Hedge trigger detected for {self.signal_data['symbol']}")
+                await self._transition_to(TradeState.HEDGE_ACTIVE)
+                return True
             
-            # Check for trailing stop (only if trailing strategy is active)
-            try:
-                if self.trailing_strategy:
-                    await self._check_trailing_stop()
-            except Exception as e:
-                system_logger.warning(f"Trailing stop check failed for {self.signal_data['symbol']}: {e}")
+            # The reconcile fetch doubles as a strategy event for this symbol
+            mark_price = Decimal(str(position.get('markPrice', 0)))
+            if mark_price > 0:
+                scheduler.on_price(self.signal_data['symbol'], mark_price)
             
-            # Brief pause before next check
-            await asyncio.sleep(1)
+            await self._wait_for_wakeup(scheduler.get_reconcile_interval())
             return True
             
         except Exception as e:
@@ -441,6 +557,45 @@ class TradeFSM:
             await asyncio.sleep(1)
             return True
     
+    def wake(self):
+        """Wake the RUNNING handler before its next reconcile."""
+        self._wakeup.set()
+    
+    async def _wait_for_wakeup(self, timeout: float):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+    
+    async def on_strategy_action(self, action: str, current_price: Decimal):
+        """
+        Run a strategy action fired by the strategy scheduler.
+        
+        Called from the scheduler's worker pool, never concurrently for the
+        same trade.
+        """
+        if self.state != TradeState.RUNNING:
+            return
+        
+        if action == "hedge" and self.hedge_strategy:
+            if await self.hedge_strategy.check_and_activate(current_price, self.original_entry):
+                system_logger.info(f"Hedge strategy activated for {self.signal_data['symbol']}")
+                self._hedge_triggered = True
+                self.wake()
+        
+        elif action == "pyramid" and self.pyramid_strategy:
+            activated = await self.pyramid_strategy.check_and_activate(current_price)
+            if activated:
+                self.pyramid_level += 1
+                system_logger.info(f"Pyramid level {self.pyramid_level} activated for {self.signal_data['symbol']}")
+        
+        elif action == "trailing" and self.trailing_strategy:
+            updated = await self.trailing_strategy.check_and_update(current_price, self.original_entry)
+            if updated and not self.trailing_active:
+                self.trailing_active = True
+                system_logger.info(f"Trailing stop activated for {self.signal_data['symbol']}")
+    
     async def _handle_tp_hit(self) -> bool:
         """Handle TP_HIT state - manage TP hits."""
         try:
@@ -576,26 +731,29 @@ class TradeFSM:
             from app.core.symbol_registry import get_symbol_registry
             from app.core.position_calculator import PositionCalculator
             from app.bybit.client import get_bybit_client
+            from app.core.account_state import get_account_state
             
-            # Get account balance
+            # Get account balance (live wallet cache, REST when the private stream is not live)
             client = get_bybit_client()
-            balance_data = await client.wallet_balance("USDT")
-            if not balance_data:
-                system_logger.error("Failed to get account balance - no response")
-                return Decimal("0")
-            
-            # Check if the response has the expected structure
-            if 'result' in balance_data and 'list' in balance_data['result'] and balance_data['result']['list']:
-                # Extract balance from the list format
-                account_info = balance_data['result']['list'][0]
-                balance = Decimal(str(account_info.get('totalWalletBalance', '0')))
-            elif 'totalWalletBalance' in balance_data:
-                balance = Decimal(str(balance_data['totalWalletBalance']))
-            else:
-                system_logger.error(f"Unexpected balance data format: {balance_data}")
-                # Use default balance for testing
-                balance = Decimal("1000.0")
-                system_logger.warning(f"Using default balance: {balance}")
+            balance = get_account_state().get_wallet_balance()
+            if balance is None:
+                balance_data = await client.wallet_balance("USDT")
+                if not balance_data:
+                    system_logger.error("Failed to get account balance - no response")
+                    return Decimal("0")
+                
+                # Check if the response has the expected structure
+                if 'result' in balance_data and 'list' in balance_data['result'] and balance_data['result']['list']:
+                    # Extract balance from the list format
+                    account_info = balance_data['result']['list'][0]
+                    balance = Decimal(str(account_info.get('totalWalletBalance', '0')))
+                elif 'totalWalletBalance' in balance_data:
+                    balance = Decimal(str(balance_data['totalWalletBalance']))
+                else:
+                    system_logger.error(f"Unexpected balance data format: {balance_data}")
+                    # Use default balance for testing
+                    balance = Decimal("1000.0")
+                    system_logger.warning(f"Using default balance: {balance}")
             
             if balance <= 0:
                 system_logger.error(f"Invalid balance: {balance}, using default")
@@ -718,10 +876,6 @@ class TradeFSM:
             from app.bybit.client import get_bybit_client
             client = get_bybit_client()
             
-            # Initialize position check counter if not exists
-            if not hasattr(self, '_position_check_count'):
-                self._position_check_count = 0
-            
             # Get position from Bybit
             result = await client.get_position(
                 category="linear",
@@ -736,9 +890,9 @@ class TradeFSM:
                     if size > 0:  # Only return if we have a position
                         # Only log positions that we're actively managing (not existing positions)
                         # Check if we have a trade_id or are in an active state
-                        if hasattr(self, 'trade_id') and self.trade_id:
+                        if self.trade_id:
                             # Only log once per position to avoid spam
-                            if not hasattr(self, '_position_logged') or not self._position_logged:
+                            if not self._position_logged:
                                 system_logger.info(f"Position found for {self.signal_data['symbol']}: {size} contracts")
                                 self._position_logged = True
                         return position
@@ -769,35 +923,6 @@ class TradeFSM:
         """Check if SL was hit."""
         return False  # Placeholder
     
-    async def _check_hedge_trigger(self) -> bool:
-        """Check if hedge should be triggered."""
-        if not self.hedge_strategy:
-            return False
-            
-        # If hedge is already activated, don't check again
-        if self.hedge_strategy.activated:
-            return False
-            
-        try:
-            # Get current price from position
-            position = await self._get_position()
-            if not position:
-                # No position found - transition to CLOSED state to stop hedge checks
-                system_logger.warning(f"No position found for {self.signal_data['symbol']} - transitioning to CLOSED")
-                await self._transition_to(TradeState.CLOSED)
-                return False
-                
-            current_price = Decimal(str(position.get('markPrice', 0)))
-            if current_price > 0:
-                activated = await self.hedge_strategy.check_and_activate(current_price, self.original_entry)
-                if activated:
-                    system_logger.info(f"Hedge strategy activated for {self.signal_data['symbol']}")
-                    return True
-        except Exception as e:
-            system_logger.error(f"Hedge trigger check error: {e}", exc_info=True)
-        
-        return False
-    
     def _initialize_strategies(self):
         """Initialize all trading strategies."""
         try:
@@ -842,44 +967,6 @@ class TradeFSM:
         except Exception as e:
             system_logger.error(f"Strategy initialization error: {e}", exc_info=True)
 
-    async def _check_pyramid_levels(self):
-        """Check and handle pyramid levels."""
-        if not self.pyramid_strategy:
-            return
-            
-        try:
-            # Get current price from position
-            position = await self._get_position()
-            if position:
-                current_price = Decimal(str(position.get('markPrice', 0)))
-                if current_price > 0:
-                    activated = await self.pyramid_strategy.check_and_activate(current_price)
-                    if activated:
-                        self.pyramid_level += 1
-                        system_logger.info(f"Pyramid level {self.pyramid_level} activated for {self.signal_data['symbol']}")
-        except Exception as e:
-            system_logger.error(f"Pyramid check error: {e}", exc_info=True)
-            # Don't let pyramid errors crash the trade
-            # Continue with normal trade flow
-    
-    async def _check_trailing_stop(self):
-        """Check and handle trailing stop."""
-        if not self.trailing_strategy:
-            return
-            
-        try:
-            # Get current price from position
-            position = await self._get_position()
-            if position:
-                current_price = Decimal(str(position.get('markPrice', 0)))
-                if current_price > 0:
-                    updated = await self.trailing_strategy.check_and_update(current_price, self.original_entry)
-                    if updated and not self.trailing_active:
-                        self.trailing_active = True
-                        system_logger.info(f"Trailing stop activated for {self.signal_data['symbol']}")
-        except Exception as e:
-            system_logger.error(f"Trailing stop check error: {e}", exc_info=True)
-    
     async def _move_to_breakeven(self):
         """Move SL to breakeven after TP2."""
         pass  # Placeholder
@@ -929,7 +1016,9 @@ class TradeFSM:
                 direction=self.signal_data['direction'],
                 entry_price=float(self.entry_price or 0),  # Use 0 if entry_price not set yet
                 size=float(self.position_size),
-                state=self.state.value
+                state=self.state.value,
+                leverage=float(self.signal_data['leverage']),
+                channel_name=self.signal_data['channel_name']
             )
             
             system_logger.info(f"Trade {self.trade_id} saved to database", {
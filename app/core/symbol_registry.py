@@ -4,6 +4,7 @@ import asyncio
 from decimal import Decimal
 from typing import Dict, Any, Optional, List
 from app.core.decimal_config import to_decimal, quantize_price, quantize_qty
+from app.core.ticks import tick_scale
 from app.core.strict_config import STRICT_CONFIG
 from app.core.logging import system_logger
 from app.bybit.client import BybitClient
@@ -13,6 +14,7 @@ class SymbolInfo:
     
     def __init__(self, symbol: str, data: Dict[str, Any]):
         self.symbol = symbol
+        self.data = data  # raw instrument (shared with trade shards as a snapshot)
         
         # Extract lot size filter (quantity constraints)
         lot_size_filter = data.get('lotSizeFilter', {})
@@ -25,6 +27,9 @@ class SymbolInfo:
         price_filter = data.get('priceFilter', {})
         self.tick_size = to_decimal(price_filter.get('tickSize', '0.01'))
         
+        # Integer tick/step arithmetic (None for degenerate filters)
+        self.ticks = tick_scale(self.tick_size, self.step_size) if self.tick_size > 0 and self.step_size > 0 else None
+        
         # Extract leverage filter
         leverage_filter = data.get('leverageFilter', {})
         self.max_leverage = to_decimal(leverage_filter.get('maxLeverage', '50'))
@@ -41,12 +46,17 @@ class SymbolInfo:
             self.qty_precision = 0
     
     def quantize_price(self, price: Decimal) -> Decimal:
-        """Quantize price to tick size."""
-        return quantize_price(price, self.tick_size)
+        """Round price down to a multiple of the tick size."""
+        if self.ticks is None:
+            return quantize_price(price, self.tick_size)
+        floor, ceil = self.ticks.bracket(price)
+        return self.ticks.price(floor if price >= 0 else ceil)
     
     def quantize_qty(self, qty: Decimal) -> Decimal:
-        """Quantize quantity to step size."""
-        return quantize_qty(qty, self.step_size)
+        """Round quantity down (floor) to a multiple of the step size."""
+        if self.ticks is None:
+            return quantize_qty(qty, self.step_size)
+        return self.ticks.qty(self.ticks.qty_steps(qty))
     
     def format_qty(self, qty: Decimal) -> str:
         """Format quantity as string with correct precision for Bybit API."""
@@ -80,6 +90,7 @@ class SymbolRegistry:
         self._last_update = 0
         self._update_interval = 300  # 5 minutes
         self._bybit_client = None
+        self._snapshot_mode = False  # trade shards: instruments pushed by ingress, never fetched
     
     def _get_bybit_client(self) -> BybitClient:
         """Get singleton Bybit client."""
@@ -123,6 +134,8 @@ class SymbolRegistry:
         import time
         now = time.time()
         
+        if self._snapshot_mode:
+            return
         if not force and now - self._last_update < self._update_interval:
             return
         
@@ -136,11 +149,23 @@ class SymbolRegistry:
         except Exception as e:
             system_logger.error(f"Symbol registry update failed: {e}", exc_info=True)
     
+    def load_snapshot(self, instruments: List[Dict[str, Any]]):
+        """Replace the registry with a read-only instrument snapshot (no Bybit fetches)."""
+        import time
+        self._symbols = {inst["symbol"]: SymbolInfo(inst["symbol"], inst) for inst in instruments}
+        self._last_update = time.time()
+        self._snapshot_mode = True
+        system_logger.info(f"Symbol registry loaded snapshot with {len(self._symbols)} symbols")
+    
     async def get_symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
         """Get symbol information."""
         await self.update_symbols()
         return self._symbols.get(symbol)
     
+    def get_cached_symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
+        """Symbol information if already loaded (never fetches)."""
+        return self._symbols.get(symbol)
+    
     async def is_symbol_valid(self, symbol: str) -> bool:
         """Check if symbol is valid and trading."""
         info = await self.get_symbol_info(symbol)
@@ -0,0 +1,152 @@
+"""
+Integer tick/step arithmetic for one instrument.
+
+Prices are held as an int count of `tick_size` and quantities as an int count
+of `qty_step`. Conversions from Bybit strings/Decimals are exact (ratio
+arithmetic, no float, no context rounding) and back to Decimal/str give the
+same digits Bybit uses (`ticks * tick_size` keeps the tick's exponent).
+
+Unlike Decimal.quantize(), which only rounds to the tick's number of
+decimals, rounding here snaps to a multiple of the tick, so ticks like 0.5
+or steps like 100 are handled correctly.
+
+Hot paths convert once at the boundary and then compare ints:
+
+- trigger levels compile to ticks with ceil (fires when price >= level) or
+  floor (fires when price <= level); for prices on the tick grid this is
+  exactly the Decimal comparison
+- a price update converts to (floor, ceil) ticks once (bracket); both are
+  equal for on-grid prices, which is what Bybit sends. An off-grid price is
+  rounded against firing (>= checks use floor, <= checks use ceil)
+
+scripts/benchmark_tick_arithmetic.py compares the Decimal and tick paths.
+"""
+
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+# 10**n for the digits of a decimal string
+_POW10 = [10 ** n for n in range(40)]
+
+
+def ratio(value) -> Tuple[int, int]:
+    """Exact (numerator, denominator > 0) of a price/qty string, Decimal or int."""
+    if isinstance(value, str):
+        whole, _, frac = value.partition(".")
+        if len(frac) < 40 and "e" not in value and "E" not in value:
+            try:
+                return int(whole + frac), _POW10[len(frac)]
+            except ValueError:
+                pass
+        return Decimal(value).as_integer_ratio()
+    if isinstance(value, int):
+        return value, 1
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return value.as_integer_ratio()
+
+
+class PriceTicks:
+    """A price update converted once: its scale and (floor, ceil) ticks."""
+
+    __slots__ = ("scale", "price", "floor", "ceil")
+
+    def __init__(self, scale: "TickScale", price, floor: int, ceil: int):
+        self.scale = scale
+        self.price = price
+        self.floor = floor
+        self.ceil = ceil
+
+
+class TickScale:
+    """Tick size and quantity step of one symbol as exact integer ratios."""
+
+    __slots__ = ("tick_size", "qty_step", "_tick_num", "_tick_den", "_step_num", "_step_den", "_last")
+
+    def __init__(self, tick_size: Decimal, qty_step: Decimal):
+        if tick_size <= 0 or qty_step <= 0:
+            raise ValueError(f"Tick size and qty step must be positive: {tick_size}, {qty_step}")
+        self.tick_size = tick_size
+        self.qty_step = qty_step
+        self._tick_num, self._tick_den = tick_size.as_integer_ratio()
+        self._step_num, self._step_den = qty_step.as_integer_ratio()
+        self._last: Optional[PriceTicks] = None
+
+    # -- prices ----------------------------------------------------------- #
+
+    def bracket(self, price) -> Tuple[int, int]:
+        """(floor, ceil) ticks of a price; equal when the price is on the grid."""
+        num, den = price.as_integer_ratio() if type(price) is Decimal else ratio(price)
+        q, r = divmod(num * self._tick_den, den * self._tick_num)
+        return (q, q + 1) if r else (q, q)
+
+    def at(self, price) -> PriceTicks:
+        """
+        Convert a price update for int comparisons against compiled triggers.
+
+        The last conversion is kept: listeners of the same update (strategy
+        scheduler, TP/SL engine) get the same Decimal and convert it once.
+        """
+        last = self._last
+        if last is not None and last.price is price:
+            return last
+        floor, ceil = self.bracket(price)
+        last = self._last = PriceTicks(self, price, floor, ceil)
+        return last
+
+    def price_ticks(self, price) -> Optional[int]:
+        """Exact ticks of an on-grid price, None if the price is off the grid."""
+        num, den = ratio(price)
+        q, r = divmod(num * self._tick_den, den * self._tick_num)
+        return None if r else q
+
+    def floor_ticks(self, price) -> int:
+        return self.bracket(price)[0]
+
+    def ceil_ticks(self, price) -> int:
+        return self.bracket(price)[1]
+
+    def price(self, ticks: int) -> Decimal:
+        """Ticks -> Decimal with the tick's exponent (Bybit's price format)."""
+        return ticks * self.tick_size
+
+    def price_str(self, ticks: int) -> str:
+        return str(ticks * self.tick_size)
+
+    # -- quantities ------------------------------------------------------- #
+
+    def qty_steps(self, qty) -> int:
+        """Whole steps in a quantity (floor)."""
+        num, den = ratio(qty)
+        return (num * self._step_den) // (den * self._step_num)
+
+    def qty(self, steps: int) -> Decimal:
+        """Steps -> Decimal with the step's exponent."""
+        return steps * self.qty_step
+
+    def qty_str(self, steps: int) -> str:
+        return str(steps * self.qty_step)
+
+    def split_qty(self, total_qty, parts: int) -> int:
+        """Steps per part when `total_qty` is split evenly (floor, never exceeds total)."""
+        return self.qty_steps(total_qty) // parts
+
+
+# Keyed by the filter strings so "0.10" and "0.1" keep their own output format
+_scales: Dict[Tuple[str, str], TickScale] = {}
+
+
+def tick_scale(tick_size: Decimal, qty_step: Decimal) -> TickScale:
+    """Shared TickScale per (tick, step): triggers compiled for it stay valid across registry refreshes."""
+    key = (str(tick_size), str(qty_step))
+    scale = _scales.get(key)
+    if scale is None:
+        scale = _scales[key] = TickScale(tick_size, qty_step)
+    return scale
+
+
+def get_tick_scale(symbol: str) -> Optional[TickScale]:
+    """Tick scale of a symbol whose instrument info is loaded, else None."""
+    from app.core.symbol_registry import get_symbol_registry
+    info = get_symbol_registry().get_cached_symbol_info(symbol)
+    return info.ticks if info is not None else None
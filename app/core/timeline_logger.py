@@ -16,11 +16,11 @@ import asyncio
 from datetime import datetime
 from decimal import Decimal
 from typing import Dict, Any, Optional
-import json
 from pathlib import Path
 import pytz
 
 from app.core.logging import system_logger
+from app.core import json_codec
 
 class TimelineEvent:
     """Single timeline event with microsecond precision."""
@@ -153,8 +153,8 @@ class TimelineLogger:
             self._events[event.operation_id].append(event)
             
             # Append to file for persistence
-            with open(self.timeline_file, 'a') as f:
-                f.write(json.dumps(event.to_dict()) + '\n')
+            with open(self.timeline_file, 'a', encoding='utf-8') as f:
+                f.write(json_codec.dumps(event.to_dict()) + '\n')
                 f.flush()
     
     async def verify_sequence(self, operation_id: str) -> Dict[str, Any]:
@@ -0,0 +1,271 @@
+"""
+Event-driven TP/SL trigger engine.
+
+TP/SL levels are compiled to absolute trigger prices once, when the order is
+added, and kept per symbol in two sorted ladders:
+
+- ABOVE ladder: fires when price >= level (long TP, short SL)
+- BELOW ladder: fires when price <= level (long SL, short TP)
+
+Each price tick is checked with one bisect per ladder (O(log n)), and every
+level crossed by the tick fires immediately - including several levels
+crossed by a single gap move. When the symbol's instrument info is loaded
+the ladder keys are integer ticks (app.core.ticks): levels are rounded onto
+the tick grid when armed and each tick is converted once, so the bisects
+compare ints instead of Decimals. Trigger-to-order latency (tick received →
+close order acknowledged) is recorded for every fired trigger.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left, bisect_right
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional, Callable, Awaitable, Any
+
+from app.core.logging import system_logger
+from app.core.ticks import TickScale, get_tick_scale
+
+ABOVE = "above"
+BELOW = "below"
+
+
+@dataclass
+class PriceTrigger:
+    """A single armed TP or SL level at an absolute price."""
+    trade_id: str
+    symbol: str
+    price: Decimal
+    direction: str  # ABOVE or BELOW
+    kind: str       # 'tp' or 'sl'
+    index: int = 0  # TP level index within the order
+
+
+def compile_tpsl_triggers(
+    trade_id: str,
+    symbol: str,
+    side: str,
+    entry_price: Decimal,
+    tp_percentages: List[Decimal],
+    sl_percentage: Optional[Decimal]
+) -> List[PriceTrigger]:
+    """
+    Convert percentage TP/SL levels into absolute price triggers.
+
+    Percentages are measured from entry, in the position's favour for TP and
+    against it for SL (same semantics as the old per-poll percentage check).
+    """
+    is_long = side == 'Buy'
+    triggers = []
+
+    for i, tp_pct in enumerate(tp_percentages):
+        move = entry_price * tp_pct / Decimal("100")
+        triggers.append(PriceTrigger(
+            trade_id=trade_id,
+            symbol=symbol,
+            price=entry_price + move if is_long else entry_price - move,
+            direction=ABOVE if is_long else BELOW,
+            kind='tp',
+            index=i
+        ))
+
+    if sl_percentage is not None:
+        move = entry_price * sl_percentage / Decimal("100")
+        triggers.append(PriceTrigger(
+            trade_id=trade_id,
+            symbol=symbol,
+            price=entry_price - move if is_long else entry_price + move,
+            direction=BELOW if is_long else ABOVE,
+            kind='sl'
+        ))
+
+    return triggers
+
+
+class SymbolTriggerLadder:
+    """Bisectable ABOVE/BELOW price ladders for a single symbol."""
+
+    def __init__(self, scale: Optional[TickScale] = None):
+        # Ladder keys: ticks of `scale` if given, else the Decimal prices
+        self.scale = scale
+        # Parallel lists: keys are kept sorted ascending for bisect
+        self._above_prices: list = []
+        self._above: List[PriceTrigger] = []
+        self._below_prices: list = []
+        self._below: List[PriceTrigger] = []
+
+    def __len__(self) -> int:
+        return len(self._above) + len(self._below)
+
+    def add(self, trigger: PriceTrigger):
+        """Arm a trigger."""
+        if trigger.direction == ABOVE:
+            prices, triggers = self._above_prices, self._above
+        else:
+            prices, triggers = self._below_prices, self._below
+        key = trigger.price
+        if self.scale is not None:
+            # On-grid prices cross ceil(level) going up exactly when they cross level
+            key = self.scale.ceil_ticks(key) if trigger.direction == ABOVE else self.scale.floor_ticks(key)
+        idx = bisect_right(prices, key)
+        prices.insert(idx, key)
+        triggers.insert(idx, trigger)
+
+    def remove_trade(self, trade_id: str) -> int:
+        """Disarm every trigger of a trade; returns number removed."""
+        before = len(self)
+        for prices, triggers in ((self._above_prices, self._above), (self._below_prices, self._below)):
+            keep = [i for i, t in enumerate(triggers) if t.trade_id != trade_id]
+            if len(keep) != len(triggers):
+                prices[:] = [prices[i] for i in keep]
+                triggers[:] = [triggers[i] for i in keep]
+        return before - len(self)
+
+    def pop_fired(self, price: Decimal) -> List[PriceTrigger]:
+        """Remove and return every trigger crossed by `price`."""
+        fired: List[PriceTrigger] = []
+        above_key = below_key = price
+        if self.scale is not None:
+            # Off-grid prices round against firing
+            at = self.scale.at(price)
+            above_key, below_key = at.floor, at.ceil
+
+        # ABOVE: all levels <= price
+        idx = bisect_right(self._above_prices, above_key)
+        if idx:
+            fired.extend(self._above[:idx])
+            del self._above[:idx]
+            del self._above_prices[:idx]
+
+        # BELOW: all levels >= price
+        idx = bisect_left(self._below_prices, below_key)
+        if idx < len(self._below):
+            fired.extend(self._below[idx:])
+            del self._below[idx:]
+            del self._below_prices[idx:]
+
+        return fired
+
+
+FireHandler = Callable[[PriceTrigger, Decimal, float], Awaitable[Any]]
+
+
+class TPSLTriggerEngine:
+    """Per-symbol trigger ladders driven by streaming price updates."""
+
+    def __init__(self, max_latency_history: int = 1000):
+        self._ladders: Dict[str, SymbolTriggerLadder] = {}
+        self._fire_handler: Optional[FireHandler] = None
+        self._tasks: set = set()
+        self.latencies_ms: deque = deque(maxlen=max_latency_history)
+        self.ticks_processed = 0
+        self.triggers_fired = 0
+
+    def set_fire_handler(self, handler: FireHandler):
+        """Set the coroutine called for each fired trigger: handler(trigger, price, received_at)."""
+        self._fire_handler = handler
+
+    def add_triggers(self, triggers: List[PriceTrigger]):
+        """Arm triggers (typically the output of compile_tpsl_triggers)."""
+        for trigger in triggers:
+            ladder = self._ladders.get(trigger.symbol)
+            if ladder is None:
+                ladder = self._ladders[trigger.symbol] = SymbolTriggerLadder(get_tick_scale(trigger.symbol))
+            ladder.add(trigger)
+
+    def remove_trade(self, symbol: str, trade_id: str) -> int:
+        """Disarm all remaining triggers of a trade."""
+        ladder = self._ladders.get(symbol)
+        if ladder is None:
+            return 0
+        removed = ladder.remove_trade(trade_id)
+        if not ladder:
+            del self._ladders[symbol]
+        return removed
+
+    def armed_symbols(self) -> List[str]:
+        """Symbols with at least one armed trigger."""
+        return list(self._ladders.keys())
+
+    def armed_count(self, symbol: Optional[str] = None) -> int:
+        """Number of armed triggers (for one symbol or all)."""
+        if symbol is not None:
+            ladder = self._ladders.get(symbol)
+            return len(ladder) if ladder else 0
+        return sum(len(ladder) for ladder in self._ladders.values())
+
+    def on_price(self, symbol: str, price: Decimal, received_at: Optional[float] = None) -> List[PriceTrigger]:
+        """
+        Check a price tick against the symbol's ladders.
+
+        Synchronous and O(log n) so it can run directly inside the stream's
+        receive loop. Fired triggers are dispatched to the fire handler as
+        tasks; the list is also returned for callers/tests. A trade whose SL
+        fires loses its TP triggers.
+        """
+        self.ticks_processed += 1
+        ladder = self._ladders.get(symbol)
+        if ladder is None:
+            return []
+
+        fired = ladder.pop_fired(price)
+        if not fired:
+            return fired
+        sl_trades = {t.trade_id for t in fired if t.kind == 'sl'}
+        if sl_trades:
+            # The SL closes the whole position: that trade's TPs (crossed by the
+            # same tick or still armed) must not race it with reduce-only closes
+            fired = [t for t in fired if t.kind == 'sl' or t.trade_id not in sl_trades]
+            for trade_id in sl_trades:
+                ladder.remove_trade(trade_id)
+        if not ladder:
+            del self._ladders[symbol]
+
+        if received_at is None:
+            received_at = time.monotonic()
+        self.triggers_fired += len(fired)
+
+        if self._fire_handler is not None:
+            for trigger in fired:
+                task = asyncio.create_task(self._fire_handler(trigger, price, received_at))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        return fired
+
+    def record_trigger_latency(self, trigger: PriceTrigger, received_at: float, success: bool = True) -> float:
+        """Record tick-to-order-ack latency for a fired trigger; returns it in ms."""
+        from app.core.performance_monitor import get_performance_monitor
+
+        latency = time.monotonic() - received_at
+        latency_ms = latency * 1000
+        self.latencies_ms.append(latency_ms)
+        get_performance_monitor().record_request(f"tpsl_trigger_{trigger.kind}", latency, success)
+        system_logger.debug("TP/SL trigger latency", {
+            'trade_id': trigger.trade_id,
+            'symbol': trigger.symbol,
+            'kind': trigger.kind,
+            'latency_ms': latency_ms,
+            'success': success
+        })
+        return latency_ms
+
+    def get_latency_stats(self) -> Dict[str, Any]:
+        """Trigger-to-order latency percentiles in milliseconds."""
+        if not self.latencies_ms:
+            return {'count': 0}
+        ordered = sorted(self.latencies_ms)
+        count = len(ordered)
+        return {
+            'count': count,
+            'p50_ms': ordered[int(count * 0.50)],
+            'p95_ms': ordered[min(int(count * 0.95), count - 1)],
+            'p99_ms': ordered[min(int(count * 0.99), count - 1)],
+            'max_ms': ordered[-1]
+        }
+
+    async def drain(self):
+        """Wait for in-flight fire handlers (used on shutdown/tests)."""
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
@@ -0,0 +1,197 @@
+"""
+Compact per-trade state for many concurrent trades.
+
+A live TradeFSM used to keep its numbers as Decimal attributes in the
+instance __dict__, next to ad hoc counters added with hasattr and a dict of
+bound state handlers per instance: about 20 GC-tracked objects per trade
+before strategies. The numeric state now lives in a slotted TradeRecord:
+
+- prices and quantities are ints at the symbol's tick/step precision
+  (SymbolScale, shared by all trades on a symbol); prices keep
+  PRICE_EXTRA_DIGITS digits below the tick for averaged fills
+- counters are plain ints, booleans are bits of one `flags` int
+
+TradeFSM exposes the same Decimal/int/bool attributes through RecordField
+descriptors, so callers are unchanged. TradeBook owns all live records,
+indexed by trade_id and by symbol.
+
+scripts/benchmark_trade_state.py measures bytes per trade and GC pressure.
+"""
+
+from decimal import Decimal, ROUND_HALF_EVEN
+from typing import Dict, List, Optional
+
+PRICE_EXTRA_DIGITS = 4
+DEFAULT_EXP = -8   # symbol not in the registry yet
+PNL_EXP = -8       # USDT amounts
+
+# TradeRecord.flags bits
+TRAILING_ACTIVE = 1
+HEDGE_TRIGGERED = 2
+POSITION_LOGGED = 4
+
+
+def to_units(value, exp: int) -> int:
+    """Decimal-like value -> int count of 10**exp units (half-even)."""
+    return int(Decimal(str(value)).scaleb(-exp).to_integral_value(rounding=ROUND_HALF_EVEN))
+
+
+def from_units(units: int, exp: int) -> Decimal:
+    """Int units -> Decimal without trailing zeros (100, not 100.0000)."""
+    if not units:
+        return Decimal("0")
+    value = Decimal(units).scaleb(exp).normalize()
+    return value.quantize(Decimal(1)) if value.as_tuple().exponent > 0 else value
+
+
+class SymbolScale:
+    """Fixed-point exponents of one symbol's prices and quantities."""
+
+    __slots__ = ("price_exp", "qty_exp")
+
+    def __init__(self, price_exp: int = DEFAULT_EXP, qty_exp: int = DEFAULT_EXP):
+        self.price_exp = price_exp
+        self.qty_exp = qty_exp
+
+    @classmethod
+    def from_filters(cls, tick_size: Decimal, qty_step: Decimal) -> "SymbolScale":
+        return cls(
+            min(tick_size.normalize().as_tuple().exponent, 0) - PRICE_EXTRA_DIGITS,
+            min(qty_step.normalize().as_tuple().exponent, 0)
+        )
+
+
+class TradeRecord:
+    """Numeric state of one trade."""
+
+    __slots__ = ("trade_id", "symbol", "scale", "entry", "original_entry", "size", "pnl",
+                 "pyramid_level", "hedge_count", "reentry_count", "error_count",
+                 "position_checks", "flags")
+
+    def __init__(self, trade_id: str, symbol: str, scale: SymbolScale):
+        self.trade_id = trade_id
+        self.symbol = symbol
+        self.scale = scale
+        self.entry = 0           # price units
+        self.original_entry = 0  # price units
+        self.size = 0            # qty units
+        self.pnl = 0             # PNL_EXP units
+        self.pyramid_level = 0
+        self.hedge_count = 0
+        self.reentry_count = 0
+        self.error_count = 0
+        self.position_checks = 0
+        self.flags = 0
+
+
+class RecordField:
+    """
+    Descriptor exposing a TradeRecord slot on its owner (`self.record`).
+
+    kind: "price" / "qty" / "pnl" -> Decimal, "int" -> int, or a flag bit -> bool.
+    """
+
+    __slots__ = ("slot", "kind")
+
+    def __init__(self, slot: str, kind):
+        self.slot = slot
+        self.kind = kind
+
+    def __get__(self, owner, owner_type=None):
+        if owner is None:
+            return self
+        record = owner.record
+        if self.kind == "int":
+            return getattr(record, self.slot)
+        if isinstance(self.kind, int):
+            return bool(record.flags & self.kind)
+        return from_units(getattr(record, self.slot), self._exp(record))
+
+    def __set__(self, owner, value):
+        record = owner.record
+        if self.kind == "int":
+            setattr(record, self.slot, int(value))
+        elif isinstance(self.kind, int):
+            record.flags = record.flags | self.kind if value else record.flags & ~self.kind
+        else:
+            setattr(record, self.slot, to_units(value or 0, self._exp(record)))
+
+    def _exp(self, record: TradeRecord) -> int:
+        if self.kind == "price":
+            return record.scale.price_exp
+        if self.kind == "qty":
+            return record.scale.qty_exp
+        return PNL_EXP
+
+
+class TradeBook:
+    """All live trade records, by trade_id and by symbol."""
+
+    def __init__(self):
+        self._records: Dict[str, TradeRecord] = {}
+        self._by_symbol: Dict[str, Dict[str, TradeRecord]] = {}
+        self._scales: Dict[str, SymbolScale] = {}
+        self._default_scale = SymbolScale()
+
+    def scale_for(self, symbol: str) -> SymbolScale:
+        """Shared scale of `symbol` (from the symbol registry once it is loaded)."""
+        scale = self._scales.get(symbol)
+        if scale is not None:
+            return scale
+        from app.core.symbol_registry import get_symbol_registry
+        info = get_symbol_registry().get_cached_symbol_info(symbol)
+        if info is None:
+            return self._default_scale
+        scale = self._scales[symbol] = SymbolScale.from_filters(info.tick_size, info.step_size)
+        return scale
+
+    def open(self, trade_id: str, symbol: str) -> TradeRecord:
+        record = TradeRecord(trade_id, symbol, self.scale_for(symbol))
+        self._add(record)
+        return record
+
+    def rename(self, record: TradeRecord, trade_id: str):
+        """Re-key a record (the FSM's trade_id was reassigned, e.g. on resume)."""
+        self.close(record)
+        record.trade_id = trade_id
+        self._add(record)
+
+    def close(self, record: TradeRecord):
+        if self._records.get(record.trade_id) is record:
+            del self._records[record.trade_id]
+        trades = self._by_symbol.get(record.symbol)
+        if trades is not None and trades.get(record.trade_id) is record:
+            del trades[record.trade_id]
+            if not trades:
+                del self._by_symbol[record.symbol]
+
+    def _add(self, record: TradeRecord):
+        self._records[record.trade_id] = record
+        self._by_symbol.setdefault(record.symbol, {})[record.trade_id] = record
+
+    def get(self, trade_id: str) -> Optional[TradeRecord]:
+        return self._records.get(trade_id)
+
+    def for_symbol(self, symbol: str) -> List[TradeRecord]:
+        return list(self._by_symbol.get(symbol, {}).values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "trades": len(self._records),
+            "symbols": len(self._by_symbol)
+        }
+
+
+# Global trade book instance
+_trade_book: Optional[TradeBook] = None
+
+
+def get_trade_book() -> TradeBook:
+    """Get global trade book."""
+    global _trade_book
+    if _trade_book is None:
+        _trade_book = TradeBook()
+    return _trade_book
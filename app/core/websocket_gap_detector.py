@@ -7,11 +7,17 @@ CLIENT SPEC (doc/10_15.md Lines 86-91):
 - Heartbeat: ping every 30s, reconnect on pong timeout
 - Ensure no missed fills or position updates
 
+Recovery (gap or reconnect) runs in the background while the stream keeps
+receiving: incoming messages are buffered, positions/open orders/recent
+executions/wallet are fetched concurrently and applied, the buffer is
+replayed in sequence order, and only then is trading resumed. Pause
+duration is reported in get_status() and /metrics.
+
 This ensures data consistency and prevents trading on stale data.
 """
 
 import asyncio
-from typing import Dict, Any, Optional, List, Set
+from typing import Dict, Any, Optional, List, Set, Tuple, Callable, Awaitable
 from dataclasses import dataclass, field
 from datetime import datetime
 import time
@@ -91,6 +97,22 @@ class WebSocketGapDetector:
         self.total_recoveries_successful = 0
         self.total_recoveries_failed = 0
         
+        # Recovery: messages are buffered until the snapshot is applied
+        self.recovering = False
+        self.max_buffer = 10000
+        self._buffer: List[Tuple[str, Dict[str, Any]]] = []
+        self._replay_handler: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None
+        self._recovery_task: Optional[asyncio.Task] = None
+        self.messages_replayed = 0
+        self.messages_dropped = 0
+        
+        # Trading pause durations
+        self._paused_at: Optional[float] = None
+        self.pauses = 0
+        self.last_pause_ms = 0.0
+        self.max_pause_ms = 0.0
+        self.total_pause_ms = 0.0
+        
         # Heartbeat tracking
         self.last_ping_sent: Optional[float] = None
         self.last_pong_received: Optional[float] = None
@@ -105,8 +127,12 @@ class WebSocketGapDetector:
         return self.trackers[topic]
     
     async def check_message(self, topic: str, message: Dict[str, Any]) -> bool:
+        """Async wrapper of detect_gap()."""
+        return self.detect_gap(topic, message)
+    
+    def detect_gap(self, topic: str, message: Dict[str, Any]) -> bool:
         """
-        Check message for sequence gaps.
+        Check message for sequence gaps (synchronous: called for every frame).
         
         Args:
             topic: Message topic ("execution", "position", etc.)
@@ -127,77 +153,144 @@ class WebSocketGapDetector:
         if gap_detected:
             self.total_gaps_detected += 1
             
-            # Trigger gap recovery
-            await self.handle_gap_detected(topic, tracker)
+            # Trigger gap recovery; the message itself is replayed after the snapshot
+            self.start_recovery(f"gap:{topic}", topic, message)
             return True
         
         return False
     
+    def set_replay_handler(self, handler: Callable[[Dict[str, Any]], Awaitable[None]]):
+        """Coroutine that processes a buffered message (without gap checks)."""
+        self._replay_handler = handler
+    
+    def buffer(self, topic: str, message: Dict[str, Any]):
+        """Hold a message received during recovery."""
+        if len(self._buffer) >= self.max_buffer:
+            self.messages_dropped += 1
+            return
+        self._buffer.append((topic, message))
+    
+    def start_recovery(self, reason: str, topic: Optional[str] = None,
+                       message: Optional[Dict[str, Any]] = None) -> Optional[asyncio.Task]:
+        """Start buffering and recover in the background (no-op if already recovering)."""
+        if message is not None:
+            self.buffer(topic or "", message)
+        if self.recovering:
+            return self._recovery_task
+        self.recovering = True
+        self._pause()
+        self._recovery_task = asyncio.create_task(self.recover(reason))
+        return self._recovery_task
+    
     async def handle_gap_detected(self, topic: str, tracker: SequenceTracker):
+        """Handle detected sequence gap (recovers inline)."""
+        if self.recovering:
+            system_logger.warning(f"Gap recovery already in progress, skipping for {topic}")
+            return
+        self.recovering = True
+        await self.recover(f"gap:{topic}")
+    
+    async def recover(self, reason: str):
         """
-        Handle detected sequence gap.
-        
         CLIENT SPEC Flow:
-        1. Pause trading
+        1. Pause trading (messages are buffered while recovering)
         2. Log gap event
-        3. Fetch REST snapshot
-        4. Replay if possible
+        3. Fetch REST snapshot (concurrently) and apply it
+        4. Replay buffered messages in sequence order
         5. Resume trading
         """
-        if self.gap_recovery_in_progress:
-            system_logger.warning(f"Gap recovery already in progress, skipping for {topic}")
-            return
-        
+        self.recovering = True
+        self.gap_recovery_in_progress = True
         try:
-            self.gap_recovery_in_progress = True
-            
             # Step 1: Pause trading
             await self.pause_trading()
             
             # Step 2: Log gap event
             system_logger.critical(
-                "WebSocket sequence gap detected - initiating recovery",
+                "WebSocket recovery initiated",
                 {
-                    "topic": topic,
-                    "expected_seq": tracker.expected_next - (tracker.expected_next - tracker.last_sequence),
-                    "received_seq": tracker.last_sequence,
-                    "gap_size": tracker.expected_next - tracker.last_sequence - 1,
+                    "reason": reason,
+                    "buffered": len(self._buffer),
                     "action": "PAUSE_TRADING"
                 }
             )
             
-            # Step 3: Fetch REST snapshot
+            # Step 3: Fetch and apply REST snapshot
             snapshot = await self.fetch_snapshot()
+            if snapshot is not None:
+                self.apply_snapshot(snapshot)
             
-            # Step 4: Replay (if needed)
-            # Note: Actual replay depends on stored messages
-            # For now, we just resync state from snapshot
-            
-            # Step 5: Resume trading
-            await self.resume_trading()
+            # Step 4: Replay what arrived meanwhile
+            replayed = await self.replay_buffer()
             
             self.total_recoveries_successful += 1
-            
             system_logger.info(
                 "Gap recovery completed successfully",
                 {
-                    "topic": topic,
+                    "reason": reason,
                     "snapshot_fetched": snapshot is not None,
-                    "trading_resumed": not self.trading_paused
+                    "replayed": replayed
                 }
             )
             
         except Exception as e:
             self.total_recoveries_failed += 1
             system_logger.error(f"Gap recovery failed: {e}", exc_info=True)
+            # Do not hold back live messages after a failed recovery
+            await self.replay_buffer()
             
         finally:
+            # Step 5: Resume trading (buffer is empty here: no await since the last drain)
+            self.recovering = False
             self.gap_recovery_in_progress = False
+            await self.resume_trading()
+    
+    async def replay_buffer(self) -> int:
+        """
+        Process buffered messages, each topic in sequence order.
+        
+        Messages keep their arrival slots across topics; within a topic whose
+        messages all carry `seq` they are reordered by seq. Loops until no
+        new message was buffered while replaying.
+        """
+        replayed = 0
+        while self._buffer:
+            batch, self._buffer = self._buffer, []
+            by_topic: Dict[str, List[int]] = {}
+            for index, (topic, _) in enumerate(batch):
+                by_topic.setdefault(topic, []).append(index)
+            ordered = list(batch)
+            for topic, indexes in by_topic.items():
+                messages = [batch[i] for i in indexes]
+                if all(m.get("seq") is not None for _, m in messages):
+                    messages.sort(key=lambda item: item[1]["seq"])
+                for index, item in zip(indexes, messages):
+                    ordered[index] = item
+            
+            for topic, message in ordered:
+                sequence = message.get("seq")
+                if sequence is not None:
+                    # Resync the tracker: the snapshot covers anything missed
+                    tracker = self.get_or_create_tracker(topic)
+                    tracker.last_sequence = sequence
+                    tracker.expected_next = sequence + 1
+                if self._replay_handler is not None:
+                    try:
+                        await self._replay_handler(message)
+                    except Exception as e:
+                        system_logger.error(f"Replay of buffered {topic} message failed: {e}")
+                replayed += 1
+        self.messages_replayed += replayed
+        return replayed
     
     async def pause_trading(self):
         """Pause trading immediately."""
+        self._pause()
+    
+    def _pause(self):
         if not self.trading_paused:
             self.trading_paused = True
+            self._paused_at = time.monotonic()
             system_logger.critical("⚠️ TRADING PAUSED due to WebSocket gap", {
                 "action": "TRADING_PAUSED",
                 "reason": "ws_gap_detected"
@@ -207,36 +300,62 @@ class WebSocketGapDetector:
         """Resume trading after gap recovery."""
         if self.trading_paused:
             self.trading_paused = False
+            pause_ms = (time.monotonic() - self._paused_at) * 1000 if self._paused_at else 0.0
+            self._paused_at = None
+            self.pauses += 1
+            self.last_pause_ms = pause_ms
+            self.max_pause_ms = max(self.max_pause_ms, pause_ms)
+            self.total_pause_ms += pause_ms
             system_logger.info("✅ TRADING RESUMED after gap recovery", {
-                "action": "TRADING_RESUMED"
+                "action": "TRADING_RESUMED",
+                "pause_ms": round(pause_ms, 1)
             })
     
-    async def fetch_snapshot(self) -> Optional[Dict[str, Any]]:
+    async def fetch_snapshot(self, since_ms: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Fetch REST snapshot of current state.
         
+        Positions, open orders, recent executions (since `since_ms` when
+        given) and the wallet are fetched concurrently; a part that fails is
+        None.
+        
         Returns:
-            Snapshot data including positions and orders
+            Snapshot data including positions and orders (None if all failed)
         """
         try:
             from app.bybit.client import get_bybit_client
             client = get_bybit_client()
             
-            # Get all positions
-            positions = await client.positions("linear", symbol=None)  # Get all symbols
-            
-            # Get all open orders
-            # Note: Bybit V5 doesn't support getting all orders at once
-            # Would need to iterate through symbols
+            results = await asyncio.gather(
+                client.positions_by_settle_coin("linear", "USDT"),
+                client.query_open("linear", settleCoin="USDT"),
+                client.get_executions("linear", limit=100 if since_ms else 50, start_time=since_ms),
+                client.get_wallet_balance("UNIFIED"),
+                return_exceptions=True
+            )
+            parts = []
+            for name, result in zip(("positions", "orders", "executions", "wallet"), results):
+                if isinstance(result, BaseException):
+                    system_logger.warning(f"REST snapshot {name} failed: {result}")
+                    parts.append(None)
+                else:
+                    parts.append(result)
+            if all(part is None for part in parts):
+                return None
             
+            positions, orders, executions, wallet = parts
             snapshot = {
                 "timestamp": time.time(),
-                "positions": positions.get("result", {}).get("list", []),
-                "orders": []  # Would need symbol-specific fetching
+                "positions": positions.get("result", {}).get("list", []) if positions else None,
+                "orders": orders.get("result", {}).get("list", []) if orders else None,
+                "executions": executions.get("result", {}).get("list", []) if executions else None,
+                "wallet": wallet
             }
             
             system_logger.info("REST snapshot fetched", {
-                "positions_count": len(snapshot["positions"]),
+                "positions_count": len(snapshot["positions"] or []),
+                "orders_count": len(snapshot["orders"] or []),
+                "executions_count": len(snapshot["executions"] or []),
                 "timestamp": snapshot["timestamp"]
             })
             
@@ -246,6 +365,24 @@ class WebSocketGapDetector:
             system_logger.error(f"Failed to fetch REST snapshot: {e}", exc_info=True)
             return None
     
+    def apply_snapshot(self, snapshot: Dict[str, Any]):
+        """Bring the account cache and pending fill waiters up to date."""
+        from app.core.account_state import get_account_state
+        from app.core.fill_waiters import get_fill_registry
+        
+        positions = snapshot.get("positions")
+        get_account_state().apply_snapshot(
+            snapshot.get("wallet"),
+            {"result": {"list": positions}} if positions is not None else None
+        )
+        
+        # Fills/cancellations missed during the gap
+        registry = get_fill_registry()
+        for execution in snapshot.get("executions") or []:
+            registry.on_execution(execution)
+        for order in snapshot.get("orders") or []:
+            registry.on_order(order)
+    
     def is_trading_allowed(self) -> bool:
         """Check if trading is allowed (not paused due to gap)."""
         return not self.trading_paused
@@ -280,6 +417,14 @@ class WebSocketGapDetector:
             "total_gaps_detected": self.total_gaps_detected,
             "total_recoveries_successful": self.total_recoveries_successful,
             "total_recoveries_failed": self.total_recoveries_failed,
+            "recovering": self.recovering,
+            "buffered": len(self._buffer),
+            "messages_replayed": self.messages_replayed,
+            "messages_dropped": self.messages_dropped,
+            "pauses": self.pauses,
+            "last_pause_ms": round(self.last_pause_ms, 1),
+            "max_pause_ms": round(self.max_pause_ms, 1),
+            "total_pause_ms": round(self.total_pause_ms, 1),
             "trackers": {}
         }
         
@@ -24,6 +24,11 @@ if sys.platform == "win32":
             pass
     atexit.register(cleanup_asyncio)
 
+# Startup profiler must be imported first so its import hook sees everything below
+from app.core.startup_profiler import get_startup_profiler
+_profiler = get_startup_profiler()
+_profiler.install_import_hook()
+
 # CRITICAL: Environment variables must be set in .env file or system environment
 # Do not hardcode secrets in code for security reasons
 from app.core.decimal_config import ensure_decimal_precision
@@ -34,14 +39,10 @@ from app.config.settings import (
     MAX_CONCURRENT_TRADES, ALWAYS_WHITELIST_CHANNELS
 )
 # NOTE: Migration to strict_config in progress - some values still from settings.py
-from app.telegram.strict_client import start_strict_telegram
+# Heavy subsystems (telethon client, trade manager, resume, cleanup, health API,
+# NTP, report scheduler) are imported inside main() so each import is paid on
+# first use and shows up in the startup profile under its component.
 # CLIENT FIX: Removed old strict_scheduler import - using ReportSchedulerV2 only
-from app.reports.cleanup import cleanup_scheduler
-from app.runtime.resume import resume_open_trades
-from app.bybit.client import BybitClient
-from app.trade.manager import get_position_manager
-from app.core.symbol_registry import get_symbol_registry
-from app.core.idempotency import get_idempotency_manager
 # from app.core.intelligent_tpsl import initialize_intelligent_tpsl  # OLD VERSION - REMOVED
 
 # Fix Windows console encoding for emojis
@@ -90,7 +91,7 @@ async def _print_config_snapshot():
         "max_trades": STRICT_CONFIG.max_trades
     })
 
-async def _validate_api(client: BybitClient):
+async def _validate_api(client):
     """Fail-fast API validation with strict config."""
     try:
         r = await client.wallet_balance("USDT")
@@ -100,32 +101,41 @@ async def _validate_api(client: BybitClient):
         system_logger.error("API key/endpoint invalid or timestamp drift. Fix .env / system clock.", {'error': str(e)})
         raise
 
-async def _initialize_strict_components():
+async def _initialize_strict_components(runs_trades: bool = True, fetch_instruments: bool = True):
     """Initialize all strict compliance components."""
     try:
         # Ensure decimal precision
         ensure_decimal_precision()
         system_logger.info("Decimal precision configured")
         
-        # Initialize symbol registry
-        symbol_registry = get_symbol_registry()
-        await symbol_registry.update_symbols(force=True)
-        system_logger.info("Symbol registry initialized")
+        # Initialize symbol registry (trade workers get the ingress snapshot instead)
+        if fetch_instruments:
+            with _profiler.component("symbol_registry"):
+                from app.core.symbol_registry import get_symbol_registry
+                symbol_registry = get_symbol_registry()
+                await symbol_registry.update_symbols(force=True)
+            system_logger.info("Symbol registry initialized")
         
         # Initialize idempotency manager
-        idempotency_manager = get_idempotency_manager()
+        with _profiler.component("idempotency_manager"):
+            from app.core.idempotency import get_idempotency_manager
+            idempotency_manager = get_idempotency_manager()
         system_logger.info("Idempotency manager initialized")
         
-        # Initialize intelligent TP/SL handler
-        from app.core.intelligent_tpsl_fixed_v3 import get_intelligent_tpsl_handler_fixed
-        handler = get_intelligent_tpsl_handler_fixed()
-        await handler.initialize()
-        system_logger.info("Intelligent TP/SL handler initialized")
-        
-        # Start simulated TP/SL manager (for testnet fallback)
-        from app.core.simulated_tpsl import start_simulated_tpsl
-        await start_simulated_tpsl()
-        system_logger.info("Simulated TP/SL manager started")
+        # TP/SL handling only where trades run (not in the ingress process)
+        if runs_trades:
+            # Initialize intelligent TP/SL handler
+            with _profiler.component("intelligent_tpsl"):
+                from app.core.intelligent_tpsl_fixed_v3 import get_intelligent_tpsl_handler_fixed
+                handler = get_intelligent_tpsl_handler_fixed()
+                await handler.initialize()
+            system_logger.info("Intelligent TP/SL handler initialized")
+            
+            # Start simulated TP/SL manager (for testnet fallback)
+            with _profiler.component("simulated_tpsl"):
+                from app.core.simulated_tpsl import start_simulated_tpsl
+                await start_simulated_tpsl()
+            system_logger.info("Simulated TP/SL manager started")
         
         # Log configuration
         system_logger.info("Strict configuration loaded", {
@@ -177,18 +187,27 @@ async def _validate_strict_requirements():
 
 async def main():
     """Main function with strict compliance."""
+    # Supervisor mode (start.py --shards N): ingress owns Telegram/API/reports,
+    # trade workers own FSMs and streams; standalone runs everything
+    from app.runtime.sharding import get_process_role, ROLE_INGRESS, ROLE_WORKER
+    role = get_process_role()
+    runs_trades = role != ROLE_INGRESS
+    runs_ingress = role != ROLE_WORKER
+    
     system_logger.info("Bybit Copybot Pro - STRICT COMPLIANCE MODE", {
         "python_version": sys.version,
-        "platform": sys.platform
+        "platform": sys.platform,
+        "role": role
     })
     
     # CRITICAL FIX: Clean up locked session files on startup
+    # (never from a trade worker: the ingress process holds the session)
     try:
         import time
         session_files = [
             "bybit_copybot_session.session",
             "bybit_copybot_session.session-journal"
-        ]
+        ] if runs_ingress else []
         for file in session_files:
             if os.path.exists(file):
                 # Check if file is locked by trying to rename it
@@ -220,56 +239,74 @@ async def main():
         breaker_reset()
         
         # Initialize strict components
-        await _initialize_strict_components()
+        await _initialize_strict_components(runs_trades, fetch_instruments=runs_ingress)
         
         # Validate strict requirements
         await _validate_strict_requirements()
         
         # Initialize Bybit client (singleton)
-        from app.bybit.client import get_bybit_client
-        client = get_bybit_client()
+        with _profiler.component("bybit_client"):
+            from app.bybit.client import get_bybit_client
+            client = get_bybit_client()
         
         # Validate API keys first (fail-fast)
-        await _validate_api(client)
+        with _profiler.component("api_validation"):
+            await _validate_api(client)
         
         # =================================================================
         # CLIENT SPEC PRODUCTION BLOCKERS - Initialize critical systems
         # =================================================================
         
-        # BLOCKER #3: Journal reconciliation on startup
-        try:
-            from app.core.journal import reconcile_on_startup, get_append_only_journal
-            system_logger.info("Running journal reconciliation")
-            reconciliation_report = await reconcile_on_startup(client)
+        if runs_ingress:
+            # BLOCKER #3: Journal reconciliation on startup (once, in the ingress/standalone process)
+            try:
+                system_logger.info("Running journal reconciliation")
+                with _profiler.component("journal_reconciliation"):
+                    from app.core.journal import reconcile_on_startup
+                    from app.runtime.resume import get_startup_snapshot, clear_startup_snapshot
+                    # One account snapshot, shared with resume_open_trades below
+                    reconciliation_report = await reconcile_on_startup(client, await get_startup_snapshot())
+                    if not runs_trades:
+                        clear_startup_snapshot()
             
-            if reconciliation_report["status"] == "clean":
-                system_logger.info(f"Journal reconciliation CLEAN ({reconciliation_report['journal_order_count']} entries)")
-            else:
-                system_logger.warning("Journal reconciliation found issues", {"orphans": len(reconciliation_report.get("orphans", [])), "missing": len(reconciliation_report.get("missing", []))})
-                if reconciliation_report.get("orphans"):
-                    pass  # Already logged above
-                if reconciliation_report.get("missing"):
-                    pass  # Already logged above
-        except Exception as e:
-            # Already logged by system_logger.warning above
-            system_logger.warning(f"Journal reconciliation failed (continuing): {e}")
+                if reconciliation_report["status"] == "clean":
+                    system_logger.info(f"Journal reconciliation CLEAN ({reconciliation_report['journal_order_count']} entries)")
+                else:
+                    system_logger.warning("Journal reconciliation found issues", {"orphans": len(reconciliation_report.get("orphans", [])), "missing": len(reconciliation_report.get("missing", []))})
+                    if reconciliation_report.get("orphans"):
+                        pass  # Already logged above
+                    if reconciliation_report.get("missing"):
+                        pass  # Already logged above
+            except Exception as e:
+                # Already logged by system_logger.warning above
+                system_logger.warning(f"Journal reconciliation failed (continuing): {e}")
         
         # PRIORITY 2: Start message queue worker
         try:
-            from app.telegram.engine import get_template_engine
-            engine = get_template_engine()
-            await engine.start_queue()
+            with _profiler.component("message_queue"):
+                from app.telegram.engine import get_template_engine
+                engine = get_template_engine()
+                await engine.start_queue()
             # Already logged by system_logger.info
             system_logger.info("Message queue worker started")
         except Exception as e:
             # Already logged by system_logger.warning
             system_logger.warning(f"Message queue start failed (continuing): {e}")
         
+        # Event-loop watchdog: lag histogram + stacks of blocking callbacks
+        try:
+            with _profiler.component("loop_monitor"):
+                from app.core.loop_monitor import start_loop_monitor
+                await start_loop_monitor()
+        except Exception as e:
+            system_logger.warning(f"Event loop monitor disabled: {e}")
+        
         # BLOCKER #4: Start NTP monitoring
         try:
-            from app.core.ntp_sync import start_ntp_monitoring, get_ntp_monitor
-            await start_ntp_monitoring()
-            ntp_monitor = get_ntp_monitor()
+            with _profiler.component("ntp_monitor"):
+                from app.core.ntp_sync import start_ntp_monitoring, get_ntp_monitor
+                await start_ntp_monitoring()
+                ntp_monitor = get_ntp_monitor()
             
             if ntp_monitor.is_trading_allowed():
                 system_logger.info(f"NTP monitoring started (drift: {ntp_monitor.last_drift * 1000 if ntp_monitor.last_drift else 0:.2f} ms)")
@@ -279,19 +316,21 @@ async def main():
             # Already logged by system_logger.warning
             system_logger.warning(f"NTP monitoring disabled: {e}")
         
-        # BLOCKER #10: Start health API server
-        try:
-            from app.api.health import start_health_server
-            system_logger.info("Starting health API server on port 8080...")
-            asyncio.create_task(start_health_server(host="0.0.0.0", port=8080))
-            system_logger.info("Health API started: http://localhost:8080/health", {"endpoints": ["/health", "/status", "/metrics", "/killswitch"]})
+        if runs_ingress:
+            # BLOCKER #10: Start health API server
+            try:
+                with _profiler.component("health_api"):
+                    from app.api.health import start_health_server
+                    system_logger.info("Starting health API server on port 8080...")
+                    asyncio.create_task(start_health_server(host="0.0.0.0", port=8080))
+                system_logger.info("Health API started: http://localhost:8080/health", {"endpoints": ["/health", "/status", "/metrics", "/killswitch", "/debug/loop"]})
             
             
             
             
-        except Exception as e:
-            # Already logged by system_logger.warning
-            system_logger.warning(f"Health API disabled: {e}")
+            except Exception as e:
+                # Already logged by system_logger.warning
+                system_logger.warning(f"Health API disabled: {e}")
         
         # =================================================================
         # End of production blocker initializations
@@ -300,42 +339,60 @@ async def main():
         # CLIENT FIX: Removed old strict_report_scheduler - using ReportSchedulerV2 only
         # See lines below for the new scheduler initialization
         
-        # Start 6-day cleanup scheduler for unfilled orders
-        asyncio.create_task(cleanup_scheduler())
-        system_logger.info("6-day cleanup scheduler started")
-        
-        # Resume open trades: reattach OCO, trailing, hedge monitors
-        try:
-            await resume_open_trades()
-            system_logger.info("Open trades resumed")
-        except Exception as e:
-            system_logger.warning(f"Resume error: {e}")
-            # Already logged
+        if runs_ingress:
+            # Start 6-day cleanup scheduler for unfilled orders
+            with _profiler.component("cleanup_scheduler"):
+                from app.reports.cleanup import cleanup_scheduler
+                asyncio.create_task(cleanup_scheduler())
+            system_logger.info("6-day cleanup scheduler started")
         
-        # Start position manager
-        position_manager = await get_position_manager()
-        # NOTE: Position manager cleanup scheduler disabled to prevent conflict with global cleanup scheduler
-        # await position_manager.start_cleanup_scheduler()
-        system_logger.info("Position manager started")
+        # Trade-side components (standalone or trade worker)
+        if runs_trades:
+            # Resume open trades: reattach OCO, trailing, hedge monitors
+            try:
+                with _profiler.component("resume_open_trades"):
+                    from app.runtime.resume import resume_open_trades
+                    await resume_open_trades()
+                system_logger.info("Open trades resumed")
+            except Exception as e:
+                system_logger.warning(f"Resume error: {e}")
+                # Already logged
+        
+            # Start position manager
+            with _profiler.component("position_manager"):
+                from app.trade.manager import get_position_manager
+                position_manager = await get_position_manager()
+            # NOTE: Position manager cleanup scheduler disabled to prevent conflict with global cleanup scheduler
+            # await position_manager.start_cleanup_scheduler()
+            system_logger.info("Position manager started")
+        
+            # Start Bybit WebSocket for real-time updates (if available)
+            try:
+                with _profiler.component("websocket"):
+                    from app.bybit.websocket import get_websocket
+                    ws = await get_websocket()
+                system_logger.info("Bybit WebSocket started for real-time updates")
+            except Exception as e:
+                # Already logged
+                system_logger.info("Bot will use REST API polling for updates")
         
-        # Start Bybit WebSocket for real-time updates (if available)
-        try:
-            from app.bybit.websocket import get_websocket
-            ws = await get_websocket()
-            system_logger.info("Bybit WebSocket started for real-time updates")
-        except Exception as e:
-            # Already logged
-            system_logger.info("Bot will use REST API polling for updates")
+            # Start central strategy scheduler (pyramid/trailing/hedge for RUNNING trades)
+            with _profiler.component("strategy_scheduler"):
+                from app.core.strategy_scheduler import start_strategy_scheduler
+                await start_strategy_scheduler()
+            system_logger.info("Strategy scheduler started")
         
-        # Start advanced report scheduler
-        try:
-            from app.reports.scheduler_v2 import get_report_scheduler
-            report_scheduler = await get_report_scheduler()
-            await report_scheduler.start()
-            system_logger.info("Advanced report scheduler started (Daily 08:00, Weekly Sat 22:00 Stockholm)")
-        except Exception as e:
-            # Already logged
-            system_logger.info("Reports will not be automatically generated")
+        if runs_ingress:
+            # Start advanced report scheduler
+            try:
+                with _profiler.component("report_scheduler"):
+                    from app.reports.scheduler_v2 import get_report_scheduler
+                    report_scheduler = await get_report_scheduler()
+                    await report_scheduler.start()
+                system_logger.info("Advanced report scheduler started (Daily 08:00, Weekly Sat 22:00 Stockholm)")
+            except Exception as e:
+                # Already logged
+                system_logger.info("Reports will not be automatically generated")
         
         # Emit "BOOT OK" message with trace_id
         system_logger.info("BOOT OK", {
@@ -344,10 +401,27 @@ async def main():
             'risk_pct': str(RISK_PER_TRADE),
             'base_im': str(BASE_IM),
             'max_trades': MAX_CONCURRENT_TRADES,
-            'whitelist_channels': ALWAYS_WHITELIST_CHANNELS
+            'whitelist_channels': ALWAYS_WHITELIST_CHANNELS,
+            'role': role
         })
         system_logger.info("BOOT OK - All systems initialized")
         
+        if role == ROLE_WORKER:
+            # Trade shard: run FSMs for signals routed by the ingress process
+            from app.runtime.sharding import get_shard_worker
+            _profiler.log_report()
+            await get_shard_worker().serve()
+            return
+        
+        if role == ROLE_INGRESS:
+            from app.runtime.sharding import get_shard_router
+            await get_shard_router().start()
+        
+        # Parser worker processes (PARSE_WORKERS > 0), started before messages arrive
+        with _profiler.component("parse_pool"):
+            from app.signals.parse_pool import start_parse_pool
+            await start_parse_pool()
+        
         # Start strict Telegram client with all compliance features
         system_logger.info("Starting strict Telegram client with ALL COMPLIANCE FEATURES", {
             'features': [
@@ -364,6 +438,10 @@ async def main():
             ]
         })
         
+        with _profiler.component("telegram_client_import"):
+            from app.telegram.strict_client import start_strict_telegram
+        _profiler.log_report()
+        
         await start_strict_telegram()
         
     except KeyboardInterrupt:
@@ -375,6 +453,9 @@ async def main():
         import traceback
         traceback.print_exc()
     finally:
+        # Startup is over even if it failed before the profile was logged
+        _profiler.remove_import_hook()
+        
         # Cleanup on exit
         system_logger.info("Starting cleanup process")
         try:
@@ -424,7 +505,53 @@ async def main():
                 await stop_simulated_tpsl()
             except Exception as e:
                 system_logger.warning(f"Simulated TP/SL cleanup error: {e}")
+            
+            # Stop parser worker processes
+            try:
+                from app.signals.parse_pool import stop_parse_pool
+                await stop_parse_pool()
+            except Exception as e:
+                system_logger.warning(f"Parser pool cleanup error: {e}")
+            
+            # Disconnect from trade shards (ingress only)
+            try:
+                from app.runtime.sharding import get_shard_router
+                router = get_shard_router()
+                if router is not None:
+                    await router.stop()
+            except Exception as e:
+                system_logger.warning(f"Shard router cleanup error: {e}")
+            
+            # Close additional account clients
+            try:
+                from app.trade.multi_account import get_account_pool
+                pool = get_account_pool()
+                if pool is not None:
+                    await pool.close()
+            except Exception as e:
+                system_logger.warning(f"Account pool cleanup error: {e}")
+            
+            # Stop strategy scheduler workers
+            try:
+                from app.core.strategy_scheduler import stop_strategy_scheduler
+                await stop_strategy_scheduler()
+            except Exception as e:
+                system_logger.warning(f"Strategy scheduler cleanup error: {e}")
+            
+            # Stop public market stream (ticker feed for TP/SL triggers)
+            try:
+                from app.bybit.market_stream import stop_market_stream
+                await stop_market_stream()
+            except Exception as e:
+                system_logger.warning(f"Market stream cleanup error: {e}")
                 
+            # Stop event-loop watchdog
+            try:
+                from app.core.loop_monitor import stop_loop_monitor
+                await stop_loop_monitor()
+            except Exception as e:
+                system_logger.warning(f"Loop monitor cleanup error: {e}")
+            
             # Get all running tasks and cancel them properly
             current_task = asyncio.current_task()
             tasks = [task for task in asyncio.all_tasks() if not task.done() and task is not current_task]
@@ -10,6 +10,7 @@ from app.core.strict_config import STRICT_CONFIG
 from app.bybit.client import BybitClient
 from app.storage.db import aiosqlite, DB_PATH
 from app.telegram.output import send_message
+from app.core.fill_waiters import get_fill_registry
 
 TZ = ZoneInfo(TIMEZONE)
 MAX_ORDER_AGE_DAYS = 6
@@ -41,6 +42,7 @@ async def cleanup_old_orders():
             try:
                 # Cancel all orders for this symbol
                 await bybit.cancel_all(STRICT_CONFIG.category, symbol)
+                get_fill_registry().cancel_symbol(symbol)
                 
                 # Mark as DONE/CANCELLED in database
                 await db.execute("""
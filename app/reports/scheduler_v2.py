@@ -4,8 +4,6 @@ import asyncio
 from datetime import datetime, time
 from typing import Dict, Any
 import pytz
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from app.core.logging import system_logger
 from app.reports.generator_v2 import ReportGeneratorV2
 from app.telegram.output import send_message
@@ -14,7 +12,9 @@ class ReportSchedulerV2:
     """Advanced report scheduler with exact client requirements."""
     
     def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+        # APScheduler is imported and the scheduler built in start(), so
+        # creating this object (and importing the module) stays cheap.
+        self.scheduler = None
         self.report_generator = ReportGeneratorV2()
         self.stockholm_tz = pytz.timezone('Europe/Stockholm')
         self.running = False
@@ -22,6 +22,12 @@ class ReportSchedulerV2:
     async def start(self):
         """Start the report scheduler."""
         try:
+            from apscheduler.schedulers.asyncio import AsyncIOScheduler
+            from apscheduler.triggers.cron import CronTrigger
+            
+            if self.scheduler is None:
+                self.scheduler = AsyncIOScheduler()
+            
             # Daily report at 08:00 Stockholm time
             self.scheduler.add_job(
                 self._send_daily_report,
@@ -1,45 +1,243 @@
-import asyncio, sqlite3
+"""
+Startup recovery: re-attach the FSMs of trades that were open before a restart.
+
+The pipeline makes one batched account snapshot and matches every trade in
+memory, instead of querying the exchange per trade:
+
+1. Load trades in a non-terminal state from the database (own shard only).
+2. Snapshot: positions, open orders and executions since the last journal
+   entry, fetched concurrently once (get_startup_snapshot). The journal
+   reconciliation that runs just before reuses the same snapshot.
+3. Match each trade (newest first per symbol/side):
+   - position on its side  -> RUNNING (TP_SL_PLACED if no exit orders rest)
+   - resting entry orders  -> ENTRY_FILLED, waiting on those orderLinkIds
+   - neither               -> closed in the database
+4. Re-attach FSMs with bounded concurrency (RESUME_CONCURRENCY) and start
+   them.
+
+Time-to-ready (start of resume -> all FSMs started) and the match
+counts are logged and kept in get_resume_report().
+"""
+
+import asyncio
+import os
+import sqlite3
+import time
 from decimal import Decimal
-from app.strategies.trailing_v2 import TrailingStopStrategyV2
-from app.strategies.hedge_v2 import HedgeStrategyV2
-from app.strategies.breakeven_v2 import BreakevenStrategyV2
-from app.storage.db import DB_PATH
+from typing import Any, Dict, List, Optional
+
+from app.core.fill_waiters import entry_link_prefix
+from app.core.logging import system_logger
+from app.storage.db import aiosqlite, DB_PATH
+
+RESUME_CONCURRENCY = int(os.getenv("RESUME_CONCURRENCY", "8"))
+
+# Terminal states are CLOSED/ERROR (FSM) and DONE (closed via update_trade_close);
+# OPEN is written by older versions
+RESUMABLE_STATES = ("ENTRY_PLACED", "ENTRY_FILLED", "TP_SL_PLACED", "RUNNING", "HEDGE_ACTIVE", "OPEN")
+
+# Bybit only serves executions from the last 7 days
+_EXECUTION_WINDOW_MS = 7 * 24 * 3600 * 1000
+
+_snapshot_task: Optional[asyncio.Task] = None
+_last_report: Dict[str, Any] = {}
+
+
+async def _fetch_startup_snapshot() -> Optional[Dict[str, Any]]:
+    from app.core.journal import get_append_only_journal
+    from app.core.websocket_gap_detector import get_gap_detector
+
+    started = time.perf_counter()
+    since_ms = get_append_only_journal().last_entry_time_ms()
+    if since_ms is not None:
+        since_ms = max(since_ms, int(time.time() * 1000) - _EXECUTION_WINDOW_MS + 60_000)
+    snapshot = await get_gap_detector().fetch_snapshot(since_ms=since_ms)
+    if snapshot is not None:
+        snapshot["since_ms"] = since_ms
+        snapshot["fetch_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return snapshot
+
+
+async def get_startup_snapshot() -> Optional[Dict[str, Any]]:
+    """The startup account snapshot, fetched once and shared by all startup steps."""
+    global _snapshot_task
+    if _snapshot_task is None:
+        _snapshot_task = asyncio.create_task(_fetch_startup_snapshot())
+    return await asyncio.shield(_snapshot_task)
+
+
+def clear_startup_snapshot():
+    """Drop the startup snapshot (it is stale once trades are running)."""
+    global _snapshot_task
+    _snapshot_task = None
+
+
+_TRADE_COLUMNS = ("trade_id", "symbol", "direction", "entry_price", "size", "leverage", "channel_name", "state")
+
+
+async def _load_resumable_trades() -> List[Dict[str, Any]]:
+    placeholders = ",".join("?" for _ in RESUMABLE_STATES)
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            async with db.execute(
+                "SELECT trade_id,symbol,direction,COALESCE(avg_entry,entry_price) AS entry_price,"
+                "COALESCE(position_size,size) AS size,leverage,channel_name,state "
+                f"FROM trades WHERE state IN ({placeholders}) ORDER BY created_at DESC, trade_id DESC",
+                RESUMABLE_STATES,
+            ) as cur:
+                rows = await cur.fetchall()
+    except sqlite3.OperationalError as e:
+        # No trades table yet (fresh install)
+        system_logger.warning(f"No trades to resume: {e}")
+        return []
+
+    from app.runtime.sharding import owns_symbol
+    trades = [dict(zip(_TRADE_COLUMNS, row)) for row in rows]
+    return [trade for trade in trades if owns_symbol(trade["symbol"])]
 
-async def resume_open_trades():
+
+def match_trades(trades: List[Dict[str, Any]], snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Decide in memory how each trade resumes.
+
+    `trades` must be newest first: a position is claimed by the newest trade
+    on its symbol/side, older trades on it are stale.
+    """
+    positions = {}
+    for position in snapshot.get("positions") or []:
+        if Decimal(str(position.get("size") or "0")) > 0:
+            positions[(position.get("symbol"), position.get("side"))] = position
+
+    orders_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+    for order in snapshot.get("orders") or []:
+        orders_by_symbol.setdefault(order.get("symbol"), []).append(order)
+
+    plans = []
+    claimed = set()
+    for trade in trades:
+        symbol = trade["symbol"]
+        side = "Buy" if trade["direction"] == "LONG" else "Sell"
+        orders = orders_by_symbol.get(symbol, [])
+        entry_prefix = f"{entry_link_prefix(trade['trade_id'])}_"
+        entries = [o for o in orders if (o.get("orderLinkId") or "").startswith(entry_prefix)]
+        position = positions.get((symbol, side))
+
+        if position is not None and (symbol, side) not in claimed:
+            claimed.add((symbol, side))
+            has_exits = any(o.get("reduceOnly") or o.get("stopOrderType") for o in orders)
+            plans.append({"trade": trade, "action": "RUNNING" if has_exits else "TP_SL_PLACED", "position": position})
+        elif entries:
+            plans.append({"trade": trade, "action": "ENTRY_FILLED", "entries": entries})
+        else:
+            plans.append({"trade": trade, "action": "STALE"})
+    return plans
+
+
+def _signal_data(trade: Dict[str, Any], plan: Dict[str, Any]) -> Dict[str, Any]:
+    """Signal data for TradeFSM.restore (mode and TP/SL are not persisted)."""
+    position = plan.get("position") or {}
+    leverage = trade.get("leverage") or position.get("leverage") or 10
+    return {
+        "symbol": trade["symbol"],
+        "direction": trade["direction"],
+        "mode": "FIXED",
+        "entries": [str(trade.get("entry_price") or position.get("avgPrice") or "0")],
+        "leverage": Decimal(str(leverage)),
+        "channel_name": trade.get("channel_name") or "RESUMED",
+        "resumed": True
+    }
+
+
+async def _reattach(plan: Dict[str, Any], semaphore: asyncio.Semaphore):
+    """Rebuild and start one trade's FSM."""
+    from app.core.strict_fsm import TradeFSM, TradeState
+    from app.core.symbol_registry import get_symbol_registry
+    from app.core.trade_limiter import get_trade_limiter
+
+    trade = plan["trade"]
+    async with semaphore:
+        # Instrument info is needed by every exit/strategy order
+        await get_symbol_registry().get_symbol_info(trade["symbol"])
+
+        position = plan.get("position")
+        if position is not None:
+            entry_price = Decimal(str(position.get("avgPrice") or "0"))
+            size = Decimal(str(position.get("size") or "0"))
+            link_ids = ()
+        else:
+            entry_price = Decimal(str(trade.get("entry_price") or "0"))
+            size = Decimal(str(trade.get("size") or "0"))
+            link_ids = [o.get("orderLinkId") for o in plan["entries"]]
+
+        fsm = TradeFSM.restore(
+            trade["trade_id"], _signal_data(trade, plan), TradeState(plan["action"]),
+            entry_price, size, entry_link_ids=link_ids
+        )
+        get_trade_limiter().start_trade(fsm.trade_id, trade["symbol"])
+
+    task = asyncio.create_task(fsm.run())
+    resume_open_trades._active_tasks.add(task)
+    task.add_done_callback(resume_open_trades._active_tasks.discard)
+    return fsm
+
+
+async def resume_open_trades(concurrency: int = RESUME_CONCURRENCY) -> Dict[str, Any]:
+    """Resume all open trades of this process; returns the resume report."""
+    global _last_report
+    if not hasattr(resume_open_trades, '_active_tasks'):
+        resume_open_trades._active_tasks = set()
+
+    started = time.perf_counter()
+    report = {"trades": 0, "running": 0, "pending_entries": 0, "stale": 0, "failed": 0,
+              "snapshot_ms": 0.0, "time_to_ready_ms": 0.0}
     try:
-        def _sync_operation():
-            with sqlite3.connect(DB_PATH) as db:
-                db.execute("""CREATE TABLE IF NOT EXISTS trades(
-                    trade_id TEXT PRIMARY KEY, symbol TEXT, direction TEXT,
-                    avg_entry REAL, position_size REAL, leverage REAL,
-                    channel_name TEXT, realized_pnl REAL DEFAULT 0, state TEXT
-                )""")
-                cur = db.execute("SELECT trade_id,symbol,direction,avg_entry,position_size,leverage,channel_name FROM trades WHERE state='OPEN'")
-                return cur.fetchall()
-        
-        loop = asyncio.get_event_loop()
-        rows = await loop.run_in_executor(None, _sync_operation)
-        
-        for (tid,sym,dir_,avg,pos,lev,chan) in rows:
-            trail = TrailingStopStrategyV2(tid, sym, dir_, Decimal(str(avg)), Decimal(str(pos)), chan)
-            hedge = HedgeStrategyV2(tid, sym, dir_, Decimal(str(avg)), Decimal(str(pos)), int(lev), chan)
-            tp2   = BreakevenStrategyV2(tid, sym, dir_, Decimal(str(avg)), chan)
-            # Create tasks with proper cleanup tracking
-            trail_task = asyncio.create_task(trail.run())
-            hedge_task = asyncio.create_task(hedge.run())
-            tp2_task = asyncio.create_task(tp2.run())
-            
-            # Store tasks for cleanup
-            if not hasattr(resume_open_trades, '_active_tasks'):
-                resume_open_trades._active_tasks = set()
-            
-            resume_open_trades._active_tasks.update([trail_task, hedge_task, tp2_task])
-            
-            # Add done callbacks to remove completed tasks
-            for task in [trail_task, hedge_task, tp2_task]:
-                task.add_done_callback(lambda t: resume_open_trades._active_tasks.discard(t))
+        trades = await _load_resumable_trades()
+        report["trades"] = len(trades)
+        if trades:
+            snapshot = await get_startup_snapshot()
+            if snapshot is None or snapshot.get("positions") is None or snapshot.get("orders") is None:
+                # Without positions and orders nothing can be matched safely
+                report["failed"] = len(trades)
+                system_logger.error("Resume skipped: startup snapshot unavailable", {"trades": len(trades)})
+            else:
+                report["snapshot_ms"] = snapshot.get("fetch_ms", 0.0)
+                plans = match_trades(trades, snapshot)
+
+                stale = [p["trade"]["trade_id"] for p in plans if p["action"] == "STALE"]
+                if stale:
+                    from app.storage.db import mark_trades_closed
+                    await mark_trades_closed(stale)
+                    system_logger.info(f"Closed {len(stale)} stale trades (no position, no entry orders)", {
+                        "trade_ids": stale
+                    })
+
+                live = [p for p in plans if p["action"] != "STALE"]
+                semaphore = asyncio.Semaphore(max(1, concurrency))
+                results = await asyncio.gather(*(_reattach(p, semaphore) for p in live), return_exceptions=True)
+                for plan, result in zip(live, results):
+                    if isinstance(result, BaseException):
+                        report["failed"] += 1
+                        system_logger.error(f"Failed to resume trade {plan['trade']['trade_id']}: {result}")
+                    elif plan["action"] == "ENTRY_FILLED":
+                        report["pending_entries"] += 1
+                    else:
+                        report["running"] += 1
+                report["stale"] = len(stale)
     except Exception as e:
-        system_logger.error(f"Error resuming trade strategies: {e}", exc_info=True)
+        system_logger.error(f"Error resuming open trades: {e}", exc_info=True)
+    finally:
+        clear_startup_snapshot()
+
+    report["time_to_ready_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    _last_report = report
+    system_logger.info(f"Trades resumed, ready in {report['time_to_ready_ms']} ms", report)
+    return report
+
+
+def get_resume_report() -> Dict[str, Any]:
+    """Report of the last resume (counts and time-to-ready)."""
+    return dict(_last_report)
+
 
 async def cleanup_resume_tasks():
     """Clean up all active resume tasks"""
@@ -52,4 +250,4 @@ async def cleanup_resume_tasks():
                     task.cancel()
             # Wait for tasks to complete
             await asyncio.gather(*active_tasks, return_exceptions=True)
-            resume_open_trades._active_tasks.clear()
\ No newline at end of file
+            resume_open_trades._active_tasks.clear()
@@ -0,0 +1,483 @@
+"""
+Horizontal sharding of trades across worker processes.
+
+Supervisor mode (``python start.py --shards N``) runs:
+
+- one ingress process: Telegram client, signal parsing, health API, reports
+- N trade-worker processes: TradeFSMs, strategies, Bybit streams
+
+Each worker owns a stable hash-partition of symbols (crc32(symbol) % N), so
+every trade for a symbol lives in one process and per-symbol state (price
+stream, strategy scheduler, simulated TP/SL ladders) is never split.
+
+Ingress and workers talk over a localhost TCP connection (asyncio streams,
+so it works on Windows too). Messages are small dicts, pickled into
+length-prefixed frames signed with HMAC-SHA256 under a per-run key; a frame
+that fails verification is never unpickled.
+
+    ingress -> worker   snapshot  read-only instrument list (sent on connect
+                                  and whenever the ingress registry refreshes)
+                        signal    parsed signal to run as a TradeFSM
+    worker -> ingress   health    periodic shard heartbeat (shown in /status)
+                        telegram  outgoing message (only ingress owns Telegram)
+                        trade_failed  FSM failure, reported to the channel
+
+
+The role of the current process comes from COPYBOT_ROLE (standalone when
+unset), set by start.py.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import os
+import pickle
+import struct
+import time
+import zlib
+from typing import Dict, Any, Optional, List, Tuple
+
+from app.core.logging import system_logger
+
+ROLE_STANDALONE = "standalone"
+ROLE_INGRESS = "ingress"
+ROLE_WORKER = "worker"
+
+DEFAULT_BASE_PORT = 8790
+HEARTBEAT_INTERVAL = 5.0
+# A heartbeat this old no longer counts (one beat plus delivery jitter)
+HEARTBEAT_MAX_AGE = HEARTBEAT_INTERVAL * 1.5
+SNAPSHOT_REFRESH_INTERVAL = 300.0
+
+
+def get_process_role() -> str:
+    """Role of this process (standalone, ingress or worker)."""
+    return os.getenv("COPYBOT_ROLE", ROLE_STANDALONE)
+
+
+def get_shard_count() -> int:
+    return int(os.getenv("COPYBOT_SHARDS", "1"))
+
+
+def get_shard_id() -> int:
+    return int(os.getenv("COPYBOT_SHARD_ID", "0"))
+
+
+def shard_for_symbol(symbol: str, shard_count: int) -> int:
+    """Stable symbol -> shard mapping (same in every process, unlike hash())."""
+    return zlib.crc32(symbol.upper().encode("utf-8")) % shard_count
+
+
+def owns_symbol(symbol: str) -> bool:
+    """Whether this process is responsible for trades on `symbol`."""
+    role = get_process_role()
+    if role == ROLE_WORKER:
+        return shard_for_symbol(symbol, get_shard_count()) == get_shard_id()
+    return role == ROLE_STANDALONE
+
+
+def _shard_address(shard_id: int) -> Tuple[str, int]:
+    base_port = int(os.getenv("COPYBOT_SHARD_BASE_PORT", str(DEFAULT_BASE_PORT)))
+    return ("127.0.0.1", base_port + shard_id)
+
+
+def _authkey() -> bytes:
+    key = os.getenv("COPYBOT_SHARD_AUTHKEY")
+    if not key:
+        raise RuntimeError("COPYBOT_SHARD_AUTHKEY not set (start shards via start.py --shards N)")
+    return bytes.fromhex(key)
+
+
+async def _write_frame(writer: asyncio.StreamWriter, message: Dict[str, Any], authkey: bytes):
+    payload = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+    mac = hmac.new(authkey, payload, hashlib.sha256).digest()
+    writer.write(struct.pack(">I", len(payload)) + mac + payload)
+    await writer.drain()
+
+
+async def _read_frame(reader: asyncio.StreamReader, authkey: bytes) -> Dict[str, Any]:
+    header = await reader.readexactly(4 + 32)
+    payload = await reader.readexactly(struct.unpack(">I", header[:4])[0])
+    if not hmac.compare_digest(header[4:], hmac.new(authkey, payload, hashlib.sha256).digest()):
+        raise ConnectionError("IPC frame failed authentication")
+    return pickle.loads(payload)
+
+
+def build_instrument_snapshot(registry) -> List[Dict[str, Any]]:
+    """Raw instrument dicts from the registry (what workers load read-only)."""
+    return [info.data for info in registry._symbols.values()]
+
+
+class ShardRouter:
+    """Ingress side: routes parsed signals to the worker owning the symbol."""
+
+    def __init__(self, shard_count: int, addresses: Optional[List[Tuple[str, int]]] = None,
+                 authkey: Optional[bytes] = None):
+        self.shard_count = shard_count
+        self.addresses = addresses or [_shard_address(i) for i in range(shard_count)]
+        self._authkey = authkey
+        self._conns: Dict[int, Any] = {}
+        self._send_locks: Dict[int, asyncio.Lock] = {i: asyncio.Lock() for i in range(shard_count)}
+        self._health: Dict[int, Dict[str, Any]] = {}
+        self._routed_since_heartbeat: Dict[int, int] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+        self.signals_routed = 0
+        self.signals_rejected = 0
+
+    async def start(self):
+        """Connect to every worker (they may still be booting) and push the snapshot."""
+        self._running = True
+        for shard_id in range(self.shard_count):
+            self._tasks.append(asyncio.create_task(self._maintain(shard_id)))
+        self._tasks.append(asyncio.create_task(self._refresh_snapshot_loop()))
+        system_logger.info("Shard router started", {
+            'shards': self.shard_count,
+            'addresses': [f"{host}:{port}" for host, port in self.addresses]
+        })
+
+    async def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for writer in self._conns.values():
+            writer.close()
+        self._conns.clear()
+
+    async def _connect(self, shard_id: int):
+        host, port = self.addresses[shard_id]
+        delay = 0.5
+        while self._running:
+            try:
+                return await asyncio.open_connection(host, port)
+            except OSError:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 5.0)
+        return None, None
+
+    async def _maintain(self, shard_id: int):
+        """Keep one connection per shard; read its messages until it drops."""
+        authkey = self._authkey or _authkey()
+        while self._running:
+            reader, writer = await self._connect(shard_id)
+            if writer is None:
+                return
+            self._conns[shard_id] = writer
+            system_logger.info(f"Connected to trade shard {shard_id}")
+            try:
+                await self._send(shard_id, {"type": "snapshot", "instruments": await self._get_snapshot()})
+                while self._running:
+                    await self._handle(shard_id, await _read_frame(reader, authkey))
+            except asyncio.CancelledError:
+                raise
+            except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+                system_logger.error(f"Trade shard {shard_id} disconnected: {e}")
+            except Exception as e:
+                system_logger.error(f"Trade shard {shard_id} channel error: {e}", exc_info=True)
+            finally:
+                self._conns.pop(shard_id, None)
+                health = self._health.get(shard_id)
+                if health is not None:
+                    health['connected'] = False
+                writer.close()
+
+    async def _send(self, shard_id: int, message: Dict[str, Any]) -> bool:
+        writer = self._conns.get(shard_id)
+        if writer is None:
+            return False
+        try:
+            async with self._send_locks[shard_id]:
+                await _write_frame(writer, message, self._authkey or _authkey())
+            return True
+        except (ConnectionError, OSError) as e:
+            system_logger.warning(f"Send to trade shard {shard_id} failed: {e}")
+            return False
+
+    async def _get_snapshot(self) -> List[Dict[str, Any]]:
+        from app.core.symbol_registry import get_symbol_registry
+        registry = get_symbol_registry()
+        await registry.update_symbols()
+        return build_instrument_snapshot(registry)
+
+    async def _refresh_snapshot_loop(self):
+        """The ingress registry is the only one that polls Bybit; workers get pushed copies."""
+        while self._running:
+            await asyncio.sleep(SNAPSHOT_REFRESH_INTERVAL)
+            try:
+                snapshot = await self._get_snapshot()
+                for shard_id in list(self._conns):
+                    await self._send(shard_id, {"type": "snapshot", "instruments": snapshot})
+            except Exception as e:
+                system_logger.warning(f"Instrument snapshot refresh failed: {e}")
+
+    async def _handle(self, shard_id: int, message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "health":
+            message["connected"] = True
+            message["received_at"] = time.monotonic()
+            self._health[shard_id] = message
+            self._routed_since_heartbeat.pop(shard_id, None)
+        elif kind == "telegram":
+            from app.telegram.output import send_message
+            await send_message(message["text"], message.get("target_chat_id"), **message.get("kwargs", {}))
+        elif kind == "trade_failed":
+            from app.telegram.strict_client import get_strict_telegram_client
+            client = await get_strict_telegram_client()
+            await client._send_error_message(message["signal"], message["error"])
+        else:
+            system_logger.warning(f"Unknown message from shard {shard_id}: {kind}")
+
+    def active_trades(self) -> int:
+        """Trades open across all shards (from heartbeats no older than HEARTBEAT_MAX_AGE)."""
+        now = time.monotonic()
+        return sum(
+            h.get('active_trades', 0) for h in self._health.values()
+            if now - h['received_at'] <= HEARTBEAT_MAX_AGE
+        )
+
+    def pending_trades(self) -> int:
+        """Signals routed since each shard's last heartbeat (not yet in its active_trades)."""
+        return sum(self._routed_since_heartbeat.values())
+
+    async def dispatch(self, signal_data: Dict[str, Any]) -> Optional[int]:
+        """Send a signal to its shard; returns the shard id, or None if it could not be routed."""
+        from app.core.strict_config import STRICT_CONFIG
+
+        symbol = signal_data['symbol']
+        shard_id = shard_for_symbol(symbol, self.shard_count)
+
+        # The trade limit is global; each worker only sees its own trades, and a
+        # burst of signals lands before the next heartbeat reports them
+        if self.active_trades() + self.pending_trades() >= STRICT_CONFIG.max_trades:
+            self.signals_rejected += 1
+            system_logger.warning("Signal rejected: trade limit reached across shards", {
+                'symbol': symbol,
+                'active_trades': self.active_trades(),
+                'pending_trades': self.pending_trades(),
+                'max_trades': STRICT_CONFIG.max_trades
+            })
+            return None
+
+        if not await self._send(shard_id, {"type": "signal", "signal": signal_data}):
+            self.signals_rejected += 1
+            system_logger.error(f"Trade shard {shard_id} unavailable, signal for {symbol} not routed")
+            return None
+
+        self._routed_since_heartbeat[shard_id] = self._routed_since_heartbeat.get(shard_id, 0) + 1
+        self.signals_routed += 1
+        system_logger.info("Signal routed to trade shard", {'symbol': symbol, 'shard': shard_id})
+        return shard_id
+
+    def get_status(self) -> Dict[str, Any]:
+        """Per-shard health for /status."""
+        now = time.monotonic()
+        shards = {}
+        for shard_id in range(self.shard_count):
+            health = self._health.get(shard_id)
+            if health is None:
+                shards[str(shard_id)] = {'connected': shard_id in self._conns, 'healthy': False}
+                continue
+            age = now - health['received_at']
+            shards[str(shard_id)] = {
+                'connected': shard_id in self._conns,
+                'healthy': shard_id in self._conns and age < HEARTBEAT_INTERVAL * 3,
+                'heartbeat_age_s': round(age, 1),
+                'pid': health.get('pid'),
+                'active_trades': health.get('active_trades', 0),
+                'symbols': health.get('symbols', []),
+                'instruments': health.get('instruments', 0),
+                'strategy_scheduler': health.get('strategy_scheduler'),
+                'uptime_s': health.get('uptime_s')
+            }
+        return {
+            'shard_count': self.shard_count,
+            'healthy_shards': sum(1 for s in shards.values() if s['healthy']),
+            'active_trades': self.active_trades(),
+            'pending_trades': self.pending_trades(),
+            'signals_routed': self.signals_routed,
+            'signals_rejected': self.signals_rejected,
+            'shards': shards
+        }
+
+
+class ShardWorker:
+    """Worker side: runs the TradeFSMs for one symbol partition."""
+
+    def __init__(self, shard_id: int, shard_count: int, address: Optional[Tuple[str, int]] = None,
+                 authkey: Optional[bytes] = None):
+        self.shard_id = shard_id
+        self.shard_count = shard_count
+        self.address = address or _shard_address(shard_id)
+        self._authkey = authkey
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._conn: Optional[asyncio.StreamWriter] = None
+        self._send_lock = asyncio.Lock()
+        self._snapshot_ready = asyncio.Event()
+        self.active_trades: Dict[str, Any] = {}
+        self._tasks: set = set()
+        self._started_at = time.monotonic()
+
+    async def listen(self) -> Tuple[str, int]:
+        """Bind the listening socket (before the ingress starts connecting)."""
+        if self._server is None:
+            host, port = self.address
+            self._server = await asyncio.start_server(self._on_connection, host, port)
+            self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    async def serve(self):
+        """Serve the ingress connection until cancelled (a reconnect replaces it)."""
+        await self.listen()
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        system_logger.info("Trade shard listening", {
+            'shard': self.shard_id,
+            'shards': self.shard_count,
+            'address': f"{self.address[0]}:{self.address[1]}"
+        })
+        try:
+            await self._server.serve_forever()
+        finally:
+            heartbeat.cancel()
+            self._server.close()
+            if self._conn is not None:
+                self._conn.close()
+
+    async def _on_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        authkey = self._authkey or _authkey()
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = writer
+        system_logger.info(f"Ingress connected to trade shard {self.shard_id}")
+        try:
+            while True:
+                await self._handle(await _read_frame(reader, authkey))
+        except (asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            system_logger.warning(f"Ingress disconnected from shard {self.shard_id}: {e}")
+        finally:
+            if self._conn is writer:
+                self._conn = None
+            writer.close()
+
+    async def _handle(self, message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "snapshot":
+            from app.core.symbol_registry import get_symbol_registry
+            get_symbol_registry().load_snapshot(message["instruments"])
+            self._snapshot_ready.set()
+        elif kind == "signal":
+            signal_data = message["signal"]
+            if shard_for_symbol(signal_data['symbol'], self.shard_count) != self.shard_id:
+                system_logger.error("Signal routed to wrong shard", {
+                    'symbol': signal_data['symbol'],
+                    'shard': self.shard_id
+                })
+                return
+            await self._snapshot_ready.wait()
+            self._start_trade(signal_data)
+        else:
+            system_logger.warning(f"Unknown message on shard {self.shard_id}: {kind}")
+
+    def _start_trade(self, signal_data: Dict[str, Any]):
+        from app.core.strict_fsm import TradeFSM
+        fsm = TradeFSM(signal_data)
+        self.active_trades[fsm.trade_id] = fsm
+        system_logger.info("Starting trade FSM", {
+            'trade_id': fsm.trade_id,
+            'symbol': signal_data['symbol'],
+            'direction': signal_data['direction'],
+            'mode': signal_data.get('mode'),
+            'shard': self.shard_id
+        })
+        task = asyncio.create_task(self._run_trade(fsm))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_trade(self, fsm):
+        error = None
+        try:
+            if not await fsm.run():
+                error = "Trade execution failed"
+                system_logger.error("Trade FSM failed", {
+                    'trade_id': fsm.trade_id,
+                    'symbol': fsm.signal_data['symbol'],
+                    'final_state': fsm.state.value
+                })
+        except Exception as e:
+            error = str(e)
+            system_logger.error(f"Trade FSM execution error: {e}", {
+                'trade_id': fsm.trade_id,
+                'symbol': fsm.signal_data.get('symbol', 'unknown')
+            }, exc_info=True)
+        finally:
+            self.active_trades.pop(fsm.trade_id, None)
+        if error:
+            await self.send({"type": "trade_failed", "signal": fsm.signal_data, "error": error})
+
+    async def send(self, message: Dict[str, Any]) -> bool:
+        writer = self._conn
+        if writer is None:
+            return False
+        try:
+            async with self._send_lock:
+                await _write_frame(writer, message, self._authkey or _authkey())
+            return True
+        except (ConnectionError, OSError) as e:
+            system_logger.warning(f"Shard {self.shard_id} send failed: {e}")
+            return False
+
+    async def forward_telegram(self, text: str, target_chat_id: Optional[int], **kwargs) -> Optional[int]:
+        """Telegram output from this shard is sent by the ingress process."""
+        sent = await self.send({"type": "telegram", "text": text, "target_chat_id": target_chat_id, "kwargs": kwargs})
+        if not sent:
+            system_logger.warning("Telegram message dropped: ingress not connected", {
+                'shard': self.shard_id,
+                'template_name': kwargs.get('template_name', ''),
+                'trade_id': kwargs.get('trade_id', '')
+            })
+        return None
+
+    def get_health(self) -> Dict[str, Any]:
+        from app.core.symbol_registry import get_symbol_registry
+        health = {
+            'type': 'health',
+            'shard': self.shard_id,
+            'pid': os.getpid(),
+            'active_trades': len(self.active_trades),
+            'symbols': sorted({fsm.signal_data['symbol'] for fsm in self.active_trades.values()}),
+            'instruments': len(get_symbol_registry()._symbols),
+            'uptime_s': round(time.monotonic() - self._started_at, 1)
+        }
+        from app.core import strategy_scheduler
+        if strategy_scheduler._strategy_scheduler is not None:
+            health['strategy_scheduler'] = strategy_scheduler._strategy_scheduler.get_stats()
+        return health
+
+    async def _heartbeat_loop(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+            if self._conn is not None:
+                await self.send(self.get_health())
+
+
+# Global instances (one of them per process, depending on role)
+_shard_router: Optional[ShardRouter] = None
+_shard_worker: Optional[ShardWorker] = None
+
+
+def get_shard_router() -> Optional[ShardRouter]:
+    """Ingress router (None unless this is the ingress process)."""
+    global _shard_router
+    if _shard_router is None and get_process_role() == ROLE_INGRESS:
+        _shard_router = ShardRouter(get_shard_count())
+    return _shard_router
+
+
+def get_shard_worker() -> Optional[ShardWorker]:
+    """This process's shard worker (None unless this is a worker process)."""
+    global _shard_worker
+    if _shard_worker is None and get_process_role() == ROLE_WORKER:
+        _shard_worker = ShardWorker(get_shard_id(), get_shard_count())
+    return _shard_worker
@@ -0,0 +1,124 @@
+"""
+Content-addressed cache of parsed signals.
+
+The same signal text is often cross-posted to several whitelisted channels
+(or re-sent with only whitespace changed). Each copy used to go through the
+full StrictSignalParser.parse_signal() path: pattern matching, the
+is_symbol_available() lookup and the leverage policy. The parse result does
+not depend on the channel, so it is cached by a hash of the normalized text:
+
+- key: blake2b of the text with line endings unified and whitespace at line
+  ends stripped (changes the patterns cannot see)
+- value: the signal dict without its per-message fields (channel_name,
+  raw_message); a hit returns a copy with those applied for the new message
+- bounded LRU (PARSE_CACHE_SIZE entries, 0 disables) with a TTL
+  (PARSE_CACHE_TTL seconds) so symbol availability is re-checked regularly
+
+Only accepted signals are cached, and not those validated against a live
+ticker price (MARKET entries with an explicit SL). Hits, misses and the hit
+ratio are in get_stats().
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", "512"))
+PARSE_CACHE_TTL = float(os.getenv("PARSE_CACHE_TTL", "300"))
+
+# Fields of a parsed signal that belong to the message, not to its text
+MESSAGE_FIELDS = ("channel_name", "raw_message")
+
+
+def content_key(message: str) -> str:
+    """Hash of a message's text, equal for copies that parse the same."""
+    lines = message.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    normalized = "\n".join(line.rstrip() for line in lines).strip()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ParseCache:
+    """Bounded LRU of channel-independent parse results with a TTL."""
+
+    def __init__(self, max_entries: int = PARSE_CACHE_SIZE, ttl_seconds: float = PARSE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (stored at, signal without message fields)
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def get(self, key: str, channel_name: str, message: str) -> Optional[Dict[str, Any]]:
+        """Cached signal for `key` with this message's fields applied, or None."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, signal = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+
+        result = dict(signal)
+        result["entries"] = list(signal["entries"])
+        result["tps"] = list(signal["tps"])
+        result["channel_name"] = channel_name
+        result["raw_message"] = message
+        return result
+
+    def put(self, key: str, signal: Dict[str, Any]):
+        if not self.enabled:
+            return
+        stored = {k: v for k, v in signal.items() if k not in MESSAGE_FIELDS}
+        stored["entries"] = list(stored["entries"])
+        stored["tps"] = list(stored["tps"])
+        self._entries[key] = (time.monotonic(), stored)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+
+# Global parse cache instance
+_parse_cache: Optional[ParseCache] = None
+
+
+def get_parse_cache() -> ParseCache:
+    """Get global parse cache."""
+    global _parse_cache
+    if _parse_cache is None:
+        _parse_cache = ParseCache()
+    return _parse_cache
@@ -0,0 +1,247 @@
+"""
+Optional process pool for the CPU part of signal parsing.
+
+StrictSignalParser.parse_signal() runs dozens of regexes per message
+(extract_fields) before it validates the fields against Bybit. On a busy
+ingress a pathological message (long cross-posts, backtracking patterns)
+holds the event loop for as long as the regexes take. With PARSE_WORKERS > 0
+the pattern matching runs in pre-started worker processes instead:
+
+- workers are spawned at startup (start_parse_pool) and each compiles every
+  parser pattern once in its initializer, so the first message pays nothing
+- each message gets PARSE_TIMEOUT seconds from when a worker takes it (at
+  most one message per worker is in flight, later ones wait for a free
+  worker outside the budget); a message over budget is dropped (logged with
+  its channel) and the pool is recycled, since the worker stuck on it cannot
+  be interrupted. Messages in flight on the other workers or waiting for one
+  are parsed on the new pool, or inline until it is up
+- if the pool is disabled, not started yet or broken, messages are parsed
+  inline as before
+
+Per-message CPU time (thread CPU of the parse, in the worker or inline) is
+returned to parse_signal() for its log line and summarized in get_stats().
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.logging import system_logger
+
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))         # 0 = parse inline
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "2.0"))     # seconds per message
+PARSE_START_TIMEOUT = float(os.getenv("PARSE_START_TIMEOUT", "30"))
+
+# Parser of this worker process (set by _init_worker)
+_worker_parser = None
+
+
+def _init_worker():
+    """Worker initializer: build the parser and compile its patterns once."""
+    global _worker_parser
+    from app.signals.strict_parser import StrictSignalParser
+    _worker_parser = StrictSignalParser()
+    _worker_parser.warm_up()
+
+
+def _worker_ready() -> int:
+    return os.getpid()
+
+
+def _extract_in_worker(message: str) -> Tuple[Dict[str, Any], float]:
+    """Run the parser's pattern matching; returns (fields, CPU ms)."""
+    started = time.thread_time()
+    fields = _worker_parser.extract_fields(message)
+    return fields, (time.thread_time() - started) * 1000
+
+
+class ParsePool:
+    """Pre-started parser workers with a per-message time budget."""
+
+    # Function run in the workers (module level so it pickles)
+    _target = staticmethod(_extract_in_worker)
+
+    def __init__(self, workers: int = PARSE_WORKERS, timeout: float = PARSE_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None  # one per worker of _executor
+        self._restart_task: Optional[asyncio.Task] = None
+        self._stopped = False
+        self.messages = 0
+        self.pooled = 0
+        self.inline = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+        self.restarts = 0
+        self._cpu_total_ms = 0.0
+        self._cpu_max_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._executor is not None
+
+    async def start(self) -> bool:
+        """Spawn the workers and wait until each has compiled its patterns."""
+        if self.workers <= 0 or self._executor is not None:
+            return self._executor is not None
+        self._stopped = False
+        started = time.perf_counter()
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+        try:
+            # Workers start on demand: one call per worker starts them all now
+            loop = asyncio.get_running_loop()
+            pids = await asyncio.wait_for(
+                asyncio.gather(*[loop.run_in_executor(executor, _worker_ready) for _ in range(self.workers)]),
+                timeout=PARSE_START_TIMEOUT
+            )
+        except asyncio.CancelledError:
+            self._kill(executor)
+            raise
+        except Exception as e:
+            self._kill(executor)
+            system_logger.error(f"Parser pool failed to start, parsing inline: {e}", {
+                'workers': self.workers
+            })
+            return False
+        self._slots = asyncio.Semaphore(self.workers)
+        self._executor = executor
+        system_logger.info("Parser pool started", {
+            'workers': self.workers,
+            'processes': len(set(pids)),
+            'timeout_s': self.timeout,
+            'start_ms': round((time.perf_counter() - started) * 1000, 1)
+        })
+        return True
+
+    async def stop(self):
+        self._stopped = True
+        if self._restart_task is not None and not self._restart_task.done():
+            self._restart_task.cancel()
+        executor, self._executor = self._executor, None
+        self._slots = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def extract(self, message: str, channel_name: str = "") -> Tuple[Optional[Dict[str, Any]], float]:
+        """
+        Raw fields of a message and the CPU ms spent on them.
+
+        Returns (None, budget ms) when the message exceeded its time budget.
+        """
+        self.messages += 1
+        while True:
+            executor, slots = self._executor, self._slots
+            if executor is None:
+                return self._extract_inline(message)
+
+            # Wait for a free worker first: the budget only covers the parse itself
+            async with slots:
+                if self._executor is not executor:
+                    continue  # recycled while waiting: use the new pool (or parse inline)
+                try:
+                    loop = asyncio.get_running_loop()
+                    fields, cpu_ms = await asyncio.wait_for(
+                        loop.run_in_executor(executor, self._target, message),
+                        timeout=self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    system_logger.error("Signal parse exceeded time budget, message dropped", {
+                        'channel': channel_name,
+                        'timeout_s': self.timeout,
+                        'length': len(message),
+                        'text': message[:100]
+                    })
+                    self._recycle(executor)
+                    return None, self.timeout * 1000
+                except BrokenProcessPool as e:
+                    if self._executor is not executor:
+                        continue  # killed with its pool by another message's recycle: parse again
+                    self.fallbacks += 1
+                    system_logger.warning(f"Parser pool broken, parsing inline: {e}", {'channel': channel_name})
+                    self._recycle(executor)
+                    return self._extract_inline(message)
+
+            self.pooled += 1
+            self._record_cpu(cpu_ms)
+            return fields, cpu_ms
+
+    def _extract_inline(self, message: str) -> Tuple[Dict[str, Any], float]:
+        from app.signals.strict_parser import get_strict_parser
+        started = time.thread_time()
+        fields = get_strict_parser().extract_fields(message)
+        cpu_ms = (time.thread_time() - started) * 1000
+        self.inline += 1
+        self._record_cpu(cpu_ms)
+        return fields, cpu_ms
+
+    def _record_cpu(self, cpu_ms: float):
+        self._cpu_total_ms += cpu_ms
+        if cpu_ms > self._cpu_max_ms:
+            self._cpu_max_ms = cpu_ms
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        """Replace a pool whose worker is stuck or dead; parse inline meanwhile."""
+        if self._executor is not executor:
+            return  # already recycled by a concurrent message
+        self._executor = None
+        self._slots = None
+        self._kill(executor)
+        if not self._stopped and (self._restart_task is None or self._restart_task.done()):
+            self.restarts += 1
+            self._restart_task = asyncio.create_task(self.start())
+
+    @staticmethod
+    def _kill(executor: ProcessPoolExecutor):
+        # shutdown() does not interrupt a running call, so end the processes first;
+        # calls still in flight then fail with BrokenProcessPool (not cancelled)
+        for process in list((getattr(executor, "_processes", None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        parsed = self.pooled + self.inline
+        return {
+            "workers": self.workers if self.running else 0,
+            "messages": self.messages,
+            "pooled": self.pooled,
+            "inline": self.inline,
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+            "restarts": self.restarts,
+            "cpu_avg_ms": round(self._cpu_total_ms / parsed, 3) if parsed else 0.0,
+            "cpu_max_ms": round(self._cpu_max_ms, 3)
+        }
+
+
+# Global parser pool instance
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """Get global parser pool (inline until start_parse_pool)."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+
+async def start_parse_pool() -> bool:
+    return await get_parse_pool().start()
+
+
+async def stop_parse_pool():
+    if _parse_pool is not None:
+        await _parse_pool.stop()
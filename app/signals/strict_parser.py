@@ -243,6 +243,45 @@ class StrictSignalParser:
         ]
         return any(indicator in message for indicator in take_profit_indicators)
     
+    def extract_fields(self, message: str) -> Dict[str, Any]:
+        """
+        Run every text pattern over a message (CPU only, no I/O).
+        
+        Returns picklable raw fields, so this can run in a parser worker
+        process (app.signals.parse_pool); parse_signal() validates them.
+        """
+        if self._is_take_profit_signal(message):
+            return {'take_profit_signal': True}
+        
+        message_upper = message.upper()
+        symbol = self._extract_symbol(message_upper)
+        if not symbol:
+            return {'symbol': None}
+        
+        from app.core.leverage_policy import LeveragePolicy
+        return {
+            'symbol': symbol,
+            'direction': self._extract_direction(message_upper),
+            'entries': self._extract_entries(message),
+            'tps': self._extract_tps(message, symbol),
+            'sl': self._extract_sl(message),
+            'raw_leverage': self._extract_leverage(message),
+            'mode_hint': self._extract_mode(message_upper),
+            'cross_margin': LeveragePolicy.enforce_isolated_margin_only(message)
+        }
+    
+    def warm_up(self):
+        """Compile every pattern once (re caches compiled patterns per process)."""
+        from app.core.leverage_policy import LeveragePolicy
+        self._extract_symbol("")
+        self._extract_direction("")
+        self._extract_entries("")
+        self._extract_tps("", "BTCUSDT")
+        self._extract_sl("")
+        self._extract_leverage("")
+        self._extract_mode("")
+        LeveragePolicy.enforce_isolated_margin_only("")
+    
     async def parse_signal(self, message: str, channel_name: str) -> Optional[Dict[str, Any]]:
         """
         Parse signal with strict client requirements.
@@ -253,20 +292,44 @@ class StrictSignalParser:
         - If exactly 1 entry, synthesize entry2 = entry ±0.1% in trade direction
         - Mode classification: SWING=x6.00, DYNAMIC≥x7.50, FIXED=explicit
         - Missing SL → set auto-SL = entry ±2% adverse direction + lock leverage x10 (CLIENT SPEC)
+        
+        The pattern matching (extract_fields) runs in the parser worker pool
+        when it is enabled, with a per-message time budget. Accepted signals
+        are cached by text (app.signals.parse_cache), so cross-posted copies
+        skip the parse and the symbol checks.
         """
         try:
+            from app.signals.parse_cache import content_key, get_parse_cache
+            cache = get_parse_cache()
+            cache_key = content_key(message) if cache.enabled else None
+            if cache_key is not None:
+                cached = cache.get(cache_key, channel_name, message)
+                if cached is not None:
+                    system_logger.info("Signal parsed successfully (cached)", {
+                        'symbol': cached['symbol'],
+                        'direction': cached['direction'],
+                        'mode': cached['mode'],
+                        'channel': channel_name,
+                        'cache_key': cache_key
+                    })
+                    return cached
+            
+            from app.signals.parse_pool import get_parse_pool
+            fields, cpu_ms = await get_parse_pool().extract(message, channel_name)
+            if fields is None:
+                # Over the time budget (already logged)
+                return None
+            
             # PERFECTION FIX: Skip Take-Profit signals (not trading signals)
-            if self._is_take_profit_signal(message):
+            if fields.get('take_profit_signal'):
                 system_logger.debug(f"Signal parsing skipped: Take-Profit signal (not a trading signal)", {
                     'text': message[:100],
                     'channel': channel_name
                 })
                 return None
             
-            message_upper = message.upper()
-            
             # Extract symbol (required)
-            symbol = self._extract_symbol(message_upper)
+            symbol = fields['symbol']
             if not symbol:
                 return None
             
@@ -298,12 +361,12 @@ class StrictSignalParser:
                 return None
             
             # Extract direction (required)
-            direction = self._extract_direction(message_upper)
+            direction = fields['direction']
             if not direction:
                 return None
             
             # Extract entries (required, ≥1)
-            entries = self._extract_entries(message)
+            entries = list(fields['entries'])
             if not entries:
                 # For signals without explicit entry prices, use market price
                 system_logger.info("No explicit entry prices found, will use market price", {
@@ -320,8 +383,8 @@ class StrictSignalParser:
                 entries = ["MARKET", "MARKET"]
             
             # Extract TPs and SL
-            tps = self._extract_tps(message, symbol)
-            sl = self._extract_sl(message)
+            tps = fields['tps']
+            sl = fields['sl']
             
             # Log extracted TP/SL for debugging
             system_logger.info(f"Signal parser extracted for {symbol}: TPs={tps}, SL={sl}", {
@@ -343,12 +406,12 @@ class StrictSignalParser:
                 sl = "DEFAULT_SL"  # Special marker for default SL
             
             # Extract leverage and mode
-            raw_leverage = self._extract_leverage(message)
-            mode_hint = self._extract_mode(message_upper)
+            raw_leverage = fields['raw_leverage']
+            mode_hint = fields['mode_hint']
             
             # CRITICAL: Check for Cross margin and reject the signal
             from app.core.leverage_policy import LeveragePolicy
-            if LeveragePolicy.enforce_isolated_margin_only(message):
+            if fields['cross_margin']:
                 system_logger.warning("Signal rejected: Cross margin not allowed", {
                     'text': message[:100],
                     'channel': channel_name,
@@ -357,6 +420,7 @@ class StrictSignalParser:
                 return None
             
             # Validate SL and TP make sense for position direction (if provided)
+            live_price_checked = False  # result depends on the market: not cached
             if sl and sl != "DEFAULT_SL":
                 # Get reference price (first entry or market price)
                 reference_price = None
@@ -364,6 +428,7 @@ class StrictSignalParser:
                     reference_price = to_decimal(entries[0])
                 else:
                     # CRITICAL FIX: For MARKET entries, get current market price for validation
+                    live_price_checked = True
                     from app.bybit.client import get_bybit_client
                     try:
                         client = get_bybit_client()
@@ -466,8 +531,8 @@ class StrictSignalParser:
                 'channel_name': channel_name,
                 'raw_message': message,
                 'has_sl': bool(sl),
-                'synthesized_sl': not bool(self._extract_sl(message)),  # Track if SL was synthesized
-                'synthesized_entry2': len(self._extract_entries(message)) == 1  # Track if entry2 was synthesized
+                'synthesized_sl': not bool(fields['sl']),  # Track if SL was synthesized
+                'synthesized_entry2': len(fields['entries']) == 1  # Track if entry2 was synthesized
             }
             
             system_logger.info("Signal parsed successfully", {
@@ -479,9 +544,13 @@ class StrictSignalParser:
                 'tps_count': len(tps),
                 'has_sl': bool(sl),
                 'synthesized_sl': signal_data['synthesized_sl'],
-                'synthesized_entry2': signal_data['synthesized_entry2']
+                'synthesized_entry2': signal_data['synthesized_entry2'],
+                'parse_cpu_ms': round(cpu_ms, 3)
             })
             
+            if cache_key is not None and not live_price_checked:
+                cache.put(cache_key, signal_data)
+            
             return signal_data
             
         except Exception as e:
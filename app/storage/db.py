@@ -273,11 +273,14 @@ async def _migrate_trades_table(db) -> None:
         pass
 
 
-async def save_trade(trade_id: str, symbol: str, direction: str, entry_price: float, size: float, state: str):
+async def save_trade(trade_id: str, symbol: str, direction: str, entry_price: float, size: float, state: str,
+                     leverage: float = None, channel_name: str = None):
     async with aiosqlite.connect(DB_PATH) as db:
+        # leverage/channel_name are kept so the trade can be resumed after a restart
         await db.execute(
-            "INSERT OR REPLACE INTO trades (trade_id,symbol,direction,avg_entry,position_size,state) VALUES (?,?,?,?,?,?)",
-            (trade_id, symbol, direction, entry_price, size, state),
+            "INSERT OR REPLACE INTO trades (trade_id,symbol,direction,entry_price,size,avg_entry,position_size,leverage,channel_name,state) "
+            "VALUES (?,?,?,?,?,?,?,?,?,?)",
+            (trade_id, symbol, direction, entry_price, size, entry_price, size, leverage, channel_name, state),
         )
         await db.commit()
 
@@ -322,6 +325,16 @@ async def update_trade_close(trade_id: str, realized_pnl: float):
         await db.commit()
 
 
+async def mark_trades_closed(trade_ids):
+    """Close trades found to have neither a position nor open entries (e.g. after a restart)."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.executemany(
+            "UPDATE trades SET closed_at=CURRENT_TIMESTAMP, state='CLOSED' WHERE trade_id=?",
+            [(trade_id,) for trade_id in trade_ids],
+        )
+        await db.commit()
+
+
 # Convenience alias matching API suggested in runbook
 async def close_trade(trade_id: str, realized_pnl: float):
     await update_trade_close(trade_id, realized_pnl)
@@ -15,6 +15,7 @@ class HedgeStrategyV2:
         self.trade_id = trade_id
         self.symbol = symbol
         self.direction = direction.upper()
+        self.is_long = self.direction in ("LONG", "BUY")  # TradeFSM passes LONG/SHORT
         self.original_entry = original_entry
         self.channel_name = channel_name
         from app.bybit.client import get_bybit_client
@@ -29,13 +30,62 @@ class HedgeStrategyV2:
         self.hedge_size: Optional[Decimal] = None
         self.retry_count = 0
         self.max_retries = 3  # Maximum retry attempts for hedge activation
+        
+        # Activation price compiled from original entry (recompiled if a different entry is passed)
+        self._compiled_entry: Optional[Decimal] = None
+        self._activation_price: Optional[Decimal] = None
+        self._tick_scale = None
+        self._activation_ticks: Optional[int] = None
+    
+    def _get_activation_price(self, original_entry: Decimal) -> Decimal:
+        """Absolute price at which the hedge opens (-trigger_pct against the trade)."""
+        if original_entry != self._compiled_entry:
+            move = original_entry * self.trigger_pct / Decimal("100")
+            self._activation_price = original_entry - move if self.is_long else original_entry + move
+            self._compiled_entry = original_entry
+            self._tick_scale = None
+        return self._activation_price
+    
+    def should_activate(self, current_price: Decimal, original_entry: Decimal, at=None) -> bool:
+        """
+        Cheap check (no I/O): has price moved far enough against the trade to hedge?
+        
+        `at` is the same price as PriceTicks (app.core.ticks) for an int compare.
+        """
+        if self.activated:
+            return False
+        if at is not None:
+            above, below = self.tick_band(at.scale, original_entry)
+            return at.floor >= above if below is None else at.ceil <= below
+        activation_price = self._get_activation_price(original_entry)
+        if self.is_long:
+            return current_price <= activation_price
+        return current_price >= activation_price  # SELL
+    
+    def tick_band(self, scale, original_entry: Decimal):
+        """
+        (above, below) activation ticks: fires when a price's floor ticks >=
+        above (short) or ceil ticks <= below (long); (None, None) once activated.
+        """
+        if self.activated:
+            return None, None
+        activation_price = self._get_activation_price(original_entry)
+        if scale is not self._tick_scale:
+            self._tick_scale = scale
+            self._activation_ticks = (scale.floor_ticks(activation_price) if self.is_long
+                                      else scale.ceil_ticks(activation_price))
+        return (None, self._activation_ticks) if self.is_long else (self._activation_ticks, None)
     
     async def check_and_activate(self, current_price: Decimal, original_entry: Decimal) -> bool:
         """Check if hedge should be activated."""
         if self.activated:
             return True
         
-        # First check if position still exists
+        # Compare with the compiled activation price before any REST call
+        if not self.should_activate(current_price, original_entry):
+            return False
+        
+        # Check if position still exists
         try:
             pos = await self.bybit.positions("linear", self.symbol)
             if not pos.get("result", {}).get("list"):
@@ -53,18 +103,14 @@ class HedgeStrategyV2:
             system_logger.error(f"Failed to check position for hedge: {e}")
             return False
         
-        # Calculate current loss percentage
-        if self.direction == "BUY":
+        # Loss percentage for logging/notification only
+        if self.is_long:
             loss_pct = (original_entry - current_price) / original_entry * 100
         else:  # SELL
             loss_pct = (current_price - original_entry) / original_entry * 100
         
-        # Check if we've hit -2% trigger
-        if loss_pct >= self.trigger_pct:
-            await self._activate_hedge(current_price, loss_pct)
-            return True
-        
-        return False
+        await self._activate_hedge(current_price, loss_pct)
+        return True
     
     async def _activate_hedge(self, current_price: Decimal, loss_pct: Decimal):
         """Activate hedge by opening reverse position."""
@@ -117,7 +163,7 @@ class HedgeStrategyV2:
             self.hedge_size = current_size
             
             # Determine hedge direction (opposite of current position)
-            hedge_direction = "Sell" if self.direction == "BUY" else "Buy"
+            hedge_direction = "Sell" if self.is_long else "Buy"
             
             # Place hedge order
             order_body = {
@@ -151,7 +197,7 @@ class HedgeStrategyV2:
                     current_leverage = Decimal(str(pos["result"]["list"][0].get("leverage", "6.00")))
                 
                 # Calculate hedge details
-                hedge_side = "SHORT" if self.direction == "BUY" else "LONG"
+                hedge_side = "SHORT" if self.is_long else "LONG"
                 
                 # PRIORITY 2: Use Engine queue instead of direct send_message
                 from app.telegram.engine import get_template_engine
@@ -209,7 +255,7 @@ class HedgeStrategyV2:
             current_size = Decimal(str(position.get("size", "0")))
             
             # Determine close direction
-            close_direction = "Sell" if self.direction == "BUY" else "Buy"
+            close_direction = "Sell" if self.is_long else "Buy"
             
             # Close hedge position
             order_body = {
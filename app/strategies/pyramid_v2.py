@@ -13,7 +13,7 @@ CRITICAL: +2.4% step MUST be leverage-only (forbid qty_add/im_add per CLIENT SPE
 """
 
 from decimal import Decimal
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from app.bybit.client import BybitClient
 from app.core.logging import system_logger
 from app.telegram.output import send_message
@@ -59,23 +59,90 @@ class PyramidStrategyV2:
         
         self.activated_levels = set()
         self.max_adds = len(STRICT_CONFIG.pyramid_levels)  # Dynamic based on config
+        self._compile_triggers()
     
-    async def check_and_activate(self, current_price: Decimal) -> bool:
-        """Check if pyramid levels should be activated."""
-        # Calculate gain from original entry
+    def _compile_triggers(self):
+        """
+        Compile the % levels into absolute trigger prices, once, from original entry.
+        
+        Levels fire in ascending order, so a tick only needs to be compared with
+        the next armed trigger price - no per-tick percentage arithmetic.
+        """
+        self._level_pcts = sorted(self.levels)
+        if self.original_entry > 0:
+            sign = Decimal("1") if self.direction == "LONG" else Decimal("-1")
+            self._trigger_prices = [
+                self.original_entry * (Decimal("1") + sign * level_pct / Decimal("100"))
+                for level_pct in self._level_pcts
+            ]
+        else:
+            # No entry yet: nothing can fire
+            self._trigger_prices = []
+        self._next_index = 0
+        self._next_trigger: Optional[Decimal] = self._trigger_prices[0] if self._trigger_prices else None
+        self._tick_scale = None
+        self._trigger_ticks = []
+    
+    def _compile_ticks(self, scale):
+        """Trigger prices as ticks of `scale` (rounded so int compares match the Decimal ones)."""
+        to_ticks = scale.ceil_ticks if self.direction == "LONG" else scale.floor_ticks
+        self._trigger_ticks = [to_ticks(price) for price in self._trigger_prices]
+        self._tick_scale = scale
+    
+    def _advance(self):
+        """Move to the next level that has not been activated yet."""
+        index = self._next_index
+        while index < len(self._trigger_prices) and self._level_pcts[index] in self.activated_levels:
+            index += 1
+        self._next_index = index
+        self._next_trigger = self._trigger_prices[index] if index < len(self._trigger_prices) else None
+    
+    def _gain_pct(self, current_price: Decimal) -> Decimal:
+        """Gain from original entry in the position's favour."""
         if self.direction == "LONG":
-            gain_pct = (current_price - self.original_entry) / self.original_entry * 100
-        else:  # SHORT
-            gain_pct = (self.original_entry - current_price) / self.original_entry * 100
+            return (current_price - self.original_entry) / self.original_entry * 100
+        return (self.original_entry - current_price) / self.original_entry * 100
+    
+    def should_activate(self, current_price: Decimal, at=None) -> bool:
+        """
+        Cheap check (no I/O): would check_and_activate() fire a level at this price?
         
-        # Check each level
-        for level_pct, config in self.levels.items():
-            if gain_pct >= level_pct and level_pct not in self.activated_levels:
-                await self._activate_level(level_pct, config, gain_pct)
-                self.activated_levels.add(level_pct)
-                return True
+        `at` is the same price as PriceTicks (app.core.ticks); when given the
+        check is an int compare against the tick-compiled trigger.
+        """
+        trigger = self._next_trigger
+        if trigger is None:
+            return False
+        if at is not None:
+            above, below = self.tick_band(at.scale)
+            return at.floor >= above if below is None else at.ceil <= below
+        if self.direction == "LONG":
+            return current_price >= trigger
+        return current_price <= trigger
+    
+    def tick_band(self, scale):
+        """
+        (above, below) ticks of the next armed level: fires when a price's
+        floor ticks >= above (LONG) or ceil ticks <= below (SHORT).
+        """
+        if self._next_trigger is None:
+            return None, None
+        if scale is not self._tick_scale:
+            self._compile_ticks(scale)
+        trigger = self._trigger_ticks[self._next_index]
+        return (trigger, None) if self.direction == "LONG" else (None, trigger)
+    
+    async def check_and_activate(self, current_price: Decimal) -> bool:
+        """Check if pyramid levels should be activated (at most one level per call)."""
+        self._advance()  # Skip levels marked activated outside this method
+        if not self.should_activate(current_price):
+            return False
         
-        return False
+        level_pct = self._level_pcts[self._next_index]
+        await self._activate_level(level_pct, self.levels[level_pct], self._gain_pct(current_price))
+        self.activated_levels.add(level_pct)
+        self._advance()
+        return True
     
     async def _activate_level(self, level_pct: Decimal, config: Dict[str, Any], gain_pct: Decimal):
         """
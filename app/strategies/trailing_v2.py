@@ -6,8 +6,16 @@ CLIENT SPEC COMPLIANCE (doc/10_15.md):
 - Trailing activates at +6.1% from original entry
 - Keeps SL 2.5% behind highest/lowest price
 - After activation, only the trailer controls SL
+
+The trailing SL is the position's single stop (/v5/position/trading-stop),
+moved in place rather than re-placed per tick. Moves are coalesced: the live
+stop only follows once the new level is at least one tick and
+trailing_min_step % away, and at most once per trailing_min_interval; the
+latest level is flushed when the interval expires.
 """
 
+import asyncio
+import time
 from decimal import Decimal
 from typing import Dict, Any, Optional
 from app.bybit.client import BybitClient
@@ -23,6 +31,7 @@ class TrailingStopStrategyV2:
         self.trade_id = trade_id
         self.symbol = symbol
         self.direction = direction.upper()
+        self.is_long = self.direction in ("LONG", "BUY")  # TradeFSM passes LONG/SHORT
         self.channel_name = channel_name
         from app.bybit.client import get_bybit_client
         self.bybit = get_bybit_client()
@@ -38,17 +47,93 @@ class TrailingStopStrategyV2:
         self.lowest_price: Optional[Decimal] = None
         self.current_sl: Optional[Decimal] = None
         self.tps_cancelled = False
+        
+        # Activation price compiled from original entry on first use
+        self._compiled_entry: Optional[Decimal] = None
+        self._activation_price: Optional[Decimal] = None
+        self._tick_scale = None
+        self._activation_ticks: Optional[int] = None
+        self._extreme_price: Optional[Decimal] = None  # highest/lowest price _extreme_ticks was built from
+        self._extreme_scale = None
+        self._extreme_ticks: Optional[int] = None
+        
+        # Debounced SL moves: current_sl is live on the exchange, _pending_sl waits
+        self.min_step_pct = STRICT_CONFIG.trailing_min_step
+        self.min_update_interval = STRICT_CONFIG.trailing_min_interval
+        self._pending_sl: Optional[Decimal] = None
+        self._last_push_at: Optional[float] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._push_lock = asyncio.Lock()
+        self._symbol_info = None
+        self._position_idx: Optional[int] = None
+        
+        # Per-trade counters: one exchange call per SL move was the old cost
+        self.sl_moves = 0
+        self.exchange_calls = 0
+    
+    def _get_activation_price(self, original_entry: Decimal) -> Decimal:
+        """Absolute price at which trailing arms (+trigger_pct from original entry)."""
+        if original_entry != self._compiled_entry:
+            move = original_entry * self.trigger_pct / Decimal("100")
+            self._activation_price = original_entry + move if self.is_long else original_entry - move
+            self._compiled_entry = original_entry
+            self._tick_scale = None
+        return self._activation_price
+    
+    def tick_band(self, scale, original_entry: Decimal):
+        """
+        (above, below) ticks at which check_and_update() has work: fires when a
+        price's floor ticks >= above (long) or ceil ticks <= below (short).
+        
+        Unarmed: the activation price. Armed: one tick past the highest/lowest
+        price (price > highest <=> ticks > floor(highest)).
+        """
+        buy = self.is_long
+        if not self.armed:
+            activation_price = self._get_activation_price(original_entry)
+            if scale is not self._tick_scale:
+                self._tick_scale = scale
+                self._activation_ticks = scale.ceil_ticks(activation_price) if buy else scale.floor_ticks(activation_price)
+            return (self._activation_ticks, None) if buy else (None, self._activation_ticks)
+        
+        extreme = self.highest_price if buy else self.lowest_price
+        if extreme is None:
+            # Armed without an extreme yet: every price moves the SL
+            return (float("-inf"), None) if buy else (None, float("inf"))
+        if extreme is not self._extreme_price or scale is not self._extreme_scale:
+            self._extreme_scale = scale
+            self._extreme_ticks = scale.floor_ticks(extreme) + 1 if buy else scale.ceil_ticks(extreme) - 1
+            self._extreme_price = extreme
+        return (self._extreme_ticks, None) if buy else (None, self._extreme_ticks)
+    
+    def needs_update(self, current_price: Decimal, original_entry: Decimal, at=None) -> bool:
+        """
+        Cheap check (no I/O): would check_and_update() arm or move the SL at this price?
+        
+        `at` is the same price as PriceTicks (app.core.ticks) for int compares.
+        """
+        if at is not None:
+            above, below = self.tick_band(at.scale, original_entry)
+            return at.floor >= above if below is None else at.ceil <= below
+        if not self.armed:
+            activation_price = self._get_activation_price(original_entry)
+            if self.is_long:
+                return current_price >= activation_price
+            return current_price <= activation_price  # short
+        
+        # Armed: only a new extreme moves the SL
+        if self.is_long:
+            return self.highest_price is None or current_price > self.highest_price
+        return self.lowest_price is None or current_price < self.lowest_price
     
     async def check_and_update(self, current_price: Decimal, original_entry: Decimal) -> bool:
         """Check if trailing should be activated and update SL."""
-        # Calculate gain from original entry
-        if self.direction == "BUY":
-            gain_pct = (current_price - original_entry) / original_entry * 100
-        else:  # SELL
-            gain_pct = (original_entry - current_price) / original_entry * 100
-        
-        # Check if we should arm trailing
-        if not self.armed and gain_pct >= self.trigger_pct:
+        # Check if we should arm trailing (compiled activation price, no % math per tick)
+        if not self.armed and self.needs_update(current_price, original_entry):
+            if self.is_long:
+                gain_pct = (current_price - original_entry) / original_entry * 100
+            else:  # short
+                gain_pct = (original_entry - current_price) / original_entry * 100
             await self._arm_trailing(current_price, gain_pct)
             self.armed = True
         
@@ -68,14 +153,19 @@ class TrailingStopStrategyV2:
                 self.tps_cancelled = True
             
             # Set initial trailing SL at 2.5% behind current price
-            if self.direction == "BUY":
+            if self.is_long:
                 initial_sl = current_price * (Decimal("1") - self.trail_distance / 100)
                 self.highest_price = current_price
-            else:  # SELL
+            else:  # short
                 initial_sl = current_price * (Decimal("1") + self.trail_distance / 100)
                 self.lowest_price = current_price
             
-            await self._place_trailing_sl(initial_sl)
+            await self._load_symbol_info()
+            self.sl_moves += 1
+            async with self._push_lock:
+                if await self._set_trailing_sl(initial_sl):
+                    self.current_sl = self._quantize(initial_sl)
+                self._last_push_at = time.monotonic()
             
             # CLIENT FIX (DEEP_ANALYSIS): Verify Bybit confirmed the trailing SL
             verification = await self.bybit.get_position("linear", self.symbol)
@@ -91,6 +181,11 @@ class TrailingStopStrategyV2:
                 )
                 return  # ❌ Do NOT send Telegram
             
+            # Reuse the position index for later moves (skips set_trading_stop's mode lookup)
+            positions = verification.get('result', {}).get('list') or []
+            if positions and positions[0].get('positionIdx') is not None:
+                self._position_idx = int(positions[0]['positionIdx'])
+            
             # ✅ Bybit confirmed - proceed
             system_logger.info(f"Trailing stop armed for {self.symbol} at +{gain_pct:.2f}%")
             
@@ -112,7 +207,7 @@ class TrailingStopStrategyV2:
             pnl_usdt = im_confirmed * (pnl_pct_leveraged / Decimal("100"))  # Estimated
             
             # Calculate new SL based on trail distance
-            if self.direction == "BUY":
+            if self.is_long:
                 new_sl = current_price * (Decimal("1") - (self.trail_distance / Decimal("100")))
             else:
                 new_sl = current_price * (Decimal("1") + (self.trail_distance / Decimal("100")))
@@ -150,21 +245,22 @@ class TrailingStopStrategyV2:
         try:
             new_sl = None
             
-            if self.direction == "BUY":
+            if self.is_long:
                 # Update highest price
                 if self.highest_price is None or current_price > self.highest_price:
                     self.highest_price = current_price
                     new_sl = current_price * (Decimal("1") - self.trail_distance / 100)
-            else:  # SELL
+            else:  # short
                 # Update lowest price
                 if self.lowest_price is None or current_price < self.lowest_price:
                     self.lowest_price = current_price
                     new_sl = current_price * (Decimal("1") + self.trail_distance / 100)
             
-            # Update SL if we have a better price
-            if new_sl and (self.current_sl is None or self._is_better_sl(new_sl)):
-                await self._place_trailing_sl(new_sl)
-                self.current_sl = new_sl
+            # Queue the better SL; the live stop follows once step/interval allow
+            if new_sl and self._is_better_sl(new_sl):
+                self.sl_moves += 1
+                self._pending_sl = new_sl
+                await self._flush_pending()
                 
         except Exception as e:
             system_logger.error(f"Trailing stop update error: {e}", exc_info=True)
@@ -174,36 +270,114 @@ class TrailingStopStrategyV2:
         if self.current_sl is None:
             return True
         
-        if self.direction == "BUY":
-            return new_sl > self.current_sl  # Higher SL is better for BUY
-        else:  # SELL
-            return new_sl < self.current_sl  # Lower SL is better for SELL
+        if self.is_long:
+            return new_sl > self.current_sl  # Higher SL is better for a long
+        else:  # short
+            return new_sl < self.current_sl  # Lower SL is better for a short
     
-    async def _place_trailing_sl(self, sl_price: Decimal):
-        """Place trailing stop loss order."""
-        try:
-            order_body = {
-                "category": "linear",
-                "symbol": self.symbol,
-                "side": "Sell" if self.direction == "BUY" else "Buy",
-                "orderType": "Limit",
-                "qty": "0",  # Will be filled by position size
-                "price": str(sl_price),
-                "timeInForce": "GTC",
-                "reduceOnly": True,
-                "positionIdx": 0,
-                "orderLinkId": f"trail_{self.trade_id}"
-            }
+    def _step_reached(self, new_sl: Decimal) -> bool:
+        """Is new_sl far enough from the live SL to be worth an exchange call?"""
+        if self.current_sl is None:
+            return True
+        move = abs(new_sl - self.current_sl)
+        if self._symbol_info is not None and move < self._symbol_info.tick_size:
+            return False
+        return move * 100 >= self.current_sl * self.min_step_pct
+    
+    async def _flush_pending(self):
+        """Move the live SL to the pending level if step and interval allow."""
+        async with self._push_lock:
+            new_sl = self._pending_sl
+            if new_sl is None or not self._step_reached(new_sl):
+                return
             
-            result = await self.bybit.place_order(order_body)
+            if self._last_push_at is not None:
+                wait = self.min_update_interval - (time.monotonic() - self._last_push_at)
+                if wait > 0:
+                    self._schedule_flush(wait)
+                    return
             
+            self._pending_sl = None
+            self._last_push_at = time.monotonic()
+            if await self._set_trailing_sl(new_sl):
+                self.current_sl = self._quantize(new_sl)
+            elif self._pending_sl is None:
+                self._pending_sl = new_sl  # retry with the next tick or flush
+    
+    def _schedule_flush(self, delay: float):
+        """Push the latest pending SL when the interval expires, even without a new tick."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after(delay))
+    
+    async def _flush_after(self, delay: float):
+        try:
+            await asyncio.sleep(delay)
+            self._flush_task = None
+            await self._flush_pending()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            system_logger.error(f"Trailing SL flush error: {e}", exc_info=True)
+    
+    async def _load_symbol_info(self):
+        """Tick size for SL quantization and the minimum step (cached by the registry)."""
+        if self._symbol_info is not None:
+            return
+        try:
+            from app.core.symbol_registry import get_symbol_registry
+            self._symbol_info = await get_symbol_registry().get_symbol_info(self.symbol)
+        except Exception as e:
+            system_logger.warning(f"Trailing SL tick size unavailable for {self.symbol}: {e}")
+    
+    def _quantize(self, sl_price: Decimal) -> Decimal:
+        if self._symbol_info is None:
+            return sl_price
+        return self._symbol_info.quantize_price(sl_price)
+    
+    async def _set_trailing_sl(self, sl_price: Decimal) -> bool:
+        """Move the position's stop loss in place (one live stop per trade)."""
+        sl_price = self._quantize(sl_price)
+        self.exchange_calls += 1
+        try:
+            result = await self.bybit.set_trading_stop(
+                "linear", self.symbol,
+                stop_loss=sl_price,
+                position_idx=self._position_idx
+            )
             if result.get('retCode') == 0:
-                system_logger.info(f"Trailing SL updated to {sl_price} for {self.symbol}")
-            else:
-                system_logger.error(f"Failed to update trailing SL: {result}")
-                
+                system_logger.info(f"Trailing SL moved to {sl_price} for {self.symbol}", {
+                    'trade_id': self.trade_id,
+                    'sl_moves': self.sl_moves,
+                    'exchange_calls': self.exchange_calls
+                })
+                return True
+            system_logger.error(f"Failed to move trailing SL: {result}")
         except Exception as e:
-            system_logger.error(f"Trailing SL placement error: {e}", exc_info=True)
+            system_logger.error(f"Trailing SL update error: {e}", exc_info=True)
+        return False
+    
+    def stop(self):
+        """Drop any pending SL move (trade closed) and log the calls saved."""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
+        self._flush_task = None
+        self._pending_sl = None
+        if self.sl_moves:
+            system_logger.info("Trailing stop finished", {
+                'trade_id': self.trade_id,
+                'symbol': self.symbol,
+                **self.get_stats()
+            })
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """SL moves vs exchange calls actually sent."""
+        return {
+            'sl_moves': self.sl_moves,
+            'exchange_calls': self.exchange_calls,
+            'calls_saved': max(0, self.sl_moves - self.exchange_calls),
+            'current_sl': str(self.current_sl) if self.current_sl is not None else None,
+            'pending_sl': str(self._pending_sl) if self._pending_sl is not None else None
+        }
     
     async def _cancel_tps_below_6_1_percent(self):
         """Cancel all TP orders below 6.1% profit."""
@@ -54,6 +54,16 @@ async def send_message(
     Returns:
         Message ID if successful, None otherwise
     """
+    # Trade shards have no Telegram connection: the ingress process sends for them
+    from app.runtime.sharding import get_shard_worker
+    shard_worker = get_shard_worker()
+    if shard_worker is not None:
+        return await shard_worker.forward_telegram(
+            text, target_chat_id,
+            template_name=template_name, trade_id=trade_id, symbol=symbol, hashtags=hashtags,
+            parse_mode=parse_mode, operation_id=operation_id, trace_id=trace_id
+        )
+    
     try:
         # Import here to avoid circular import
         from app.telegram.strict_client import get_strict_telegram_client
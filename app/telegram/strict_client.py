@@ -211,7 +211,14 @@ class StrictTelegramClient:
             system_logger.error(f"Error sending signal received message: {e}", exc_info=True)
     
     async def _start_trade_fsm(self, signal_data: dict):
-        """Start trade FSM for signal."""
+        """Start trade FSM for signal (or hand it to its trade shard in supervisor mode)."""
+        from app.runtime.sharding import get_shard_router
+        router = get_shard_router()
+        if router is not None:
+            if await router.dispatch(signal_data) is None:
+                await self._send_error_message(signal_data, "Trade shard unavailable or trade limit reached")
+            return
+        
         try:
             # Create trade FSM
             fsm = TradeFSM(signal_data)
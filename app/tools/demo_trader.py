@@ -6,7 +6,6 @@ TP/SL automation without risking real money.
 """
 
 import asyncio
-import httpx
 from decimal import Decimal, ROUND_DOWN
 from typing import Dict, Any, List, Optional
 from app.core.logging import system_logger
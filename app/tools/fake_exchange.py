@@ -0,0 +1,973 @@
+"""
+Local stand-in for the Bybit V5 API (load, latency and chaos testing).
+
+FakeBybitExchange implements the REST endpoints and the private/public
+WebSocket streams the bot uses, backed by a small matching engine:
+
+- market orders fill at the last price; limit orders rest until the price
+  crosses them (PostOnly orders that would take liquidity are cancelled,
+  as on Bybit)
+- conditional orders (triggerPrice) and position TP/SL trigger on price moves
+- one-way positions with average price, fees, realised PnL and a USDT wallet
+
+Prices only move when set_price() is called (by a test, a price tape or a
+random walk), so runs are deterministic. Faults are injected per request:
+fixed/jittered latency, random or scripted HTTP 429/5xx and retCode errors,
+Bybit-style rate-limit headers (retCode 10006 once a group's window is used
+up) and WebSocket disconnects.
+
+Two ways to point the bot at it:
+
+- in-process: exchange.attach(client) routes a BybitClient through an httpx
+  mock transport (no sockets)
+- localhost: serve() runs it with uvicorn (scripts/run_fake_exchange.py);
+  set BYBIT_ENDPOINT=http://host:port,
+  BYBIT_WS_PRIVATE_URL=ws://host:port/v5/private and
+  BYBIT_WS_PUBLIC_URL=ws://host:port/v5/public/linear
+
+FastAPI/uvicorn are imported lazily, as in app/api/health.py.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import itertools
+import json
+import random
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from app.bybit.rate_limiter import ENDPOINT_GROUPS, get_endpoint_group
+from app.core.logging import system_logger
+
+ZERO = Decimal("0")
+TAKER_FEE = Decimal("0.00055")
+MAKER_FEE = Decimal("0.0002")
+
+# symbol -> (last price, tickSize, qtyStep, minOrderQty, maxLeverage)
+DEFAULT_INSTRUMENTS: Dict[str, Tuple[str, str, str, str, str]] = {
+    "BTCUSDT": ("65000", "0.10", "0.001", "0.001", "100"),
+    "ETHUSDT": ("3200", "0.01", "0.01", "0.01", "100"),
+    "SOLUSDT": ("150", "0.010", "0.1", "0.1", "75"),
+    "XRPUSDT": ("0.6000", "0.0001", "1", "1", "75"),
+    "DOGEUSDT": ("0.15000", "0.00001", "1", "1", "75"),
+}
+
+OPEN_STATUSES = ("New", "PartiallyFilled", "Untriggered")
+
+
+class FakeExchangeError(Exception):
+    """A Bybit retCode error returned by a fake endpoint."""
+
+    def __init__(self, ret_code: int, ret_msg: str):
+        self.ret_code = ret_code
+        self.ret_msg = ret_msg
+        super().__init__(f"{ret_code}: {ret_msg}")
+
+
+@dataclass
+class FaultConfig:
+    """Fault injection settings (rates are probabilities per REST request)."""
+    latency_ms: float = 0.0        # Added to every REST response and WS push
+    jitter_ms: float = 0.0         # Uniform extra latency in [0, jitter_ms]
+    error_429_rate: float = 0.0
+    error_5xx_rate: float = 0.0
+    enforce_rate_limits: bool = False  # Return 10006 once a group's per-second budget is used
+    ws_drop_after: int = 0         # Drop each WS connection after this many pushes (0 = never)
+    seed: int = 0
+
+
+class _Subscriber:
+    """One WebSocket connection: its topics and outgoing message queue."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, private: bool):
+        self.conn_id = f"fake-{next(self._ids)}"
+        self.private = private
+        self.authenticated = False
+        self.topics = set()
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.sent = 0
+
+    def push(self, message: Optional[Dict[str, Any]]):
+        """Queue a message (None closes the connection)."""
+        self.queue.put_nowait(message)
+
+
+class FakeBybitExchange:
+    """In-memory Bybit V5 exchange (linear USDT perpetuals, one-way mode)."""
+
+    def __init__(
+        self,
+        instruments: Optional[Dict[str, Tuple[str, str, str, str, str]]] = None,
+        balance: Decimal = Decimal("10000"),
+        api_keys: Optional[Dict[str, str]] = None,
+        faults: Optional[FaultConfig] = None,
+        clock: Callable[[], float] = time.time,
+        rate_limits: Optional[Dict[str, int]] = None
+    ):
+        self.clock = clock
+        self.faults = faults or FaultConfig()
+        # Requests per second advertised (and enforced) per endpoint group
+        self.rate_limits = {group: int(rate) for group, (rate, _) in ENDPOINT_GROUPS.items()}
+        self.rate_limits.update(rate_limits or {})
+        self._rng = random.Random(self.faults.seed)
+        # api_key -> secret; empty accepts any key without checking signatures
+        self.api_keys = dict(api_keys or {})
+        self.balance = Decimal(str(balance))
+
+        self.instruments: Dict[str, Dict[str, Any]] = {}
+        self.prices: Dict[str, Decimal] = {}
+        for symbol, spec in (DEFAULT_INSTRUMENTS if instruments is None else instruments).items():
+            self.add_instrument(symbol, *spec)
+
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self._order_by_link: Dict[str, str] = {}
+        # symbol -> {orderId: order} for orders still working (matching only scans these)
+        self._open_orders: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.positions: Dict[str, Dict[str, Any]] = {}
+        self.leverage: Dict[str, Decimal] = {}
+        self.executions: List[Dict[str, Any]] = []
+        self.closed_pnl: List[Dict[str, Any]] = []
+        self._order_ids = itertools.count(1)
+        self._exec_ids = itertools.count(1)
+
+        self._scripted: List[Tuple[int, Optional[int]]] = []
+        self._windows: Dict[str, Tuple[int, int]] = {}
+        self._subscribers: List[_Subscriber] = []
+
+        self.stats = {
+            "requests": 0,
+            "orders": 0,
+            "fills": 0,
+            "injected_errors": 0,
+            "rate_limited": 0,
+            "ws_messages": 0,
+            "ws_drops": 0
+        }
+
+        self._routes: Dict[Tuple[str, str], Callable[[Dict[str, Any]], Any]] = {
+            ("GET", "/v5/market/time"): self._market_time,
+            ("GET", "/v5/market/tickers"): self._market_tickers,
+            ("GET", "/v5/market/instruments-info"): self._market_instruments,
+            ("GET", "/v5/account/wallet-balance"): self._wallet_balance,
+            ("GET", "/v5/account/info"): self._account_info,
+            ("GET", "/v5/position/list"): self._position_list,
+            ("GET", "/v5/position/closed-pnl"): self._closed_pnl,
+            ("GET", "/v5/order/realtime"): self._order_realtime,
+            ("GET", "/v5/order/history"): self._order_history,
+            ("GET", "/v5/execution/list"): self._execution_list,
+            ("POST", "/v5/order/create"): self._order_create,
+            ("POST", "/v5/order/amend"): self._order_amend,
+            ("POST", "/v5/order/cancel"): self._order_cancel,
+            ("POST", "/v5/order/cancel-all"): self._order_cancel_all,
+            ("POST", "/v5/position/trading-stop"): self._trading_stop,
+            ("POST", "/v5/position/set-leverage"): self._set_leverage,
+            ("POST", "/v5/position/set-margin-mode"): self._accept,
+            ("POST", "/v5/position/switch-isolated"): self._accept,
+            ("POST", "/v5/position/switch-mode"): self._accept,
+        }
+
+    # ------------------------------------------------------------------
+    # Market setup and control
+    # ------------------------------------------------------------------
+
+    def add_instrument(self, symbol: str, price: str, tick_size: str, qty_step: str,
+                       min_qty: str, max_leverage: str = "100"):
+        """List a linear USDT perpetual."""
+        self.instruments[symbol] = {
+            "symbol": symbol,
+            "contractType": "LinearPerpetual",
+            "status": "Trading",
+            "baseCoin": symbol[:-4],
+            "quoteCoin": "USDT",
+            "settleCoin": "USDT",
+            "priceScale": str(max(0, -Decimal(tick_size).as_tuple().exponent)),
+            "leverageFilter": {"minLeverage": "1", "maxLeverage": max_leverage, "leverageStep": "0.01"},
+            "priceFilter": {"minPrice": tick_size, "maxPrice": "1999999.8", "tickSize": tick_size},
+            "lotSizeFilter": {
+                "maxOrderQty": str(Decimal(min_qty) * 1000000),
+                "minOrderQty": min_qty,
+                "qtyStep": qty_step,
+                "postOnlyMaxOrderQty": str(Decimal(min_qty) * 1000000),
+                "minNotionalValue": "5"
+            }
+        }
+        self.prices[symbol] = Decimal(price)
+
+    def set_price(self, symbol: str, price) -> None:
+        """Move the last/mark price, publish the ticker and run matching."""
+        self.prices[symbol] = Decimal(str(price))
+        self._publish_public(f"tickers.{symbol}", self._ticker(symbol))
+        self._match(symbol)
+
+    def fail_next(self, count: int = 1, status: int = 429, ret_code: Optional[int] = None):
+        """Fail the next `count` REST requests with an HTTP status (or a retCode with HTTP 200)."""
+        self._scripted.extend([(status, ret_code)] * count)
+
+    def drop_connections(self) -> int:
+        """Disconnect every WebSocket client; returns how many were dropped."""
+        dropped = 0
+        for subscriber in list(self._subscribers):
+            subscriber.push(None)
+            dropped += 1
+        self.stats["ws_drops"] += dropped
+        return dropped
+
+    def get_position(self, symbol: str) -> Dict[str, Any]:
+        return self._position_view(symbol)
+
+    # ------------------------------------------------------------------
+    # Transport-independent request handling
+    # ------------------------------------------------------------------
+
+    def _now_ms(self) -> int:
+        return int(self.clock() * 1000)
+
+    async def _delay(self):
+        delay = self.faults.latency_ms
+        if self.faults.jitter_ms:
+            delay += self._rng.uniform(0, self.faults.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _rate_limit(self, path: str) -> Tuple[Dict[str, str], bool]:
+        """Bybit-style limit headers for the request's endpoint group."""
+        group = get_endpoint_group(path)
+        limit = self.rate_limits[group]
+        second = int(self.clock())
+        window, used = self._windows.get(group, (second, 0))
+        if window != second:
+            window, used = second, 0
+        used += 1
+        self._windows[group] = (window, used)
+        headers = {
+            "X-Bapi-Limit": str(limit),
+            "X-Bapi-Limit-Status": str(max(limit - used, 0)),
+            "X-Bapi-Limit-Reset-Timestamp": str((window + 1) * 1000)
+        }
+        return headers, self.faults.enforce_rate_limits and used > limit
+
+    def _check_auth(self, method: str, query: str, headers: Mapping[str, str], body: bytes):
+        headers = {k.lower(): v for k, v in headers.items()}
+        key = headers.get("x-bapi-api-key")
+        if not key:
+            raise FakeExchangeError(10003, "API key is invalid.")
+        if not self.api_keys:
+            return
+        secret = self.api_keys.get(key)
+        if secret is None:
+            raise FakeExchangeError(10003, "API key is invalid.")
+        ts = headers.get("x-bapi-timestamp", "")
+        recv_window = headers.get("x-bapi-recv-window", "")
+        payload = query if method == "GET" else body.decode()
+        expected = hmac.new(secret.encode(), (ts + key + recv_window + payload).encode(), hashlib.sha256).hexdigest()
+        sign = headers.get("x-bapi-sign", "")
+        if not hmac.compare_digest(expected, sign):
+            raise FakeExchangeError(10004, "Error sign, please check your signature generation algorithm.")
+
+    async def handle_http(self, method: str, path: str, query: str,
+                          headers: Mapping[str, str], body: bytes = b"") -> Tuple[int, Dict[str, str], Any]:
+        """Serve one REST request; returns (HTTP status, headers, JSON payload)."""
+        self.stats["requests"] += 1
+        await self._delay()
+
+        if self._scripted:
+            status, ret_code = self._scripted.pop(0)
+            self.stats["injected_errors"] += 1
+            if ret_code is None:
+                return status, {}, {"error": "injected"}
+            return status, {}, self._envelope(None, ret_code, "injected error")
+        roll = self._rng.random() if (self.faults.error_429_rate or self.faults.error_5xx_rate) else 1.0
+        if roll < self.faults.error_429_rate:
+            self.stats["injected_errors"] += 1
+            return 429, {}, {"error": "Too Many Requests"}
+        if roll < self.faults.error_429_rate + self.faults.error_5xx_rate:
+            self.stats["injected_errors"] += 1
+            return self._rng.choice((500, 502, 503)), {}, {"error": "injected"}
+
+        handler = self._routes.get((method, path))
+        if handler is None:
+            return 404, {}, {"error": "Not Found"}
+
+        limit_headers, limited = self._rate_limit(path)
+        if limited:
+            self.stats["rate_limited"] += 1
+            return 200, limit_headers, self._envelope(None, 10006, "Too many visits!")
+
+        try:
+            if not path.startswith("/v5/market/"):
+                self._check_auth(method, query, headers, body)
+            if method == "GET":
+                params = dict(parse_qsl(query))
+            else:
+                params = json.loads(body or b"{}")
+            return 200, limit_headers, self._envelope(handler(params))
+        except FakeExchangeError as e:
+            return 200, limit_headers, self._envelope(None, e.ret_code, e.ret_msg)
+
+    def _envelope(self, result: Any, ret_code: int = 0, ret_msg: str = "OK") -> Dict[str, Any]:
+        return {
+            "retCode": ret_code,
+            "retMsg": ret_msg,
+            "result": result if result is not None else {},
+            "retExtInfo": {},
+            "time": self._now_ms()
+        }
+
+    def attach(self, client):
+        """Route a BybitClient's REST calls to this exchange in-process."""
+        import httpx
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            status, headers, payload = await self.handle_http(
+                request.method, request.url.path, request.url.query.decode(),
+                request.headers, request.content
+            )
+            return httpx.Response(status, headers=headers, json=payload)
+
+        client.http = httpx.AsyncClient(base_url="http://fake-bybit", transport=httpx.MockTransport(handler))
+        return client
+
+    # ------------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------------
+
+    def _instrument(self, symbol: Optional[str]) -> Dict[str, Any]:
+        instrument = self.instruments.get(symbol or "")
+        if instrument is None:
+            raise FakeExchangeError(10001, "params error: symbol invalid")
+        return instrument
+
+    def _ticker(self, symbol: str) -> Dict[str, Any]:
+        price = self.prices[symbol]
+        tick = Decimal(self.instruments[symbol]["priceFilter"]["tickSize"])
+        return {
+            "symbol": symbol,
+            "lastPrice": str(price),
+            "markPrice": str(price),
+            "indexPrice": str(price),
+            "bid1Price": str(price - tick),
+            "bid1Size": "100",
+            "ask1Price": str(price + tick),
+            "ask1Size": "100",
+            "price24hPcnt": "0",
+            "volume24h": "1000000",
+            "turnover24h": str(price * 1000000),
+            "fundingRate": "0.0001"
+        }
+
+    def _market_time(self, params):
+        now = self.clock()
+        return {"timeSecond": str(int(now)), "timeNano": str(int(now * 1e9))}
+
+    def _market_tickers(self, params):
+        symbol = params.get("symbol")
+        symbols = [self._instrument(symbol)["symbol"]] if symbol else list(self.instruments)
+        return {"category": "linear", "list": [self._ticker(s) for s in symbols]}
+
+    def _market_instruments(self, params):
+        symbol = params.get("symbol")
+        if symbol:
+            instruments = [self.instruments[symbol]] if symbol in self.instruments else []
+        else:
+            instruments = list(self.instruments.values())
+        return {"category": "linear", "list": instruments, "nextPageCursor": ""}
+
+    # ------------------------------------------------------------------
+    # Account and positions
+    # ------------------------------------------------------------------
+
+    def _position(self, symbol: str) -> Dict[str, Any]:
+        position = self.positions.get(symbol)
+        if position is None:
+            position = self.positions[symbol] = {
+                "size": ZERO,   # signed: long > 0, short < 0
+                "avg": ZERO,
+                "realised": ZERO,
+                "take_profit": ZERO,
+                "stop_loss": ZERO,
+                "created": self._now_ms(),
+                "updated": self._now_ms()
+            }
+        return position
+
+    def _leverage(self, symbol: str) -> Decimal:
+        return self.leverage.get(symbol, Decimal("10"))
+
+    def _position_view(self, symbol: str) -> Dict[str, Any]:
+        position = self._position(symbol)
+        size = position["size"]
+        price = self.prices[symbol]
+        leverage = self._leverage(symbol)
+        unrealised = (price - position["avg"]) * size if size else ZERO
+        return {
+            "positionIdx": 0,
+            "symbol": symbol,
+            "side": "Buy" if size > 0 else "Sell" if size < 0 else "",
+            "size": str(abs(size)) if size else "0",
+            "avgPrice": str(position["avg"]) if size else "0",
+            "positionValue": str(abs(size) * position["avg"]) if size else "0",
+            "tradeMode": 1,
+            "leverage": str(leverage),
+            "markPrice": str(price),
+            "positionIM": str(abs(size) * position["avg"] / leverage) if size else "0",
+            "unrealisedPnl": str(unrealised),
+            "cumRealisedPnl": str(position["realised"]),
+            "takeProfit": str(position["take_profit"]) if position["take_profit"] else "",
+            "stopLoss": str(position["stop_loss"]) if position["stop_loss"] else "",
+            "trailingStop": "0",
+            "liqPrice": "",
+            "positionStatus": "Normal",
+            "createdTime": str(position["created"]),
+            "updatedTime": str(position["updated"])
+        }
+
+    def _used_margin(self) -> Decimal:
+        return sum(
+            (abs(p["size"]) * p["avg"] / self._leverage(s) for s, p in self.positions.items() if p["size"]),
+            ZERO
+        )
+
+    def _wallet_view(self) -> Dict[str, Any]:
+        unrealised = sum(
+            ((self.prices[s] - p["avg"]) * p["size"] for s, p in self.positions.items() if p["size"]),
+            ZERO
+        )
+        equity = self.balance + unrealised
+        available = self.balance - self._used_margin()
+        return {
+            "accountType": "UNIFIED",
+            "totalEquity": str(equity),
+            "totalWalletBalance": str(self.balance),
+            "totalAvailableBalance": str(available),
+            "totalPerpUPL": str(unrealised),
+            "totalInitialMargin": str(self._used_margin()),
+            "coin": [{
+                "coin": "USDT",
+                "equity": str(equity),
+                "walletBalance": str(self.balance),
+                "availableToWithdraw": str(available),
+                "unrealisedPnl": str(unrealised),
+                "cumRealisedPnl": str(sum((p["realised"] for p in self.positions.values()), ZERO))
+            }]
+        }
+
+    def _wallet_balance(self, params):
+        return {"list": [self._wallet_view()]}
+
+    def _account_info(self, params):
+        return {"unifiedMarginStatus": 5, "marginMode": "ISOLATED_MARGIN", "isMasterTrader": False}
+
+    def _position_list(self, params):
+        symbol = params.get("symbol")
+        if symbol:
+            self._instrument(symbol)
+            return {"category": "linear", "list": [self._position_view(symbol)], "nextPageCursor": ""}
+        views = [self._position_view(s) for s, p in self.positions.items() if p["size"]]
+        return {"category": "linear", "list": views, "nextPageCursor": ""}
+
+    def _closed_pnl(self, params):
+        symbol = params.get("symbol")
+        rows = [r for r in reversed(self.closed_pnl) if not symbol or r["symbol"] == symbol]
+        return {"category": "linear", "list": rows[:int(params.get("limit", 50))], "nextPageCursor": ""}
+
+    def _set_leverage(self, params):
+        symbol = params.get("symbol")
+        max_leverage = Decimal(self._instrument(symbol)["leverageFilter"]["maxLeverage"])
+        leverage = Decimal(str(params.get("buyLeverage", "0")))
+        if leverage < 1 or leverage > max_leverage:
+            raise FakeExchangeError(10001, f"leverage invalid, max {max_leverage}")
+        if self.leverage.get(symbol) == leverage:
+            raise FakeExchangeError(110043, "leverage not modified")
+        self.leverage[symbol] = leverage
+        return {}
+
+    def _accept(self, params):
+        return {}
+
+    def _trading_stop(self, params):
+        symbol = params.get("symbol")
+        self._instrument(symbol)
+        position = self._position(symbol)
+        size = position["size"]
+        if not size:
+            raise FakeExchangeError(10001, "can not set tp/sl/ts for zero position")
+        price = self.prices[symbol]
+        for field, key in (("stop_loss", "stopLoss"), ("take_profit", "takeProfit")):
+            if key not in params or params[key] in (None, ""):
+                continue
+            value = Decimal(str(params[key]))
+            if value:
+                # Long: SL below / TP above the price; short: the reverse
+                above = value > price
+                valid = above != (size > 0) if field == "stop_loss" else above == (size > 0)
+                if not valid:
+                    raise FakeExchangeError(
+                        10001, f"{key}:{value} set for {'Buy' if size > 0 else 'Sell'} position is on the wrong side of {price}"
+                    )
+            position[field] = value
+        position["updated"] = self._now_ms()
+        self._publish_private("position", [self._position_view(symbol)])
+        return {}
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def _find_order(self, params) -> Dict[str, Any]:
+        order_id = params.get("orderId") or self._order_by_link.get(params.get("orderLinkId") or "")
+        order = self.orders.get(order_id or "")
+        if order is None or order["symbol"] != params.get("symbol", order["symbol"]):
+            raise FakeExchangeError(110001, "order not exists or too late to cancel")
+        return order
+
+    def _order_view(self, order: Dict[str, Any]) -> Dict[str, Any]:
+        view = {k: v for k, v in order.items() if not k.startswith("_")}
+        for key in ("qty", "price", "triggerPrice", "cumExecQty", "avgPrice", "leavesQty"):
+            view[key] = str(view[key])
+        return view
+
+    def _order_create(self, params):
+        symbol = params.get("symbol")
+        instrument = self._instrument(symbol)
+        side = params.get("side")
+        order_type = params.get("orderType")
+        if side not in ("Buy", "Sell") or order_type not in ("Market", "Limit"):
+            raise FakeExchangeError(10001, "params error: side or orderType invalid")
+
+        lot = instrument["lotSizeFilter"]
+        qty = Decimal(str(params.get("qty", "0")))
+        if qty < Decimal(lot["minOrderQty"]) or qty % Decimal(lot["qtyStep"]):
+            raise FakeExchangeError(10001, f"Qty invalid: {qty} (min {lot['minOrderQty']}, step {lot['qtyStep']})")
+        price = Decimal(str(params.get("price") or "0"))
+        if order_type == "Limit":
+            tick = Decimal(instrument["priceFilter"]["tickSize"])
+            if price <= 0 or price % tick:
+                raise FakeExchangeError(10001, f"price invalid: {price} (tick {tick})")
+
+        link_id = params.get("orderLinkId") or ""
+        if link_id and link_id in self._order_by_link:
+            raise FakeExchangeError(110072, "OrderLinkedID is duplicate")
+
+        reduce_only = bool(params.get("reduceOnly")) or bool(params.get("closeOnTrigger"))
+        position_size = self._position(symbol)["size"]
+        if reduce_only:
+            closing = position_size < 0 if side == "Buy" else position_size > 0
+            if not closing:
+                raise FakeExchangeError(110017, "current position is zero, cannot fix reduce-only order qty")
+        else:
+            leverage = self._leverage(symbol)
+            required = qty * (price or self.prices[symbol]) / leverage
+            if required > self.balance - self._used_margin():
+                raise FakeExchangeError(110007, "ab not enough for new order")
+
+        trigger_price = Decimal(str(params.get("triggerPrice") or "0"))
+        trigger_direction = int(params.get("triggerDirection") or 0)
+        if trigger_price and not trigger_direction:
+            trigger_direction = 1 if trigger_price > self.prices[symbol] else 2
+
+        now = self._now_ms()
+        order_id = f"fake-{next(self._order_ids):08d}"
+        order = {
+            "orderId": order_id,
+            "orderLinkId": link_id,
+            "symbol": symbol,
+            "side": side,
+            "orderType": order_type,
+            "price": price,
+            "qty": qty,
+            "leavesQty": qty,
+            "cumExecQty": ZERO,
+            "avgPrice": ZERO,
+            "timeInForce": params.get("timeInForce") or ("IOC" if order_type == "Market" else "GTC"),
+            "orderStatus": "Untriggered" if trigger_price else "New",
+            "rejectReason": "EC_NoError",
+            "reduceOnly": reduce_only,
+            "positionIdx": int(params.get("positionIdx") or 0),
+            "triggerPrice": trigger_price,
+            "triggerDirection": trigger_direction,
+            "stopOrderType": params.get("stopOrderType", "Stop" if trigger_price else ""),
+            "createdTime": str(now),
+            "updatedTime": str(now)
+        }
+        self.orders[order_id] = order
+        self._open_orders.setdefault(symbol, {})[order_id] = order
+        if link_id:
+            self._order_by_link[link_id] = order_id
+        self.stats["orders"] += 1
+
+        self._publish_private("order", [self._order_view(order)])
+        if not trigger_price:
+            self._activate(order)
+        return {"orderId": order_id, "orderLinkId": link_id}
+
+    def _activate(self, order: Dict[str, Any]):
+        """Execute a new (or just triggered) order against the current price."""
+        price = self.prices[order["symbol"]]
+        if order["orderType"] == "Market":
+            self._fill(order, price, maker=False)
+            return
+        crosses = price <= order["price"] if order["side"] == "Buy" else price >= order["price"]
+        if not crosses:
+            return
+        if order["timeInForce"] == "PostOnly":
+            self._close_order(order, "Cancelled", "EC_PostOnlyWillTakeLiquidity")
+            return
+        self._fill(order, price, maker=False)
+
+    def _order_amend(self, params):
+        order = self._find_order(params)
+        if order["orderStatus"] not in OPEN_STATUSES:
+            raise FakeExchangeError(110001, "order not exists or too late to amend")
+        if params.get("qty"):
+            order["qty"] = Decimal(str(params["qty"]))
+            order["leavesQty"] = order["qty"] - order["cumExecQty"]
+        if params.get("price"):
+            order["price"] = Decimal(str(params["price"]))
+        if params.get("triggerPrice"):
+            order["triggerPrice"] = Decimal(str(params["triggerPrice"]))
+        order["updatedTime"] = str(self._now_ms())
+        self._publish_private("order", [self._order_view(order)])
+        if order["orderStatus"] != "Untriggered":
+            self._activate(order)
+        return {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def _order_cancel(self, params):
+        order = self._find_order(params)
+        if order["orderStatus"] not in OPEN_STATUSES:
+            raise FakeExchangeError(110001, "order not exists or too late to cancel")
+        self._close_order(order, "Cancelled", "EC_PerCancelRequest")
+        return {"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]}
+
+    def _order_cancel_all(self, params):
+        symbol = params.get("symbol")
+        cancelled = []
+        books = [self._open_orders.get(symbol, {})] if symbol else list(self._open_orders.values())
+        for order in [o for book in books for o in book.values()]:
+            self._close_order(order, "Cancelled", "EC_PerCancelRequest")
+            cancelled.append({"orderId": order["orderId"], "orderLinkId": order["orderLinkId"]})
+        return {"list": cancelled, "success": "1"}
+
+    def _order_realtime(self, params):
+        if params.get("orderId") or params.get("orderLinkId"):
+            try:
+                orders = [self._find_order(params)]
+            except FakeExchangeError:
+                orders = []
+        else:
+            symbol = params.get("symbol")
+            books = [self._open_orders.get(symbol, {})] if symbol else list(self._open_orders.values())
+            orders = [o for book in books for o in book.values()]
+        return {"category": "linear", "list": [self._order_view(o) for o in orders], "nextPageCursor": ""}
+
+    def _order_history(self, params):
+        symbol = params.get("symbol")
+        orders = [o for o in reversed(list(self.orders.values()))
+                  if o["orderStatus"] not in OPEN_STATUSES and (not symbol or o["symbol"] == symbol)]
+        limit = int(params.get("limit", 50))
+        return {"category": "linear", "list": [self._order_view(o) for o in orders[:limit]], "nextPageCursor": ""}
+
+    def _execution_list(self, params):
+        symbol = params.get("symbol")
+        start = int(params.get("startTime") or 0)
+        rows = [e for e in reversed(self.executions)
+                if (not symbol or e["symbol"] == symbol) and int(e["execTime"]) >= start]
+        return {"category": "linear", "list": rows[:int(params.get("limit", 50))], "nextPageCursor": ""}
+
+    def _close_order(self, order: Dict[str, Any], status: str, reason: str = "EC_NoError"):
+        self._open_orders.get(order["symbol"], {}).pop(order["orderId"], None)
+        order["orderStatus"] = status
+        order["rejectReason"] = reason
+        order["updatedTime"] = str(self._now_ms())
+        self._publish_private("order", [self._order_view(order)])
+
+    # ------------------------------------------------------------------
+    # Matching engine
+    # ------------------------------------------------------------------
+
+    def _match(self, symbol: str):
+        price = self.prices[symbol]
+        for order in list(self._open_orders.get(symbol, {}).values()):
+            status = order["orderStatus"]
+            if status == "Untriggered":
+                rising = order["triggerDirection"] == 1
+                if (rising and price >= order["triggerPrice"]) or (not rising and price <= order["triggerPrice"]):
+                    order["orderStatus"] = "New"
+                    self._activate(order)
+            elif status in ("New", "PartiallyFilled") and order["orderType"] == "Limit":
+                crosses = price <= order["price"] if order["side"] == "Buy" else price >= order["price"]
+                if crosses:
+                    # Resting order: fills at its own price as maker
+                    self._fill(order, order["price"], maker=True)
+
+        position = self._position(symbol)
+        size = position["size"]
+        if not size:
+            return
+        long = size > 0
+        stop, take = position["stop_loss"], position["take_profit"]
+        if stop and (price <= stop if long else price >= stop):
+            self._close_position(symbol, "StopLoss")
+        elif take and (price >= take if long else price <= take):
+            self._close_position(symbol, "TakeProfit")
+
+    def _close_position(self, symbol: str, stop_order_type: str):
+        """Position TP/SL triggered: close it with a market order."""
+        position = self._position(symbol)
+        order_id = f"fake-{next(self._order_ids):08d}"
+        qty = abs(position["size"])
+        now = str(self._now_ms())
+        order = {
+            "orderId": order_id, "orderLinkId": "", "symbol": symbol,
+            "side": "Sell" if position["size"] > 0 else "Buy", "orderType": "Market",
+            "price": ZERO, "qty": qty, "leavesQty": qty, "cumExecQty": ZERO, "avgPrice": ZERO,
+            "timeInForce": "IOC", "orderStatus": "New", "rejectReason": "EC_NoError",
+            "reduceOnly": True, "positionIdx": 0, "triggerPrice": ZERO, "triggerDirection": 0,
+            "stopOrderType": stop_order_type, "createdTime": now, "updatedTime": now
+        }
+        self.orders[order_id] = order
+        position["stop_loss"] = position["take_profit"] = ZERO
+        self._fill(order, self.prices[symbol], maker=False)
+
+    def _fill(self, order: Dict[str, Any], price: Decimal, maker: bool):
+        symbol = order["symbol"]
+        position = self._position(symbol)
+        qty = order["leavesQty"]
+        if order["reduceOnly"]:
+            qty = min(qty, abs(position["size"]))
+            if not qty:
+                self._close_order(order, "Deactivated", "EC_ReduceOnlyNoPosition")
+                return
+
+        signed = qty if order["side"] == "Buy" else -qty
+        size, avg = position["size"], position["avg"]
+        entry_avg = avg
+        realised = ZERO
+        closed = ZERO
+        if not size or (size > 0) == (signed > 0):
+            new_size = size + signed
+            avg = (abs(size) * avg + qty * price) / abs(new_size)
+        else:
+            closed = min(abs(size), qty)
+            realised = (price - avg) * closed * (1 if size > 0 else -1)
+            new_size = size + signed
+            if not new_size:
+                avg = ZERO
+            elif (new_size > 0) != (size > 0):
+                avg = price
+
+        fee = qty * price * (MAKER_FEE if maker else TAKER_FEE)
+        self.balance += realised - fee
+        position["size"], position["avg"] = new_size, avg
+        position["realised"] += realised - fee
+        position["updated"] = self._now_ms()
+        if not new_size:
+            position["stop_loss"] = position["take_profit"] = ZERO
+
+        order["cumExecQty"] += qty
+        order["leavesQty"] -= qty
+        order["avgPrice"] = price
+        order["orderStatus"] = "Filled" if not order["leavesQty"] else "PartiallyFilled"
+        if order["reduceOnly"] and order["leavesQty"]:
+            order["leavesQty"] = ZERO
+            order["orderStatus"] = "Filled"
+        if order["orderStatus"] == "Filled":
+            self._open_orders.get(symbol, {}).pop(order["orderId"], None)
+        order["updatedTime"] = str(self._now_ms())
+
+        execution = {
+            "symbol": symbol,
+            "orderId": order["orderId"],
+            "orderLinkId": order["orderLinkId"],
+            "side": order["side"],
+            "orderType": order["orderType"],
+            "stopOrderType": order["stopOrderType"],
+            "orderPrice": str(order["price"]),
+            "orderQty": str(order["qty"]),
+            "leavesQty": str(order["leavesQty"]),
+            "orderStatus": order["orderStatus"],
+            "execId": f"exec-{next(self._exec_ids):08d}",
+            "execPrice": str(price),
+            "execQty": str(qty),
+            "execValue": str(qty * price),
+            "execFee": str(fee),
+            "execType": "Trade",
+            "isMaker": maker,
+            "closedSize": str(closed),
+            "execTime": str(self._now_ms())
+        }
+        self.executions.append(execution)
+        self.stats["fills"] += 1
+        if closed:
+            self.closed_pnl.append({
+                "symbol": symbol,
+                "orderId": order["orderId"],
+                "side": order["side"],
+                "qty": str(closed),
+                "orderPrice": str(order["price"]),
+                "avgEntryPrice": str(entry_avg),
+                "avgExitPrice": str(price),
+                "closedPnl": str(realised - fee),
+                "leverage": str(self._leverage(symbol)),
+                "createdTime": str(self._now_ms()),
+                "updatedTime": str(self._now_ms())
+            })
+
+        self._publish_private("order", [self._order_view(order)])
+        self._publish_private("execution", [execution])
+        self._publish_private("position", [self._position_view(symbol)])
+        self._publish_private("wallet", [self._wallet_view()])
+
+    # ------------------------------------------------------------------
+    # WebSocket streams
+    # ------------------------------------------------------------------
+
+    def _publish_private(self, topic: str, data: List[Dict[str, Any]]):
+        message = None
+        for subscriber in self._subscribers:
+            if subscriber.private and topic in subscriber.topics:
+                if message is None:
+                    message = {"id": f"{topic}-{self._now_ms()}", "topic": topic,
+                               "creationTime": self._now_ms(), "data": data}
+                subscriber.push(message)
+
+    def _publish_public(self, topic: str, data: Dict[str, Any]):
+        message = None
+        for subscriber in self._subscribers:
+            if not subscriber.private and topic in subscriber.topics:
+                if message is None:
+                    message = {"topic": topic, "type": "snapshot", "ts": self._now_ms(), "data": data}
+                subscriber.push(message)
+
+    def connect(self, private: bool) -> _Subscriber:
+        """Register a WebSocket connection."""
+        subscriber = _Subscriber(private)
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def disconnect(self, subscriber: _Subscriber):
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+
+    def handle_ws_message(self, subscriber: _Subscriber, message: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Handle a client op (auth/subscribe/unsubscribe/ping); returns the messages to send back."""
+        op = message.get("op")
+        req_id = message.get("req_id", "")
+        args = message.get("args") or []
+        reply = {"op": op, "req_id": req_id, "conn_id": subscriber.conn_id, "success": True, "ret_msg": ""}
+
+        if op == "ping":
+            return [{"op": "pong", "req_id": req_id, "conn_id": subscriber.conn_id,
+                     "success": True, "ret_msg": "pong", "args": [str(self._now_ms())]}]
+
+        if op == "auth":
+            ok = self._check_ws_auth(args)
+            subscriber.authenticated = ok
+            reply.update(success=ok, ret_msg="" if ok else "Params Error")
+            return [reply]
+
+        if op in ("subscribe", "unsubscribe"):
+            if subscriber.private and not subscriber.authenticated:
+                reply.update(success=False, ret_msg="Request not authorized")
+                return [reply]
+            messages = [reply]
+            for topic in args:
+                if op == "subscribe":
+                    subscriber.topics.add(topic)
+                    symbol = topic[len("tickers."):] if topic.startswith("tickers.") else None
+                    if symbol in self.instruments:
+                        # Public topics start with a snapshot, as on Bybit
+                        messages.append({"topic": topic, "type": "snapshot",
+                                         "ts": self._now_ms(), "data": self._ticker(symbol)})
+                else:
+                    subscriber.topics.discard(topic)
+            return messages
+
+        reply.update(success=False, ret_msg=f"Unsupported op: {op}")
+        return [reply]
+
+    def _check_ws_auth(self, args: List[str]) -> bool:
+        if len(args) != 3:
+            return False
+        key, expires, signature = args
+        if not self.api_keys:
+            return bool(key)
+        secret = self.api_keys.get(key)
+        if secret is None or int(expires) * 1000 < self._now_ms():
+            return False
+        expected = hmac.new(secret.encode(), f"GET/realtime{expires}".encode(), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    async def serve_websocket(self, websocket, private: bool):
+        """Run one Starlette WebSocket connection until either side closes."""
+        await websocket.accept()
+        subscriber = self.connect(private)
+
+        async def reader():
+            while True:
+                message = json.loads(await websocket.receive_text())
+                for reply in self.handle_ws_message(subscriber, message):
+                    subscriber.push(reply)
+
+        async def writer():
+            while True:
+                message = await subscriber.queue.get()
+                if message is None:
+                    return
+                await self._delay()
+                await websocket.send_text(json.dumps(message))
+                subscriber.sent += 1
+                self.stats["ws_messages"] += 1
+                if self.faults.ws_drop_after and subscriber.sent >= self.faults.ws_drop_after:
+                    self.stats["ws_drops"] += 1
+                    return
+
+        tasks = [asyncio.create_task(reader()), asyncio.create_task(writer())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.disconnect(subscriber)
+            try:
+                await websocket.close(code=1011)
+            except Exception:
+                pass
+
+
+def create_app(exchange: FakeBybitExchange):
+    """FastAPI app exposing the exchange over HTTP and WebSocket."""
+    from fastapi import FastAPI, Request, Response, WebSocket
+
+    app = FastAPI(title="Fake Bybit V5", version="1.0.0")
+
+    @app.api_route("/v5/{path:path}", methods=["GET", "POST"])
+    async def rest(path: str, request: Request):
+        status, headers, payload = await exchange.handle_http(
+            request.method, request.url.path, request.url.query, request.headers, await request.body()
+        )
+        return Response(json.dumps(payload), status_code=status, headers=headers, media_type="application/json")
+
+    @app.websocket("/v5/private")
+    async def private_stream(websocket: WebSocket):
+        await exchange.serve_websocket(websocket, private=True)
+
+    @app.websocket("/v5/public/linear")
+    async def public_stream(websocket: WebSocket):
+        await exchange.serve_websocket(websocket, private=False)
+
+    return app
+
+
+async def serve(exchange: FakeBybitExchange, host: str = "127.0.0.1", port: int = 8799):
+    """Serve the exchange on localhost with uvicorn."""
+    import uvicorn
+
+    system_logger.info("Starting fake Bybit exchange", {"host": host, "port": port})
+    config = uvicorn.Config(create_app(exchange), host=host, port=port, log_level="warning", access_log=False)
+    await uvicorn.Server(config).serve()
@@ -0,0 +1,551 @@
+"""
+Accelerated replay of recorded Telegram signals and price tapes.
+
+Recorded channel messages are fed at their original timestamps through
+StrictTelegramClient._handle_message -> TradeFSM, against an in-process
+FakeBybitExchange whose prices follow a recorded tape. Everything runs on a
+VirtualClock:
+- the event loop's timers
+- time.time()/time.monotonic()
+- the exchange clock
+
+All of these advance `speed` times faster than wall time, while the bot's
+own sleeps, timeouts, rate limits and time windows keep their meaning. A day
+of signals replays in about 90 s at 1000x. With skip_idle, quiet stretches
+between recorded events are cut short: the clock jumps ahead and timers due
+in the skipped span (reconciles, fill timeouts) fire at once, as if that
+much time had passed with no price change.
+
+Stage latencies are reported in wall milliseconds and in virtual seconds.
+The bot's own processing time is scaled by `speed` on the virtual clock, so
+compare wall times across runs, and use a low speed when the interplay of
+processing time with exchange timing matters.
+
+The same input and seed give the same sequence of events, so the report
+(throughput, per-stage latency and every trade's outcome) can be compared
+before and after a change to parsing, strategies or scheduling.
+
+Inputs:
+- messages: a Telegram text export ("<channel>, [YYYY-MM-DD HH:MM]" headers,
+  as in doc/signals from channels.txt) or JSON lines
+  {"ts", "channel", "text"[, "chat_id"]}
+- tape: CSV "ts,symbol,price" or JSON lines {"ts", "symbol", "price"};
+  synthetic_tape() builds a seeded one from the signals when none was recorded
+
+WebSocket streams are not replayed: the bot falls back to REST polling
+against the fake exchange (scripts/replay_signals.py points the stream URLs
+at a closed local port). One replay per process: the bot's singletons are
+created on the replay's event loop.
+"""
+
+import asyncio
+import contextvars
+import csv
+import json
+import random
+import re
+import selectors
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.logging import system_logger
+from app.tools.fake_exchange import FakeBybitExchange, FaultConfig
+
+# Telegram export header: "<channel name>, [2025-05-28 07:46]"
+EXPORT_HEADER = re.compile(r"^(?P<channel>.+), \[(?P<ts>\d{4}-\d{2}-\d{2} \d{2}:\d{2}(?::\d{2})?)\]\s*$")
+
+# First synthetic chat id for recorded channels that are not in channel_id_name_map
+REPLAY_CHAT_ID_BASE = -1009000000000
+
+
+@dataclass
+class RecordedMessage:
+    ts: float
+    channel: str
+    text: str
+    chat_id: Optional[str] = None
+
+
+@dataclass
+class PriceTick:
+    ts: float
+    symbol: str
+    price: Decimal
+
+
+def parse_timestamp(value: Any) -> float:
+    """Epoch seconds (or ms) or an ISO / "YYYY-MM-DD HH:MM[:SS]" string (UTC if naive)."""
+    if isinstance(value, (int, float)) or re.fullmatch(r"\d+(\.\d+)?", str(value).strip()):
+        ts = float(value)
+        return ts / 1000 if ts > 1e11 else ts
+    parsed = datetime.fromisoformat(str(value).strip())
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def load_messages(path: str) -> List[RecordedMessage]:
+    """Load recorded channel messages, ordered by timestamp."""
+    content = Path(path).read_text(encoding="utf-8")
+    messages = []
+    if path.endswith((".jsonl", ".json")):
+        for line in content.splitlines():
+            if line.strip():
+                row = json.loads(line)
+                messages.append(RecordedMessage(
+                    parse_timestamp(row["ts"]), row.get("channel", ""), row["text"],
+                    str(row["chat_id"]) if row.get("chat_id") is not None else None
+                ))
+    else:
+        current = None
+        for line in content.splitlines():
+            header = EXPORT_HEADER.match(line)
+            if header:
+                current = RecordedMessage(parse_timestamp(header["ts"]), header["channel"].strip(), "")
+                messages.append(current)
+            elif current is not None:
+                current.text += line + "\n"
+        for message in messages:
+            message.text = message.text.strip()
+    return sorted(messages, key=lambda m: m.ts)
+
+
+def load_tape(path: str) -> List[PriceTick]:
+    """Load a recorded price tape, ordered by timestamp."""
+    ticks = []
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".json")):
+            rows = (json.loads(line) for line in f if line.strip())
+        else:
+            rows = csv.DictReader(f)
+        for row in rows:
+            ticks.append(PriceTick(parse_timestamp(row["ts"]), row["symbol"], Decimal(str(row["price"]))))
+    return sorted(ticks, key=lambda t: t.ts)
+
+
+def synthetic_tape(messages: Iterable[RecordedMessage], seed: int = 0) -> List[PriceTick]:
+    """
+    Seeded price path per signal: just off the entries, through all of them a
+    minute after the message, then past TP1 or the SL ten minutes later.
+    """
+    from app.signals.strict_parser import get_strict_parser
+
+    parser = get_strict_parser()
+    rng = random.Random(seed)
+    ticks = []
+    for message in messages:
+        upper = message.text.upper()
+        symbol = parser._extract_symbol(upper)
+        direction = parser._extract_direction(upper)
+        entries = [Decimal(str(e)) for e in parser._extract_entries(message.text) if e != "MARKET"]
+        if not symbol or not direction or not entries:
+            continue
+        sign = 1 if direction in ("LONG", "BUY") else -1
+        # Entries in the order the price reaches them: first touched, last touched
+        first, last = (max(entries), min(entries)) if sign > 0 else (min(entries), max(entries))
+        tps = [Decimal(str(tp)) for tp in parser._extract_tps(message.text, symbol) if tp != "DEFAULT_TP"]
+        sl = parser._extract_sl(message.text)
+        # Without a signal SL the bot places one about 2% away: go 3% to be sure it triggers
+        target = min(tps, key=lambda tp: abs(tp - first)) if tps else first * (1 + sign * Decimal("0.02"))
+        stop = Decimal(str(sl)) if sl else last * (1 - sign * Decimal("0.03"))
+        outcome = target * (1 + sign * Decimal("0.001")) if rng.random() < 0.5 else stop * (1 - sign * Decimal("0.001"))
+        ticks += [
+            PriceTick(message.ts - 60, symbol, first * (1 + sign * Decimal("0.003"))),
+            PriceTick(message.ts + 60, symbol, last * (1 - sign * Decimal("0.003"))),
+            PriceTick(message.ts + 600, symbol, outcome)
+        ]
+    return sorted(ticks, key=lambda t: t.ts)
+
+
+class VirtualClock:
+    """Wall time scaled by `speed`, starting at epoch `start`."""
+
+    def __init__(self, start: float, speed: float = 1.0):
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+        self.start = start
+        self.speed = speed
+        self._real_time = time.time
+        self._real_monotonic = time.monotonic
+        self._origin = time.monotonic()
+        self._skipped = 0.0
+
+    def elapsed(self) -> float:
+        """Virtual seconds since `start`."""
+        return (self._real_monotonic() - self._origin) * self.speed + self._skipped
+
+    def time(self) -> float:
+        return self.start + self.elapsed()
+
+    def monotonic(self) -> float:
+        return self._origin + self.elapsed()
+
+    def advance(self, seconds: float):
+        """Jump ahead (timers due in the skipped span fire right away)."""
+        self._skipped += seconds
+
+    def install(self):
+        """Restart at `start` and make time.time()/time.monotonic() virtual (perf_counter stays wall time)."""
+        self._origin = self._real_monotonic()
+        self._skipped = 0.0
+        time.time = self.time
+        time.monotonic = self.monotonic
+
+    def uninstall(self):
+        time.time = self._real_time
+        time.monotonic = self._real_monotonic
+
+    def new_event_loop(self) -> asyncio.AbstractEventLoop:
+        return VirtualTimeLoop(self)
+
+
+class _ScaledSelector:
+    """Selector whose select() timeout is given in virtual seconds."""
+
+    def __init__(self, selector: selectors.BaseSelector, speed: float):
+        self._selector = selector
+        self._speed = speed
+
+    def select(self, timeout=None):
+        if timeout is not None and timeout > 0:
+            timeout /= self._speed
+        return self._selector.select(timeout)
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose timers run on a VirtualClock."""
+
+    def __init__(self, clock: VirtualClock):
+        super().__init__(_ScaledSelector(selectors.DefaultSelector(), clock.speed))
+        self._clock = clock
+
+    def time(self) -> float:
+        return self._clock.monotonic()
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100)
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = samples[0]
+    return {'count': len(samples), 'p50': p50, 'p95': p95, 'p99': p99, 'max': max(samples)}
+
+
+# (virtual ts, wall perf_counter) of the message being handled by the current task
+_received: contextvars.ContextVar = contextvars.ContextVar("replay_received", default=None)
+
+
+class ReplayRecorder:
+    """Stage timings, outgoing Telegram messages and trade outcomes of one replay."""
+
+    def __init__(self, exchange: FakeBybitExchange):
+        self.exchange = exchange
+        self.messages = 0
+        self.signals = 0
+        self.telegram: List[Tuple[float, Any, str]] = []
+        self.stage_wall_ms: Dict[str, List[float]] = defaultdict(list)
+        self.stage_virtual_s: Dict[str, List[float]] = defaultdict(list)
+        self.trades: Dict[str, Dict[str, Any]] = {}
+        # trade_id -> (state, virtual ts, wall perf_counter) of its last transition
+        self._last: Dict[str, Tuple[str, float, float]] = {}
+
+    def add_stage(self, stage: str, since: Tuple[float, float]):
+        self.stage_virtual_s[stage].append(time.time() - since[0])
+        self.stage_wall_ms[stage].append((time.perf_counter() - since[1]) * 1000)
+
+    def on_trade_start(self, fsm):
+        received = _received.get()
+        self.trades[fsm.trade_id] = {
+            'trade_id': fsm.trade_id,
+            'symbol': fsm.signal_data['symbol'],
+            'direction': fsm.signal_data['direction'],
+            'channel': fsm.signal_data.get('channel_name'),
+            'received': received,
+            'started_ms': int(time.time() * 1000),
+            'final_state': None
+        }
+        self._last[fsm.trade_id] = (fsm.state.value, time.time(), time.perf_counter())
+
+    def on_transition(self, fsm, new_state):
+        previous = self._last.get(fsm.trade_id)
+        if previous is None:
+            return
+        state, virtual, wall = previous
+        self.add_stage(f"{state}->{new_state.value}", (virtual, wall))
+        received = self.trades[fsm.trade_id]['received']
+        if received and new_state.value == "ENTRY_FILLED":
+            # ENTRY_FILLED is entered once the entry orders are acknowledged
+            self.add_stage("signal->entry_orders", received)
+        self._last[fsm.trade_id] = (new_state.value, time.time(), time.perf_counter())
+
+    def on_trade_end(self, fsm):
+        trade = self.trades[fsm.trade_id]
+        ended_ms = int(time.time() * 1000)
+        realised = sum(
+            (Decimal(row["closedPnl"]) for row in self.exchange.closed_pnl
+             if row["symbol"] == trade['symbol'] and trade['started_ms'] <= int(row["updatedTime"]) <= ended_ms),
+            Decimal("0")
+        )
+        trade.update({
+            'final_state': fsm.state.value,
+            'entry_price': str(fsm.entry_price) if fsm.entry_price else None,
+            'position_size': str(fsm.position_size) if fsm.position_size else None,
+            'realised_pnl': str(realised),
+            'duration_s': (ended_ms - trade['started_ms']) / 1000
+        })
+
+
+class _TelegramOutput:
+    """Stands in for the Telethon connection: records what the bot would send."""
+
+    def __init__(self, recorder: ReplayRecorder):
+        self.recorder = recorder
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def send_message(self, chat_id, text, parse_mode=None):
+        self.recorder.telegram.append((time.time(), chat_id, text))
+        return SimpleNamespace(id=len(self.recorder.telegram))
+
+
+class _TimedParser:
+    """Signal parser wrapper that records parse latency."""
+
+    def __init__(self, parser, recorder: ReplayRecorder):
+        self._parser = parser
+        self._recorder = recorder
+
+    async def parse_signal(self, text: str, channel_name: str):
+        started = (time.time(), time.perf_counter())
+        signal = await self._parser.parse_signal(text, channel_name)
+        self._recorder.add_stage("parse", started)
+        if signal:
+            self._recorder.signals += 1
+        return signal
+
+    def __getattr__(self, name):
+        return getattr(self._parser, name)
+
+
+def _replay_client_class():
+    """StrictTelegramClient subclass fed from a recording (imported lazily: needs telethon)."""
+    from app.core.strict_fsm import TradeFSM
+    from app.telegram.strict_client import StrictTelegramClient, get_confirmation_gate, get_strict_parser
+
+    class RecordedTradeFSM(TradeFSM):
+        recorder: ReplayRecorder = None
+
+        async def _transition_to(self, new_state):
+            self.recorder.on_transition(self, new_state)
+            await super()._transition_to(new_state)
+
+    class ReplayTelegramClient(StrictTelegramClient):
+        def __init__(self, recorder: ReplayRecorder):
+            # No Telegram connection: input comes from the recording, output goes to the recorder
+            self.client = _TelegramOutput(recorder)
+            self.parser = _TimedParser(get_strict_parser(), recorder)
+            self.confirmation_gate = get_confirmation_gate()
+            self.active_trades = {}
+            self.recorder = recorder
+            self.tasks: List[asyncio.Task] = []
+            RecordedTradeFSM.recorder = recorder
+
+        async def _handle_message(self, event):
+            received = (time.time(), time.perf_counter())
+            _received.set(received)
+            self.recorder.messages += 1
+            await super()._handle_message(event)
+            self.recorder.add_stage("handle_message", received)
+
+        async def _start_trade_fsm(self, signal_data: dict):
+            fsm = RecordedTradeFSM(signal_data)
+            self.active_trades[fsm.trade_id] = fsm
+            self.recorder.on_trade_start(fsm)
+            self.tasks.append(asyncio.create_task(self._run_trade_fsm(fsm)))
+
+        async def _run_trade_fsm(self, fsm):
+            try:
+                await super()._run_trade_fsm(fsm)
+            finally:
+                self.recorder.on_trade_end(fsm)
+
+    return ReplayTelegramClient
+
+
+class ReplayHarness:
+    """Replays messages and a price tape through the bot at `speed`x on a virtual clock."""
+
+    def __init__(
+        self,
+        messages: List[RecordedMessage],
+        tape: List[PriceTick],
+        speed: float = 100.0,
+        balance: Decimal = Decimal("100000"),
+        faults: Optional[FaultConfig] = None,
+        drain: float = 3600.0,
+        skip_idle: Optional[float] = None
+    ):
+        self.messages = messages
+        self.tape = tape
+        self.speed = speed
+        self.drain = drain
+        # Gaps longer than this with no message or trade in flight are skipped
+        self.skip_idle = skip_idle
+        first = min([m.ts for m in messages] + [t.ts for t in tape])
+        self.clock = VirtualClock(first - 1, speed)
+        self.exchange = FakeBybitExchange(instruments={}, balance=balance, faults=faults, clock=self.clock.time)
+        self.recorder = ReplayRecorder(self.exchange)
+        self._chat_ids: Dict[str, str] = {}
+
+    def _list_instruments(self):
+        """List every taped or signalled symbol, priced at its first tick (or entry)."""
+        first_price: Dict[str, Decimal] = {}
+        for tick in self.tape:
+            first_price.setdefault(tick.symbol, tick.price)
+        for tick in synthetic_tape(self.messages):
+            first_price.setdefault(tick.symbol, tick.price)
+        for symbol, price in first_price.items():
+            # ~5 significant digits of tick and a fine qty step (at most 1 contract)
+            tick = Decimal(1).scaleb(price.adjusted() - 4)
+            qty_step = min(Decimal(1), Decimal(1).scaleb(-price.adjusted() - 2))
+            self.exchange.add_instrument(symbol, str(price.quantize(tick)), str(tick), str(qty_step), str(qty_step), "100")
+
+    def _chat_id(self, message: RecordedMessage) -> str:
+        """Chat id for a recorded channel; unknown channels are whitelisted for the replay."""
+        from app.core.strict_config import STRICT_CONFIG
+
+        if message.chat_id:
+            return message.chat_id
+        if message.channel not in self._chat_ids:
+            by_name = {name: chat_id for chat_id, name in STRICT_CONFIG.channel_id_name_map.items()}
+            chat_id = by_name.get(message.channel)
+            if chat_id is None:
+                chat_id = str(REPLAY_CHAT_ID_BASE - len(self._chat_ids))
+                STRICT_CONFIG.channel_id_name_map = {**STRICT_CONFIG.channel_id_name_map, chat_id: message.channel}
+                STRICT_CONFIG.source_whitelist = STRICT_CONFIG.source_whitelist + [chat_id]
+            self._chat_ids[message.channel] = chat_id
+        return self._chat_ids[message.channel]
+
+    async def _sleep_until(self, ts: float):
+        delay = ts - self.clock.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _run(self) -> Dict[str, Any]:
+        from app.bybit.client import get_bybit_client
+        from app.core.strategy_scheduler import get_strategy_scheduler
+        from app.storage.db import init_db
+        import app.telegram.strict_client as strict_client
+
+        await init_db()
+        self._list_instruments()
+        self.exchange.attach(get_bybit_client())
+        client = _replay_client_class()(self.recorder)
+        strict_client._strict_client = client
+
+        events = sorted(
+            [(m.ts, 1, m) for m in self.messages] + [(t.ts, 0, t) for t in self.tape],
+            key=lambda e: (e[0], e[1])
+        )
+        wall_start = time.perf_counter()
+        handlers = []
+        for ts, _, item in events:
+            gap = ts - self.clock.time()
+            if self.skip_idle is not None and gap > self.skip_idle:
+                handlers = [t for t in handlers if not t.done()]
+                if not handlers and all(t.done() for t in client.tasks):
+                    self.clock.advance(gap - self.skip_idle)
+            await self._sleep_until(ts)
+            if isinstance(item, PriceTick):
+                self.exchange.set_price(item.symbol, item.price)
+            else:
+                event = SimpleNamespace(chat_id=int(self._chat_id(item)), raw_text=item.text)
+                handlers.append(asyncio.create_task(client._handle_message(event)))
+        await asyncio.gather(*handlers)
+
+        pending = [t for t in client.tasks if not t.done()]
+        if pending:
+            await asyncio.wait(pending, timeout=self.drain)
+        for task in client.tasks:
+            task.cancel()
+        await asyncio.gather(*client.tasks, return_exceptions=True)
+        await get_strategy_scheduler().stop()
+        return self._report(time.perf_counter() - wall_start)
+
+    def _report(self, wall: float) -> Dict[str, Any]:
+        recorder = self.recorder
+        stages = {}
+        for stage, samples in recorder.stage_wall_ms.items():
+            stages[stage] = {
+                'wall_ms': _summary(samples),
+                'virtual_s': _summary(recorder.stage_virtual_s[stage])
+            }
+        outcomes = list(recorder.trades.values())
+        for trade in outcomes:
+            trade.pop('received', None)
+            trade['final_state'] = trade['final_state'] or "OPEN"
+        states = defaultdict(int)
+        for trade in outcomes:
+            states[trade['final_state']] += 1
+        return {
+            'speed': self.speed,
+            'virtual_seconds': self.clock.elapsed(),
+            'wall_seconds': wall,
+            'messages': recorder.messages,
+            'signals': recorder.signals,
+            'trades': len(outcomes),
+            'final_states': dict(states),
+            'realised_pnl': str(sum((Decimal(t.get('realised_pnl') or "0") for t in outcomes), Decimal("0"))),
+            'telegram_messages': len(recorder.telegram),
+            'throughput': {
+                'messages_per_s': recorder.messages / wall if wall else 0.0,
+                'requests_per_s': self.exchange.stats['requests'] / wall if wall else 0.0
+            },
+            'stages': stages,
+            'outcomes': outcomes,
+            'exchange': dict(self.exchange.stats)
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run the replay to completion on its own virtual-time event loop.
+
+        Trades go to a throwaway database, and the virtual clock is removed
+        again however the replay ends.
+        """
+        from app.storage import db as storage_db
+
+        db_path = storage_db.DB_PATH
+        loop = self.clock.new_event_loop()
+        try:
+            with tempfile.TemporaryDirectory(prefix="replay_") as tmp:
+                storage_db.DB_PATH = str(Path(tmp) / "replay.sqlite")
+                self.clock.install()
+                try:
+                    report = loop.run_until_complete(self._run())
+                finally:
+                    self.clock.uninstall()
+        finally:
+            storage_db.DB_PATH = db_path
+            loop.close()
+        system_logger.info("Replay finished", {
+            'speed': report['speed'],
+            'messages': report['messages'],
+            'trades': report['trades'],
+            'final_states': report['final_states'],
+            'wall_seconds': report['wall_seconds']
+        })
+        return report
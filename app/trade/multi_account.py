@@ -0,0 +1,224 @@
+"""
+Multi-account execution: copy every signal to additional Bybit accounts.
+
+The main account keeps trading through the trade FSM. Each account listed in
+STRICT_CONFIG.bybit_accounts (BYBIT_ACCOUNTS) gets its own pooled,
+separately-signed BybitClient with its own rate limiter, and is sized with
+PositionCalculator from its own IM target. Entry and exit orders for all
+accounts go through the same ConfirmationGate concurrently, bounded by
+multi_account_concurrency, so copying a signal to N accounts takes about
+as long as one account instead of N times as long.
+
+Only the main account sends Telegram confirmations; mirrored accounts are
+reported in the logs and through get_stats().
+"""
+
+import asyncio
+import time
+from collections import deque
+from decimal import Decimal
+from typing import Dict, Any, List, Optional
+
+from app.bybit.client import BybitClient
+from app.core.logging import system_logger
+from app.core.strict_config import STRICT_CONFIG
+
+
+class AccountPool:
+    """Separately-signed clients for the additional accounts and concurrent order fan-out."""
+
+    def __init__(self, accounts: List[Dict[str, Any]], concurrency: int = 8):
+        self.accounts: Dict[str, Dict[str, Any]] = {a["name"]: a for a in accounts}
+        self.clients: Dict[str, BybitClient] = {
+            name: BybitClient(account) for name, account in self.accounts.items()
+        }
+        self.concurrency = max(1, concurrency)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # trade_id -> {account name: contracts entered}
+        self._open: Dict[str, Dict[str, Decimal]] = {}
+
+        self._latencies: Dict[str, deque] = {name: deque(maxlen=100) for name in self.accounts}
+        self._placed: Dict[str, int] = {name: 0 for name in self.accounts}
+        self._failed: Dict[str, int] = {name: 0 for name in self.accounts}
+
+    def size_for_account(self, name: str, symbol: str, leverage: Decimal,
+                         entry_price: Decimal, symbol_info) -> Decimal:
+        """Contracts for one account from its IM target (0 if it can't meet the symbol's minimums)."""
+        from app.core.position_calculator import PositionCalculator
+
+        im_target = Decimal(str(self.accounts[name].get("im_target", STRICT_CONFIG.im_target)))
+        try:
+            return PositionCalculator.calculate_contract_qty_simple(
+                symbol=symbol,
+                im_usdt=im_target,
+                leverage=leverage,
+                entry_price=entry_price,
+                symbol_info=symbol_info
+            )
+        except ValueError as e:
+            system_logger.warning(f"Account {name}: cannot size {symbol}: {e}")
+            return Decimal("0")
+
+    async def _reference_price(self, symbol: str, entries: List) -> Optional[Decimal]:
+        """Price used for sizing: first limit entry, else the current last price."""
+        for entry in entries:
+            if entry != "MARKET":
+                return Decimal(str(entry))
+        client = next(iter(self.clients.values()))
+        ticker = await client.get_ticker(symbol)
+        tickers = (ticker or {}).get("result", {}).get("list") or []
+        if tickers and tickers[0].get("lastPrice"):
+            return Decimal(str(tickers[0]["lastPrice"]))
+        return None
+
+    async def _run(self, operation: str, name: str, started: float, call) -> Dict[str, Any]:
+        """Run one account's gate call under the semaphore and record its latency."""
+        async with self._semaphore:
+            sent = time.perf_counter()
+            try:
+                success = await call()
+            except Exception as e:
+                system_logger.error(f"Account {name}: {operation} failed: {e}", exc_info=True)
+                success = False
+            acked = time.perf_counter()
+
+        latency = acked - sent
+        self._latencies[name].append(latency * 1000)
+        if success:
+            self._placed[name] += 1
+        else:
+            self._failed[name] += 1
+
+        from app.core.performance_monitor import get_performance_monitor
+        get_performance_monitor().record_request(f"account_{operation}", latency, success)
+        return {
+            'success': success,
+            'queued_ms': (sent - started) * 1000,
+            'latency_ms': latency * 1000,
+            'since_signal_ms': (acked - started) * 1000
+        }
+
+    def _report(self, operation: str, trade_id: str, symbol: str,
+                results: Dict[str, Dict[str, Any]], started: float):
+        system_logger.info(f"Multi-account {operation} for {symbol}", {
+            'trade_id': trade_id,
+            'accounts': len(results),
+            'succeeded': sum(1 for r in results.values() if r.get('success')),
+            'wall_ms': (time.perf_counter() - started) * 1000,
+            'per_account': results
+        })
+
+    async def place_entry_orders(
+        self,
+        trade_id: str,
+        symbol: str,
+        direction: str,
+        entries: List,
+        leverage: Decimal,
+        channel_name: str,
+        tps: List = None,
+        sl = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Size and place the signal's entry orders on every account concurrently."""
+        from app.core.confirmation_gate import get_confirmation_gate
+        from app.core.symbol_registry import get_symbol_registry
+
+        started = time.perf_counter()
+        gate = get_confirmation_gate()
+        try:
+            symbol_info = await get_symbol_registry().get_symbol_info(symbol)
+            entry_price = await self._reference_price(symbol, entries)
+        except Exception as e:
+            system_logger.error(f"Multi-account entry for {symbol} skipped: {e}", exc_info=True)
+            return {}
+        if not symbol_info or not entry_price:
+            system_logger.error(f"Multi-account entry for {symbol} skipped: no symbol info or price")
+            return {}
+
+        async def run(name: str) -> Dict[str, Any]:
+            qty = self.size_for_account(name, symbol, leverage, entry_price, symbol_info)
+            if qty <= 0:
+                self._failed[name] += 1
+                return {'success': False, 'qty': "0"}
+            result = await self._run("entry", name, started, lambda: gate.place_entry_orders(
+                symbol, direction, entries, qty, leverage, channel_name,
+                tps=tps, sl=sl, client=self.clients[name], notify=False
+            ))
+            if result['success']:
+                self._open.setdefault(trade_id, {})[name] = qty
+            result['qty'] = str(qty)
+            return result
+
+        names = list(self.clients)
+        outcomes = await asyncio.gather(*(run(name) for name in names))
+        results = dict(zip(names, outcomes))
+        self._report("entry", trade_id, symbol, results, started)
+        return results
+
+    async def place_exit_orders(
+        self,
+        trade_id: str,
+        symbol: str,
+        side: str,
+        tps: List,
+        sl,
+        channel_name: str,
+        entry_price: Decimal = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Place TP/SL on every account that entered `trade_id`, concurrently."""
+        from app.core.confirmation_gate import get_confirmation_gate
+
+        positions = self._open.pop(trade_id, {})
+        if not positions:
+            return {}
+
+        started = time.perf_counter()
+        gate = get_confirmation_gate()
+
+        async def run(name: str, qty: Decimal) -> Dict[str, Any]:
+            return await self._run("exit", name, started, lambda: gate.place_exit_orders(
+                symbol, side, qty, tps, sl, channel_name, entry_price=entry_price,
+                client=self.clients[name], notify=False
+            ))
+
+        names = list(positions)
+        outcomes = await asyncio.gather(*(run(name, positions[name]) for name in names))
+        results = dict(zip(names, outcomes))
+        self._report("exit", trade_id, symbol, results, started)
+        return results
+
+    def discard(self, trade_id: str):
+        """Forget a trade that ended before its exits were placed."""
+        self._open.pop(trade_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        accounts = {}
+        for name in self.accounts:
+            latencies = self._latencies[name]
+            accounts[name] = {
+                'placed': self._placed[name],
+                'failed': self._failed[name],
+                'last_latency_ms': latencies[-1] if latencies else None,
+                'avg_latency_ms': sum(latencies) / len(latencies) if latencies else None,
+                'max_latency_ms': max(latencies) if latencies else None
+            }
+        return {
+            'concurrency': self.concurrency,
+            'open_trades': len(self._open),
+            'accounts': accounts
+        }
+
+    async def close(self):
+        await asyncio.gather(*(client.aclose() for client in self.clients.values()))
+
+
+# Global account pool (None when no additional accounts are configured)
+_account_pool: Optional[AccountPool] = None
+
+
+def get_account_pool() -> Optional[AccountPool]:
+    """Get the pool of additional accounts, or None if BYBIT_ACCOUNTS is empty."""
+    global _account_pool
+    if _account_pool is None and STRICT_CONFIG.bybit_accounts:
+        _account_pool = AccountPool(STRICT_CONFIG.bybit_accounts, STRICT_CONFIG.multi_account_concurrency)
+    return _account_pool
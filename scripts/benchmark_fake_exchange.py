@@ -0,0 +1,132 @@
+"""
+Concurrent Trade Benchmark (fake exchange)
+
+Drives N concurrent trade lifecycles through BybitClient against the
+in-process fake exchange (app/tools/fake_exchange.py), so runs are
+deterministic and need no API keys or network:
+
+    set leverage -> PostOnly entry -> fill -> read position
+    -> set SL (trading-stop) -> price hits SL -> position closed
+
+Each trade gets its own symbol. Reports wall time, trades/s and per-call
+latency percentiles. Use --latency-ms/--jitter-ms/--error-5xx to model a
+slow or flaky exchange.
+
+Usage:
+    python scripts/benchmark_fake_exchange.py
+    python scripts/benchmark_fake_exchange.py --trades 500 --latency-ms 20 --jitter-ms 10
+    python scripts/benchmark_fake_exchange.py --rate-limited   # keep Bybit's per-UID limits
+
+Needs the usual .env (the client reads STRICT_CONFIG); no request is sent to Bybit.
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.bybit.client import BybitClient
+from app.bybit.rate_limiter import BybitRateLimiter, ENDPOINT_GROUPS
+from app.tools.fake_exchange import FakeBybitExchange, FaultConfig
+
+TICK = Decimal("0.01")
+UNTHROTTLED = 1_000_000
+
+
+class Timer:
+    """Per-operation latency samples."""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, name, coro):
+        start = time.perf_counter()
+        try:
+            return await coro
+        except Exception:
+            self.errors[name] += 1
+            raise
+        finally:
+            self.samples[name].append((time.perf_counter() - start) * 1000)
+
+
+async def run_trade(i: int, client: BybitClient, exchange: FakeBybitExchange, timer: Timer) -> bool:
+    symbol = f"T{i:04d}USDT"
+    price = exchange.prices[symbol]
+    entry = (price * Decimal("0.999")).quantize(TICK)
+    stop = (entry * Decimal("0.99")).quantize(TICK)
+    try:
+        await timer.call("set_leverage", client.set_leverage("linear", symbol, 10, 10))
+        await timer.call("entry_postonly", client.entry_limit_postonly(
+            "linear", symbol, "Buy", "1.0", str(entry), f"bench-{i}"
+        ))
+        exchange.set_price(symbol, entry)  # market trades down to the entry
+        position = await timer.call("get_position", client.get_position("linear", symbol))
+        if position["result"]["list"][0]["size"] == "0":
+            return False
+        await timer.call("set_trading_stop", client.set_trading_stop("linear", symbol, stop_loss=str(stop), position_idx=0))
+        exchange.set_price(symbol, stop - TICK)  # SL triggers
+        position = await timer.call("get_position", client.get_position("linear", symbol))
+        return position["result"]["list"][0]["size"] == "0"
+    except Exception:
+        return False
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark concurrent trades against the fake exchange")
+    parser.add_argument("--trades", type=int, default=200, help="Concurrent trades")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-5xx", type=float, default=0.0)
+    parser.add_argument("--rate-limited", action="store_true", help="Keep the client's Bybit rate limits")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    faults = FaultConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                         error_5xx_rate=args.error_5xx, seed=args.seed)
+    # Without --rate-limited both sides allow UNTHROTTLED req/s per group, so
+    # the run measures the client and exchange path rather than Bybit's quotas
+    groups = dict(ENDPOINT_GROUPS) if args.rate_limited else {
+        group: (UNTHROTTLED, priority) for group, (_, priority) in ENDPOINT_GROUPS.items()
+    }
+    exchange = FakeBybitExchange(
+        instruments={}, balance=Decimal("1000000"), faults=faults,
+        rate_limits={group: rate for group, (rate, _) in groups.items()}
+    )
+    for i in range(args.trades):
+        exchange.add_instrument(f"T{i:04d}USDT", "100.00", "0.01", "0.1", "0.1", "50")
+
+    client = exchange.attach(BybitClient())
+    client._rate_limiter = BybitRateLimiter(groups)
+
+    timer = Timer()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_trade(i, client, exchange, timer) for i in range(args.trades)))
+    wall = time.perf_counter() - start
+
+    completed = sum(results)
+    print(f"\nFake exchange benchmark: {args.trades} concurrent trades "
+          f"(latency {args.latency_ms}ms ±{args.jitter_ms}ms, 5xx {args.error_5xx:.1%})")
+    print("=" * 72)
+    print(f"Completed: {completed}/{args.trades}   wall: {wall:.2f}s   "
+          f"throughput: {completed / wall:.1f} trades/s, {exchange.stats['requests'] / wall:.0f} req/s")
+    print(f"\n{'call':<18} {'count':>7} {'errors':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, samples in timer.samples.items():
+        cuts = statistics.quantiles(samples, n=100) if len(samples) > 1 else samples * 99
+        print(f"{name:<18} {len(samples):>7} {timer.errors[name]:>7} "
+              f"{cuts[49]:>9.2f} {cuts[94]:>9.2f} {cuts[98]:>9.2f}")
+    print("=" * 72)
+    print(f"Exchange: {exchange.stats}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
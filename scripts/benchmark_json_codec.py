@@ -0,0 +1,120 @@
+"""
+JSON Codec Benchmark
+
+Compares the JSON backends available to app/core/json_codec.py (orjson,
+stdlib json) on the payloads the bot serializes and parses on its hot path:
+
+    sign body      order body dumped for the request signature (and sent as-is)
+    REST response  position list from /v5/position/list
+    WS frame       private execution frame
+    log entry      StructuredLogger line
+    journal line   JournalEntry.to_json (data serialized once for hash + line)
+
+Usage:
+    python scripts/benchmark_json_codec.py
+    python scripts/benchmark_json_codec.py --iterations 200000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core import json_codec
+from app.core.journal import JournalEntry
+
+ORDER_BODY = {
+    "category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit",
+    "qty": "0.010", "price": "59000.5", "timeInForce": "PostOnly",
+    "orderLinkId": "entry-1717000000-BTCUSDT", "reduceOnly": False, "positionIdx": 0
+}
+
+POSITION = {
+    "symbol": "BTCUSDT", "side": "Buy", "size": "0.010", "avgPrice": "59000.5",
+    "positionValue": "590.005", "leverage": "10", "markPrice": "59120.1",
+    "unrealisedPnl": "1.196", "cumRealisedPnl": "-0.35", "stopLoss": "58000",
+    "takeProfit": "", "trailingStop": "0", "positionIdx": 0, "positionStatus": "Normal",
+    "createdTime": "1717000000000", "updatedTime": "1717000300000"
+}
+REST_RESPONSE = (
+    '{"retCode":0,"retMsg":"OK","result":{"category":"linear","list":['
+    + ",".join([json_codec.dumps(POSITION)] * 20)
+    + ']},"retExtInfo":{},"time":1717000300123}'
+).encode()
+
+WS_FRAME = json_codec.dumps({
+    "topic": "execution", "id": "386825804_BTCUSDT_140612148849382", "creationTime": 1717000300123,
+    "data": [{
+        "category": "linear", "symbol": "BTCUSDT", "execFee": "0.005061", "execId": "7e2ae69c-4edf",
+        "execPrice": "59000.5", "execQty": "0.010", "execType": "Trade", "execValue": "590.005",
+        "isMaker": True, "orderId": "c6f055d9-7f21", "orderLinkId": "entry-1717000000-BTCUSDT",
+        "orderPrice": "59000.5", "orderQty": "0.010", "side": "Buy", "execTime": "1717000300120"
+    }]
+})
+
+LOG_ENTRY = {
+    "timestamp": "2025-05-28T07:46:00.123456", "level": "INFO", "logger": "system",
+    "traceId": "fed5fd5e", "message": "Entry order placed",
+    "data": {"symbol": "BTCUSDT", "side": "Buy", "qty": "0.010", "price": "59000.5",
+             "order_id": "c6f055d9-7f21", "latency_ms": 41.7, "channel": "Wolf Of Trading"}
+}
+
+JOURNAL_DATA = {"order_id": "c6f055d9-7f21", "symbol": "BTCUSDT", "side": "Buy",
+                "qty": "0.010", "price": "59000.5", "trade_id": "T-1717000000"}
+
+CASES = [
+    ("sign body", lambda: json_codec.dumps(ORDER_BODY)),
+    ("REST response", lambda: json_codec.loads(REST_RESPONSE)),
+    ("WS frame", lambda: json_codec.loads(WS_FRAME)),
+    ("log entry", lambda: json_codec.dumps(LOG_ENTRY)),
+    ("journal line", lambda: JournalEntry(1, "ORDER_PLACED", JOURNAL_DATA, "GENESIS").to_json()),
+]
+
+
+def bench(func, iterations: int) -> float:
+    """Best of three runs, in microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare JSON codec backends")
+    parser.add_argument("--iterations", type=int, default=50000)
+    args = parser.parse_args()
+
+    previous = json_codec.get_backend()
+    results = {}
+    for backend in json_codec.AVAILABLE_BACKENDS:
+        json_codec.set_backend(backend)
+        results[backend] = {name: bench(func, args.iterations) for name, func in CASES}
+    json_codec.set_backend(previous)
+
+    backends = list(json_codec.AVAILABLE_BACKENDS)
+    print(f"\nJSON codec benchmark ({args.iterations} iterations, best of 3, µs/call)")
+    print("=" * 64)
+    header = f"{'payload':<16}" + "".join(f"{b:>12}" for b in backends)
+    if len(backends) > 1:
+        header += f"{'speedup':>12}"
+    print(header)
+    for name, _ in CASES:
+        row = f"{name:<16}" + "".join(f"{results[b][name]:>12.2f}" for b in backends)
+        if len(backends) > 1:
+            row += f"{results['json'][name] / results[backends[0]][name]:>11.1f}x"
+        print(row)
+    print("=" * 64)
+    if "orjson" not in backends:
+        print("orjson not installed: only the stdlib backend was measured (pip install orjson)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Request Signing Micro-benchmark
+
+Measures the per-request cost of building Bybit auth headers:
+
+    legacy   three STRICT_CONFIG lookups per call (function-local import each),
+             secret re-encoded and a fresh HMAC keyed for every request
+    signer   app/bybit/signer.py: pre-keyed HMAC state copied per request,
+             pre-encoded key/recv-window, prebuilt constant headers
+
+for a GET query and a POST order body (body serialization excluded).
+
+Usage:
+    python scripts/benchmark_signing.py
+    python scripts/benchmark_signing.py --iterations 500000
+"""
+
+import argparse
+import hashlib
+import hmac
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.bybit.client import _get_bybit_api_key, _get_bybit_api_secret, _get_bybit_recv_window
+from app.bybit.signer import RequestSigner
+
+QUERY = "category=linear&symbol=BTCUSDT"
+BODY = ('{"category":"linear","symbol":"BTCUSDT","side":"Buy","orderType":"Limit","qty":"0.010",'
+        '"price":"59000.5","timeInForce":"PostOnly","orderLinkId":"entry-1717000000-BTCUSDT"}')
+TIMESTAMP = "1717000000000"
+
+
+def legacy_headers(payload: str, json_body: bool):
+    """Header construction as BybitClient did it before the signer."""
+    prehash = TIMESTAMP + _get_bybit_api_key() + _get_bybit_recv_window() + payload
+    headers = {
+        "X-BAPI-API-KEY": _get_bybit_api_key(),
+        "X-BAPI-TIMESTAMP": TIMESTAMP,
+        "X-BAPI-RECV-WINDOW": _get_bybit_recv_window(),
+        "X-BAPI-SIGN": hmac.new(_get_bybit_api_secret().encode(), prehash.encode(), hashlib.sha256).hexdigest(),
+        "X-BAPI-SIGN-TYPE": "2",
+    }
+    if json_body:
+        headers["Content-Type"] = "application/json"
+    return headers
+
+
+def bench(func, iterations: int) -> float:
+    """Best of three runs, in microseconds per call."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / iterations * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request signing overhead")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    signer = RequestSigner(_get_bybit_api_key(), _get_bybit_api_secret(), _get_bybit_recv_window())
+    assert signer.headers(TIMESTAMP, BODY, json_body=True) == legacy_headers(BODY, True)
+    assert signer.headers(TIMESTAMP, QUERY) == legacy_headers(QUERY, False)
+
+    cases = [
+        ("GET query", lambda: legacy_headers(QUERY, False), lambda: signer.headers(TIMESTAMP, QUERY)),
+        ("POST body", lambda: legacy_headers(BODY, True), lambda: signer.headers(TIMESTAMP, BODY, json_body=True)),
+    ]
+
+    print(f"\nSigning overhead per request ({args.iterations} iterations, best of 3, µs)")
+    print("=" * 56)
+    print(f"{'request':<12} {'legacy':>12} {'signer':>12} {'speedup':>12}")
+    for name, legacy, fast in cases:
+        before = bench(legacy, args.iterations)
+        after = bench(fast, args.iterations)
+        print(f"{name:<12} {before:>12.2f} {after:>12.2f} {before / after:>11.1f}x")
+    print("=" * 56 + "\n")
+
+
+if __name__ == "__main__":
+    main()
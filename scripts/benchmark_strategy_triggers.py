@@ -0,0 +1,135 @@
+"""
+Strategy Trigger Micro-Benchmark
+
+Measures the per-tick cost of checking pyramid, trailing and hedge triggers
+for N concurrent trades:
+
+- legacy:   recompute gain/loss % from original entry with Decimal math and
+            walk every pyramid level (the pre-compiled-ladder behaviour)
+- compiled: compare the tick against each strategy's precomputed trigger price
+
+Usage:
+    python scripts/benchmark_strategy_triggers.py
+    python scripts/benchmark_strategy_triggers.py --trades 100 --ticks 2000
+
+Needs the usual .env (strategies load STRICT_CONFIG and the Bybit client
+singleton); no request is sent to Bybit.
+"""
+
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.strategies.pyramid_v2 import PyramidStrategyV2
+from app.strategies.trailing_v2 import TrailingStopStrategyV2
+from app.strategies.hedge_v2 import HedgeStrategyV2
+
+
+def build_trades(count: int):
+    """Create `count` trades with a spread of entries and both directions."""
+    trades = []
+    for i in range(count):
+        entry = Decimal("105") + Decimal(i % 10 - 5) / Decimal("100")
+        long = i % 2 == 0
+        trades.append({
+            "entry": entry,
+            "pyramid": PyramidStrategyV2(f"T{i}", "BTCUSDT", "LONG" if long else "SHORT", entry, "BENCH"),
+            "trailing": TrailingStopStrategyV2(f"T{i}", "BTCUSDT", "BUY" if long else "SELL", "BENCH"),
+            "hedge": HedgeStrategyV2(f"T{i}", "BTCUSDT", "BUY" if long else "SELL", entry, "BENCH"),
+        })
+    return trades
+
+
+def legacy_check(trade, price: Decimal) -> int:
+    """Per-tick work of the old percentage-based checks."""
+    fired = 0
+    entry = trade["entry"]
+    pyramid = trade["pyramid"]
+    if pyramid.direction == "LONG":
+        gain_pct = (price - entry) / entry * 100
+    else:
+        gain_pct = (entry - price) / entry * 100
+    for level_pct in pyramid.levels:
+        if gain_pct >= level_pct and level_pct not in pyramid.activated_levels:
+            fired += 1
+            break
+
+    trailing = trade["trailing"]
+    if trailing.direction == "BUY":
+        gain_pct = (price - entry) / entry * 100
+    else:
+        gain_pct = (entry - price) / entry * 100
+    if not trailing.armed and gain_pct >= trailing.trigger_pct:
+        fired += 1
+
+    hedge = trade["hedge"]
+    if hedge.direction == "BUY":
+        loss_pct = (entry - price) / entry * 100
+    else:
+        loss_pct = (price - entry) / entry * 100
+    if loss_pct >= hedge.trigger_pct:
+        fired += 1
+    return fired
+
+
+def compiled_check(trade, price: Decimal) -> int:
+    """Per-tick work with precomputed trigger prices."""
+    fired = 0
+    entry = trade["entry"]
+    if trade["pyramid"].should_activate(price):
+        fired += 1
+    if trade["trailing"].needs_update(price, entry):
+        fired += 1
+    if trade["hedge"].should_activate(price, entry):
+        fired += 1
+    return fired
+
+
+def run(check, trades, prices):
+    start = time.perf_counter()
+    fired = 0
+    for price in prices:
+        for trade in trades:
+            fired += check(trade, price)
+    return time.perf_counter() - start, fired
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strategy trigger checks")
+    parser.add_argument("--trades", type=int, default=100, help="Concurrent trades")
+    parser.add_argument("--ticks", type=int, default=2000, help="Price ticks per run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # Quiet market around the entries: triggers rarely fire, as in production
+    prices = [Decimal("105") + Decimal(random.randint(-300, 300)) / Decimal("1000") for _ in range(args.ticks)]
+    trades = build_trades(args.trades)
+
+    # Warm up (compiles lazily-cached activation prices)
+    run(compiled_check, trades, prices[:10])
+    run(legacy_check, trades, prices[:10])
+
+    legacy_s, legacy_fired = run(legacy_check, trades, prices)
+    compiled_s, compiled_fired = run(compiled_check, trades, prices)
+
+    checks = args.trades * args.ticks
+    print(f"\nStrategy trigger checks: {args.trades} trades x {args.ticks} ticks = {checks} checks")
+    print("=" * 72)
+    print(f"{'mode':<10} {'total ms':>10} {'us/check':>10} {'us/tick (all trades)':>22} {'fired':>8}")
+    for name, seconds, fired in (("legacy", legacy_s, legacy_fired), ("compiled", compiled_s, compiled_fired)):
+        print(f"{name:<10} {seconds * 1000:>10.1f} {seconds / checks * 1e6:>10.3f} "
+              f"{seconds / args.ticks * 1e6:>22.1f} {fired:>8}")
+    print("=" * 72)
+    print(f"Speed-up: {legacy_s / compiled_s:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Tick Arithmetic Micro-Benchmark
+
+Compares the Decimal and integer-tick versions of the per-tick hot paths
+for N concurrent trades on one symbol:
+
+- triggers: the strategy scheduler's per-update pass (pyramid/trailing/hedge).
+            Decimal compares per trade vs one tick conversion per update
+            and the symbol's quiet band in ticks (per-trade int compares
+            only for updates that reach a trigger)
+- ladder:   TP/SL ladder bisects alone, Decimal keys vs tick keys (includes
+            the update's tick conversion)
+- update:   both market stream listeners for one update (scheduler + TP/SL
+            ladder); with ticks the conversion is shared
+- sizing:   dual-entry split and ±0.1% offset prices, Decimal quantize() vs
+            whole steps/ticks (once per order; ticks are there for
+            correctness with ticks like 0.5 and steps like 100, not speed)
+
+Usage:
+    python scripts/benchmark_tick_arithmetic.py
+    python scripts/benchmark_tick_arithmetic.py --trades 100 --ticks 2000
+
+Needs the usual .env (strategies load STRICT_CONFIG and the Bybit client
+singleton); no request is sent to Bybit.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.decimal_config import quantize_price, quantize_qty
+from app.core.strategy_scheduler import StrategyScheduler
+from app.core.symbol_registry import get_symbol_registry
+from app.core.ticks import tick_scale
+from app.core.tpsl_trigger_engine import SymbolTriggerLadder, compile_tpsl_triggers
+from app.strategies.pyramid_v2 import PyramidStrategyV2
+from app.strategies.trailing_v2 import TrailingStopStrategyV2
+from app.strategies.hedge_v2 import HedgeStrategyV2
+
+TICK = Decimal("0.001")
+STEP = Decimal("0.1")
+
+
+def build_trades(count: int, symbol: str):
+    """Stub RUNNING trades with a spread of entries and both directions."""
+    trades = []
+    for i in range(count):
+        entry = Decimal("105") + Decimal(i % 10 - 5) / Decimal("100")
+        long = i % 2 == 0
+        trades.append(SimpleNamespace(
+            trade_id=f"{symbol}_{i}",
+            signal_data={"symbol": symbol},
+            original_entry=entry,
+            pyramid_strategy=PyramidStrategyV2(f"T{i}", symbol, "LONG" if long else "SHORT", entry, "BENCH"),
+            trailing_strategy=TrailingStopStrategyV2(f"T{i}", symbol, "BUY" if long else "SELL", "BENCH"),
+            hedge_strategy=HedgeStrategyV2(f"T{i}", symbol, "BUY" if long else "SELL", entry, "BENCH"),
+        ))
+    return trades
+
+
+def build_scheduler(count: int) -> StrategyScheduler:
+    """Scheduler with `count` trades on XUSDT (instrument loaded) and on YUSDT (not loaded)."""
+    get_symbol_registry().load_snapshot([{
+        "symbol": "XUSDT",
+        "lotSizeFilter": {"minOrderQty": str(STEP), "maxOrderQty": "1000000", "qtyStep": str(STEP)},
+        "priceFilter": {"tickSize": str(TICK)}
+    }])
+    scheduler = StrategyScheduler()
+
+    async def register():
+        for symbol in ("XUSDT", "YUSDT"):
+            for fsm in build_trades(count, symbol):
+                await scheduler.register(fsm)
+
+    asyncio.run(register())
+    return scheduler
+
+
+def scheduler_run(scheduler, symbol, prices):
+    fired = 0
+    for price in prices:
+        fired += len(scheduler.on_price(symbol, price))
+    return fired
+
+
+def build_ladder(count: int, scale):
+    ladder = SymbolTriggerLadder(scale)
+    for i in range(count):
+        entry = Decimal("105") + Decimal(i % 10 - 5) / Decimal("100")
+        side = "Buy" if i % 2 == 0 else "Sell"
+        for trigger in compile_tpsl_triggers(f"T{i}", "XUSDT", side, entry,
+                                             [Decimal("2"), Decimal("4"), Decimal("6")], Decimal("7.5")):
+            ladder.add(trigger)
+    return ladder
+
+
+def ladder_run(ladder, prices):
+    fired = 0
+    for price in prices:
+        fired += len(ladder.pop_fired(price))
+    return fired
+
+
+def update_run(scheduler, symbol, ladder, prices):
+    fired = 0
+    for price in prices:
+        fired += len(scheduler.on_price(symbol, price))
+        fired += len(ladder.pop_fired(price))
+    return fired
+
+
+def sizing_decimal(totals, bases):
+    out = 0
+    below, above = Decimal("1") - Decimal("0.1") / Decimal("100"), Decimal("1") + Decimal("0.1") / Decimal("100")
+    for total, base in zip(totals, bases):
+        qty = quantize_qty(total / Decimal("2"), STEP)
+        low = quantize_price(base * below, TICK)
+        high = quantize_price(base * above, TICK)
+        out += len(str(qty)) + len(str(low)) + len(str(high))
+    return out
+
+
+def sizing_ticks(totals, bases, scale):
+    out = 0
+    below, above = Decimal("1") - Decimal("0.1") / Decimal("100"), Decimal("1") + Decimal("0.1") / Decimal("100")
+    for total, base in zip(totals, bases):
+        qty = scale.qty_str(scale.split_qty(total, 2))
+        low = scale.price_str(scale.floor_ticks(base * below))
+        high = scale.price_str(scale.floor_ticks(base * above))
+        out += len(qty) + len(low) + len(high)
+    return out
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Decimal vs integer tick arithmetic")
+    parser.add_argument("--trades", type=int, default=100, help="Concurrent trades")
+    parser.add_argument("--ticks", type=int, default=2000, help="Price ticks per run")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    scale = tick_scale(TICK, STEP)  # the scale the registry hands out for XUSDT
+    # Quiet market around the entries (on the tick grid, as Bybit sends them)
+    prices = [Decimal("105") + Decimal(random.randint(-300, 300)) * TICK for _ in range(args.ticks)]
+    totals = [Decimal(random.randint(10, 100000)) * STEP / Decimal("7") for _ in range(args.ticks)]
+    bases = [Decimal(random.randint(50000, 150000)) / Decimal("997") for _ in range(args.ticks)]
+    scheduler = build_scheduler(args.trades)
+
+    # Warm up (compiles lazily-cached activation prices/ticks)
+    scheduler_run(scheduler, "YUSDT", prices[:10])
+    scheduler_run(scheduler, "XUSDT", prices[:10])
+
+    results = []
+    decimal_s, decimal_fired = timed(scheduler_run, scheduler, "YUSDT", prices)
+    ticks_s, ticks_fired = timed(scheduler_run, scheduler, "XUSDT", prices)
+    assert decimal_fired == ticks_fired, "tick triggers disagree with Decimal triggers"
+    results.append(("triggers", args.ticks, decimal_s, ticks_s))
+
+    # Fresh Decimal objects per run, as each stream message brings new ones
+    decimal_ladder, tick_ladder = build_ladder(args.trades, None), build_ladder(args.trades, scale)
+    decimal_s, decimal_fired = timed(ladder_run, decimal_ladder, [Decimal(str(p)) for p in prices])
+    ticks_s, ticks_fired = timed(ladder_run, tick_ladder, [Decimal(str(p)) for p in prices])
+    assert decimal_fired == ticks_fired, "tick ladder disagrees with Decimal ladder"
+    results.append(("ladder", args.ticks, decimal_s, ticks_s))
+
+    decimal_ladder, tick_ladder = build_ladder(args.trades, None), build_ladder(args.trades, scale)
+    decimal_s, decimal_fired = timed(update_run, scheduler, "YUSDT", decimal_ladder, [Decimal(str(p)) for p in prices])
+    ticks_s, ticks_fired = timed(update_run, scheduler, "XUSDT", tick_ladder, [Decimal(str(p)) for p in prices])
+    assert decimal_fired == ticks_fired, "tick update disagrees with Decimal update"
+    results.append(("update", args.ticks, decimal_s, ticks_s))
+
+    decimal_s, _ = timed(sizing_decimal, totals, bases)
+    ticks_s, _ = timed(sizing_ticks, totals, bases, scale)
+    results.append(("sizing", args.ticks, decimal_s, ticks_s))
+
+    print(f"\nDecimal vs tick arithmetic: {args.trades} trades, {args.ticks} price updates")
+    print("=" * 72)
+    print(f"{'path':<10} {'ops':>9} {'decimal us/op':>14} {'ticks us/op':>12} {'speed-up':>10}")
+    for name, ops, decimal_s, ticks_s in results:
+        print(f"{name:<10} {ops:>9} {decimal_s / ops * 1e6:>14.3f} {ticks_s / ops * 1e6:>12.3f} "
+              f"{decimal_s / ticks_s:>9.1f}x")
+    print("=" * 72 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Trade State Memory Benchmark
+
+Measures the per-trade memory and GC cost of live trade state for N
+concurrent trades:
+
+- legacy:  the previous TradeFSM layout: Decimal/int/bool attributes in the
+           instance __dict__, unused order lists and a dict of bound state
+           handlers per instance
+- compact: the current TradeFSM, numeric state in a slotted TradeRecord
+           (ints at tick/step precision) indexed by the TradeBook
+
+Strategy objects are created after the fill in both designs and are not
+included. Reported per design: bytes per trade (tracemalloc), GC-tracked
+objects per trade, and gen-0 collections triggered while creating and
+updating the trades.
+
+Usage:
+    python scripts/benchmark_trade_state.py
+    python scripts/benchmark_trade_state.py --trades 100 1000 5000
+
+Needs the usual .env (TradeFSM loads STRICT_CONFIG and the Bybit client
+singleton); no request is sent to Bybit.
+"""
+
+import argparse
+import asyncio
+import gc
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.core.strict_fsm import TradeFSM, TradeState
+from app.core.trade_book import get_trade_book
+
+
+class LegacyTradeState:
+    """Attribute layout of TradeFSM before the TradeBook."""
+
+    def __init__(self, signal_data):
+        self.signal_data = signal_data
+        self.state = TradeState.INIT
+        self.trade_id = f"{signal_data['symbol']}_{int(time.time())}"
+        self.entry_orders = []
+        self.exit_orders = []
+        self.position_size = Decimal("0")
+        self.entry_price = Decimal("0")
+        self.original_entry = Decimal("0")
+        self.current_pnl = Decimal("0")
+        self.pyramid_level = 0
+        self.trailing_active = False
+        self.hedge_count = 0
+        self.reentry_count = 0
+        self.error_count = 0
+        self.max_errors = 3
+        self.pyramid_strategy = None
+        self.trailing_strategy = None
+        self.hedge_strategy = None
+        self.reentry_strategy = None
+        self._wakeup = asyncio.Event()
+        self._hedge_triggered = False
+        self._fill_waiter = None
+        self._handlers = {state: getattr(self, "_handle") for state in TradeState}
+        self._position_check_count = 0  # added on first position check
+        self._position_logged = False
+
+    async def _handle(self):
+        return True
+
+
+def signal(i: int):
+    return {
+        "symbol": f"SYM{i % 50}USDT",
+        "direction": "LONG" if i % 2 else "SHORT",
+        "mode": "SWING",
+        "entries": ["105.5"],
+        "leverage": 10,
+        "channel_name": "BENCH"
+    }
+
+
+def fill(trade, i: int):
+    """State of a filled, running trade (values as parsed from Bybit strings)."""
+    trade.entry_price = Decimal(f"105.{i % 1000:03d}")
+    trade.original_entry = trade.entry_price
+    trade.position_size = Decimal(f"{1 + i % 7}.25")
+    trade.current_pnl = Decimal(f"-0.{i % 97:02d}")
+    trade.pyramid_level = i % 3
+    trade.trailing_active = bool(i % 2)
+    trade.state = TradeState.RUNNING
+
+
+def measure(factory, count: int):
+    gc.collect()
+    gen0_before = gc.get_stats()[0]["collections"]
+    tracked_before = len(gc.get_objects())
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    trades = []
+    for i in range(count):
+        trade = factory(signal(i))
+        fill(trade, i)
+        trades.append(trade)
+
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - tracked_before
+    gen0 = gc.get_stats()[0]["collections"] - gen0_before
+    # The list holding the trades is not trade state
+    list_bytes = sys.getsizeof(trades)
+    result = ((after - before - list_bytes) / count, tracked / count, gen0)
+    del trades
+    return result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark trade state memory")
+    parser.add_argument("--trades", type=int, nargs="+", default=[100, 1000], help="Concurrent trades")
+    args = parser.parse_args()
+
+    def compact(signal_data):
+        return TradeFSM(signal_data)
+
+    # Warm up caches (symbol scales, Decimal contexts)
+    measure(compact, 10)
+    measure(LegacyTradeState, 10)
+
+    print("\nTrade state memory (excluding strategy objects)")
+    print("=" * 72)
+    print(f"{'trades':>7} {'design':<8} {'bytes/trade':>12} {'gc objs/trade':>14} {'gen0 collections':>17}")
+    for count in args.trades:
+        for name, factory in (("legacy", LegacyTradeState), ("compact", compact)):
+            bytes_per, objects_per, gen0 = measure(factory, count)
+            print(f"{count:>7} {name:<8} {bytes_per:>12.0f} {objects_per:>14.1f} {gen0:>17}")
+        # Compact trades stay in the book until closed
+        for record in list(get_trade_book()._records.values()):
+            get_trade_book().close(record)
+    print("=" * 72 + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Run the Fake Bybit Exchange
+
+Serves app/tools/fake_exchange.py on localhost (REST + private/public
+WebSocket) so the bot, or any Bybit V5 client, can be pointed at it.
+Prices follow a seeded random walk unless --no-walk is given.
+
+Usage:
+    python scripts/run_fake_exchange.py
+    python scripts/run_fake_exchange.py --port 8799 --latency-ms 25 --jitter-ms 10 --error-429 0.01
+
+Then start the bot with:
+    BYBIT_ENDPOINT=http://127.0.0.1:8799
+    BYBIT_WS_PRIVATE_URL=ws://127.0.0.1:8799/v5/private
+    BYBIT_WS_PUBLIC_URL=ws://127.0.0.1:8799/v5/public/linear
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from app.tools.fake_exchange import FakeBybitExchange, FaultConfig, serve
+
+
+async def random_walk(exchange: FakeBybitExchange, interval: float, step_pct: float, seed: int):
+    """Move every symbol by up to ±step_pct each interval."""
+    rng = random.Random(seed)
+    while True:
+        await asyncio.sleep(interval)
+        for symbol, price in list(exchange.prices.items()):
+            tick = Decimal(exchange.instruments[symbol]["priceFilter"]["tickSize"])
+            move = price * Decimal(str(rng.uniform(-step_pct, step_pct))) / 100
+            exchange.set_price(symbol, max(tick, (price + move).quantize(tick)))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run a local Bybit V5 stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--balance", default="10000", help="USDT wallet balance")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-429", type=float, default=0.0, help="Probability of HTTP 429 per request")
+    parser.add_argument("--error-5xx", type=float, default=0.0, help="Probability of HTTP 5xx per request")
+    parser.add_argument("--enforce-rate-limits", action="store_true", help="Return 10006 when a group's budget is used")
+    parser.add_argument("--ws-drop-after", type=int, default=0, help="Drop WS connections after N pushes")
+    parser.add_argument("--walk-interval", type=float, default=1.0, help="Seconds between price moves")
+    parser.add_argument("--walk-step", type=float, default=0.1, help="Max price move per step (%%)")
+    parser.add_argument("--no-walk", action="store_true", help="Keep prices fixed")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_429_rate=args.error_429,
+        error_5xx_rate=args.error_5xx,
+        enforce_rate_limits=args.enforce_rate_limits,
+        ws_drop_after=args.ws_drop_after,
+        seed=args.seed
+    )
+    exchange = FakeBybitExchange(balance=Decimal(args.balance), faults=faults)
+
+    base = f"{args.host}:{args.port}"
+    print(f"\nFake Bybit exchange on http://{base}")
+    print(f"  BYBIT_ENDPOINT=http://{base}")
+    print(f"  BYBIT_WS_PRIVATE_URL=ws://{base}/v5/private")
+    print(f"  BYBIT_WS_PUBLIC_URL=ws://{base}/v5/public/linear")
+    print(f"  Symbols: {', '.join(exchange.instruments)}\n")
+
+    if not args.no_walk:
+        asyncio.create_task(random_walk(exchange, args.walk_interval, args.walk_step, args.seed))
+    await serve(exchange, args.host, args.port)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -8,6 +8,8 @@ Usage:
     python start.py --audit            # With audit logger
     python start.py --clean            # Clean restart (reset session)
     python start.py --audit --backfill # With audit + backfill last 7 days
+    python start.py --profile-startup  # Log per-module import / per-component init times
+    python start.py --shards 4         # Supervisor mode: 1 ingress + 4 trade-worker processes
 """
 
 import os
@@ -16,6 +18,7 @@ import subprocess
 import time
 import glob
 import argparse
+import secrets
 from pathlib import Path
 
 
@@ -88,15 +91,22 @@ def clean_session():
     return True
 
 
-def start_bot_process():
+def start_bot_process(profile_startup=False):
     """Start the main bot process"""
     print("\n[*] Starting Bybit Copybot Pro...")
     
+    env = os.environ.copy()
+    if profile_startup:
+        # Read by app.core.startup_profiler in the bot process
+        env["COPYBOT_PROFILE_STARTUP"] = "1"
+        print("   Startup profiling: ENABLED (see 'Startup profile' in logs/system.log)")
+    
     try:
         bot_process = subprocess.Popen(
             [sys.executable, "-m", "app.main"],
             stdout=sys.stdout,
-            stderr=sys.stderr
+            stderr=sys.stderr,
+            env=env
         )
         print(f"[OK] Bot started (PID: {bot_process.pid})")
         return bot_process
@@ -105,6 +115,40 @@ def start_bot_process():
         return None
 
 
+def start_sharded_processes(shards, profile_startup=False):
+    """
+    Supervisor mode: N trade workers (each owns a hash-partition of symbols)
+    plus one ingress process for Telegram, parsing, health API and reports.
+    See app/runtime/sharding.py.
+    """
+    print(f"\n[*] Starting Bybit Copybot Pro in supervisor mode ({shards} trade shards)...")
+    
+    env = os.environ.copy()
+    env["COPYBOT_SHARDS"] = str(shards)
+    env["COPYBOT_SHARD_AUTHKEY"] = secrets.token_hex(32)  # per-run key for the local IPC channel
+    if profile_startup:
+        env["COPYBOT_PROFILE_STARTUP"] = "1"
+    
+    processes = []
+    try:
+        for shard_id in range(shards):
+            worker_env = dict(env, COPYBOT_ROLE="worker", COPYBOT_SHARD_ID=str(shard_id))
+            proc = subprocess.Popen([sys.executable, "-m", "app.main"], stdout=sys.stdout, stderr=sys.stderr, env=worker_env)
+            print(f"[OK] Trade shard {shard_id} started (PID: {proc.pid})")
+            processes.append((f"Trade shard {shard_id}", proc))
+        
+        ingress = subprocess.Popen([sys.executable, "-m", "app.main"], stdout=sys.stdout, stderr=sys.stderr,
+                                   env=dict(env, COPYBOT_ROLE="ingress"))
+        print(f"[OK] Ingress started (PID: {ingress.pid})")
+        processes.append(("Ingress", ingress))
+        return processes
+    except Exception as e:
+        print(f"[ERROR] Failed to start sharded bot: {e}")
+        for _, proc in processes:
+            proc.kill()
+        return None
+
+
 def start_audit_process(backfill=False, days=7):
     """Start the audit logger process"""
     print("\n[*] Starting Audit Logger...")
@@ -140,6 +184,8 @@ Examples:
   python start.py --audit            # With audit logger
   python start.py --clean            # Clean restart
   python start.py --audit --backfill # With audit + backfill
+  python start.py --profile-startup  # Profile imports and init
+  python start.py --shards 4         # 1 ingress + 4 trade-worker processes
         """
     )
     
@@ -168,6 +214,19 @@ Examples:
         help="Clean restart (reset Telegram session)"
     )
     
+    parser.add_argument(
+        "--profile-startup", "-p",
+        action="store_true",
+        help="Report per-module import cost and per-component init time"
+    )
+    
+    parser.add_argument(
+        "--shards", "-s",
+        type=int,
+        default=0,
+        help="Supervisor mode: run trades in N worker processes (symbols hash-partitioned)"
+    )
+    
     args = parser.parse_args()
     
     # Setup environment
@@ -201,12 +260,17 @@ Examples:
     processes = []
     
     try:
-        # Start main bot
-        bot_process = start_bot_process()
-        if bot_process is None:
-            return
-        
-        processes.append(("Bot", bot_process))
+        # Start main bot (single process, or ingress + trade shards)
+        if args.shards > 0:
+            bot_processes = start_sharded_processes(args.shards, profile_startup=args.profile_startup)
+            if bot_processes is None:
+                return
+            processes.extend(bot_processes)
+        else:
+            bot_process = start_bot_process(profile_startup=args.profile_startup)
+            if bot_process is None:
+                return
+            processes.append(("Bot", bot_process))
         time.sleep(3)  # Give bot time to initialize
         
         # Start audit logger if requested
@@ -0,0 +1,78 @@
+"""
+Tests for the live account-state cache (app/core/account_state.py).
+"""
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.account_state import AccountState
+
+
+WALLET = {
+    "accountType": "UNIFIED", "totalEquity": "1012.5", "totalWalletBalance": "1000",
+    "totalAvailableBalance": "960", "totalInitialMargin": "40"
+}
+
+
+def make_client(wallet=WALLET, positions=()):
+    client = MagicMock()
+    client.get_wallet_balance = AsyncMock(return_value={"retCode": 0, "result": {"list": [wallet]}})
+    client.positions_by_settle_coin = AsyncMock(return_value={"retCode": 0, "result": {"list": list(positions)}})
+    return client
+
+
+class TestStreamUpdates:
+    """Wallet/position events keep the cache current."""
+
+    def test_not_live_until_seeded(self):
+        state = AccountState(stream_live=lambda: True)
+        state.on_wallet(WALLET)
+
+        assert state.get_wallet_balance() is None
+
+    @pytest.mark.asyncio
+    async def test_refresh_then_stream_updates(self):
+        state = AccountState(stream_live=lambda: True)
+        client = make_client(positions=[{"symbol": "BTCUSDT", "size": "0.01", "avgPrice": "60000", "positionIM": "60.2"}])
+
+        with patch("app.bybit.client.get_bybit_client", return_value=client):
+            assert await state.refresh("test")
+
+        assert state.get_wallet_balance() == Decimal("1000")
+        assert state.get_position_im("BTCUSDT") == Decimal("60.2")
+
+        state.on_wallet({**WALLET, "totalWalletBalance": "987.65"})
+        state.on_position({"symbol": "BTCUSDT", "size": "0", "positionIM": "0"})
+        state.on_position({"symbol": "ETHUSDT", "size": "1", "avgPrice": "3000", "positionIM": "150"})
+
+        assert state.get_wallet_balance() == Decimal("987.65")
+        assert state.get_position_im("BTCUSDT") is None
+        assert state.get_position_im("ETHUSDT") == Decimal("150")
+
+    @pytest.mark.asyncio
+    async def test_stream_down_or_invalidated_falls_back(self):
+        live = {"value": True}
+        state = AccountState(stream_live=lambda: live["value"])
+        with patch("app.bybit.client.get_bybit_client", return_value=make_client()):
+            await state.refresh("test")
+
+        live["value"] = False
+        assert state.get_wallet_balance() is None
+
+        live["value"] = True
+        state.invalidate()
+        assert state.get_wallet_balance() is None
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_stays_unsynced(self):
+        state = AccountState(stream_live=lambda: True)
+        client = make_client()
+        client.get_wallet_balance.side_effect = RuntimeError("boom")
+
+        with patch("app.bybit.client.get_bybit_client", return_value=client):
+            assert not await state.refresh("test")
+
+        assert not state.synced
+        assert state.get_stats()["live"] is False
@@ -0,0 +1,119 @@
+"""
+Tests for the WS-driven fill-waiter registry (app/core/fill_waiters.py).
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.fill_waiters import CANCELLED, FILLED, FillWaiterRegistry, entry_link_id
+from app.core.idempotency import ORDER_LINK_ID_MAX
+
+
+def make_registry(positions=None, live=True, **kwargs):
+    positions = positions if positions is not None else {}
+
+    async def fetch_position(symbol):
+        return positions.get(symbol)
+
+    return FillWaiterRegistry(stream_live=lambda: live, fetch_position=fetch_position, **kwargs)
+
+
+class TestStreamEvents:
+    """Execution and order events resolve the right waiter."""
+
+    @pytest.mark.asyncio
+    async def test_execution_resolves_by_link_id(self):
+        registry = make_registry()
+        waiter = registry.expect("BTCUSDT", ["entry_t1_0", "entry_t1_1"])
+        other = registry.expect("BTCUSDT", ["entry_t2_0"])
+
+        registry.on_execution({"orderLinkId": "entry_t1_1", "execType": "Trade", "execQty": "0.01"})
+
+        result = await asyncio.wait_for(waiter.wait(), 1)
+        assert result["status"] == FILLED
+        assert result["source"] == "ws"
+        assert not other.done
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_funding_execution_ignored_and_order_id_binding(self):
+        registry = make_registry()
+        waiter = registry.expect("ETHUSDT", ["entry_t1_0"])
+        registry.bind(waiter, "entry_t1_0", "oid-1")
+
+        registry.on_execution({"orderId": "oid-1", "execType": "Funding"})
+        assert not waiter.done
+
+        registry.on_order({"orderId": "oid-1", "orderStatus": "PartiallyFilled", "cumExecQty": "0.5"})
+        assert (await asyncio.wait_for(waiter.wait(), 1))["status"] == FILLED
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_only_when_all_entries_dead(self):
+        registry = make_registry()
+        waiter = registry.expect("SOLUSDT", ["entry_t1_0", "entry_t1_1"])
+
+        registry.on_order({"orderLinkId": "entry_t1_0", "orderStatus": "Cancelled", "cumExecQty": "0"})
+        assert not waiter.done
+
+        registry.on_order({"orderLinkId": "entry_t1_1", "orderStatus": "Rejected", "cumExecQty": "0"})
+        assert (await asyncio.wait_for(waiter.wait(), 1))["status"] == CANCELLED
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_cancel_symbol_and_discard(self):
+        registry = make_registry()
+        waiter = registry.expect("XRPUSDT", ["entry_t1_0"])
+        dropped = registry.expect("XRPUSDT", ["entry_t2_0"])
+
+        registry.discard(dropped)
+        registry.cancel_symbol("XRPUSDT")
+
+        assert (await asyncio.wait_for(waiter.wait(), 1))["status"] == CANCELLED
+        assert dropped.future.cancelled()
+        registry.discard(waiter)
+        assert registry.get_stats()["symbols"] == 0
+        await registry.stop()
+
+
+class TestReconciliationSweep:
+    """REST sweep as safety net for missed events."""
+
+    @pytest.mark.asyncio
+    async def test_sweep_resolves_symbols_with_position(self):
+        registry = make_registry(positions={"BTCUSDT": {"size": "0.01"}, "ETHUSDT": {"size": "0"}})
+        filled = registry.expect("BTCUSDT", ["entry_t1_0"])
+        resting = registry.expect("ETHUSDT", ["entry_t2_0"])
+
+        assert await registry.sweep() == 1
+
+        result = await asyncio.wait_for(filled.wait(), 1)
+        assert result["source"] == "rest"
+        assert not resting.done
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_fallback_cadence_when_stream_down(self):
+        positions = {}
+        registry = make_registry(positions=positions, live=False, sweep_interval=60, fallback_interval=0.01)
+        waiter = registry.expect("BTCUSDT", [])
+
+        positions["BTCUSDT"] = {"size": "1"}
+        result = await asyncio.wait_for(waiter.wait(), 1)
+
+        assert result["status"] == FILLED
+        assert registry.sweeps >= 1
+        await registry.stop()
+
+
+class TestEntryLinkIds:
+    """Entry orderLinkIds fit Bybit's length limit."""
+
+    def test_link_ids_are_bounded_and_distinct(self):
+        long_trade = "1000000BABYDOGEUSDT_1760000000"
+
+        assert len(entry_link_id(long_trade, 9)) <= ORDER_LINK_ID_MAX
+        assert entry_link_id(long_trade, 0) == entry_link_id(long_trade, 0)
+        assert entry_link_id(long_trade, 0) != entry_link_id(long_trade, 1)
+        assert entry_link_id(long_trade, 0) != entry_link_id("1000000BABYDOGEUSDT_1760000001", 0)
@@ -0,0 +1,102 @@
+"""
+Tests for buffered WebSocket gap recovery (app/core/websocket_gap_detector.py).
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.websocket_gap_detector import WebSocketGapDetector
+
+
+def execution(seq):
+    return {"topic": "execution", "seq": seq, "data": [{"execType": "Trade", "orderLinkId": f"x{seq}"}]}
+
+
+def make_client(delay=0.05):
+    def slow(result):
+        async def call(*args, **kwargs):
+            await asyncio.sleep(delay)
+            return result
+        return call
+
+    client = MagicMock()
+    client.positions_by_settle_coin = AsyncMock(side_effect=slow({"result": {"list": [{"symbol": "BTCUSDT", "size": "1"}]}}))
+    client.query_open = AsyncMock(side_effect=slow({"result": {"list": []}}))
+    client.get_executions = AsyncMock(side_effect=RuntimeError("boom"))
+    client.get_wallet_balance = AsyncMock(side_effect=slow({"result": {"list": []}}))
+    return client
+
+
+class TestSnapshot:
+    """Snapshot parts are fetched concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_fetch_tolerates_partial_failure(self):
+        detector = WebSocketGapDetector()
+
+        with patch("app.bybit.client.get_bybit_client", return_value=make_client(delay=0.1)):
+            started = time.monotonic()
+            snapshot = await detector.fetch_snapshot()
+            elapsed = time.monotonic() - started
+
+        assert elapsed < 0.25  # three 100 ms calls overlap
+        assert snapshot["positions"] == [{"symbol": "BTCUSDT", "size": "1"}]
+        assert snapshot["orders"] == []
+        assert snapshot["executions"] is None
+
+
+class TestRecovery:
+    """Messages are buffered during recovery and replayed in order."""
+
+    @pytest.mark.asyncio
+    async def test_gap_buffers_and_replays_by_sequence(self):
+        detector = WebSocketGapDetector()
+        replayed = []
+
+        async def handler(message):
+            replayed.append(message["seq"])
+
+        snapshot_ready = asyncio.Event()
+
+        async def fetch_snapshot():
+            await snapshot_ready.wait()
+            return {"positions": [], "wallet": None}
+
+        detector.set_replay_handler(handler)
+        detector.fetch_snapshot = fetch_snapshot
+        detector.apply_snapshot = MagicMock()
+
+        assert not await detector.check_message("execution", execution(1))
+        assert await detector.check_message("execution", execution(5))
+        assert detector.recovering and not detector.is_trading_allowed()
+
+        detector.buffer("execution", execution(7))
+        detector.buffer("execution", execution(6))
+        await asyncio.sleep(0.02)
+        snapshot_ready.set()
+        await asyncio.wait_for(detector._recovery_task, 1)
+
+        assert replayed == [5, 6, 7]
+        detector.apply_snapshot.assert_called_once()
+        assert detector.is_trading_allowed() and not detector.recovering
+        assert detector.trackers["execution"].expected_next == 8
+        status = detector.get_status()
+        assert status["pauses"] == 1
+        assert status["last_pause_ms"] >= 15
+
+    @pytest.mark.asyncio
+    async def test_failed_snapshot_still_replays_and_resumes(self):
+        detector = WebSocketGapDetector()
+        handler = AsyncMock()
+        detector.set_replay_handler(handler)
+        detector.fetch_snapshot = AsyncMock(side_effect=RuntimeError("down"))
+
+        task = detector.start_recovery("reconnect", "order", {"topic": "order", "data": []})
+        await asyncio.wait_for(task, 1)
+
+        handler.assert_awaited_once()
+        assert detector.total_recoveries_failed == 1
+        assert detector.is_trading_allowed()
@@ -0,0 +1,94 @@
+"""
+Tests for the pluggable JSON codec and its callers (signing, journal).
+"""
+
+import hashlib
+import json
+from unittest.mock import patch
+
+import pytest
+
+from app.core import json_codec
+from app.core.journal import JournalEntry
+
+
+@pytest.fixture(params=json_codec.AVAILABLE_BACKENDS)
+def backend(request):
+    previous = json_codec.get_backend()
+    json_codec.set_backend(request.param)
+    yield request.param
+    json_codec.set_backend(previous)
+
+
+ORDER_BODY = {
+    "category": "linear",
+    "symbol": "BTCUSDT",
+    "side": "Buy",
+    "orderType": "Limit",
+    "qty": "0.010",
+    "price": "59000.5",
+    "timeInForce": "PostOnly",
+    "orderLinkId": "entry-ü-1",
+    "reduceOnly": False,
+    "positionIdx": 0,
+    "triggerPrice": None
+}
+
+
+class TestCodec:
+    """Backend parity with the stdlib settings callers used before."""
+
+    def test_signing_body_is_byte_identical(self, backend):
+        expected = json.dumps(ORDER_BODY, separators=(",", ":"), ensure_ascii=False)
+        assert json_codec.dumps(ORDER_BODY) == expected
+
+    def test_sort_keys_and_non_str_keys(self, backend):
+        obj = {"b": 1, "a": [1, 2.5, "x"], 3: True}
+        assert json_codec.dumps(obj) == '{"b":1,"a":[1,2.5,"x"],"3":true}'
+        assert json_codec.loads(json_codec.dumps({"b": 1, "a": 2}, sort_keys=True)) == {"a": 2, "b": 1}
+        assert json_codec.dumps({"b": 1, "a": 2}, sort_keys=True) == '{"a":2,"b":1}'
+
+    def test_unsupported_values_fall_back_to_stdlib(self, backend):
+        assert json_codec.dumps({"n": 2 ** 70}) == '{"n":%d}' % 2 ** 70
+        assert json_codec.loads('{"n": %d}' % 2 ** 70) == {"n": 2 ** 70}
+        with pytest.raises(TypeError):
+            json_codec.dumps({"x": object()})
+
+    def test_loads_str_and_bytes(self, backend):
+        frame = b'{"topic":"execution","data":[{"execQty":"0.01"}]}'
+        assert json_codec.loads(frame) == json_codec.loads(frame.decode())
+        with pytest.raises(ValueError):
+            json_codec.loads("{not json")
+
+    def test_unknown_backend_falls_back_to_json(self):
+        previous = json_codec.get_backend()
+        try:
+            assert json_codec.set_backend("ujson") == "json"
+        finally:
+            json_codec.set_backend(previous)
+
+
+class TestJournalSerialization:
+    """Journal hash stays stable; data is serialized once per entry."""
+
+    def test_hash_matches_legacy_format(self, backend):
+        entry = JournalEntry(1, "ORDER_PLACED", {"symbol": "BTCUSDT", "qty": "0.01"}, "GENESIS")
+        legacy = hashlib.sha256(
+            f"1|ORDER_PLACED|{json.dumps(entry.data, sort_keys=True)}|GENESIS|{entry.timestamp_utc}".encode()
+        ).hexdigest()
+        assert entry.hash == legacy
+
+    def test_line_round_trips_and_verifies(self, backend):
+        entry = JournalEntry(7, "FILL", {"z": "1", "a": {"note": "ü"}}, "abc")
+
+        restored = JournalEntry.from_dict(json_codec.loads(entry.to_json()))
+
+        assert restored.to_dict() == entry.to_dict()
+        assert restored._compute_hash() == entry.hash
+
+    def test_data_serialized_once_per_write(self):
+        with patch.object(JournalEntry, "_canonical_data", autospec=True,
+                          side_effect=lambda self: json.dumps(self.data, sort_keys=True)) as canonical:
+            entry = JournalEntry(1, "SIGNAL_RECEIVED", {"symbol": "ETHUSDT"}, "GENESIS")
+            entry.to_json()
+        assert canonical.call_count == 1
@@ -0,0 +1,66 @@
+"""
+Tests for the event-loop lag monitor and slow-callback profiler.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.core.loop_monitor import LoopLagMonitor, UNSAMPLED
+
+
+def _blocking_work(seconds: float):
+    """Stand-in for sync I/O on the loop."""
+    time.sleep(seconds)
+
+
+class TestLoopLagMonitor:
+    """Lag measurement and offender capture."""
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_has_no_stalls(self):
+        monitor = LoopLagMonitor(interval=0.01, threshold_ms=100)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.15)
+        finally:
+            await monitor.stop()
+
+        stats = monitor.get_stats()
+        assert stats["samples"] > 0
+        assert stats["stalls"] == 0
+        assert stats["histogram_ms"]["+Inf"] == stats["samples"]
+        assert not stats["running"]
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_is_captured(self):
+        monitor = LoopLagMonitor(interval=0.01, threshold_ms=50)
+        monitor.start()
+        try:
+            await asyncio.sleep(0.03)
+            _blocking_work(0.3)
+            await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        assert monitor.stalls == 1
+        assert monitor.max_lag_ms >= 250
+        assert monitor.histogram["100"] < monitor.histogram["+Inf"]
+
+        offender = monitor.top_offenders(with_stacks=True)[0]
+        assert offender["callback"].startswith("tests/core/test_loop_monitor.py:")
+        assert offender["callback"].endswith("in _blocking_work")
+        assert offender["count"] == 1
+        assert any("time.sleep(seconds)" in line for line in offender["stack"])
+
+        debug = monitor.get_debug()
+        assert debug["recent_stalls"][0]["callback"] == offender["callback"]
+
+    @pytest.mark.asyncio
+    async def test_stall_without_sample_is_still_counted(self):
+        monitor = LoopLagMonitor(interval=0.01, threshold_ms=50)
+        monitor._record(beat=1.0, lag_ms=80.0)
+
+        assert monitor.stalls == 1
+        assert monitor.top_offenders()[0]["callback"] == UNSAMPLED
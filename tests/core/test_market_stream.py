@@ -0,0 +1,97 @@
+"""
+Tests for the public ticker stream's reconnect behaviour.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.bybit.market_stream import BybitMarketStream
+
+
+class TestReconnect:
+    """A long outage never stops the stream."""
+
+    @pytest.mark.asyncio
+    async def test_keeps_reconnecting_past_max_retries(self):
+        stream = BybitMarketStream()
+        stream.running = True
+        stream.base_delay = stream.max_delay = 0
+        # Connection comes back on the 8th attempt (max_retries is 5)
+        stream.connect = AsyncMock(side_effect=[False] * 7 + [True])
+
+        with patch("app.bybit.market_stream.asyncio.sleep", AsyncMock()):
+            assert await stream._reconnect() is True
+
+        assert stream.connect.await_count == 8
+        assert stream.running is True
+
+    @pytest.mark.asyncio
+    async def test_backoff_is_capped(self):
+        stream = BybitMarketStream()
+        stream.running = True
+        stream.retry_count = 10_000
+        stream.connect = AsyncMock(return_value=True)
+        sleep = AsyncMock()
+
+        with patch("app.bybit.market_stream.asyncio.sleep", sleep):
+            await stream._reconnect()
+
+        sleep.assert_awaited_once_with(stream.max_delay)
+
+
+class TestStart:
+    """The loops run even when the first connect fails."""
+
+    @pytest.mark.asyncio
+    async def test_first_connect_failure_keeps_reconnecting(self):
+        stream = BybitMarketStream()
+        stream.base_delay = 0
+        ws = MagicMock(closed=False)
+        ws.close = AsyncMock()
+
+        async def recv():
+            await asyncio.sleep(3600)
+
+        ws.recv = recv
+        attempts = []
+
+        async def connect():
+            attempts.append(len(attempts))
+            if len(attempts) == 1:
+                return False
+            stream.ws = ws
+            return True
+
+        stream.connect = connect
+        with patch("app.bybit.market_stream.WEBSOCKETS_AVAILABLE", True):
+            try:
+                assert await stream.start() is False
+                assert stream.running
+                await asyncio.sleep(0.05)
+                assert stream.is_connected and len(attempts) == 2
+            finally:
+                await stream.stop()
+
+    @pytest.mark.asyncio
+    async def test_receive_errors_back_off(self):
+        stream = BybitMarketStream()
+        stream.running = True
+        stream.ws = MagicMock(closed=False)
+        stream.ws.recv = AsyncMock(side_effect=RuntimeError("socket broken"))
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            if len(delays) == 3:
+                stream.running = False
+
+        # websockets may not be installed here; only its ConnectionClosed is used
+        fake_websockets = SimpleNamespace(exceptions=SimpleNamespace(ConnectionClosed=ConnectionError))
+        with patch("app.bybit.market_stream.asyncio.sleep", sleep), \
+                patch("app.bybit.market_stream.websockets", fake_websockets, create=True):
+            await stream._receive_loop()
+
+        assert delays == [1.0, 2.0, 4.0]
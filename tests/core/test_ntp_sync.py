@@ -4,6 +4,9 @@ Tests for NTP sync and clock discipline.
 CLIENT SPEC Lines 299-302: NTP sync with drift thresholds.
 """
 
+import asyncio
+import time
+
 import pytest
 from decimal import Decimal
 from unittest.mock import Mock, patch, AsyncMock
@@ -127,3 +130,123 @@ def test_is_trading_allowed_global():
     allowed = is_trading_allowed_by_clock()
     assert isinstance(allowed, bool)
 
+
+
+class TestConcurrentProbing:
+    """All servers probed in parallel off the event loop; median kept."""
+    
+    @pytest.mark.asyncio
+    async def test_median_across_servers(self):
+        monitor = NTPClockMonitor(['a', 'b', 'c', 'd', 'e'])
+        offsets = {'a': 0.010, 'b': 0.020, 'c': 0.030, 'd': 2.0, 'e': None}
+        
+        def request(server, **kwargs):
+            if offsets[server] is None:
+                raise OSError("timed out")
+            response = Mock()
+            response.offset = offsets[server]
+            return response
+        
+        with patch('ntplib.NTPClient.request', side_effect=request):
+            drift = await monitor.check_drift()
+        
+        # One outlier and one dead server do not move the result
+        assert drift == pytest.approx(0.025)
+        assert monitor.get_status()["servers_responded"] == 4
+        assert monitor.last_source == "ntp"
+    
+    @pytest.mark.asyncio
+    async def test_slow_servers_do_not_block_loop(self):
+        monitor = NTPClockMonitor(['a', 'b', 'c', 'd'])
+        
+        def request(server, **kwargs):
+            time.sleep(0.2)
+            response = Mock()
+            response.offset = 0.010
+            return response
+        
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+        
+        task = asyncio.create_task(ticker())
+        start = time.monotonic()
+        with patch('ntplib.NTPClient.request', side_effect=request):
+            drift = await monitor.check_drift()
+        elapsed = time.monotonic() - start
+        task.cancel()
+        
+        assert drift == pytest.approx(0.010)
+        assert elapsed < 0.6  # parallel, not 4 x 0.2s
+        assert ticks >= 5  # loop kept running meanwhile
+    
+    @pytest.mark.asyncio
+    async def test_exchange_offset_fallback(self):
+        monitor = NTPClockMonitor(['a'])
+        monitor.record_exchange_offset(40.0, rtt_ms=12.0)
+        
+        with patch('ntplib.NTPClient.request', side_effect=OSError("filtered")):
+            drift = await monitor.check_drift()
+        
+        assert drift == pytest.approx(0.040)
+        assert monitor.last_source == "exchange"
+        assert monitor.consecutive_failures == 0
+    
+    @pytest.mark.asyncio
+    async def test_clock_offset_merges_ntp_and_exchange(self):
+        monitor = NTPClockMonitor(['a'])
+        assert monitor.get_offset_ms() == 0.0
+        
+        response = Mock()
+        response.offset = 0.010
+        with patch('ntplib.NTPClient.request', return_value=response):
+            await monitor.check_drift()
+        assert monitor.get_offset_ms() == pytest.approx(10.0)  # NTP only
+        
+        # Equal uncertainty (5 ms each): plain average
+        monitor.record_exchange_offset(30.0, rtt_ms=10.0)
+        assert monitor.get_offset_ms() == pytest.approx(20.0)
+        
+        # A tighter exchange sample (1 ms) dominates: weights 1/25 vs 1/1
+        monitor.record_exchange_offset(30.0, rtt_ms=2.0)
+        assert monitor.get_offset_ms() == pytest.approx((10.0 / 25 + 30.0) / (1 / 25 + 1))
+        
+        # Stale NTP sample: exchange only
+        monitor.ntp_synced_at -= monitor.ntp_max_age + 1
+        assert monitor.get_offset_ms() == pytest.approx(30.0)
+    
+    @pytest.mark.asyncio
+    async def test_client_sync_time_feeds_monitor(self, monkeypatch):
+        from app.bybit.client import BybitClient
+        from app.core import ntp_sync
+        
+        monitor = NTPClockMonitor()
+        monkeypatch.setattr(ntp_sync, "get_ntp_monitor", lambda: monitor)
+        
+        client = BybitClient()
+        server_ms = int(time.time() * 1000) + 500
+        monkeypatch.setattr(client, "_server_ms", AsyncMock(return_value=server_ms))
+        await client.sync_time(force=True)
+        
+        assert monitor.exchange_offset_ms == pytest.approx(500, abs=100)
+        assert client._ts_offset_ms == monitor.get_offset_ms()
+    
+    @pytest.mark.asyncio
+    async def test_failed_sync_is_not_a_fresh_sync(self, monkeypatch):
+        from app.bybit.client import BybitClient
+        
+        client = BybitClient()
+        monkeypatch.setattr(client, "_server_ms", AsyncMock(return_value=None))
+        client._last_sync = 0.0
+        await client.sync_time(force=True)
+        
+        assert client._last_sync == 0.0
+        # Retried after the short retry interval, not after the full sync interval
+        client._last_sync_attempt -= client._sync_retry_interval
+        await client.sync_time()
+        assert client._server_ms.await_count == 2
+
@@ -0,0 +1,158 @@
+"""
+Tests for order-book aware PostOnly pricing (app/core/postonly_repricer.py).
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.bybit.client import BybitAPIError
+from app.bybit.market_stream import BybitMarketStream
+from app.core.fill_waiters import CANCELLED, FillWaiterRegistry
+from app.core.postonly_repricer import POSTONLY_CANCEL_REASON, PostOnlyRepricer, is_postonly_reject, posting_price
+
+TICK = Decimal("0.1")
+BODY = {"category": "linear", "symbol": "BTCUSDT", "side": "Buy", "orderType": "Limit",
+        "qty": "0.01", "price": "60000", "timeInForce": "PostOnly", "orderLinkId": "entry_t1_0"}
+
+
+def stream_with_book(bid="59990.0", ask="59990.1"):
+    stream = BybitMarketStream()
+    stream._handle_message({"topic": "tickers.BTCUSDT", "data": {
+        "symbol": "BTCUSDT", "lastPrice": bid, "bid1Price": bid, "ask1Price": ask}}, time.monotonic())
+    return stream
+
+
+class TestPostingPrice:
+    """Most aggressive non-crossing price."""
+
+    def test_target_kept_when_it_rests(self):
+        assert posting_price("Buy", Decimal("59000"), Decimal("59990"), Decimal("59990.1"), TICK) == Decimal("59000")
+        assert posting_price("Sell", Decimal("61000"), Decimal("59990"), Decimal("59990.1"), TICK) == Decimal("61000")
+
+    def test_clamped_inside_the_book(self):
+        bid, ask = Decimal("59990.0"), Decimal("59990.1")
+        assert posting_price("Buy", Decimal("60000"), bid, ask, TICK) == Decimal("59990.0")
+        assert posting_price("Sell", Decimal("59000"), bid, ask, TICK) == Decimal("59990.1")
+        assert posting_price("Buy", Decimal("60000"), bid, ask, TICK, extra_ticks=2) == Decimal("59989.8")
+
+    def test_reject_detection(self):
+        assert is_postonly_reject(BybitAPIError(110094, "Order would take liquidity, PostOnly rejected"))
+        assert not is_postonly_reject(BybitAPIError(110007, "ab not enough for new order"))
+
+
+class TestPlacement:
+    """Placement prices from the local book and re-quotes on rejection."""
+
+    @pytest.mark.asyncio
+    async def test_first_try_uses_streamed_book(self):
+        client = MagicMock()
+        client.place_order = AsyncMock(return_value={"retCode": 0, "result": {"orderId": "o1"}})
+        client.get_ticker = AsyncMock()
+        repricer = PostOnlyRepricer()
+
+        with patch("app.bybit.market_stream.get_market_stream", return_value=stream_with_book()):
+            result = await repricer.place(client, BODY, TICK)
+
+        assert result["retCode"] == 0
+        assert client.place_order.call_args[0][0]["price"] == "59990.0"
+        assert BODY["price"] == "60000"
+        client.get_ticker.assert_not_called()
+        stats = repricer.get_stats()
+        assert stats["attempts"] == 1 and stats["reject_rate"] == 0.0 and stats["book_from_stream"] == 1
+
+    @pytest.mark.asyncio
+    async def test_reject_requotes_without_extra_rest_calls(self):
+        client = MagicMock()
+        client.place_order = AsyncMock(side_effect=[
+            BybitAPIError(110094, "PostOnly will take liquidity"),
+            {"retCode": 0, "result": {"orderId": "o1"}}
+        ])
+        client.get_ticker = AsyncMock(return_value={"retCode": 0, "result": {"list": [
+            {"symbol": "BTCUSDT", "bid1Price": "59990.0", "ask1Price": "59990.1"}]}})
+        repricer = PostOnlyRepricer()
+
+        with patch("app.bybit.market_stream.get_market_stream", return_value=BybitMarketStream()):
+            result = await repricer.place(client, BODY, TICK)
+
+        assert result["retCode"] == 0
+        prices = [call[0][0]["price"] for call in client.place_order.call_args_list]
+        assert prices == ["59990.0", "59989.9"]
+        link_ids = [call[0][0]["orderLinkId"] for call in client.place_order.call_args_list]
+        assert link_ids == ["entry_t1_0", "entry_t1_0-1"]
+        assert client.get_ticker.await_count == 1
+        assert repricer.get_stats()["reject_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_other_errors_propagate(self):
+        client = MagicMock()
+        client.place_order = AsyncMock(side_effect=BybitAPIError(110007, "ab not enough for new order"))
+        repricer = PostOnlyRepricer()
+
+        with patch("app.bybit.market_stream.get_market_stream", return_value=stream_with_book()):
+            with pytest.raises(BybitAPIError):
+                await repricer.place(client, BODY, TICK)
+
+
+class TestExchangeCancel:
+    """Accepted orders the exchange cancels for crossing are re-sent."""
+
+    def _setup(self, max_attempts=5):
+        client = MagicMock()
+        client.place_order = AsyncMock(return_value={"retCode": 0, "result": {"orderId": "o1"}})
+        repricer = PostOnlyRepricer(max_attempts=max_attempts)
+        registry = FillWaiterRegistry(stream_live=lambda: True, fetch_position=AsyncMock(),
+                                      reprice=repricer.on_postonly_cancel)
+        return client, repricer, registry
+
+    @staticmethod
+    def _cancel(link_id):
+        return {"symbol": "BTCUSDT", "orderLinkId": link_id, "orderStatus": "Cancelled",
+                "cumExecQty": "0", "rejectReason": POSTONLY_CANCEL_REASON}
+
+    @pytest.mark.asyncio
+    async def test_cancel_event_resends_under_new_link_id(self):
+        client, repricer, registry = self._setup()
+        waiter = registry.expect("BTCUSDT", ["entry_t1_0"])
+
+        with patch("app.bybit.market_stream.get_market_stream", return_value=stream_with_book()), \
+                patch("app.core.fill_waiters.get_fill_registry", return_value=registry):
+            await repricer.place(client, BODY, TICK)
+            registry.on_order(self._cancel("entry_t1_0"))
+            await asyncio.gather(*repricer._resend_tasks)
+
+        resent = client.place_order.call_args[0][0]
+        assert resent["orderLinkId"] == "entry_t1_0-1" and resent["price"] == "59989.9"
+        assert not waiter.done and waiter.orders == {"entry_t1_0-1"}
+        registry.on_order({"orderLinkId": "entry_t1_0-1", "orderStatus": "Filled", "cumExecQty": "0.01"})
+        assert (await waiter.wait())["status"] == "Filled"
+        assert repricer.get_stats()["rejects"] == 1
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_out_of_attempts_marks_entry_dead(self):
+        client, repricer, registry = self._setup(max_attempts=1)
+        waiter = registry.expect("BTCUSDT", ["entry_t1_0"])
+
+        with patch("app.bybit.market_stream.get_market_stream", return_value=stream_with_book()):
+            await repricer.place(client, BODY, TICK)
+            registry.on_order(self._cancel("entry_t1_0"))
+
+        assert (await waiter.wait())["status"] == CANCELLED
+        assert client.place_order.await_count == 1 and repricer.get_stats()["failures"] == 1
+        await registry.stop()
+
+
+class TestStreamTopOfBook:
+    """Ticker deltas update one side of the book."""
+
+    def test_delta_and_staleness(self):
+        stream = stream_with_book()
+        stream._handle_message({"topic": "tickers.BTCUSDT", "data": {"symbol": "BTCUSDT", "ask1Price": "59991"}},
+                               time.monotonic())
+
+        assert stream.get_top_of_book("BTCUSDT", 5) == (Decimal("59990.0"), Decimal("59991"))
+        assert stream.get_top_of_book("BTCUSDT", -1) is None
@@ -0,0 +1,110 @@
+"""
+Tests for the startup profiler (import hook + component timing).
+"""
+
+import sys
+import time
+
+import pytest
+
+from app.core.startup_profiler import (
+    StartupProfiler,
+    is_startup_profiling_enabled,
+    STARTUP_PROFILE_ENV
+)
+
+
+@pytest.fixture
+def fresh_modules(tmp_path, monkeypatch):
+    """Create a tiny package whose modules have not been imported yet."""
+    pkg = tmp_path / "profiled_pkg"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("from profiled_pkg import child\n")
+    (pkg / "child.py").write_text("import time\ntime.sleep(0.02)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "profiled_pkg"
+    for name in ("profiled_pkg", "profiled_pkg.child"):
+        sys.modules.pop(name, None)
+
+
+class TestStartupProfiler:
+    """Test import and component timing."""
+
+    def test_env_flag(self, monkeypatch):
+        monkeypatch.setenv(STARTUP_PROFILE_ENV, "1")
+        assert is_startup_profiling_enabled() is True
+        monkeypatch.setenv(STARTUP_PROFILE_ENV, "0")
+        assert is_startup_profiling_enabled() is False
+
+    def test_import_hook_records_self_and_cumulative(self, fresh_modules):
+        profiler = StartupProfiler(enabled=True)
+        profiler.install_import_hook()
+        try:
+            __import__(fresh_modules)
+        finally:
+            profiler.remove_import_hook()
+
+        parent = profiler.imports["profiled_pkg"]
+        child = profiler.imports["profiled_pkg.child"]
+
+        assert child["self_ms"] >= 15
+        # Child time is attributed to the parent's cumulative, not its self time
+        assert parent["cumulative_ms"] >= child["cumulative_ms"]
+        assert parent["self_ms"] < child["self_ms"]
+
+    def test_hook_removed(self):
+        profiler = StartupProfiler(enabled=True)
+        profiler.install_import_hook()
+        finder = profiler._finder
+        assert finder in sys.meta_path
+
+        profiler.remove_import_hook()
+        assert finder not in sys.meta_path
+
+    def test_modules_keep_their_real_loader(self, fresh_modules):
+        from app.core.startup_profiler import _TimedLoader
+
+        profiler = StartupProfiler(enabled=True)
+        profiler.install_import_hook()
+        try:
+            module = __import__(fresh_modules)
+        finally:
+            profiler.remove_import_hook()
+
+        assert not isinstance(module.__loader__, _TimedLoader)
+        assert not isinstance(module.__spec__.loader, _TimedLoader)
+        assert not isinstance(sys.modules["profiled_pkg.child"].__spec__.loader, _TimedLoader)
+
+    def test_component_timing(self):
+        profiler = StartupProfiler(enabled=True)
+        with profiler.component("slow_init"):
+            time.sleep(0.01)
+
+        report = profiler.get_report()
+        assert report["components_ms"]["slow_init"] >= 5
+
+    def test_disabled_is_noop(self, fresh_modules):
+        profiler = StartupProfiler(enabled=False)
+        profiler.install_import_hook()
+        with profiler.component("anything"):
+            __import__(fresh_modules)
+
+        assert profiler.imports == {}
+        assert profiler.components == {}
+
+
+def test_strict_config_loads_on_first_access():
+    """Importing strict_config does not load .env/config until STRICT_CONFIG is used."""
+    import subprocess
+    from pathlib import Path
+
+    code = (
+        "import app.core.strict_config as m\n"
+        "assert 'STRICT_CONFIG' not in vars(m)\n"
+        "config = m.STRICT_CONFIG\n"
+        "from app.core.strict_config import STRICT_CONFIG\n"
+        "assert STRICT_CONFIG is config is vars(m)['STRICT_CONFIG']\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[2],
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,184 @@
+"""
+Tests for the central strategy scheduler (one evaluation pass per symbol,
+bounded worker pool for fired actions).
+"""
+
+import asyncio
+
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock
+
+from app.core.strategy_scheduler import (
+    StrategyScheduler,
+    ACTION_HEDGE,
+    ACTION_PYRAMID,
+    ACTION_TRAILING
+)
+from app.core.strict_fsm import TradeFSM, TradeState
+
+
+def _make_fsm(symbol="BTCUSDT", direction="LONG", entry="100", suffix=""):
+    fsm = TradeFSM({
+        'symbol': symbol,
+        'direction': direction,
+        'mode': 'SWING',
+        'entries': [Decimal(entry)],
+        'leverage': 10,
+        'channel_name': 'TEST'
+    })
+    fsm.trade_id += suffix
+    fsm.original_entry = Decimal(entry)
+    fsm._initialize_strategies()
+    fsm.state = TradeState.RUNNING
+    return fsm
+
+
+class TestEvaluation:
+    """Price updates → fired actions, no I/O."""
+
+    @pytest.mark.asyncio
+    async def test_quiet_price_fires_nothing(self):
+        scheduler = StrategyScheduler()
+        fsm = _make_fsm()
+        await scheduler.register(fsm)
+
+        assert scheduler.on_price("BTCUSDT", Decimal("100.5")) == []
+        assert scheduler.on_price("ETHUSDT", Decimal("5000")) == []
+
+    @pytest.mark.asyncio
+    async def test_one_pass_covers_all_trades_on_symbol(self):
+        scheduler = StrategyScheduler()
+        first = _make_fsm(suffix="_a")
+        second = _make_fsm(suffix="_b")
+        other = _make_fsm(symbol="ETHUSDT", suffix="_c")
+        for fsm in (first, second, other):
+            await scheduler.register(fsm)
+
+        # +1.5% fires the first pyramid level for both BTC trades only
+        fired = scheduler.on_price("BTCUSDT", Decimal("101.5"))
+        assert sorted(fired) == sorted([
+            (first.trade_id, ACTION_PYRAMID),
+            (second.trade_id, ACTION_PYRAMID)
+        ])
+
+    @pytest.mark.asyncio
+    async def test_hedge_predicate(self):
+        scheduler = StrategyScheduler()
+        fsm = _make_fsm(direction="SHORT")
+        await scheduler.register(fsm)
+
+        # Hedge strategy treats non-BUY as short: +2% against the trade
+        fired = scheduler.on_price("BTCUSDT", Decimal("102"))
+        assert (fsm.trade_id, ACTION_HEDGE) in fired
+
+    @pytest.mark.asyncio
+    async def test_unregister_stops_evaluation(self):
+        scheduler = StrategyScheduler()
+        fsm = _make_fsm()
+        await scheduler.register(fsm)
+        await scheduler.unregister(fsm)
+
+        assert scheduler.trade_count() == 0
+        assert scheduler.on_price("BTCUSDT", Decimal("110")) == []
+
+
+class TestDispatch:
+    """Worker pool execution and coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_coalesced_to_latest_price(self):
+        scheduler = StrategyScheduler(max_workers=2)
+        fsm = _make_fsm()
+        fsm.on_strategy_action = AsyncMock()
+        await scheduler.register(fsm)
+
+        scheduler.on_price("BTCUSDT", Decimal("101.5"))
+        scheduler.on_price("BTCUSDT", Decimal("101.6"))
+        scheduler.on_price("BTCUSDT", Decimal("101.7"))
+
+        scheduler._workers = [asyncio.create_task(scheduler._worker()) for _ in range(2)]
+        try:
+            await asyncio.wait_for(scheduler.drain(), 1)
+        finally:
+            for task in scheduler._workers:
+                task.cancel()
+
+        fsm.on_strategy_action.assert_awaited_once_with(ACTION_PYRAMID, Decimal("101.7"))
+        assert scheduler.actions_coalesced == 2
+
+    @pytest.mark.asyncio
+    async def test_pyramid_action_updates_fsm(self):
+        scheduler = StrategyScheduler(max_workers=1)
+        fsm = _make_fsm()
+        fsm.pyramid_strategy._activate_level = AsyncMock()
+        await scheduler.register(fsm)
+
+        scheduler.on_price("BTCUSDT", Decimal("101.5"))
+        scheduler._workers = [asyncio.create_task(scheduler._worker())]
+        try:
+            await asyncio.wait_for(scheduler.drain(), 1)
+        finally:
+            scheduler._workers[0].cancel()
+
+        fsm.pyramid_strategy._activate_level.assert_awaited_once()
+        assert fsm.pyramid_level == 1
+        # Level is consumed: the same price no longer fires
+        assert scheduler.on_price("BTCUSDT", Decimal("101.5")) == []
+
+    @pytest.mark.asyncio
+    async def test_hedge_action_wakes_fsm(self):
+        fsm = _make_fsm()
+        fsm.hedge_strategy.check_and_activate = AsyncMock(return_value=True)
+
+        await fsm.on_strategy_action(ACTION_HEDGE, Decimal("97"))
+
+        assert fsm._hedge_triggered is True
+        assert fsm._wakeup.is_set()
+
+    @pytest.mark.asyncio
+    async def test_position_close_wakes_trades(self):
+        scheduler = StrategyScheduler()
+        fsm = _make_fsm()
+        await scheduler.register(fsm)
+
+        await scheduler.on_position({"symbol": "BTCUSDT", "size": "0"})
+        assert fsm._wakeup.is_set()
+
+    @pytest.mark.asyncio
+    async def test_trailing_action_ignored_outside_running(self):
+        fsm = _make_fsm()
+        fsm.state = TradeState.CLOSED
+        fsm.trailing_strategy.check_and_update = AsyncMock()
+
+        await fsm.on_strategy_action(ACTION_TRAILING, Decimal("110"))
+        fsm.trailing_strategy.check_and_update.assert_not_awaited()
+
+
+class TestPriceFeed:
+    """REST polling covers the time the ticker stream is down."""
+
+    @pytest.mark.asyncio
+    async def test_polls_only_while_stream_is_down(self):
+        from types import SimpleNamespace
+
+        scheduler = StrategyScheduler(poll_interval=0.01)
+        await scheduler.register(_make_fsm())
+        scheduler._stream = SimpleNamespace(is_connected=True)
+        scheduler._client = SimpleNamespace(get_ticker=AsyncMock(
+            return_value={'retCode': 0, 'result': {'list': [{'lastPrice': '100.5'}]}}
+        ))
+        scheduler._running = True
+        task = asyncio.create_task(scheduler._poll_prices())
+        try:
+            await asyncio.sleep(0.05)
+            scheduler._client.get_ticker.assert_not_awaited()
+
+            scheduler._stream.is_connected = False
+            await asyncio.sleep(0.05)
+            scheduler._client.get_ticker.assert_awaited_with("BTCUSDT")
+            assert not scheduler.is_streaming
+        finally:
+            scheduler._running = False
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,121 @@
+"""
+Tests for integer tick/step arithmetic (app/core/ticks.py) and the hot paths
+that compare ticks instead of Decimals.
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.core.entry_order_policy import EntryOrderPolicy
+from app.core.strategy_scheduler import StrategyScheduler, ACTION_PYRAMID
+from app.core.symbol_registry import SymbolInfo
+from app.core.ticks import TickScale, ratio, tick_scale
+from app.core.tpsl_trigger_engine import SymbolTriggerLadder, compile_tpsl_triggers
+
+
+def make_info(tick="0.5", step="100", min_qty="100"):
+    return SymbolInfo("XUSDT", {
+        "lotSizeFilter": {"minOrderQty": min_qty, "maxOrderQty": "1000000", "qtyStep": step},
+        "priceFilter": {"tickSize": tick}
+    })
+
+
+class TestTickScale:
+    """Exact conversions to and from Bybit strings."""
+
+    def test_ratio_is_exact(self):
+        assert ratio("50000.10") == (5000010, 100)
+        assert ratio("-0.5") == (-5, 10)
+        assert ratio("1E-8") == (1, 100000000)
+        assert ratio(Decimal("0.25")) == (1, 4)
+        assert ratio(7) == (7, 1)
+
+    def test_round_trip_keeps_bybit_format(self):
+        scale = TickScale(Decimal("0.10"), Decimal("0.001"))
+
+        assert scale.price_ticks("50000.1") == 500001
+        assert scale.price_str(500001) == "50000.10"
+        assert scale.qty_steps("0.0129") == 12
+        assert scale.qty_str(12) == "0.012"
+
+    def test_off_grid_price(self):
+        scale = TickScale(Decimal("0.5"), Decimal("1"))
+
+        assert scale.price_ticks("100.5") == 201
+        assert scale.price_ticks("100.25") is None
+        assert scale.bracket("100.25") == (200, 201)
+        assert scale.bracket(Decimal("100")) == (200, 200)
+
+    def test_scales_are_shared_per_filter_string(self):
+        assert tick_scale(Decimal("0.1"), Decimal("1")) is tick_scale(Decimal("0.1"), Decimal("1"))
+        assert tick_scale(Decimal("0.10"), Decimal("1")).price(3) == Decimal("0.30")
+        assert str(tick_scale(Decimal("0.1"), Decimal("1")).price(3)) == "0.3"
+
+
+class TestQuantization:
+    """Rounding snaps to multiples of the tick/step, not just to its decimals."""
+
+    def test_symbol_info_non_decimal_tick_and_step(self):
+        info = make_info()
+
+        assert info.quantize_price(Decimal("100.7")) == Decimal("100.5")
+        assert info.quantize_qty(Decimal("250")) == Decimal("200")
+        assert info.format_qty(Decimal("250")) == "200"
+
+    def test_dual_entry_split_and_offsets(self):
+        orders = EntryOrderPolicy().create_dual_entry_orders(
+            "XUSDT", "LONG", Decimal("300"), [Decimal("100")], make_info(), "t1"
+        )
+
+        # 3 steps split in two -> 1 step per leg; ±0.1% rounded down to 0.5 ticks
+        assert [o["qty"] for o in orders] == ["100", "100"]
+        assert [o["price"] for o in orders] == ["99.5", "100.0"]
+
+
+class TestTickHotPaths:
+    """Tick comparisons agree with the Decimal ones."""
+
+    def test_ladder_with_ticks_matches_decimal_ladder(self):
+        scale = TickScale(Decimal("0.01"), Decimal("0.001"))
+        triggers = compile_tpsl_triggers("t1", "X", "Buy", Decimal("100.123"), [Decimal("1"), Decimal("2")], Decimal("3"))
+        decimal_ladder, tick_ladder = SymbolTriggerLadder(), SymbolTriggerLadder(scale)
+        for trigger in triggers:
+            decimal_ladder.add(trigger)
+            tick_ladder.add(trigger)
+
+        # TP1 at 101.12423: 101.12 stays armed, 101.13 fires
+        for price in ("101.12", "101.13", "102.12", "102.13", "97.12", "97.11"):
+            fired_decimal = [(t.kind, t.index) for t in decimal_ladder.pop_fired(Decimal(price))]
+            assert [(t.kind, t.index) for t in tick_ladder.pop_fired(Decimal(price))] == fired_decimal
+        assert len(tick_ladder) == 0
+
+    @pytest.mark.asyncio
+    async def test_scheduler_uses_ticks_when_scale_is_known(self):
+        from tests.core.test_strategy_scheduler import _make_fsm
+
+        scheduler = StrategyScheduler()
+        fsm = _make_fsm(entry="100.03")
+        await scheduler.register(fsm)
+        scale = TickScale(Decimal("0.01"), Decimal("0.001"))
+
+        # +1.5% from 100.03 = 101.53045 -> first tick at or above is 101.54
+        with patch("app.core.ticks.get_tick_scale", return_value=scale):
+            assert scheduler.on_price("BTCUSDT", Decimal("101.53")) == []
+            assert scheduler.quiet_updates == 1  # inside the symbol's band: no per-trade pass
+            assert scheduler.on_price("BTCUSDT", Decimal("101.54")) == [(fsm.trade_id, ACTION_PYRAMID)]
+        assert fsm.pyramid_strategy._tick_scale is scale
+
+    def test_trailing_band_follows_extreme(self):
+        from app.strategies.trailing_v2 import TrailingStopStrategyV2
+
+        scale = TickScale(Decimal("0.5"), Decimal("1"))
+        trailing = TrailingStopStrategyV2("t1", "XUSDT", "BUY", "TEST")
+        trailing.armed = True
+        trailing.highest_price = Decimal("110.2")
+
+        # price > 110.2 <=> ticks >= 221 (110.5)
+        assert trailing.tick_band(scale, Decimal("100")) == (221, None)
+        assert not trailing.needs_update(Decimal("110"), Decimal("100"), scale.at(Decimal("110")))
+        assert trailing.needs_update(Decimal("110.5"), Decimal("100"), scale.at(Decimal("110.5")))
@@ -0,0 +1,179 @@
+"""
+Tests for the event-driven TP/SL trigger engine and its use by
+SimulatedTPSLManager.
+"""
+
+import time
+
+import pytest
+from decimal import Decimal
+from unittest.mock import AsyncMock, Mock
+
+from app.core.tpsl_trigger_engine import (
+    TPSLTriggerEngine,
+    SymbolTriggerLadder,
+    compile_tpsl_triggers,
+    PriceTrigger,
+    ABOVE,
+    BELOW
+)
+from app.core.simulated_tpsl import SimulatedTPSLManager
+
+
+class TestCompileTriggers:
+    """Percentage levels → absolute prices."""
+
+    def test_long(self):
+        triggers = compile_tpsl_triggers("t1", "BTCUSDT", "Buy", Decimal("100"), [Decimal("2"), Decimal("4")], Decimal("3"))
+        tps = [t for t in triggers if t.kind == 'tp']
+        sl = [t for t in triggers if t.kind == 'sl'][0]
+
+        assert [t.price for t in tps] == [Decimal("102"), Decimal("104")]
+        assert all(t.direction == ABOVE for t in tps)
+        assert sl.price == Decimal("97")
+        assert sl.direction == BELOW
+
+    def test_short(self):
+        triggers = compile_tpsl_triggers("t1", "BTCUSDT", "Sell", Decimal("100"), [Decimal("2")], Decimal("3"))
+        tp = [t for t in triggers if t.kind == 'tp'][0]
+        sl = [t for t in triggers if t.kind == 'sl'][0]
+
+        assert tp.price == Decimal("98") and tp.direction == BELOW
+        assert sl.price == Decimal("103") and sl.direction == ABOVE
+
+    def test_missing_sl(self):
+        triggers = compile_tpsl_triggers("t1", "BTCUSDT", "Buy", Decimal("100"), [Decimal("2")], None)
+        assert [t.kind for t in triggers] == ['tp']
+
+
+class TestSymbolTriggerLadder:
+    """Bisect ladder semantics."""
+
+    def _ladder(self):
+        ladder = SymbolTriggerLadder()
+        for trigger in compile_tpsl_triggers("long", "X", "Buy", Decimal("100"), [Decimal("1"), Decimal("2"), Decimal("3")], Decimal("5")):
+            ladder.add(trigger)
+        for trigger in compile_tpsl_triggers("short", "X", "Sell", Decimal("100"), [Decimal("1")], Decimal("5")):
+            ladder.add(trigger)
+        return ladder
+
+    def test_no_fire_inside_band(self):
+        ladder = self._ladder()
+        assert ladder.pop_fired(Decimal("100")) == []
+        assert len(ladder) == 6
+
+    def test_gap_up_fires_every_crossed_level(self):
+        ladder = self._ladder()
+        fired = ladder.pop_fired(Decimal("102.5"))
+
+        assert sorted((t.trade_id, t.kind, t.index) for t in fired) == [
+            ("long", "tp", 0), ("long", "tp", 1)
+        ]
+        # Already fired levels don't fire again
+        assert ladder.pop_fired(Decimal("102.5")) == []
+
+    def test_boundaries_are_inclusive(self):
+        ladder = self._ladder()
+        fired = ladder.pop_fired(Decimal("99"))
+        assert [(t.trade_id, t.kind) for t in fired] == [("short", "tp")]
+
+    def test_down_move_fires_long_sl(self):
+        ladder = self._ladder()
+        fired = ladder.pop_fired(Decimal("94"))
+        assert sorted((t.trade_id, t.kind) for t in fired) == [("long", "sl"), ("short", "tp")]
+
+    def test_remove_trade(self):
+        ladder = self._ladder()
+        assert ladder.remove_trade("long") == 4
+        assert len(ladder) == 2
+        assert [t.trade_id for t in ladder.pop_fired(Decimal("200"))] == ["short"]
+
+
+class TestTriggerEngine:
+    """Engine dispatch and latency accounting."""
+
+    @pytest.mark.asyncio
+    async def test_fire_handler_called(self):
+        engine = TPSLTriggerEngine()
+        handler = AsyncMock()
+        engine.set_fire_handler(handler)
+        engine.add_triggers(compile_tpsl_triggers("t1", "BTCUSDT", "Buy", Decimal("100"), [Decimal("1")], Decimal("1")))
+
+        assert engine.on_price("ETHUSDT", Decimal("1000")) == []
+        fired = engine.on_price("BTCUSDT", Decimal("101"))
+        await engine.drain()
+
+        assert len(fired) == 1
+        handler.assert_awaited_once()
+        assert engine.armed_count("BTCUSDT") == 1
+
+    @pytest.mark.asyncio
+    async def test_sl_drops_the_trades_tps(self):
+        engine = TPSLTriggerEngine()
+        handler = AsyncMock()
+        engine.set_fire_handler(handler)
+        # Levels a single tick at 102 crosses on both sides (e.g. a stale SL after a gap)
+        engine.add_triggers([
+            PriceTrigger("t1", "BTCUSDT", Decimal("101"), ABOVE, "tp", 0),
+            PriceTrigger("t1", "BTCUSDT", Decimal("110"), ABOVE, "tp", 1),
+            PriceTrigger("t1", "BTCUSDT", Decimal("105"), BELOW, "sl"),
+            PriceTrigger("t2", "BTCUSDT", Decimal("101"), ABOVE, "tp", 0)
+        ])
+
+        fired = engine.on_price("BTCUSDT", Decimal("102"))
+        await engine.drain()
+
+        assert sorted((t.trade_id, t.kind) for t in fired) == [("t1", "sl"), ("t2", "tp")]
+        assert handler.await_count == 2
+        assert engine.armed_count() == 0
+
+    def test_latency_stats(self):
+        engine = TPSLTriggerEngine()
+        trigger = compile_tpsl_triggers("t1", "BTCUSDT", "Buy", Decimal("100"), [Decimal("1")], None)[0]
+        engine.record_trigger_latency(trigger, time.monotonic() - 0.01)
+
+        stats = engine.get_latency_stats()
+        assert stats['count'] == 1
+        assert stats['p50_ms'] >= 10
+
+
+class TestSimulatedTPSLManagerEventDriven:
+    """SimulatedTPSLManager fires on price ticks instead of polling."""
+
+    @pytest.mark.asyncio
+    async def test_tick_places_close_order(self):
+        manager = SimulatedTPSLManager()
+        manager._client = Mock()
+        manager._client.place_order = AsyncMock(return_value={'retCode': 0, 'result': {'orderId': '1'}})
+
+        await manager.add_tpsl_order(
+            "BTCUSDT", "Buy", Decimal("2"), Decimal("100"),
+            [Decimal("1"), Decimal("2")], Decimal("1"), "trade-1"
+        )
+
+        manager.trigger_engine.on_price("BTCUSDT", Decimal("101.5"), time.monotonic())
+        await manager.trigger_engine.drain()
+
+        body = manager._client.place_order.await_args.args[0]
+        assert body['side'] == 'Sell'
+        assert body['reduceOnly'] is True
+        assert body['qty'] == '1.0'
+        assert manager.active_orders["trade-1"].tp_levels[0].executed is True
+        assert manager.trigger_engine.get_latency_stats()['count'] == 1
+
+    @pytest.mark.asyncio
+    async def test_sl_removes_order(self):
+        manager = SimulatedTPSLManager()
+        manager._client = Mock()
+        manager._client.place_order = AsyncMock(return_value={'retCode': 0, 'result': {}})
+
+        await manager.add_tpsl_order(
+            "BTCUSDT", "Sell", Decimal("2"), Decimal("100"),
+            [Decimal("1")], Decimal("2"), "trade-2"
+        )
+
+        manager.trigger_engine.on_price("BTCUSDT", Decimal("103"), time.monotonic())
+        await manager.trigger_engine.drain()
+
+        assert "trade-2" not in manager.active_orders
+        assert manager.trigger_engine.armed_count() == 0
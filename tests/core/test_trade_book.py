@@ -0,0 +1,92 @@
+"""
+Tests for the compact trade state (app/core/trade_book.py).
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.core.strict_fsm import TradeFSM, TradeState
+from app.core.trade_book import SymbolScale, TradeBook, TradeRecord, from_units, get_trade_book, to_units
+
+
+def make_fsm(symbol="BTCUSDT"):
+    return TradeFSM({
+        'symbol': symbol,
+        'direction': 'LONG',
+        'mode': 'SWING',
+        'entries': [Decimal("100")],
+        'leverage': 10,
+        'channel_name': 'TEST'
+    })
+
+
+class TestUnits:
+    """Fixed-point conversion at tick/step precision."""
+
+    def test_round_trip(self):
+        scale = SymbolScale.from_filters(Decimal("0.10"), Decimal("0.001"))
+
+        assert (scale.price_exp, scale.qty_exp) == (-5, -3)
+        assert to_units(Decimal("50123.45"), scale.price_exp) == 5012345000
+        assert from_units(5012345000, scale.price_exp) == Decimal("50123.45")
+        assert str(from_units(to_units("100", scale.price_exp), scale.price_exp)) == "100"
+        assert str(from_units(to_units("1.250", scale.qty_exp), scale.qty_exp)) == "1.25"
+        assert SymbolScale.from_filters(Decimal("10"), Decimal("1")).qty_exp == 0
+
+    def test_record_is_slotted(self):
+        record = TradeRecord("T1", "BTCUSDT", SymbolScale())
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.extra = 1
+
+
+class TestTradeFSMState:
+    """TradeFSM attributes are backed by its TradeRecord."""
+
+    @pytest.mark.asyncio
+    async def test_attributes_round_trip(self):
+        fsm = make_fsm()
+        fsm.entry_price = Decimal("50100.5")
+        fsm.position_size = Decimal("0.010")
+        fsm.pyramid_level += 1
+        fsm.trailing_active = True
+        fsm._hedge_triggered = True
+        fsm._hedge_triggered = False
+
+        assert fsm.entry_price == Decimal("50100.5")
+        assert fsm.position_size == Decimal("0.01")
+        assert fsm.pyramid_level == fsm.record.pyramid_level == 1
+        assert fsm.trailing_active is True
+        assert fsm._hedge_triggered is False
+        assert fsm.current_pnl == Decimal("0")
+        assert "entry_price" not in vars(fsm)
+        get_trade_book().close(fsm.record)
+
+    @pytest.mark.asyncio
+    async def test_book_index_follows_trade(self):
+        book = get_trade_book()
+        first, second, other = make_fsm(), make_fsm(), make_fsm("ETHUSDT")
+        first.trade_id += "_a"
+        second.trade_id += "_b"
+        other.trade_id += "_c"
+
+        assert {r.trade_id for r in book.for_symbol("BTCUSDT")} >= {first.trade_id, second.trade_id}
+        assert book.get(other.trade_id) is other.record
+
+        await first._transition_to(TradeState.CLOSED)
+
+        assert book.get(first.trade_id) is None
+        assert first.record.trade_id not in {r.trade_id for r in book.for_symbol("BTCUSDT")}
+        for fsm in (second, other):
+            book.close(fsm.record)
+
+    def test_shared_scale_per_symbol(self):
+        book = TradeBook()
+        first, second = book.open("A", "XUSDT"), book.open("B", "XUSDT")
+
+        assert first.scale is second.scale
+        book.close(first)
+        assert [r.trade_id for r in book.for_symbol("XUSDT")] == ["B"]
+        assert len(book) == 1
@@ -0,0 +1,162 @@
+"""
+Tests for the local Bybit V5 stand-in exchange (app/tools/fake_exchange.py).
+"""
+
+import hashlib
+import hmac
+import time
+from decimal import Decimal
+
+import pytest
+
+from app.bybit.client import BybitAPIError, BybitClient
+from app.tools.fake_exchange import FakeBybitExchange, FaultConfig, create_app
+
+ACCOUNT = {"name": "fake", "api_key": "key1", "api_secret": "secret1"}
+
+
+def make_client(exchange, account=ACCOUNT):
+    return exchange.attach(BybitClient(account))
+
+
+class TestTradeLifecycle:
+    """Orders, fills and position stops through a real BybitClient."""
+
+    @pytest.mark.asyncio
+    async def test_postonly_fill_and_stop_loss(self):
+        exchange = FakeBybitExchange(api_keys={"key1": "secret1"})
+        client = make_client(exchange)
+
+        await client.set_leverage("linear", "BTCUSDT", 10, 10)
+        await client.entry_limit_postonly("linear", "BTCUSDT", "Buy", "0.010", "59000.0", "entry-1")
+        assert exchange.get_position("BTCUSDT")["size"] == "0"
+
+        exchange.set_price("BTCUSDT", "59000.0")
+        assert Decimal(exchange.get_position("BTCUSDT")["size"]) == Decimal("0.01")
+
+        await client.set_trading_stop("linear", "BTCUSDT", stop_loss="58000.0", position_idx=0)
+        exchange.set_price("BTCUSDT", "57900.0")
+
+        position = await client.get_position("linear", "BTCUSDT")
+        assert position["result"]["list"][0]["size"] == "0"
+        assert Decimal(exchange.closed_pnl[0]["closedPnl"]) < 0
+
+    @pytest.mark.asyncio
+    async def test_crossing_postonly_is_cancelled(self):
+        exchange = FakeBybitExchange()
+        client = make_client(exchange)
+
+        price = exchange.prices["BTCUSDT"]
+        result = await client.entry_limit_postonly("linear", "BTCUSDT", "Buy", "0.010", str(price + 100), "cross-1")
+
+        order = exchange.orders[result["result"]["orderId"]]
+        assert order["orderStatus"] == "Cancelled"
+        assert order["rejectReason"] == "EC_PostOnlyWillTakeLiquidity"
+
+    @pytest.mark.asyncio
+    async def test_duplicate_link_id_rejected(self):
+        exchange = FakeBybitExchange()
+        client = make_client(exchange)
+
+        await client.entry_limit_postonly("linear", "ETHUSDT", "Buy", "0.10", "2000.00", "dup-1")
+        with pytest.raises(BybitAPIError) as exc:
+            await client.entry_limit_postonly("linear", "ETHUSDT", "Buy", "0.10", "2000.00", "dup-1")
+        assert exc.value.ret_code == 110072
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_rejected(self):
+        exchange = FakeBybitExchange(api_keys={"key1": "secret1"})
+        client = make_client(exchange, {**ACCOUNT, "api_secret": "wrong"})
+
+        with pytest.raises(BybitAPIError) as exc:
+            await client.get_position("linear", "BTCUSDT")
+        assert exc.value.ret_code == 10004
+
+
+class TestFaults:
+    """Scripted and configured fault injection."""
+
+    @pytest.mark.asyncio
+    async def test_fail_next(self):
+        exchange = FakeBybitExchange()
+        exchange.fail_next(1, status=429)
+        exchange.fail_next(1, status=503)
+
+        first = await exchange.handle_http("GET", "/v5/market/tickers", "category=linear", {})
+        second = await exchange.handle_http("GET", "/v5/market/tickers", "category=linear", {})
+        third = await exchange.handle_http("GET", "/v5/market/tickers", "category=linear", {})
+
+        assert [first[0], second[0], third[0]] == [429, 503, 200]
+        assert exchange.stats["injected_errors"] == 2
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_headers_and_enforcement(self):
+        exchange = FakeBybitExchange(
+            faults=FaultConfig(enforce_rate_limits=True),
+            rate_limits={"market": 2},
+            clock=lambda: 1000.0
+        )
+
+        responses = [await exchange.handle_http("GET", "/v5/market/time", "", {}) for _ in range(3)]
+
+        assert responses[0][1]["X-Bapi-Limit"] == "2"
+        assert responses[0][1]["X-Bapi-Limit-Status"] == "1"
+        assert responses[0][1]["X-Bapi-Limit-Reset-Timestamp"] == "1001000"
+        assert responses[2][2]["retCode"] == 10006
+
+    @pytest.mark.asyncio
+    async def test_latency_injection(self):
+        exchange = FakeBybitExchange(faults=FaultConfig(latency_ms=50))
+
+        start = time.perf_counter()
+        await exchange.handle_http("GET", "/v5/market/time", "", {})
+        assert time.perf_counter() - start >= 0.045
+
+
+class TestWebSocket:
+    """Public and private stream handling."""
+
+    def test_public_subscribe_reply_then_snapshot(self):
+        exchange = FakeBybitExchange()
+        subscriber = exchange.connect(private=False)
+
+        messages = exchange.handle_ws_message(subscriber, {"op": "subscribe", "args": ["tickers.BTCUSDT"]})
+        assert messages[0]["success"] is True
+        assert messages[1]["type"] == "snapshot"
+
+        exchange.set_price("BTCUSDT", "61000.0")
+        update = subscriber.queue.get_nowait()
+        assert update["topic"] == "tickers.BTCUSDT"
+        assert update["data"]["lastPrice"] == "61000.0"
+
+    def test_private_requires_auth_and_receives_fills(self):
+        exchange = FakeBybitExchange(api_keys={"key1": "secret1"})
+        subscriber = exchange.connect(private=True)
+
+        denied = exchange.handle_ws_message(subscriber, {"op": "subscribe", "args": ["execution"]})
+        assert denied[0]["success"] is False
+
+        expires = str(int(time.time() + 5))
+        signature = hmac.new(b"secret1", f"GET/realtime{expires}".encode(), hashlib.sha256).hexdigest()
+        auth = exchange.handle_ws_message(subscriber, {"op": "auth", "args": ["key1", expires, signature]})
+        assert auth[0]["success"] is True
+        exchange.handle_ws_message(subscriber, {"op": "subscribe", "args": ["execution"]})
+
+        exchange._order_create({"category": "linear", "symbol": "BTCUSDT", "side": "Buy",
+                                "orderType": "Market", "qty": "0.010"})
+
+        execution = subscriber.queue.get_nowait()
+        assert execution["topic"] == "execution"
+        assert Decimal(execution["data"][0]["execQty"]) == Decimal("0.01")
+
+    def test_rest_and_ws_over_http(self):
+        from starlette.testclient import TestClient
+
+        exchange = FakeBybitExchange()
+        with TestClient(create_app(exchange)) as http:
+            tickers = http.get("/v5/market/tickers", params={"category": "linear", "symbol": "ETHUSDT"}).json()
+            assert tickers["result"]["list"][0]["symbol"] == "ETHUSDT"
+
+            with http.websocket_connect("/v5/public/linear") as ws:
+                ws.send_json({"op": "ping", "req_id": "1"})
+                assert ws.receive_json()["op"] == "pong"
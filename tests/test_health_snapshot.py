@@ -0,0 +1,106 @@
+"""
+Tests for background-computed /status and /metrics snapshots.
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+
+from app.api import health
+from app.api.health import HealthSnapshotter
+
+
+def make_snapshotter(**kwargs):
+    calls = {"status": 0, "metrics": 0}
+
+    async def status():
+        calls["status"] += 1
+        return {"components_ok": True, "shards_healthy": True, "components": {}}
+
+    async def metrics():
+        calls["metrics"] += 1
+        return {"total_trades_24h": 3, "clock_trading_allowed": True}
+
+    snapshotter = HealthSnapshotter(**kwargs)
+    snapshotter.computers = {"status": status, "metrics": metrics}
+    return snapshotter, calls
+
+
+class TestHealthSnapshotter:
+    """Serving cached snapshots."""
+
+    @pytest.mark.asyncio
+    async def test_serves_last_snapshot_without_recomputing(self):
+        snapshotter, calls = make_snapshotter(interval=10)
+        await snapshotter.refresh()
+
+        first = await snapshotter.serve("metrics")
+        second = await snapshotter.serve("metrics")
+
+        assert calls == {"status": 1, "metrics": 1}
+        assert second["total_trades_24h"] == 3
+        assert second["trading_enabled"] is True
+        assert "clock_trading_allowed" not in second
+        assert first["snapshot_stale"] is False
+        assert second["snapshot_age_s"] >= first["snapshot_age_s"]
+
+    @pytest.mark.asyncio
+    async def test_first_request_computes_on_demand(self):
+        snapshotter, calls = make_snapshotter()
+
+        status = await snapshotter.serve("status")
+
+        assert calls == {"status": 1, "metrics": 0}
+        assert status["status"] == "operational"
+        assert status["killswitch_active"] is False
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_previous_snapshot_and_goes_stale(self):
+        snapshotter, _ = make_snapshotter(interval=1, stale_after=0)
+        await snapshotter.refresh()
+
+        async def broken():
+            raise RuntimeError("db locked")
+
+        snapshotter.computers["metrics"] = broken
+        with patch.object(health.system_logger, "error") as logged:
+            await snapshotter.refresh(["metrics"])
+        served = await snapshotter.serve("metrics")
+
+        # The traceback of the gathered exception, not of the (empty) current one
+        assert "in broken" in logged.call_args[0][1]["exception"]
+        assert served["total_trades_24h"] == 3
+        assert served["snapshot_stale"] is True
+        assert served["snapshot_error"] == "db locked"
+
+    @pytest.mark.asyncio
+    async def test_killswitch_applies_to_cached_snapshot(self):
+        snapshotter, _ = make_snapshotter()
+        await snapshotter.refresh()
+
+        with patch.object(health, "_killswitch_active", True):
+            status = await snapshotter.serve("status")
+            metrics = await snapshotter.serve("metrics")
+
+        assert status["status"] == "degraded"
+        assert status["trading_enabled"] is False
+        assert metrics["trading_enabled"] is False
+        assert metrics["killswitch_active"] is True
+
+
+class TestLoopDebug:
+    """/debug/loop exposes stacks, so it needs the admin token."""
+
+    @pytest.mark.asyncio
+    async def test_requires_admin_token(self):
+        from fastapi import HTTPException
+
+        with patch.dict(os.environ, {"ADMIN_TOKEN": "secret"}):
+            with pytest.raises(HTTPException) as denied:
+                await health.loop_debug(None)
+            assert denied.value.status_code == 401
+            with pytest.raises(HTTPException):
+                await health.loop_debug("wrong")
+
+            assert "recent_stalls" in await health.loop_debug("secret")
@@ -0,0 +1,170 @@
+"""
+Tests for multi-account execution (per-account clients and concurrent fan-out).
+"""
+
+import asyncio
+import hashlib
+import hmac
+import time
+from decimal import Decimal
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from app.bybit.client import BybitClient, get_bybit_client
+from app.core.confirmation_gate import ConfirmationGate
+from app.core.simulated_tpsl import get_simulated_tpsl_manager
+from app.core.symbol_registry import SymbolInfo
+from app.trade.multi_account import AccountPool
+
+INSTRUMENT = {
+    "symbol": "BTCUSDT",
+    "status": "Trading",
+    "lotSizeFilter": {"minOrderQty": "0.001", "maxOrderQty": "100", "qtyStep": "0.001"},
+    "priceFilter": {"tickSize": "0.10"},
+    "leverageFilter": {"maxLeverage": "100"}
+}
+
+ACCOUNTS = [
+    {"name": f"sub{i}", "api_key": f"key{i}", "api_secret": f"secret{i}", "im_target": Decimal(20 * (i + 1))}
+    for i in range(4)
+]
+
+
+class FakeRegistry:
+    async def get_symbol_info(self, symbol):
+        return SymbolInfo(symbol, INSTRUMENT)
+
+
+class FakeGate:
+    """Confirmation gate stand-in that takes `delay` per account call."""
+
+    def __init__(self, delay=0.1, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.entries = []
+        self.exits = []
+
+    async def place_entry_orders(self, symbol, direction, entries, qty, leverage, channel_name,
+                                 tps=None, sl=None, client=None, notify=True):
+        await asyncio.sleep(self.delay)
+        self.entries.append((client.account_name, qty, notify))
+        return client.account_name not in self.fail
+
+    async def place_exit_orders(self, symbol, side, qty, tps, sl, channel_name,
+                                entry_price=None, client=None, notify=True):
+        await asyncio.sleep(self.delay)
+        self.exits.append((client.account_name, qty))
+        return True
+
+
+class TestAccountClients:
+    """Per-account clients next to the main singleton."""
+
+    def test_account_clients_are_separate(self):
+        first = BybitClient(ACCOUNTS[0])
+        second = BybitClient(ACCOUNTS[1])
+
+        assert first is not second
+        assert first is not get_bybit_client()
+        assert BybitClient() is get_bybit_client()
+        assert first.http is not second.http
+        assert first._limiter() is not second._limiter()
+        assert get_bybit_client().account_name is None
+
+    def test_account_client_signs_with_own_key(self):
+        client = BybitClient(ACCOUNTS[1])
+        kwargs = client._signed_get("category=linear")
+        headers = kwargs["headers"]
+
+        prehash = headers["X-BAPI-TIMESTAMP"] + "key1" + headers["X-BAPI-RECV-WINDOW"] + "category=linear"
+        expected = hmac.new(b"secret1", prehash.encode(), hashlib.sha256).hexdigest()
+        assert headers["X-BAPI-API-KEY"] == "key1"
+        assert headers["X-BAPI-SIGN"] == expected
+
+
+class TestFanOut:
+    """Concurrent entry/exit placement across accounts."""
+
+    async def _enter(self, pool, gate):
+        with patch("app.core.confirmation_gate.get_confirmation_gate", return_value=gate), \
+             patch("app.core.symbol_registry.get_symbol_registry", return_value=FakeRegistry()):
+            return await pool.place_entry_orders(
+                "T1", "BTCUSDT", "LONG", [Decimal("50000")], Decimal("10"), "TEST"
+            )
+
+    @pytest.mark.asyncio
+    async def test_entries_run_concurrently_and_sized_per_account(self):
+        pool = AccountPool(ACCOUNTS, concurrency=4)
+        gate = FakeGate(delay=0.2)
+
+        start = time.perf_counter()
+        results = await self._enter(pool, gate)
+        wall = time.perf_counter() - start
+
+        assert wall < 0.6  # four accounts, ~one account's time
+        assert all(r["success"] for r in results.values())
+        qty = {name: q for name, q, _ in gate.entries}
+        assert qty["sub1"] == 2 * qty["sub0"]
+        assert qty["sub3"] == 4 * qty["sub0"]
+        assert all(notify is False for _, _, notify in gate.entries)
+        assert pool.get_stats()["accounts"]["sub2"]["last_latency_ms"] >= 150
+
+    @pytest.mark.asyncio
+    async def test_semaphore_bounds_concurrency(self):
+        pool = AccountPool(ACCOUNTS, concurrency=1)
+        gate = FakeGate(delay=0.05)
+
+        results = await self._enter(pool, gate)
+
+        queued = sorted(r["queued_ms"] for r in results.values())
+        assert queued[-1] >= 120  # the last account waited for three others
+
+    @pytest.mark.asyncio
+    async def test_exits_only_for_accounts_that_entered(self):
+        pool = AccountPool(ACCOUNTS, concurrency=4)
+        gate = FakeGate(delay=0.01, fail={"sub2"})
+        await self._enter(pool, gate)
+
+        with patch("app.core.confirmation_gate.get_confirmation_gate", return_value=gate):
+            results = await pool.place_exit_orders(
+                "T1", "BTCUSDT", "LONG", [Decimal("51000")], Decimal("49000"), "TEST"
+            )
+
+        assert set(results) == {"sub0", "sub1", "sub3"}
+        entered = {name: q for name, q, _ in gate.entries}
+        assert all(qty == entered[name] for name, qty in gate.exits)
+        assert pool.get_stats()["accounts"]["sub2"]["failed"] == 1
+        assert pool.get_stats()["open_trades"] == 0
+
+
+class TestAccountTPSL:
+    """Simulated TP/SL of a mirrored account stays on that account."""
+
+    @pytest.mark.asyncio
+    async def test_account_manager_closes_on_its_own_client(self):
+        client = BybitClient(ACCOUNTS[0])
+        manager = get_simulated_tpsl_manager(client)
+        main = get_simulated_tpsl_manager()
+        assert manager is get_simulated_tpsl_manager(client)
+        assert manager is not main and manager is not get_simulated_tpsl_manager(BybitClient(ACCOUNTS[1]))
+
+        # One exit operation, two accounts: neither TP/SL replaces the other
+        operation_id = "exit_BTCUSDT_Sell_1000"
+        main_id = ConfirmationGate._account_operation_id(operation_id, get_bybit_client())
+        account_id = ConfirmationGate._account_operation_id(operation_id, client)
+        assert main_id != account_id
+        for target, trade_id in ((main, main_id), (manager, account_id)):
+            assert await target.add_tpsl_order(
+                "BTCUSDT", "Buy", Decimal("0.01"), Decimal("50000"), [Decimal("2")], Decimal("1"), trade_id
+            )
+        try:
+            with patch.object(client, "place_order", AsyncMock(return_value={"retCode": 0, "result": {}})) as placed:
+                order = manager.active_orders[account_id]
+                assert await manager._execute_sl_level(order, Decimal("49500"))
+
+            link_id = placed.await_args.args[0]["orderLinkId"]
+            assert link_id.startswith("sim_sl_") and len(link_id) <= 36
+            assert main_id in main.active_orders and account_id not in manager.active_orders
+        finally:
+            await main.remove_tpsl_order(main_id)
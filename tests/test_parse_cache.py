@@ -0,0 +1,89 @@
+"""Tests for the content-addressed parse cache (app/signals/parse_cache.py)."""
+
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.core.strict_config import STRICT_CONFIG
+from app.signals.parse_cache import ParseCache, content_key
+from app.signals.strict_parser import StrictSignalParser
+
+SIGNAL = """#DOGEUSDT LONG
+Isolated (10X)
+Entry: 0.17
+TP: 0.18, 0.19
+Stop Loss: 0.16"""
+
+
+def _signal(symbol="DOGEUSDT", channel="A"):
+    return {"symbol": symbol, "direction": "LONG", "entries": ["0.17"], "tps": ["0.18"],
+            "mode": "DYNAMIC", "channel_name": channel, "raw_message": "text"}
+
+
+class TestParseCache:
+    """LRU, TTL and per-message fields."""
+
+    def test_key_ignores_line_endings_and_trailing_whitespace(self):
+        assert content_key(SIGNAL) == content_key("  " + SIGNAL.replace("\n", "  \r\n") + "\n")
+        assert content_key(SIGNAL) != content_key(SIGNAL.replace("0.16", "0.15"))
+
+    def test_hit_applies_message_fields(self):
+        cache = ParseCache(max_entries=4, ttl_seconds=60)
+        cache.put("k", _signal(channel="A"))
+
+        hit = cache.get("k", "B", "copy")
+        assert hit["channel_name"] == "B" and hit["raw_message"] == "copy"
+        # Copies: the caller may mutate the result
+        hit["entries"].append("0.16")
+        assert cache.get("k", "C", "copy")["entries"] == ["0.17"]
+        assert cache.get("missing", "B", "copy") is None
+        assert cache.get_stats()["hit_ratio"] == pytest.approx(2 / 3, abs=1e-4)
+
+    def test_lru_bound_and_ttl(self):
+        cache = ParseCache(max_entries=2, ttl_seconds=60)
+        with patch("app.signals.parse_cache.time.monotonic", return_value=100.0):
+            cache.put("a", _signal("A"))
+            cache.put("b", _signal("B"))
+            cache.get("a", "X", "")       # a is now most recent
+            cache.put("c", _signal("C"))  # evicts b
+
+            assert cache.get("b", "X", "") is None
+            assert len(cache) == 2 and cache.evicted == 1
+        with patch("app.signals.parse_cache.time.monotonic", return_value=161.0):
+            assert cache.get("a", "X", "") is None
+            assert cache.expired == 1
+
+    def test_disabled_cache(self):
+        cache = ParseCache(max_entries=0)
+        cache.put("k", _signal())
+
+        assert cache.get("k", "B", "") is None
+        assert len(cache) == 0 and cache.get_stats()["hits"] == 0
+
+
+class TestParseSignalCache:
+    """Cross-posted copies skip the parse and the symbol checks."""
+
+    @pytest.mark.asyncio
+    async def test_cross_post_is_served_from_cache(self):
+        cache = ParseCache(max_entries=8, ttl_seconds=60)
+        registry = MagicMock()
+        registry.get_symbol_info = AsyncMock(return_value=SimpleNamespace(is_trading=True, status="Trading"))
+        available = AsyncMock(return_value=True)
+
+        with patch("app.signals.parse_cache.get_parse_cache", return_value=cache), \
+                patch("app.signals.strict_parser.is_symbol_available", available), \
+                patch("app.core.symbol_registry.get_symbol_registry", return_value=registry), \
+                patch.object(STRICT_CONFIG, "position_size", Decimal("20"), create=True):
+            parser = StrictSignalParser()
+            first = await parser.parse_signal(SIGNAL, "CHANNEL_A")
+            second = await parser.parse_signal(SIGNAL + "\n", "CHANNEL_B")
+
+        assert first is not None and first["symbol"] == "DOGEUSDT"
+        assert available.await_count == 1
+        assert second["channel_name"] == "CHANNEL_B"
+        assert {k: v for k, v in second.items() if k not in ("channel_name", "raw_message")} == \
+            {k: v for k, v in first.items() if k not in ("channel_name", "raw_message")}
+        assert cache.hits == 1 and cache.misses == 1
@@ -0,0 +1,140 @@
+"""Tests for the signal parser worker pool (app/signals/parse_pool.py)."""
+
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from app.signals.parse_cache import ParseCache
+from app.signals.parse_pool import ParsePool, _extract_in_worker
+from app.signals.strict_parser import get_strict_parser
+
+SIGNAL = """🪙 MOVE/USDT
+Exchanges: BYBIT
+
+🟢 LONG
+Isolated (12.5X)
+
+Entry Targets:
+ 0.10769
+
+🎯 TP:
+ 1) 0.108786
+ 2) 0.109856
+
+⛔️ SL:
+ 0.10501276"""
+
+
+def _slow_extract(message):
+    """Stands in for a pathological message in a worker."""
+    time.sleep(5)
+    return {}, 0.0
+
+
+class SlowParsePool(ParsePool):
+    _target = staticmethod(_slow_extract)
+
+
+def _slow_if_marked(message):
+    """Only the marked messages are slow (SLOW over budget, MEDIUM within it)."""
+    if message.startswith("SLOW"):
+        time.sleep(5)
+    elif message.startswith("MEDIUM"):
+        time.sleep(0.5)
+    return _extract_in_worker(message)
+
+
+class MixedParsePool(ParsePool):
+    _target = staticmethod(_slow_if_marked)
+
+
+class TestParsePool:
+    """Pooled and inline parsing return the same fields."""
+
+    @pytest.mark.asyncio
+    async def test_inline_when_pool_disabled(self):
+        pool = ParsePool(workers=0)
+
+        assert await pool.start() is False
+        fields, cpu_ms = await pool.extract(SIGNAL)
+
+        assert fields == get_strict_parser().extract_fields(SIGNAL)
+        assert fields["symbol"] == "MOVEUSDT" and fields["direction"] == "LONG"
+        assert cpu_ms >= 0
+        assert pool.get_stats()["inline"] == 1
+
+    @pytest.mark.asyncio
+    async def test_worker_matches_inline(self):
+        pool = ParsePool(workers=1, timeout=10)
+        assert await pool.start()
+        try:
+            fields, _ = await pool.extract(SIGNAL)
+            assert fields == get_strict_parser().extract_fields(SIGNAL)
+            fields, _ = await pool.extract("BTC/USDT Take-Profit target 1 ✅")
+            assert fields == {"take_profit_signal": True}
+            stats = pool.get_stats()
+            assert stats["workers"] == 1 and stats["pooled"] == 2 and stats["inline"] == 0
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_message_over_budget_is_dropped_and_pool_recycled(self):
+        pool = SlowParsePool(workers=1, timeout=0.5)
+        assert await pool.start()
+        try:
+            fields, _ = await pool.extract(SIGNAL, "TEST_CHANNEL")
+
+            assert fields is None
+            assert pool.timeouts == 1 and pool.restarts == 1
+            # Until the replacement workers are up, messages parse inline
+            assert not pool.running
+            fields, _ = await pool.extract(SIGNAL)
+            assert fields["symbol"] == "MOVEUSDT"
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_slow_message_does_not_drop_messages_queued_behind_it(self):
+        pool = MixedParsePool(workers=1, timeout=1)
+        assert await pool.start()
+        try:
+            results = await asyncio.gather(
+                pool.extract("SLOW " + SIGNAL, "SLOW_CHANNEL"),
+                pool.extract(SIGNAL, "A"),
+                pool.extract(SIGNAL, "B")
+            )
+
+            assert results[0][0] is None
+            assert [fields["symbol"] for fields, _ in results[1:]] == ["MOVEUSDT", "MOVEUSDT"]
+            assert pool.timeouts == 1
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_messages_survive_recycle(self):
+        pool = MixedParsePool(workers=2, timeout=1)
+        assert await pool.start()
+        try:
+            slow = asyncio.ensure_future(pool.extract("SLOW " + SIGNAL))
+            await asyncio.sleep(0.8)
+            # Still running on the other worker when the slow one's recycle kills it
+            fields, _ = await pool.extract("MEDIUM " + SIGNAL)
+
+            assert fields["symbol"] == "MOVEUSDT"
+            assert (await slow)[0] is None
+        finally:
+            await pool.stop()
+
+    @pytest.mark.asyncio
+    async def test_parse_signal_drops_message_over_budget(self):
+        pool = ParsePool(workers=0)
+
+        async def over_budget(message, channel_name=""):
+            return None, 2000.0
+
+        with patch("app.signals.parse_pool.get_parse_pool", return_value=pool), \
+                patch("app.signals.parse_cache.get_parse_cache", return_value=ParseCache(max_entries=0)), \
+                patch.object(pool, "extract", side_effect=over_budget):
+            assert await get_strict_parser().parse_signal(SIGNAL, "TEST_CHANNEL") is None
@@ -0,0 +1,201 @@
+"""
+Tests for the Bybit rate-limit-aware request scheduler.
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.bybit.rate_limiter import (
+    BybitRateLimiter,
+    TokenBucket,
+    get_endpoint_group,
+    PRIORITY_ORDER,
+    PRIORITY_REPORTING
+)
+
+
+class TestEndpointGroups:
+    """Path → group mapping."""
+
+    def test_order_paths(self):
+        assert get_endpoint_group("/v5/order/create") == "order"
+        assert get_endpoint_group("/v5/order/cancel-all") == "order"
+        assert get_endpoint_group("/v5/position/trading-stop") == "order"
+
+    def test_reads_and_query_strings(self):
+        assert get_endpoint_group("/v5/position/list?category=linear&symbol=BTCUSDT") == "position_read"
+        assert get_endpoint_group("/v5/order/realtime?category=linear") == "order_read"
+        assert get_endpoint_group("/v5/account/wallet-balance?accountType=UNIFIED") == "account"
+        assert get_endpoint_group("/v5/market/tickers") == "market"
+        assert get_endpoint_group("/v5/unknown") == "default"
+
+
+class TestTokenBucket:
+    """Token accounting, priorities and header feedback."""
+
+    def test_grants_until_empty(self):
+        bucket = TokenBucket("order", rate=2)
+        now = time.monotonic()
+        assert bucket.try_acquire(PRIORITY_ORDER, now) == 0.0
+        assert bucket.try_acquire(PRIORITY_ORDER, now) == 0.0
+        assert bucket.try_acquire(PRIORITY_ORDER, now) > 0.0
+
+    def test_reporting_keeps_reserve(self):
+        bucket = TokenBucket("account", rate=10, reserve_ratio=0.2)
+        now = time.monotonic()
+        granted = 0
+        while bucket.try_acquire(PRIORITY_REPORTING, now) == 0.0:
+            granted += 1
+        assert granted == 8
+        # Orders may still use the reserve
+        assert bucket.try_acquire(PRIORITY_ORDER, now) == 0.0
+
+    def test_higher_priority_waiter_goes_first(self):
+        bucket = TokenBucket("order_read", rate=10)
+        bucket.waiting[PRIORITY_ORDER] = 1
+        assert bucket.try_acquire(PRIORITY_REPORTING) > 0.0
+
+    def test_headers_exhausted_window_blocks(self):
+        bucket = TokenBucket("order", rate=10)
+        reset_ms = int((time.time() + 0.5) * 1000)
+        bucket.update_from_headers(limit=10, remaining=0, reset_ms=reset_ms)
+
+        wait = bucket.try_acquire(PRIORITY_ORDER)
+        assert 0.0 < wait <= 0.5
+        assert bucket.throttled == 1
+
+    def test_headers_lower_remaining_and_rate(self):
+        bucket = TokenBucket("order", rate=10)
+        bucket.update_from_headers(limit=5, remaining=3, reset_ms=None)
+        assert bucket.rate == 5
+        assert bucket.tokens <= 3
+
+
+class TestRateLimiter:
+    """Limiter-level behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_acquire_delays_instead_of_failing(self):
+        limiter = BybitRateLimiter({"order": (20, PRIORITY_ORDER), "default": (10, 2)})
+        limiter.buckets["order"].tokens = 0.0
+
+        waited = await limiter.acquire("/v5/order/create")
+        assert waited > 0.0
+        assert limiter.buckets["order"].delayed == 1
+
+    @pytest.mark.asyncio
+    async def test_orders_overtake_reporting(self):
+        limiter = BybitRateLimiter({
+            "order": (20, PRIORITY_ORDER),
+            "account": (20, PRIORITY_REPORTING),
+            "default": (10, 2)
+        })
+        # Route both through one bucket to check ordering
+        limiter.buckets["account"] = limiter.buckets["order"]
+        limiter.buckets["order"].tokens = 0.0
+
+        finished = []
+
+        async def call(path, name):
+            await limiter.acquire(path)
+            finished.append(name)
+
+        await asyncio.gather(
+            call("/v5/account/wallet-balance", "report"),
+            call("/v5/order/create", "order")
+        )
+        assert finished[0] == "order"
+
+    def test_record_response_reads_headers(self):
+        limiter = BybitRateLimiter()
+        limiter.record_response("/v5/order/create", {
+            "X-Bapi-Limit": "10",
+            "X-Bapi-Limit-Status": "4",
+            "X-Bapi-Limit-Reset-Timestamp": str(int(time.time() * 1000) + 500)
+        })
+        state = limiter.buckets["order"].get_state()
+        assert state["last_remaining"] == 4
+        assert state["tokens"] <= 4
+
+    def test_demo_interval_caps_order_rate(self):
+        limiter = BybitRateLimiter()
+        limiter.apply_min_interval("order", 0.5)
+        assert limiter.buckets["order"].rate == 2.0
+
+    def test_header_limit_is_scaled_by_shard_share(self):
+        limiter = BybitRateLimiter()
+        limiter.apply_share(0.25)
+        assert limiter.buckets["order"].rate == 2.5
+
+        limiter.record_response("/v5/order/create", {"X-Bapi-Limit": "10", "X-Bapi-Limit-Status": "9"})
+        assert limiter.buckets["order"].rate == 2.5
+
+    def test_header_limit_never_lifts_configured_cap(self):
+        limiter = BybitRateLimiter()
+        limiter.apply_min_interval("order", 0.5)
+        limiter.record_response("/v5/order/create", {"X-Bapi-Limit": "10", "X-Bapi-Limit-Status": "9"})
+        assert limiter.buckets["order"].rate == 2.0
+
+        limiter.record_response("/v5/order/create", {"X-Bapi-Limit": "1", "X-Bapi-Limit-Status": "1"})
+        assert limiter.buckets["order"].rate == 1.0
+
+
+class TestClientIntegration:
+    """BybitClient sends through the limiter."""
+
+    @pytest.mark.asyncio
+    async def test_send_signs_after_wait_and_records_headers(self, monkeypatch):
+        from app.bybit import client as client_module
+
+        limiter = BybitRateLimiter()
+        monkeypatch.setattr(client_module, "get_rate_limiter", lambda: limiter)
+
+        response = MagicMock()
+        response.headers = {"X-Bapi-Limit": "10", "X-Bapi-Limit-Status": "7"}
+        response.status_code = 200
+
+        client = client_module.BybitClient()
+        original_http = client.http
+        client.http = MagicMock()
+        client.http.request = AsyncMock(return_value=response)
+        request = client.http.request
+        try:
+            await client._send("POST", "/v5/order/create", sign=lambda: {"headers": {"X-BAPI-SIGN": "s"}})
+        finally:
+            client.http = original_http
+
+        assert request.await_args.kwargs["headers"] == {"X-BAPI-SIGN": "s"}
+        assert limiter.buckets["order"].last_remaining == 7
+        assert limiter.buckets["order"].granted == 1
+
+    @pytest.mark.asyncio
+    async def test_10006_retries_after_reset_without_tripping_breaker(self):
+        from app.bybit import client as client_module
+
+        def reply(ret_code):
+            response = MagicMock()
+            response.content = b'{"retCode": %d, "retMsg": "", "result": {}}' % ret_code
+            return response
+
+        client = client_module.BybitClient({"name": "rl", "api_key": "k", "api_secret": "s"})
+        client.sync_time = AsyncMock()
+        client._send = AsyncMock(side_effect=[reply(10006), reply(0)])
+
+        result = await client._post_auth("/v5/order/create", {"symbol": "BTCUSDT"})
+
+        assert result["retCode"] == 0
+        assert client._send.await_count == 2
+        assert client._limiter().buckets["order"].blocked_until > time.monotonic()
+        assert client._circuit_breaker.failure_count == 0
+
+        # Still limited after the reset: raised, but not an exchange failure
+        client._send = AsyncMock(side_effect=[reply(10006), reply(10006)])
+        for _ in range(client._circuit_breaker.failure_threshold):
+            with pytest.raises(client_module.BybitRateLimitError):
+                await client._post_auth("/v5/order/create", {"symbol": "BTCUSDT"})
+            client._send.side_effect = [reply(10006), reply(10006)]
+        assert client._circuit_breaker.failure_count == 0
+        assert client._circuit_breaker.can_execute()
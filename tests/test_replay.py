@@ -0,0 +1,185 @@
+"""
+Tests for the accelerated replay harness (inputs and virtual clock).
+"""
+
+import asyncio
+import json
+import time
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.tools.replay import (
+    ReplayHarness, VirtualClock, load_messages, load_tape, parse_timestamp, synthetic_tape
+)
+
+EXPORT = """Crypto Signals, [2025-05-28 07:46]
+#CATI/USDT
+
+LONG
+
+Entry: 0.1128 - 0.1098
+
+Targets: 0.1139, 0.1150
+
+StopLoss: 0.1058
+
+Crypto Signals, [2025-05-28 10:52]
+#RONINUSDT | SHORT
+Entry Zone: 0.673
+Targets: 0.670, 0.653
+Stop-Loss: 0.693
+"""
+
+
+class TestInputs:
+    """Recorded messages and price tapes."""
+
+    def test_parse_timestamp(self):
+        assert parse_timestamp("2025-05-28 07:46") == 1748418360.0
+        assert parse_timestamp(1748418360) == 1748418360.0
+        assert parse_timestamp("1748418360000") == 1748418360.0
+        assert parse_timestamp("2025-05-28T09:46:00+02:00") == 1748418360.0
+
+    def test_load_telegram_export(self, tmp_path):
+        path = tmp_path / "signals.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+
+        messages = load_messages(str(path))
+
+        assert [m.channel for m in messages] == ["Crypto Signals", "Crypto Signals"]
+        assert messages[1].ts - messages[0].ts == 3 * 3600 + 6 * 60
+        assert messages[0].text.startswith("#CATI/USDT")
+        assert messages[0].text.endswith("StopLoss: 0.1058")
+
+    def test_load_jsonl_messages_and_csv_tape(self, tmp_path):
+        messages_path = tmp_path / "messages.jsonl"
+        messages_path.write_text("\n".join(json.dumps(row) for row in [
+            {"ts": 200, "channel": "B", "text": "second", "chat_id": -100123},
+            {"ts": 100, "channel": "A", "text": "first"}
+        ]), encoding="utf-8")
+        tape_path = tmp_path / "tape.csv"
+        tape_path.write_text("ts,symbol,price\n20,BTCUSDT,65010.5\n10,BTCUSDT,65000\n", encoding="utf-8")
+
+        messages = load_messages(str(messages_path))
+        tape = load_tape(str(tape_path))
+
+        assert [m.text for m in messages] == ["first", "second"]
+        assert messages[1].chat_id == "-100123"
+        assert [(t.ts, t.price) for t in tape] == [(10.0, Decimal("65000")), (20.0, Decimal("65010.5"))]
+
+    def test_synthetic_tape_fills_then_exits(self, tmp_path):
+        path = tmp_path / "signals.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+        messages = load_messages(str(path))
+
+        tape = synthetic_tape(messages, seed=1)
+
+        cati = [t for t in tape if t.symbol == "CATIUSDT"]
+        assert len(cati) == 3
+        before, fill, exit_ = cati
+        assert before.ts < messages[0].ts < fill.ts < exit_.ts
+        assert before.price > Decimal("0.1128") and fill.price < Decimal("0.1098")
+        assert exit_.price > Decimal("0.1139") or exit_.price < Decimal("0.1058")
+        assert tape == synthetic_tape(messages, seed=1)
+
+
+class TestVirtualClock:
+    """Scaled event-loop timers and time functions."""
+
+    def test_sleep_runs_at_speed(self):
+        clock = VirtualClock(start=1_700_000_000.0, speed=1000)
+        loop = clock.new_event_loop()
+        real_time = time.time
+        clock.install()
+        try:
+            async def nap():
+                before = time.time()
+                await asyncio.sleep(5)
+                return time.time() - before
+
+            wall = time.perf_counter()
+            slept = loop.run_until_complete(nap())
+            wall = time.perf_counter() - wall
+        finally:
+            clock.uninstall()
+            loop.close()
+
+        assert slept >= 5
+        assert wall < 1.0
+        assert time.time is real_time
+        assert abs(time.time() - 1_700_000_000.0) > 1000
+
+    def test_advance_fires_due_timers(self):
+        clock = VirtualClock(start=0.0, speed=1)
+        loop = clock.new_event_loop()
+        try:
+            async def jump():
+                sleeper = asyncio.ensure_future(asyncio.sleep(3600))
+                await asyncio.sleep(0)
+                clock.advance(3600)
+                await asyncio.wait_for(sleeper, 1)
+                return clock.elapsed()
+
+            assert loop.run_until_complete(jump()) >= 3600
+        finally:
+            loop.close()
+
+    def test_speed_must_be_positive(self):
+        with pytest.raises(ValueError):
+            VirtualClock(start=0.0, speed=0)
+
+
+class TestHarnessSetup:
+    """Exchange listing and channel mapping before the replay starts."""
+
+    def test_lists_signalled_symbols(self, tmp_path):
+        path = tmp_path / "signals.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+        harness = ReplayHarness(load_messages(str(path)), [], speed=1000)
+
+        harness._list_instruments()
+
+        assert set(harness.exchange.instruments) == {"CATIUSDT", "RONINUSDT"}
+        price_filter = harness.exchange.instruments["CATIUSDT"]["priceFilter"]
+        assert price_filter["tickSize"] == "0.00001"
+        assert harness.exchange.prices["CATIUSDT"] > Decimal("0.1128")
+
+    def test_unknown_channel_is_whitelisted(self, tmp_path):
+        from app.core.strict_config import STRICT_CONFIG
+
+        path = tmp_path / "signals.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+        messages = load_messages(str(path))
+        harness = ReplayHarness(messages, [], speed=1000)
+        saved = (STRICT_CONFIG.channel_id_name_map, STRICT_CONFIG.source_whitelist)
+        try:
+            chat_id = harness._chat_id(messages[0])
+
+            assert harness._chat_id(messages[1]) == chat_id
+            assert STRICT_CONFIG.is_channel_whitelisted(chat_id)
+            assert STRICT_CONFIG.get_channel_name(chat_id) == "Crypto Signals"
+        finally:
+            STRICT_CONFIG.channel_id_name_map, STRICT_CONFIG.source_whitelist = saved
+
+    def test_failed_run_restores_clock_and_database(self, tmp_path):
+        from app.storage import db as storage_db
+
+        path = tmp_path / "signals.txt"
+        path.write_text(EXPORT, encoding="utf-8")
+        harness = ReplayHarness(load_messages(str(path)), [], speed=1000)
+        real_time, real_monotonic, db_path = time.time, time.monotonic, storage_db.DB_PATH
+        seen = {}
+
+        async def fail():
+            seen["db_path"] = storage_db.DB_PATH
+            raise RuntimeError("replay failed")
+
+        with patch.object(harness, "_run", fail):
+            with pytest.raises(RuntimeError):
+                harness.run()
+
+        assert seen["db_path"] != db_path and seen["db_path"].endswith("replay.sqlite")
+        assert storage_db.DB_PATH == db_path
+        assert time.time is real_time and time.monotonic is real_monotonic
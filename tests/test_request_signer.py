@@ -0,0 +1,68 @@
+"""
+Tests for the pre-keyed Bybit request signer (app/bybit/signer.py).
+"""
+
+import hashlib
+import hmac
+
+from app.bybit.client import BybitClient
+from app.bybit.signer import RequestSigner, get_request_signer
+
+
+def reference_sign(secret: str, prehash: str) -> str:
+    return hmac.new(secret.encode(), prehash.encode(), hashlib.sha256).hexdigest()
+
+
+class TestRequestSigner:
+    """Signatures and headers match the V5 scheme."""
+
+    def test_get_headers(self):
+        signer = RequestSigner("key1", "secret1", "5000")
+
+        headers = signer.headers("1717000000000", "category=linear&symbol=BTCUSDT")
+
+        assert headers == {
+            "X-BAPI-API-KEY": "key1",
+            "X-BAPI-RECV-WINDOW": "5000",
+            "X-BAPI-SIGN-TYPE": "2",
+            "X-BAPI-TIMESTAMP": "1717000000000",
+            "X-BAPI-SIGN": reference_sign("secret1", "1717000000000key15000category=linear&symbol=BTCUSDT"),
+        }
+
+    def test_post_headers_and_repeatable_signing(self):
+        signer = RequestSigner("key1", "secret1", "5000")
+        body = '{"symbol":"BTCUSDT","note":"ü"}'
+
+        first = signer.headers("1", body, json_body=True)
+        second = signer.headers("1", body, json_body=True)
+
+        assert first == second
+        assert first["Content-Type"] == "application/json"
+        assert first["X-BAPI-SIGN"] == reference_sign("secret1", "1key15000" + body)
+        assert signer.sign("abc") == reference_sign("secret1", "abc")
+
+    def test_headers_are_fresh_dicts(self):
+        signer = RequestSigner("key1", "secret1", "5000")
+        signer.headers("1", "", json_body=True)["X-BAPI-API-KEY"] = "tampered"
+        assert signer.headers("2", "")["X-BAPI-API-KEY"] == "key1"
+
+    def test_one_signer_per_credential_set(self):
+        assert get_request_signer("k", "s", "5000") is get_request_signer("k", "s", "5000")
+        assert get_request_signer("k", "s", "5000") is not get_request_signer("k", "other", "5000")
+
+
+class TestClientSigning:
+    """BybitClient resolves its signer once."""
+
+    def test_client_reuses_signer(self):
+        client = BybitClient({"name": "sig", "api_key": "key9", "api_secret": "secret9"})
+
+        get_kwargs = client._signed_get("category=linear")
+        post_kwargs = client._signed_post({"category": "linear"})
+
+        assert client._signer() is client._signer()
+        headers = post_kwargs["headers"]
+        prehash = headers["X-BAPI-TIMESTAMP"] + "key9" + headers["X-BAPI-RECV-WINDOW"] + post_kwargs["content"]
+        assert headers["X-BAPI-SIGN"] == reference_sign("secret9", prehash)
+        assert get_kwargs["headers"]["X-BAPI-API-KEY"] == "key9"
+        assert "Content-Type" not in get_kwargs["headers"]
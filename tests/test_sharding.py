@@ -0,0 +1,212 @@
+"""
+Tests for supervisor-mode sharding (symbol partitioning, ingress <-> worker IPC).
+"""
+
+import asyncio
+import time
+
+import pytest
+from unittest.mock import patch
+
+from app.runtime.sharding import (
+    ShardRouter,
+    ShardWorker,
+    shard_for_symbol,
+    owns_symbol,
+    ROLE_WORKER,
+    ROLE_INGRESS,
+    _read_frame,
+    _write_frame
+)
+
+AUTHKEY = b"test-shard-key"
+
+INSTRUMENT = {
+    "symbol": "BTCUSDT",
+    "status": "Trading",
+    "lotSizeFilter": {"minOrderQty": "0.001", "maxOrderQty": "100", "qtyStep": "0.001"},
+    "priceFilter": {"tickSize": "0.10"},
+    "leverageFilter": {"maxLeverage": "100"}
+}
+
+
+class TestPartitioning:
+    """Stable symbol -> shard mapping."""
+
+    def test_stable_and_in_range(self):
+        symbols = [f"COIN{i}USDT" for i in range(200)]
+        first = [shard_for_symbol(s, 4) for s in symbols]
+        assert first == [shard_for_symbol(s, 4) for s in symbols]
+        assert set(first) == {0, 1, 2, 3}
+        assert shard_for_symbol("btcusdt", 4) == shard_for_symbol("BTCUSDT", 4)
+
+    def test_owns_symbol_by_role(self, monkeypatch):
+        assert owns_symbol("BTCUSDT") is True  # standalone
+
+        monkeypatch.setenv("COPYBOT_ROLE", ROLE_INGRESS)
+        assert owns_symbol("BTCUSDT") is False
+
+        monkeypatch.setenv("COPYBOT_ROLE", ROLE_WORKER)
+        monkeypatch.setenv("COPYBOT_SHARDS", "3")
+        owners = []
+        for shard_id in range(3):
+            monkeypatch.setenv("COPYBOT_SHARD_ID", str(shard_id))
+            owners.append(owns_symbol("BTCUSDT"))
+        assert owners.count(True) == 1
+
+
+class TestIPC:
+    """Ingress router and worker over a real local connection."""
+
+    async def _pair(self):
+        worker = ShardWorker(0, 1, address=("127.0.0.1", 0), authkey=AUTHKEY)
+        address = await worker.listen()
+        router = ShardRouter(1, addresses=[address], authkey=AUTHKEY)
+        return worker, router
+
+    async def _wait_for(self, predicate, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                raise AssertionError("condition not met in time")
+            await asyncio.sleep(0.02)
+
+    @pytest.mark.asyncio
+    async def test_signal_routed_with_snapshot_first(self):
+        from app.core.symbol_registry import SymbolInfo
+
+        worker, router = await self._pair()
+        started = []
+        worker._start_trade = lambda signal: started.append(signal)
+
+        async def snapshot():
+            return [INSTRUMENT]
+
+        router._get_snapshot = snapshot
+        registry = type("Registry", (), {})()
+        loaded = []
+        registry.load_snapshot = lambda instruments: loaded.append(instruments)
+
+        serve = asyncio.create_task(worker.serve())
+        with patch("app.core.symbol_registry.get_symbol_registry", return_value=registry):
+            await router.start()
+            try:
+                await self._wait_for(lambda: 0 in router._conns)
+                assert await router.dispatch({"symbol": "BTCUSDT", "direction": "LONG"}) == 0
+                await self._wait_for(lambda: started)
+            finally:
+                await router.stop()
+                serve.cancel()
+
+        assert loaded == [[INSTRUMENT]]
+        assert started[0]["symbol"] == "BTCUSDT"
+        assert router.signals_routed == 1
+        assert SymbolInfo("BTCUSDT", INSTRUMENT).data is INSTRUMENT
+
+    @pytest.mark.asyncio
+    async def test_health_and_telegram_reach_ingress(self):
+        worker, router = await self._pair()
+        sent = []
+
+        async def fake_send_message(text, target_chat_id=None, **kwargs):
+            sent.append((text, kwargs.get("trade_id")))
+
+        async def snapshot():
+            return []
+
+        router._get_snapshot = snapshot
+        serve = asyncio.create_task(worker.serve())
+        with patch("app.telegram.output.send_message", fake_send_message):
+            await router.start()
+            try:
+                await self._wait_for(lambda: worker._conn is not None)
+                await worker.send({"type": "health", "shard": 0, "pid": 123, "active_trades": 2})
+                await worker.forward_telegram("hej", None, trade_id="T1")
+                await self._wait_for(lambda: sent and 0 in router._health)
+            finally:
+                await router.stop()
+                serve.cancel()
+
+        assert sent == [("hej", "T1")]
+        status = router.get_status()
+        assert status["active_trades"] == 2
+        assert status["shards"]["0"]["pid"] == 123
+
+    @pytest.mark.asyncio
+    async def test_frame_with_wrong_key_is_rejected(self):
+        received = []
+
+        async def on_connection(reader, writer):
+            try:
+                received.append(await _read_frame(reader, AUTHKEY))
+            except ConnectionError as e:
+                received.append(e)
+            writer.close()
+
+        server = await asyncio.start_server(on_connection, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        _, writer = await asyncio.open_connection(host, port)
+        await _write_frame(writer, {"type": "signal"}, b"wrong-key")
+        await self._wait_for(lambda: received)
+        writer.close()
+        server.close()
+
+        assert isinstance(received[0], ConnectionError)
+
+    @pytest.mark.asyncio
+    async def test_unreachable_shard_rejects_signal(self):
+        router = ShardRouter(2, addresses=[("127.0.0.1", 1), ("127.0.0.1", 2)], authkey=AUTHKEY)
+        assert await router.dispatch({"symbol": "BTCUSDT"}) is None
+        assert router.signals_rejected == 1
+        assert router.get_status()["healthy_shards"] == 0
+
+    def test_stale_heartbeats_do_not_count_toward_trade_limit(self):
+        router = ShardRouter(2, addresses=[("127.0.0.1", 1), ("127.0.0.1", 2)], authkey=AUTHKEY)
+        now = time.monotonic()
+        router._health[0] = {"active_trades": 3, "received_at": now}
+        router._health[1] = {"active_trades": 100, "received_at": now - 60}
+
+        assert router.active_trades() == 3
+
+    @pytest.mark.asyncio
+    async def test_burst_before_heartbeat_counts_toward_trade_limit(self):
+        from app.core.strict_config import STRICT_CONFIG
+
+        router = ShardRouter(2, addresses=[("127.0.0.1", 1), ("127.0.0.1", 2)], authkey=AUTHKEY)
+        shard_id = shard_for_symbol("BTCUSDT", 2)
+        router._health[shard_id] = {"active_trades": 0, "received_at": time.monotonic()}
+        sent = []
+
+        async def fake_send(shard, message):
+            sent.append(shard)
+            return True
+
+        with patch.object(router, "_send", fake_send), \
+                patch.object(STRICT_CONFIG, "max_trades", 2):
+            assert await router.dispatch({"symbol": "BTCUSDT"}) == shard_id
+            assert await router.dispatch({"symbol": "BTCUSDT"}) == shard_id
+            # Heartbeat still says 0 trades, but two are already on their way
+            assert await router.dispatch({"symbol": "BTCUSDT"}) is None
+            assert router.pending_trades() == 2
+
+            # The next heartbeat reports them, replacing the routed count
+            await router._handle(shard_id, {"type": "health", "active_trades": 1})
+            assert router.pending_trades() == 0
+            assert await router.dispatch({"symbol": "BTCUSDT"}) == shard_id
+
+        assert len(sent) == 3
+        assert router.signals_rejected == 1
+
+
+def test_registry_snapshot_mode_skips_fetch():
+    from app.core.symbol_registry import SymbolRegistry
+
+    registry = SymbolRegistry()
+    registry.load_snapshot([INSTRUMENT])
+
+    async def fail():
+        raise AssertionError("snapshot registry must not fetch")
+
+    registry._fetch_symbols = fail
+    info = asyncio.run(registry.get_symbol_info("BTCUSDT"))
+    assert str(info.tick_size) == "0.10"
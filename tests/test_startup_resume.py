@@ -0,0 +1,150 @@
+"""
+Tests for the startup resume pipeline (app/runtime/resume.py).
+"""
+
+import asyncio
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import aiosqlite
+import pytest
+
+from app.core.fill_waiters import entry_link_id
+from app.core.journal import AppendOnlyJournal
+from app.core.trade_limiter import get_trade_limiter
+from app.runtime import resume
+from app.storage import db as storage_db
+
+
+def make_trade(trade_id, symbol="BTCUSDT", direction="LONG", state="ENTRY_FILLED"):
+    return {"trade_id": trade_id, "symbol": symbol, "direction": direction, "entry_price": 50000.0,
+            "size": 0.01, "leverage": 10.0, "channel_name": "TEST", "state": state}
+
+
+def make_snapshot(positions=(), orders=(), executions=()):
+    return {"positions": list(positions), "orders": list(orders), "executions": list(executions), "fetch_ms": 12.5}
+
+
+class TestMatchTrades:
+    """Trades are matched against the snapshot in memory."""
+
+    def test_position_entries_and_stale(self):
+        trades = [make_trade("BTCUSDT_2"), make_trade("BTCUSDT_1"), make_trade("ETHUSDT_1", "ETHUSDT"),
+                  make_trade("SOLUSDT_1", "SOLUSDT")]
+        snapshot = make_snapshot(
+            positions=[{"symbol": "BTCUSDT", "side": "Buy", "size": "0.01", "avgPrice": "50100"}],
+            orders=[{"symbol": "BTCUSDT", "orderLinkId": "tp_BTCUSDT_2_1", "reduceOnly": True},
+                    {"symbol": "ETHUSDT", "orderLinkId": entry_link_id("ETHUSDT_1", 0), "reduceOnly": False}]
+        )
+
+        plans = {p["trade"]["trade_id"]: p for p in resume.match_trades(trades, snapshot)}
+
+        assert plans["BTCUSDT_2"]["action"] == "RUNNING"   # newest trade claims the position
+        assert plans["BTCUSDT_1"]["action"] == "STALE"
+        assert plans["ETHUSDT_1"]["action"] == "ENTRY_FILLED"
+        assert plans["ETHUSDT_1"]["entries"][0]["orderLinkId"] == entry_link_id("ETHUSDT_1", 0)
+        assert plans["SOLUSDT_1"]["action"] == "STALE"
+
+    def test_position_without_exits_replaces_tp_sl(self):
+        snapshot = make_snapshot(positions=[{"symbol": "BTCUSDT", "side": "Sell", "size": "1", "avgPrice": "1"}])
+
+        plans = resume.match_trades([make_trade("BTCUSDT_1", direction="SHORT")], snapshot)
+
+        assert plans[0]["action"] == "TP_SL_PLACED"
+
+
+class TestResumeOpenTrades:
+    """End to end with a temporary database."""
+
+    @pytest.fixture
+    def temp_db(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "trades.sqlite")
+            with patch.object(storage_db, "DB_PATH", path), patch.object(resume, "DB_PATH", path):
+                yield path
+
+    @pytest.mark.asyncio
+    async def test_resume_is_bounded_and_reports(self, temp_db):
+        await storage_db.init_db()
+        for i in range(6):
+            await storage_db.save_trade(f"SYM{i}USDT_1", f"SYM{i}USDT", "LONG", 1.0, 1.0, "ENTRY_FILLED",
+                                        leverage=5.0, channel_name="TEST")
+        await storage_db.save_trade("OLDUSDT_1", "OLDUSDT", "LONG", 1.0, 1.0, "RUNNING")
+        snapshot = make_snapshot(positions=[
+            {"symbol": f"SYM{i}USDT", "side": "Buy", "size": "1", "avgPrice": "1.5"} for i in range(6)
+        ])
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def get_symbol_info(symbol):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MagicMock()
+
+        registry = MagicMock()
+        registry.get_symbol_info = get_symbol_info
+        registry.get_cached_symbol_info.return_value = None
+        with patch("app.runtime.resume.get_startup_snapshot", AsyncMock(return_value=snapshot)), \
+             patch("app.core.symbol_registry.get_symbol_registry", return_value=registry), \
+             patch("app.runtime.sharding.owns_symbol", return_value=True), \
+             patch("app.core.strict_fsm.TradeFSM.run", AsyncMock(return_value=True)):
+            report = await resume.resume_open_trades(concurrency=2)
+            await resume.cleanup_resume_tasks()
+        for i in range(6):
+            get_trade_limiter().end_trade(f"SYM{i}USDT_1")
+
+        assert max_in_flight == 2
+        assert report["trades"] == 7
+        assert report["running"] == 6
+        assert report["stale"] == 1
+        assert report["failed"] == 0
+        assert report["snapshot_ms"] == 12.5
+        assert report["time_to_ready_ms"] > 0
+        assert resume.get_resume_report() == report
+
+        async with aiosqlite.connect(temp_db) as conn:
+            async with conn.execute("SELECT state FROM trades WHERE trade_id='OLDUSDT_1'") as cur:
+                assert (await cur.fetchone())[0] == "CLOSED"
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_fetched_once(self):
+        fetch = AsyncMock(return_value=make_snapshot())
+        resume.clear_startup_snapshot()
+        with patch("app.runtime.resume._fetch_startup_snapshot", fetch):
+            first, second = await asyncio.gather(resume.get_startup_snapshot(), resume.get_startup_snapshot())
+        resume.clear_startup_snapshot()
+
+        assert first is second
+        assert fetch.await_count == 1
+
+
+class TestJournalReuse:
+    """Journal reconciliation uses the startup snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_reconcile_with_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            journal = AppendOnlyJournal(Path(tmpdir) / "journal.jsonl")
+            await journal.append("ORDER_PLACED", {"order_id": "o1", "symbol": "BTCUSDT"})
+            await journal.append("ORDER_FILLED", {"order_id": "o1"})
+            client = MagicMock()
+            client.get_open_orders = AsyncMock()
+
+            report = await journal.reconcile_with_bybit(
+                client,
+                open_orders=[],
+                executions=[{"orderId": "o1", "execType": "Trade"},
+                            {"orderId": "o2", "symbol": "ETHUSDT", "execType": "Trade"},
+                            {"orderId": "o3", "execType": "Funding"}]
+            )
+
+            assert journal.last_entry_time_ms() is not None
+
+        client.get_open_orders.assert_not_called()
+        assert [f["order_id"] for f in report["unjournaled_fills"]] == ["o2"]
+        assert report["status"] == "clean"
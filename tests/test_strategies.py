@@ -1,5 +1,8 @@
 """Test suite for advanced strategies."""
 
+import asyncio
+import time
+
 import pytest
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
@@ -145,6 +148,138 @@ class TestHedgeStrategy:
         assert hedge_strategy.activated == True, "Hedge should be marked as activated"
         assert hedge_strategy.hedge_size == Decimal("100"), "Hedge size should be set"
 
+class TestCompiledTriggers:
+    """Thresholds compiled to absolute prices once, from original entry."""
+    
+    def test_pyramid_ladder_long(self):
+        pyramid = PyramidStrategyV2("T", "MOVEUSDT", "LONG", Decimal("100"), "TEST_CHANNEL")
+        assert pyramid._trigger_prices[0] == Decimal("101.5")
+        assert pyramid.should_activate(Decimal("101.49")) == False
+        assert pyramid.should_activate(Decimal("101.5")) == True
+    
+    def test_pyramid_ladder_short(self):
+        pyramid = PyramidStrategyV2("T", "MOVEUSDT", "SHORT", Decimal("100"), "TEST_CHANNEL")
+        assert pyramid.should_activate(Decimal("98.6")) == False
+        assert pyramid.should_activate(Decimal("98.5")) == True
+    
+    @pytest.mark.asyncio
+    async def test_pyramid_fires_one_level_per_check(self):
+        pyramid = PyramidStrategyV2("T", "MOVEUSDT", "LONG", Decimal("100"), "TEST_CHANNEL")
+        pyramid._activate_level = AsyncMock()
+        
+        assert await pyramid.check_and_activate(Decimal("102.4")) == True
+        assert pyramid.activated_levels == {Decimal("1.5")}
+        assert await pyramid.check_and_activate(Decimal("102.4")) == True
+        assert await pyramid.check_and_activate(Decimal("102.4")) == True
+        assert pyramid.activated_levels == {Decimal("1.5"), Decimal("2.3"), Decimal("2.4")}
+        # Next armed level is +2.5%
+        assert await pyramid.check_and_activate(Decimal("102.4")) == False
+        assert pyramid._next_trigger == Decimal("102.5")
+    
+    def test_pyramid_without_entry_never_fires(self):
+        pyramid = PyramidStrategyV2("T", "MOVEUSDT", "LONG", Decimal("0"), "TEST_CHANNEL")
+        assert pyramid.should_activate(Decimal("1000")) == False
+    
+    def test_trailing_activation_price(self):
+        trailing = TrailingStopStrategyV2("T", "MOVEUSDT", "LONG", "TEST_CHANNEL")
+        assert trailing.needs_update(Decimal("106.09"), Decimal("100")) == False
+        assert trailing.needs_update(Decimal("106.1"), Decimal("100")) == True
+        assert trailing._activation_price == Decimal("106.1")
+        
+        trailing.armed = True
+        trailing.highest_price = Decimal("107")
+        assert trailing.needs_update(Decimal("106.5"), Decimal("100")) == False
+        assert trailing.needs_update(Decimal("107.1"), Decimal("100")) == True
+    
+    @pytest.mark.asyncio
+    async def test_hedge_skips_rest_below_trigger(self):
+        hedge = HedgeStrategyV2("T", "MOVEUSDT", "LONG", Decimal("100"), "TEST_CHANNEL")
+        hedge.bybit.positions = AsyncMock()
+        
+        assert await hedge.check_and_activate(Decimal("98.5"), Decimal("100")) == False
+        hedge.bybit.positions.assert_not_awaited()
+        assert hedge.should_activate(Decimal("98"), Decimal("100")) == True
+
+    def test_short_activation_prices(self):
+        # TradeFSM passes LONG/SHORT, never BUY/SELL
+        trailing = TrailingStopStrategyV2("T", "MOVEUSDT", "SHORT", "TEST_CHANNEL")
+        assert trailing.needs_update(Decimal("94"), Decimal("100")) == False
+        assert trailing.needs_update(Decimal("93.9"), Decimal("100")) == True
+
+        hedge = HedgeStrategyV2("T", "MOVEUSDT", "SHORT", Decimal("100"), "TEST_CHANNEL")
+        assert hedge.should_activate(Decimal("98"), Decimal("100")) == False
+        assert hedge.should_activate(Decimal("102"), Decimal("100")) == True
+
+class TestDebouncedTrailing:
+    """Trailing SL is moved in place, coalesced by step and interval."""
+    
+    def _armed(self, interval=0.05):
+        trailing = TrailingStopStrategyV2("T", "MOVEUSDT", "LONG", "TEST_CHANNEL")
+        trailing.bybit.set_trading_stop = AsyncMock(return_value={"retCode": 0})
+        trailing.bybit.place_order = AsyncMock(return_value={"retCode": 0})
+        trailing.armed = True
+        trailing.highest_price = Decimal("100")
+        trailing.current_sl = Decimal("97.5")
+        trailing.min_update_interval = interval
+        return trailing
+    
+    @pytest.mark.asyncio
+    async def test_fast_trend_coalesced_to_one_amend(self):
+        trailing = self._armed()
+        trailing._last_push_at = time.monotonic()
+        
+        for i in range(1, 51):
+            await trailing.check_and_update(Decimal("100") + Decimal(i) / 100, Decimal("90"))
+        trailing.bybit.set_trading_stop.assert_not_awaited()
+        
+        await asyncio.sleep(0.1)
+        
+        trailing.bybit.set_trading_stop.assert_awaited_once()
+        assert trailing.bybit.set_trading_stop.await_args.kwargs["stop_loss"] == Decimal("100.50") * Decimal("0.975")
+        trailing.bybit.place_order.assert_not_awaited()
+        stats = trailing.get_stats()
+        assert stats["sl_moves"] == 50
+        assert stats["exchange_calls"] == 1
+        assert stats["calls_saved"] == 49
+    
+    @pytest.mark.asyncio
+    async def test_sub_step_move_waits(self):
+        trailing = self._armed()
+        
+        await trailing.check_and_update(Decimal("100.05"), Decimal("90"))
+        trailing.bybit.set_trading_stop.assert_not_awaited()
+        
+        await trailing.check_and_update(Decimal("100.2"), Decimal("90"))
+        trailing.bybit.set_trading_stop.assert_awaited_once()
+        assert trailing.current_sl == Decimal("100.2") * Decimal("0.975")
+    
+    @pytest.mark.asyncio
+    async def test_stop_drops_pending_move(self):
+        trailing = self._armed(interval=0.05)
+        trailing._last_push_at = time.monotonic()
+        
+        await trailing.check_and_update(Decimal("101"), Decimal("90"))
+        trailing.stop()
+        await asyncio.sleep(0.1)
+        
+        trailing.bybit.set_trading_stop.assert_not_awaited()
+    
+    @pytest.mark.asyncio
+    async def test_long_stop_below_mark_and_only_ratchets_up(self):
+        trailing = self._armed(interval=0)
+        
+        stops = []
+        for price in ("101", "100.5", "102", "101.5", "103"):
+            mark = Decimal(price)
+            await trailing.check_and_update(mark, Decimal("90"))
+            assert trailing.current_sl < mark
+            stops.append(trailing.current_sl)
+        
+        # Pullbacks leave the stop where it is; new highs only raise it
+        assert stops == sorted(stops)
+        assert trailing.bybit.set_trading_stop.await_count == 3
+        assert trailing.current_sl == Decimal("103") * Decimal("0.975")
+
 class TestReentryStrategy:
     """Test re-entry strategy."""
     
@@ -0,0 +1,100 @@
+"""
+Tests for per-topic/per-symbol WebSocket dispatch (app/bybit/ws_dispatcher.py).
+"""
+
+import asyncio
+
+import pytest
+
+from app.bybit.websocket import BybitWebSocket
+from app.bybit.ws_dispatcher import TopicDispatcher
+
+
+class TestTopicDispatcher:
+    """Lanes keep order per symbol and never block the submitter."""
+
+    @pytest.mark.asyncio
+    async def test_slow_symbol_does_not_block_others(self):
+        release = asyncio.Event()
+        seen = []
+
+        async def slow(item):
+            await release.wait()
+            seen.append(item["id"])
+
+        async def fast(item):
+            seen.append(item["id"])
+
+        dispatcher = TopicDispatcher(lambda topic, symbol: slow if symbol == "BTCUSDT" else fast)
+        dispatcher.submit("execution", "BTCUSDT", {"id": "b1"})
+        dispatcher.submit("execution", "BTCUSDT", {"id": "b2"})
+        dispatcher.submit("execution", "ETHUSDT", {"id": "e1"})
+        await asyncio.sleep(0.01)
+
+        assert seen == ["e1"]
+        assert dispatcher.get_stats()["execution"]["depth"] == 1
+
+        release.set()
+        await dispatcher.drain()
+        assert seen == ["e1", "b1", "b2"]
+        stats = dispatcher.get_stats()["execution"]
+        assert stats["processed"] == 3 and stats["depth"] == 0
+
+    @pytest.mark.asyncio
+    async def test_position_updates_are_merged_when_behind(self):
+        release = asyncio.Event()
+        seen = []
+
+        async def handler(item):
+            await release.wait()
+            seen.append(item["size"])
+
+        dispatcher = TopicDispatcher(lambda topic, symbol: handler)
+        for size in ("1", "2", "3", "4"):
+            dispatcher.submit("position", "BTCUSDT", {"size": size})
+            await asyncio.sleep(0)
+
+        release.set()
+        await dispatcher.drain()
+
+        assert seen == ["1", "4"]
+        assert dispatcher.get_stats()["position"]["merged"] == 2
+
+    @pytest.mark.asyncio
+    async def test_bounded_lane_drops_and_errors_are_isolated(self):
+        async def failing(item):
+            raise RuntimeError("handler bug")
+
+        dispatcher = TopicDispatcher(lambda topic, symbol: failing, max_pending=2)
+        for i in range(4):
+            dispatcher.submit("execution", "BTCUSDT", {"id": i})
+        await dispatcher.drain()
+
+        stats = dispatcher.get_stats()["execution"]
+        assert stats["dropped"] == 2
+        assert stats["errors"] == 2
+
+
+class TestWebSocketRouting:
+    """The receive path only routes; handlers run on the dispatcher."""
+
+    @pytest.mark.asyncio
+    async def test_handle_message_returns_before_handler_finishes(self):
+        ws = BybitWebSocket()
+        release = asyncio.Event()
+        handled = []
+
+        async def on_execution(execution):
+            await release.wait()
+            handled.append(execution["execId"])
+
+        ws.execution_handlers["BTCUSDT"] = on_execution
+        await asyncio.wait_for(ws._handle_message({"topic": "execution", "data": [
+            {"symbol": "BTCUSDT", "execType": "Trade", "execId": "1"},
+            {"symbol": "BTCUSDT", "execType": "Funding", "execId": "2"}
+        ]}), 0.5)
+
+        assert handled == []
+        release.set()
+        await ws.dispatcher.drain()
+        assert handled == ["1"]